@@ -262,6 +262,12 @@ def _add_common_lg_options(options, actions, addon, item_info, is_librarygenie_c
     except Exception:
         pass
 
+    # Offline similarity engine can serve "Find Similar" without AI search activation
+    try:
+        local_similarity_available = settings.get_local_similarity_enabled()
+    except Exception:
+        local_similarity_available = False
+
     # Determine if we're in a list context for remove option
     container_path = xbmc.getInfoLabel('Container.FolderPath')
     in_list_context = 'list_id=' in container_path or item_info.get('list_id')
@@ -340,16 +346,17 @@ def _add_common_lg_options(options, actions, addon, item_info, is_librarygenie_c
         else:
             actions.append("remove_from_list_generic")
 
-    # 5. LG Find Similar Movies (if AI search is available and item has valid IMDb ID)
+    # 5. LG Find Similar Movies (if AI search or local similarity is available and item has valid IMDb ID)
     # Determine if this is a movie - use dbtype or infer from container
     is_movie = item_info.get('dbtype') == 'movie' or (
         not item_info.get('dbtype') and item_info.get('is_movies')
     )
     
-    xbmc.log(f"[LG SIMILAR] Menu check: ai_search_available={ai_search_available}, is_playable_item={is_playable_item}, is_movie={is_movie}", xbmc.LOGINFO)
+    similar_available = ai_search_available or local_similarity_available
+    xbmc.log(f"[LG SIMILAR] Menu check: ai_search_available={ai_search_available}, local_similarity_available={local_similarity_available}, is_playable_item={is_playable_item}, is_movie={is_movie}", xbmc.LOGINFO)
     xbmc.log(f"[LG SIMILAR] Menu check: dbtype='{item_info.get('dbtype')}', is_movies={item_info.get('is_movies')}, imdbnumber='{item_info.get('imdbnumber')}'", xbmc.LOGINFO)
     
-    if ai_search_available and is_playable_item and is_movie:
+    if similar_available and is_playable_item and is_movie:
         imdb_id = item_info.get('imdbnumber', '').strip()
         
         # Only show option if we have a valid IMDb ID (already validated to start with 'tt')
@@ -366,8 +373,8 @@ def _add_common_lg_options(options, actions, addon, item_info, is_librarygenie_c
             xbmc.log(f"[LG SIMILAR] ✗ No valid IMDb ID, hiding option for: {item_info.get('title')}", xbmc.LOGINFO)
     else:
         reason = []
-        if not ai_search_available:
-            reason.append("AI search not available")
+        if not similar_available:
+            reason.append("AI search and local similarity not available")
         if not is_playable_item:
             reason.append("not playable item")
         if not is_movie:
@@ -5,7 +5,20 @@
 LibraryGenie - Authentication Module
 """
 
-from lib.auth.state import is_authorized, save_tokens, get_tokens, clear_tokens
-from lib.auth.auth_helper import get_auth_helper
+from lib.utils.lazy_exports import lazy_exports
 
-__all__ = ['is_authorized', 'save_tokens', 'get_tokens', 'clear_tokens', 'get_auth_helper']
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'is_authorized': 'lib.auth.state',
+    'save_tokens': 'lib.auth.state',
+    'get_tokens': 'lib.auth.state',
+    'clear_tokens': 'lib.auth.state',
+    'get_auth_helper': 'lib.auth.auth_helper',
+})
+
+__all__ = [
+    'is_authorized',
+    'save_tokens',
+    'get_tokens',
+    'clear_tokens',
+    'get_auth_helper',
+]
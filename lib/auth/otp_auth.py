@@ -405,7 +405,7 @@ def run_otp_authorization_flow(server_url: str) -> bool:
                             from lib.remote.ai_search_client import get_ai_search_client
                             ai_client = get_ai_search_client()
                             logger.info("Post-OTP sync: Syncing %s movies (source='lib', media_type='movie')", len(sync_items))
-                            sync_result = ai_client.sync_media_batch(sync_items, use_replace_mode=True)
+                            sync_result = ai_client.sync_library(sync_items, force_replace=True)
                             if sync_result and sync_result.get('success'):
                                 logger.info("Post-OTP authoritative sync completed: %s", sync_result.get('results', {}))
                             else:
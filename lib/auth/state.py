@@ -193,6 +193,16 @@ def clear_auth_data() -> bool:
             conn.execute("DELETE FROM auth_state")
 
         logger.info("Authentication data cleared successfully")
+
+        # Cached AI searches and similar movies belong to the account that was signed in
+        try:
+            from lib.remote.ai_search_cache import get_ai_search_result_cache
+            get_ai_search_result_cache().clear()
+            # Reused plugin interpreters still hold them in RemoteCache's memory tier
+            from lib.utils.invocation_state import advance_generation
+            advance_generation()
+        except Exception as e:
+            logger.warning("Could not clear cached AI searches: %s", e)
         return True
 
     except Exception as e:
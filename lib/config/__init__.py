@@ -5,6 +5,12 @@
 LibraryGenie - Configuration Module
 """
 
-from lib.config.config_manager import get_config
+from lib.utils.lazy_exports import lazy_exports
 
-__all__ = ["get_config"]
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'get_config': 'lib.config.config_manager',
+})
+
+__all__ = [
+    'get_config',
+]
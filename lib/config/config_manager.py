@@ -10,6 +10,8 @@ import xbmcaddon
 import threading
 from typing import Optional, Dict, Any
 
+from lib.utils.invocation_state import on_generation_change
+
 
 class ConfigManager:
     """Manages addon configuration and settings"""
@@ -41,6 +43,7 @@ class ConfigManager:
             
             # Search settings
             "search_page_size": 200,
+            "search_group_episodes": True,  # Group episode search hits by show
             
             # Pagination settings  
             "list_pagination_mode": 0,       # Integer: 0=auto, 1=manual
@@ -76,7 +79,12 @@ class ConfigManager:
             "ai_search_api_key": "",
             "ai_search_activated": False,
             "ai_search_sync_interval": 1,
+            "ai_search_cache_minutes": 60,  # Completed AI searches are reused for this long (0 = off)
+            "library_stats_ttl_minutes": 360,  # Cached AI library stats are refreshed when older
+            "ai_search_debug_logging": False,  # Log full AI search request/response payloads
             "preferred_search_mode": "local",  # 'local' or 'ai' - last used search mode
+            "local_similarity_enabled": True,  # Offline similar-movie engine
+            "similar_prefetch_enabled": True,  # Prefetch AI similar movies after playback
             
             # Backup settings
             "enable_automatic_backups": False,
@@ -89,12 +97,18 @@ class ConfigManager:
             "backup_include_settings": True,
             "backup_include_non_library": False,
             
+            # Keep settings, connections and caches between plugin calls (see invocation_state)
+            "keep_plugin_state": False,
+
             # Folder cache settings
             "folder_cache_enabled": True,  # Master switch for folder caching
             "folder_cache_fresh_ttl": 12,  # Hours - cache is considered fresh
             "folder_cache_hard_expiry": 30,  # Days - cache expires completely
+            "folder_cache_serve_outdated": False,  # Serve invalidated folders while rebuilding in background
             "folder_cache_prewarm_enabled": True,  # Enable cache pre-warming
             "folder_cache_prewarm_max_folders": 10,  # Max folders to pre-warm
+            "folder_cache_prewarm_seconds": 10,  # Seconds a pre-warm run may take
+            "folder_cache_max_mb": 20,  # Pre-warming stops at this cache size
             "folder_cache_debug_logging": False,  # Enable detailed cache logging
             
             # ShortList integration settings
@@ -399,6 +413,9 @@ class ConfigManager:
             "remote_fallback_to_local",
             # AI Search settings
             "ai_search_activated",
+            "local_similarity_enabled",
+            "similar_prefetch_enabled",
+            "search_group_episodes",
             # Backup boolean settings
             "enable_automatic_backups",
             "backup_enabled",
@@ -407,6 +424,7 @@ class ConfigManager:
             "backup_include_folders",
             # Folder cache boolean settings
             "folder_cache_enabled",
+            "folder_cache_serve_outdated",
             "folder_cache_prewarm_enabled",
             "folder_cache_debug_logging",
             # ShortList integration settings
@@ -418,6 +436,7 @@ class ConfigManager:
             "background_token_refresh",
             # Debug settings
             "debug_first_playable",
+            "ai_search_debug_logging",
             # Initialization state settings
             "initial_sync_requested",
         ]
@@ -431,13 +450,14 @@ class ConfigManager:
             # Remote service settings
             "background_interval_minutes",
             # AI Search settings
-            "ai_search_sync_interval", 
+            "ai_search_sync_interval", "ai_search_cache_minutes", "library_stats_ttl_minutes",
             # Backup integer settings
             "backup_interval", "backup_retention_count", "backup_storage_type",
             # Pagination settings
             "list_pagination_mode", "list_manual_page_size",
             # Folder cache integer settings
             "folder_cache_fresh_ttl", "folder_cache_hard_expiry", "folder_cache_prewarm_max_folders",
+            "folder_cache_prewarm_seconds", "folder_cache_max_mb",
         ]
         float_settings = []
 
@@ -786,3 +806,11 @@ def get_config() -> ConfigManager:
     return _CFG
 
 
+def _reload_config():
+    if _CFG is not None:
+        _CFG.reload()
+
+
+on_generation_change(_reload_config)
+
+
@@ -154,6 +154,11 @@ class SettingsManager:
         value = config.get_int('search_page_size', 200)
         return max(50, min(500, value))
 
+    def get_search_group_episodes(self) -> bool:
+        """Get whether episode search hits are grouped into one folder per show"""
+        config = get_config()
+        return config.get_bool('search_group_episodes', True)
+
     # Pagination Settings
     def get_list_pagination_mode(self) -> str:
         """Get list pagination mode ('auto' or 'manual')"""
@@ -274,6 +279,32 @@ class SettingsManager:
         }
         return interval_map.get(selector_value, 43200)  # Default to 12 hours
 
+
+    def get_ai_search_cache_minutes(self) -> int:
+        """Get how long completed AI searches are reused, in minutes (0 disables)"""
+        config = get_config()
+        return max(0, config.get_int('ai_search_cache_minutes', 60))
+
+    def get_library_stats_ttl_minutes(self) -> int:
+        """Get the age in minutes after which cached AI library stats are refreshed"""
+        config = get_config()
+        return max(30, config.get_int('library_stats_ttl_minutes', 360))
+
+    def get_ai_search_debug_logging(self) -> bool:
+        """Get whether full AI search payloads are logged"""
+        config = get_config()
+        return config.get_bool('ai_search_debug_logging', False)
+
+    def get_local_similarity_enabled(self) -> bool:
+        """Get whether offline similar-movie search is enabled (used when AI search is not activated)"""
+        config = get_config()
+        return config.get_bool('local_similarity_enabled', True)
+
+    def get_similar_prefetch_enabled(self) -> bool:
+        """Get whether similar movies are fetched in the background after a movie is watched"""
+        config = get_config()
+        return config.get_bool('similar_prefetch_enabled', True)
+
     # Backup Settings
     def get_enable_automatic_backups(self) -> bool:
         """Get enable automatic backups setting"""
@@ -414,6 +445,16 @@ class SettingsManager:
             'cache_duration': config.get_int('remote_cache_duration', 300)
         }
 
+    def get_keep_plugin_state(self) -> bool:
+        """Get whether plugin calls keep settings, connections and caches of earlier calls"""
+        config = get_config()
+        return config.get_bool('keep_plugin_state', False)
+
+    def set_keep_plugin_state(self, enabled: bool) -> None:
+        """Set whether plugin calls keep settings, connections and caches of earlier calls"""
+        config = get_config()
+        config.set('keep_plugin_state', enabled)
+
     # Folder Cache Settings
     def get_folder_cache_enabled(self) -> bool:
         """Get folder cache enabled setting"""
@@ -445,6 +486,16 @@ class SettingsManager:
         config = get_config()
         config.set('folder_cache_hard_expiry', max(1, days))  # Minimum 1 day
 
+    def get_folder_cache_serve_outdated(self) -> bool:
+        """Get whether invalidated folders are served while they rebuild in the background"""
+        config = get_config()
+        return config.get_bool('folder_cache_serve_outdated', False)
+
+    def set_folder_cache_serve_outdated(self, enabled: bool) -> None:
+        """Set whether invalidated folders are served while they rebuild in the background"""
+        config = get_config()
+        config.set('folder_cache_serve_outdated', enabled)
+
     def get_folder_cache_prewarm_enabled(self) -> bool:
         """Get folder cache pre-warming enabled setting"""
         config = get_config()
@@ -465,6 +516,26 @@ class SettingsManager:
         config = get_config()
         config.set('folder_cache_prewarm_max_folders', max(1, max_folders))  # Minimum 1 folder
 
+    def get_folder_cache_prewarm_seconds(self) -> int:
+        """Get time budget of a pre-warm run in seconds"""
+        config = get_config()
+        return config.get_int('folder_cache_prewarm_seconds', 10)
+
+    def set_folder_cache_prewarm_seconds(self, seconds: int) -> None:
+        """Set time budget of a pre-warm run in seconds"""
+        config = get_config()
+        config.set('folder_cache_prewarm_seconds', max(1, seconds))
+
+    def get_folder_cache_max_mb(self) -> int:
+        """Get cache size in MB at which pre-warming stops"""
+        config = get_config()
+        return config.get_int('folder_cache_max_mb', 20)
+
+    def set_folder_cache_max_mb(self, megabytes: int) -> None:
+        """Set cache size in MB at which pre-warming stops"""
+        config = get_config()
+        config.set('folder_cache_max_mb', max(1, megabytes))
+
     def get_folder_cache_debug_logging(self) -> bool:
         """Get folder cache debug logging enabled setting"""
         config = get_config()
@@ -482,8 +553,11 @@ class SettingsManager:
                 'enabled': self.get_folder_cache_enabled(),
                 'fresh_ttl_hours': self.get_folder_cache_fresh_ttl(),
                 'hard_expiry_days': self.get_folder_cache_hard_expiry(),
+                'serve_outdated': self.get_folder_cache_serve_outdated(),
                 'prewarm_enabled': self.get_folder_cache_prewarm_enabled(),
                 'prewarm_max_folders': self.get_folder_cache_prewarm_max_folders(),
+                'prewarm_seconds': self.get_folder_cache_prewarm_seconds(),
+                'max_mb': self.get_folder_cache_max_mb(),
                 'debug_logging': self.get_folder_cache_debug_logging()
             }
         except Exception as e:
@@ -492,8 +566,11 @@ class SettingsManager:
                 'enabled': True,
                 'fresh_ttl_hours': 12,
                 'hard_expiry_days': 30,
+                'serve_outdated': False,
                 'prewarm_enabled': True,
                 'prewarm_max_folders': 10,
+                'prewarm_seconds': 10,
+                'max_mb': 20,
                 'debug_logging': False
             }
 
@@ -6,16 +6,20 @@ LibraryGenie - Data Layer
 Database operations and query management
 """
 
-from lib.data.query_manager import QueryManager, get_query_manager
-from lib.data.connection_manager import get_connection_manager
-from lib.data.storage_manager import get_storage_manager
-from lib.data.migrations import get_migration_manager
+from lib.utils.lazy_exports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'QueryManager': 'lib.data.query_manager',
+    'get_query_manager': 'lib.data.query_manager',
+    'get_connection_manager': 'lib.data.connection_manager',
+    'get_storage_manager': 'lib.data.storage_manager',
+    'get_migration_manager': 'lib.data.migrations',
+})
 
-# Export main classes and functions
 __all__ = [
     'QueryManager',
     'get_query_manager',
     'get_connection_manager',
     'get_storage_manager',
-    'get_migration_manager'
-]
\ No newline at end of file
+    'get_migration_manager',
+]
@@ -14,9 +14,7 @@ from typing import Optional
 from contextlib import contextmanager
 
 from lib.utils.kodi_log import get_kodi_logger
-from lib.config import get_config
-from lib.data.storage_manager import get_storage_manager
-from lib.data.db_config import get_db_config_calculator
+from lib.utils.invocation_state import on_invocation_end, on_generation_change
 
 
 class ConnectionManager:
@@ -24,16 +22,37 @@ class ConnectionManager:
 
     def __init__(self):
         self.logger = get_kodi_logger('lib.data.connection_manager')
-        self.storage_manager = get_storage_manager()
-        self.db_config = get_db_config_calculator()
-
-        self.config = get_config()
+        # Loaded on first use so getting the manager does not set up the database
+        self._storage_manager = None
+        self._db_config = None
+        self._config = None
         self._connection = None
         self._lock = threading.RLock()
 
         # Register cleanup on interpreter exit
         atexit.register(self.close)
 
+    @property
+    def storage_manager(self):
+        if self._storage_manager is None:
+            from lib.data.storage_manager import get_storage_manager
+            self._storage_manager = get_storage_manager()
+        return self._storage_manager
+
+    @property
+    def db_config(self):
+        if self._db_config is None:
+            from lib.data.db_config import get_db_config_calculator
+            self._db_config = get_db_config_calculator()
+        return self._db_config
+
+    @property
+    def config(self):
+        if self._config is None:
+            from lib.config.config_manager import get_config
+            self._config = get_config()
+        return self._config
+
     def get_connection(self):
         """Get database connection, creating if necessary"""
         if self._connection is None:
@@ -199,6 +218,17 @@ class ConnectionManager:
                 finally:
                     self._connection = None
 
+    def release_open_transaction(self):
+        """Roll back a transaction that a finished plugin call left open
+
+        A reused interpreter keeps the connection between calls, and an open
+        write transaction would hold the database lock until Kodi exits.
+        """
+        with self._lock:
+            if self._connection is not None and self._connection.in_transaction:
+                self.logger.warning("Rolling back a transaction left open by the previous plugin call")
+                self._connection.rollback()
+
     # Phase 3: Batched operations support
 
     @contextmanager
@@ -255,4 +285,19 @@ def get_connection_manager():
     global _connection_instance
     if _connection_instance is None:
         _connection_instance = ConnectionManager()
-    return _connection_instance
\ No newline at end of file
+    return _connection_instance
+
+
+def _release_open_transaction():
+    if _connection_instance is not None:
+        _connection_instance.release_open_transaction()
+
+
+def _close_connection():
+    """The database may have been restored or its settings changed; the next query reconnects"""
+    if _connection_instance is not None:
+        _connection_instance.close()
+
+
+on_invocation_end(_release_open_transaction)
+on_generation_change(_close_connection)
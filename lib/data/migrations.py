@@ -12,7 +12,29 @@ from lib.data.connection_manager import get_connection_manager
 from lib.utils.kodi_log import get_kodi_logger
 
 # Current target schema version
-TARGET_SCHEMA_VERSION = 10
+TARGET_SCHEMA_VERSION = 15
+
+# media_items columns a rendered row is built from. updated_at is not one of them:
+# library scans set it on every item they still find ("last seen").
+MEDIA_ITEMS_CONTENT_COLUMNS = (
+    'media_type', 'title', 'year', 'imdbnumber', 'tmdb_id', 'kodi_id', 'source', 'play', 'plot',
+    'rating', 'votes', 'duration', 'mpaa', 'genre', 'director', 'studio', 'country', 'writer', 'cast',
+    'art', 'file_path', 'normalized_path', 'is_removed', 'display_title', 'duration_seconds',
+    'tvshowtitle', 'season', 'episode', 'aired', 'tvshow_kodi_id',
+)
+
+# Moves media_items.content_updated_at forward (millisecond resolution) when an update
+# changes one of the content columns, so cached render specs keyed by it survive
+# last-seen updates but never outlive a real change. Created with its own execute():
+# the ';' inside the body breaks statement splitting.
+MEDIA_ITEMS_CONTENT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS trg_media_items_content
+    AFTER UPDATE ON media_items
+    FOR EACH ROW WHEN %s
+    BEGIN
+        UPDATE media_items SET content_updated_at = strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now') WHERE id = NEW.id;
+    END
+""" % ' OR '.join('NEW.%s IS NOT OLD.%s' % (column, column) for column in MEDIA_ITEMS_CONTENT_COLUMNS)
 
 
 class MigrationManager:
@@ -108,7 +130,7 @@ class MigrationManager:
             applied_at TEXT NOT NULL
         );
         
-        INSERT INTO schema_version (id, version, applied_at) VALUES (1, 10, datetime('now')) 
+        INSERT INTO schema_version (id, version, applied_at) VALUES (1, 15, datetime('now')) 
         ON CONFLICT(id) DO UPDATE SET version=excluded.version, applied_at=excluded.applied_at;
         
         -- Auth state table for device authorization (CRITICAL - fixes original error)
@@ -190,7 +212,8 @@ class MigrationManager:
             aired TEXT,
             tvshow_kodi_id INTEGER,
             created_at TEXT NOT NULL DEFAULT (datetime('now')),
-            updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+            updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+            content_updated_at TEXT
         );
         
         CREATE INDEX idx_media_items_imdbnumber ON media_items (imdbnumber);
@@ -264,6 +287,22 @@ class MigrationManager:
         
         CREATE INDEX idx_pending_operations_processing ON pending_operations (operation, created_at);
         
+        -- IMDb IDs committed to the AI search server (delta sync manifest)
+        CREATE TABLE ai_sync_manifest (
+            imdb_id TEXT PRIMARY KEY
+        ) WITHOUT ROWID;
+        
+        -- AI batch upload in progress, for resuming after an interruption
+        CREATE TABLE ai_upload_session (
+            upload_id TEXT PRIMARY KEY,
+            mode TEXT NOT NULL,
+            chunk_size INTEGER NOT NULL,
+            ids_digest TEXT NOT NULL,
+            server_url TEXT NOT NULL,
+            acked_chunks TEXT NOT NULL DEFAULT '[]',
+            created_at TEXT NOT NULL
+        );
+        
         CREATE TABLE search_history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             query_text TEXT NOT NULL,
@@ -312,16 +351,17 @@ class MigrationManager:
         
         
         CREATE TABLE remote_cache (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            cache_key TEXT NOT NULL UNIQUE,
-            cache_value TEXT,
-            cache_metadata TEXT,
-            created_at TEXT NOT NULL DEFAULT (datetime('now')),
-            expires_at TEXT
+            cache_key TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            expires_at TEXT NOT NULL,
+            hit_count INTEGER NOT NULL DEFAULT 0,
+            last_accessed TEXT,
+            size_bytes INTEGER NOT NULL DEFAULT 0
         );
         
-        CREATE INDEX idx_remote_cache_key ON remote_cache(cache_key);
         CREATE INDEX idx_remote_cache_expires ON remote_cache(expires_at);
+        CREATE INDEX idx_remote_cache_last_accessed ON remote_cache(last_accessed);
         
         -- Sync snapshot table for memory-efficient delta detection
         CREATE TABLE sync_snapshot (
@@ -371,6 +411,7 @@ class MigrationManager:
                 if statement:
                     conn.execute(statement)
             self.logger.debug("Database schema created successfully (fallback method)")
+        conn.execute(MEDIA_ITEMS_CONTENT_TRIGGER)
         
         self.logger.info("Complete database schema created successfully")
 
@@ -659,6 +700,60 @@ class MigrationManager:
                 conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_intersection_list_sources_unique ON intersection_list_sources (intersection_list_id, source_list_id)")
                 self.logger.info("Intersection lists tables created successfully")
             
+            # Migration from version 10 to 11: Add AI sync manifest table
+            if current_version < 11:
+                self.logger.info("Migrating from version 10 to 11: Adding ai_sync_manifest table")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS ai_sync_manifest (
+                        imdb_id TEXT PRIMARY KEY
+                    ) WITHOUT ROWID
+                """)
+                self.logger.info("ai_sync_manifest table created successfully")
+            
+            # Migration from version 11 to 12: Add resumable AI upload sessions
+            if current_version < 12:
+                self.logger.info("Migrating from version 11 to 12: Adding ai_upload_session table")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS ai_upload_session (
+                        upload_id TEXT PRIMARY KEY,
+                        mode TEXT NOT NULL,
+                        chunk_size INTEGER NOT NULL,
+                        ids_digest TEXT NOT NULL,
+                        server_url TEXT NOT NULL,
+                        acked_chunks TEXT NOT NULL DEFAULT '[]',
+                        created_at TEXT NOT NULL
+                    )
+                """)
+                self.logger.info("ai_upload_session table created successfully")
+            
+            # Migration from version 12 to 13: Recreate remote_cache with the columns RemoteCache uses
+            if current_version < 13:
+                self.logger.info("Migrating from version 12 to 13: Recreating remote_cache table")
+                # Cached API responses are disposable, so the old table is dropped rather than converted
+                conn.execute("DROP TABLE IF EXISTS remote_cache")
+                conn.execute("""
+                    CREATE TABLE remote_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        created_at TEXT NOT NULL,
+                        expires_at TEXT NOT NULL,
+                        hit_count INTEGER NOT NULL DEFAULT 0,
+                        last_accessed TEXT,
+                        size_bytes INTEGER NOT NULL DEFAULT 0
+                    )
+                """)
+                conn.execute("CREATE INDEX idx_remote_cache_expires ON remote_cache(expires_at)")
+                conn.execute("CREATE INDEX idx_remote_cache_last_accessed ON remote_cache(last_accessed)")
+                self.logger.info("remote_cache table recreated successfully")
+            
+            # Version 14 added trg_media_items_touch, which version 15 replaces
+            # Migration from version 14 to 15: Track content changes apart from last-seen updates
+            if current_version < 15:
+                self.logger.info("Migrating from version 14 to 15: Adding media_items content_updated_at")
+                conn.execute("DROP TRIGGER IF EXISTS trg_media_items_touch")
+                conn.execute("ALTER TABLE media_items ADD COLUMN content_updated_at TEXT")
+                conn.execute(MEDIA_ITEMS_CONTENT_TRIGGER)
+            
             # Set final version
             self._set_schema_version(conn, TARGET_SCHEMA_VERSION)
             self.logger.info("Database migration completed successfully")
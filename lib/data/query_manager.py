@@ -10,7 +10,6 @@ import json
 from typing import List, Dict, Any, Optional
 
 from lib.data.connection_manager import get_connection_manager
-from lib.data.migrations import get_migration_manager
 from lib.utils.kodi_log import get_kodi_logger
 
 
@@ -21,10 +20,15 @@ class QueryManager:
 
     def __init__(self):
         self.logger = get_kodi_logger('lib.data.query_manager')
+        # Creating the connection manager opens nothing; the first query connects
         self.connection_manager = get_connection_manager()
-        self.migration_manager = get_migration_manager()
         self._initialized = False
 
+    @property
+    def migration_manager(self):
+        from lib.data.migrations import get_migration_manager
+        return get_migration_manager()
+
     def _normalize_to_canonical(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize any media item to canonical format"""
         canonical = {}
@@ -169,6 +173,7 @@ class QueryManager:
         # Timestamp fields from database
         canonical["created_at"] = item.get("created_at", "")
         canonical["updated_at"] = item.get("updated_at", "")
+        canonical["content_updated_at"] = item.get("content_updated_at", "")
 
         # Search score (for AI search results in search history)
         canonical["search_score"] = item.get("search_score")
@@ -182,7 +187,8 @@ class QueryManager:
         Args:
             operation_type: Type of operation (create_list, delete_list, rename_list, 
                           move_list, create_folder, delete_folder, rename_folder, 
-                          move_folder, merge_lists, clear_search_history, create_search_history)
+                          move_folder, merge_lists, clear_search_history, create_search_history,
+                          change_list_items)
             **kwargs: Operation-specific parameters:
                 - folder_id: Target folder ID
                 - source_folder_id: Source folder ID (for moves)
@@ -192,29 +198,30 @@ class QueryManager:
                 - target_list_id: Target list ID (for merges)
         """
         try:
-            from lib.ui.folder_cache import get_folder_cache
-            folder_cache = get_folder_cache()
-            if not folder_cache:
-                return
-                
             folders_to_invalidate = set()
+            # Cached list pages; their breadcrumb titles include the list and folder names
+            lists_to_invalidate = set()
+            all_lists = False
             
             if operation_type == "create_list":
                 # Invalidate parent folder (or root if None)
                 folders_to_invalidate.add(kwargs.get('folder_id'))
                 
             elif operation_type == "delete_list":
-                # Invalidate containing folder
+                # Invalidate containing folder and the list's pages
                 folders_to_invalidate.add(kwargs.get('folder_id'))
+                lists_to_invalidate.add(kwargs.get('list_id'))
                 
             elif operation_type == "rename_list":
-                # Invalidate containing folder
+                # Invalidate containing folder and the list's pages
                 folders_to_invalidate.add(kwargs.get('folder_id'))
+                lists_to_invalidate.add(kwargs.get('list_id'))
                 
             elif operation_type == "move_list":
-                # Invalidate both source and target folders
+                # Invalidate both source and target folders and the list's pages
                 folders_to_invalidate.add(kwargs.get('source_folder_id'))
                 folders_to_invalidate.add(kwargs.get('target_folder_id'))
+                lists_to_invalidate.add(kwargs.get('list_id'))
                 
             elif operation_type == "create_folder":
                 # Invalidate parent folder (or root if None)
@@ -224,31 +231,51 @@ class QueryManager:
                 # Invalidate parent folder and the folder itself
                 folders_to_invalidate.add(kwargs.get('parent_folder_id'))
                 folders_to_invalidate.add(kwargs.get('folder_id'))
+                all_lists = True
                 
             elif operation_type == "rename_folder":
-                # Invalidate folder and its parent
+                # Invalidate folder and its parent; titles of lists below it change
                 folders_to_invalidate.add(kwargs.get('folder_id'))
                 folders_to_invalidate.add(kwargs.get('parent_folder_id'))
+                all_lists = True
                 
             elif operation_type == "move_folder":
                 # Invalidate source parent, target parent, and the folder itself
                 folders_to_invalidate.add(kwargs.get('source_parent_id'))
                 folders_to_invalidate.add(kwargs.get('target_parent_id'))
                 folders_to_invalidate.add(kwargs.get('folder_id'))
+                all_lists = True
                 
             elif operation_type == "merge_lists":
                 # Invalidate folders containing both lists
                 folders_to_invalidate.add(kwargs.get('source_folder_id'))
                 folders_to_invalidate.add(kwargs.get('target_folder_id'))
+                lists_to_invalidate.add(kwargs.get('target_list_id'))
                 
             elif operation_type in ["clear_search_history", "create_search_history"]:
                 # Invalidate search history folder
                 folders_to_invalidate.add(kwargs.get('search_history_folder_id'))
-            
-            # Perform invalidation for all affected folders (including root when folder_id is None)
-            for folder_id in folders_to_invalidate:
-                folder_cache.invalidate_folder(folder_id)
-                self.logger.debug("Cache invalidated for folder %s after %s", folder_id, operation_type)
+                
+            elif operation_type == "change_list_items":
+                # Items added to or removed from a list; call after the transaction commits
+                lists_to_invalidate.add(kwargs.get('list_id'))
+            
+            # Advance the generation of all affected folders (including root when folder_id is None)
+            if folders_to_invalidate:
+                from lib.ui.folder_cache import get_folder_cache
+                get_folder_cache().invalidate_folders(folders_to_invalidate)
+                self.logger.debug("Cache invalidated for folders %s after %s", folders_to_invalidate, operation_type)
+            
+            lists_to_invalidate.discard(None)
+            if all_lists or lists_to_invalidate:
+                from lib.ui.list_cache import get_list_cache
+                list_cache = get_list_cache()
+                if all_lists:
+                    list_cache.invalidate_all()
+                else:
+                    list_cache.invalidate_lists(lists_to_invalidate)
+                self.logger.debug("List cache invalidated for %s after %s",
+                                  "all lists" if all_lists else lists_to_invalidate, operation_type)
                     
         except Exception as e:
             self.logger.warning("Failed to invalidate cache after %s: %s", operation_type, e)
@@ -354,7 +381,8 @@ class QueryManager:
                     mi.episode,
                     mi.aired,
                     mi.created_at,
-                    mi.updated_at
+                    mi.updated_at,
+                    COALESCE(mi.content_updated_at, mi.created_at) AS content_updated_at
                 FROM list_items li
                 JOIN media_items mi ON li.media_item_id = mi.id
                 WHERE li.list_id = ?
@@ -421,6 +449,69 @@ class QueryManager:
             self.logger.error("Traceback: %s", traceback.format_exc())
             return []
             
+    def get_media_items_by_ids(self, media_item_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get library items by media_items id, normalized to canonical format
+
+        Items are returned in the order of media_item_ids; ids that no longer exist are skipped.
+        """
+        if not media_item_ids:
+            return []
+        try:
+            placeholders = ','.join(['?'] * len(media_item_ids))
+            rows = self.connection_manager.execute_query(f"""
+                SELECT
+                    mi.id,
+                    mi.id as item_id,
+                    mi.kodi_id,
+                    mi.media_type,
+                    mi.title,
+                    mi.year,
+                    mi.imdbnumber as imdb_id,
+                    mi.tmdb_id,
+                    mi.plot,
+                    mi.rating,
+                    mi.votes,
+                    mi.duration,
+                    mi.duration_seconds,
+                    mi.mpaa,
+                    mi.genre,
+                    mi.director,
+                    mi.studio,
+                    mi.country,
+                    mi.writer,
+                    mi.art,
+                    mi.play as file_path,
+                    mi.source,
+                    mi.tvshowtitle,
+                    mi.season,
+                    mi.episode,
+                    mi.aired,
+                    mi.created_at,
+                    mi.updated_at,
+                    COALESCE(mi.content_updated_at, mi.created_at) AS content_updated_at
+                FROM media_items mi
+                WHERE mi.id IN ({placeholders})
+            """, list(media_item_ids)) or []
+
+            from lib.utils.kodi_version import get_kodi_major_version
+            kodi_major = get_kodi_major_version()
+            items_by_id = {}
+            for row in rows:
+                item = self._row_to_dict(row)
+                if item.get('art') and isinstance(item['art'], str):
+                    try:
+                        item['art'] = self._format_art_for_kodi_version(json.loads(item['art']), kodi_major)
+                    except json.JSONDecodeError:
+                        self.logger.warning("Failed to parse art JSON for item %s", item.get('title', 'Unknown'))
+                        item['art'] = {}
+                items_by_id[item['id']] = self._normalize_to_canonical(item)
+
+            return [items_by_id[media_item_id] for media_item_id in media_item_ids if media_item_id in items_by_id]
+
+        except Exception as e:
+            self.logger.error("Error getting media items by id: %s", e)
+            return []
+
     def get_list_item_count(self, list_id: int) -> int:
         """Get total count of items in a specific list"""
         try:
@@ -554,6 +645,8 @@ class QueryManager:
                     VALUES (?, ?, ?)
                 """, [int(list_id), media_item_id, next_position])
 
+            self._invalidate_after_change("change_list_items", list_id=list_id)
+
             result = {
                 "id": str(media_item_id),
                 "title": title,
@@ -600,7 +693,9 @@ class QueryManager:
                     return {"error": "item_not_found"}
                 
                 self.logger.info("Successfully deleted %d rows for item %s from list %s", rows_deleted, item_id, list_id)
-                return True
+
+            self._invalidate_after_change("change_list_items", list_id=list_id)
+            return True
 
         except Exception as e:
             self.logger.error("Failed to delete item %s from list %s: %s", item_id, list_id, e)
@@ -637,9 +732,9 @@ class QueryManager:
                     SET name = ?
                     WHERE id = ?
                 """, [new_name, int(list_id)])
-                
-                # Invalidate cache after successful list rename
-                self._invalidate_after_change("rename_list", folder_id=existing['folder_id'])
+
+            # Invalidate cache after successful list rename
+            self._invalidate_after_change("rename_list", folder_id=existing['folder_id'], list_id=list_id)
 
             return {"success": True, "name": new_name}
 
@@ -673,9 +768,9 @@ class QueryManager:
 
                 # Delete list (items cascade automatically via foreign key)
                 conn.execute("DELETE FROM lists WHERE id = ?", [int(list_id)])
-                
-                # Invalidate cache after successful list deletion
-                self._invalidate_after_change("delete_list", folder_id=existing['folder_id'])
+
+            # Invalidate cache after successful list deletion
+            self._invalidate_after_change("delete_list", folder_id=existing['folder_id'], list_id=list_id)
 
             return {"success": True}
 
@@ -862,12 +957,37 @@ class QueryManager:
                         continue
 
             self.logger.debug("Added %s items to search history list %s", added_count, list_id)
+            if added_count:
+                self._invalidate_after_change("change_list_items", list_id=list_id)
             return added_count
 
         except Exception as e:
             self.logger.error("Failed to add search results to list: %s", e)
             return 0
 
+    def add_ranked_items_to_list(self, list_id, items, start_position=0):
+        """Append existing media items (dicts with 'id' and optional 'search_score')
+        to a list at consecutive positions, in one executemany transaction"""
+        try:
+            rows = [(list_id, item['id'], start_position + offset, item.get('search_score'))
+                    for offset, item in enumerate(items) if item.get('id')]
+            if not rows:
+                return 0
+
+            with self.connection_manager.transaction() as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO list_items (list_id, media_item_id, position, search_score)
+                    VALUES (?, ?, ?, ?)
+                """, rows)
+
+            self.logger.debug("Added %s ranked items to list %s", len(rows), list_id)
+            self._invalidate_after_change("change_list_items", list_id=list_id)
+            return len(rows)
+
+        except Exception as e:
+            self.logger.error("Failed to add ranked items to list: %s", e)
+            return 0
+
     def add_library_items_to_list(self, list_id, library_items):
         """Add library items to a list using canonical pipeline (same as search process)"""
         try:
@@ -905,6 +1025,8 @@ class QueryManager:
                         continue
 
             self.logger.debug("Added %s library items to list %s", added_count, list_id)
+            if added_count:
+                self._invalidate_after_change("change_list_items", list_id=list_id)
             return added_count
 
         except Exception as e:
@@ -922,12 +1044,13 @@ class QueryManager:
 
                 removed_count = cursor.rowcount
 
-                if removed_count > 0:
-                    self.logger.debug("Removed %s item(s) from list %s", removed_count, list_id)
-                    return {"success": True, "removed_count": removed_count}
-                else:
-                    self.logger.warning("No items found to remove from list %s with item_id %s", list_id, item_id)
-                    return {"error": "item_not_found"}
+            if removed_count > 0:
+                self.logger.debug("Removed %s item(s) from list %s", removed_count, list_id)
+                self._invalidate_after_change("change_list_items", list_id=list_id)
+                return {"success": True, "removed_count": removed_count}
+            else:
+                self.logger.warning("No items found to remove from list %s with item_id %s", list_id, item_id)
+                return {"error": "item_not_found"}
 
         except Exception as e:
             self.logger.error("Failed to remove item from list: %s", e)
@@ -1579,6 +1702,8 @@ class QueryManager:
                     VALUES (?, ?, ?)
                 """, [int(list_id), media_item_id, next_position])
 
+            self._invalidate_after_change("change_list_items", list_id=list_id)
+
             return {
                 "id": str(media_item_id),
                 "title": kodi_item.get('title', 'Unknown'),
@@ -2315,11 +2440,12 @@ class QueryManager:
                     return {"error": "update_failed"}
 
                 self.logger.info("Successfully moved list %s to folder %s", list_id, target_folder_id)
-                
-                # Invalidate cache for both source and target folders
-                self._invalidate_after_change("move_list", 
-                                            source_folder_id=source_folder_id,
-                                            target_folder_id=target_folder_id)
+
+            # Invalidate cache for both source and target folders
+            self._invalidate_after_change("move_list", 
+                                        source_folder_id=source_folder_id,
+                                        target_folder_id=target_folder_id,
+                                        list_id=list_id)
 
             return {"success": True}
 
@@ -2383,7 +2509,8 @@ class QueryManager:
             # Invalidate cache for both folders
             self._invalidate_after_change("merge_lists", 
                                         source_folder_id=source_folder['folder_id'] if source_folder else None,
-                                        target_folder_id=target_folder['folder_id'] if target_folder else None)
+                                        target_folder_id=target_folder['folder_id'] if target_folder else None,
+                                        target_list_id=target_list_id)
             
             return {"success": True, "items_added": items_added}
 
@@ -2635,7 +2762,8 @@ class QueryManager:
                     mi.episode,
                     mi.aired,
                     mi.created_at,
-                    mi.updated_at
+                    mi.updated_at,
+                    COALESCE(mi.content_updated_at, mi.created_at) AS content_updated_at
                 FROM (
                     SELECT media_item_id
                     FROM list_items
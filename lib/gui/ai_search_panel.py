@@ -7,6 +7,7 @@ Provides custom AI-powered search dialog with natural language input
 """
 
 import json
+import threading
 import xbmc
 import xbmcaddon
 import xbmcgui
@@ -41,6 +42,9 @@ class AISearchPanel(xbmcgui.WindowXMLDialog):
             'debug_intent': False  # Hard-coded: Debug always off
         }
         
+        # Set once the dialog has closed, stops the stats refresh watcher
+        self._closed = threading.Event()
+        
         # Initialize search history flag before checking
         self._has_search_history = False
         
@@ -118,7 +122,11 @@ class AISearchPanel(xbmcgui.WindowXMLDialog):
     # _open_keyboard method removed - now using native edit control which handles input directly
 
     def _load_and_display_stats(self):
-        """Load library statistics from cached file"""
+        """Show library statistics from the cached file; never waits on the network
+
+        Missing or stale stats are shown as they are (or a placeholder) while the
+        service refreshes them; the columns are redrawn when the new file lands.
+        """
         if not self.stats_col1:
             return
         
@@ -134,20 +142,52 @@ class AISearchPanel(xbmcgui.WindowXMLDialog):
             
             # Load stats from cached file
             stats_cache = get_stats_cache()
-            stats = stats_cache.load_stats()
+            entry = stats_cache.load_entry()
             
-            if stats:
+            if entry:
                 xbmc.log('[LG-AISearchPanel] Using cached library stats from file', xbmc.LOGDEBUG)
-                self._display_stats(stats)
+                self._display_stats(entry['stats'], entry['age_seconds'], entry['stale'])
             else:
-                self.stats_col1.setText('[COLOR FFAAAAAA]No statistics[/COLOR]\n[COLOR FFAAAAAA]available yet[/COLOR]\n[COLOR FF888888]Stats cached[/COLOR]\n[COLOR FF888888]after sync[/COLOR]')
+                self.stats_col1.setText('[COLOR FFAAAAAA]Fetching[/COLOR]\n[COLOR FFAAAAAA]statistics...[/COLOR]')
+
+            if entry is None or entry['stale']:
+                stats_cache.request_refresh()
+                threading.Thread(target=self._wait_for_stats_refresh, args=(entry is not None,),
+                                 daemon=True).start()
         
         except Exception as e:
             xbmc.log('[LG-AISearchPanel] Error loading stats: {}'.format(str(e)), xbmc.LOGERROR)
             self.stats_col1.setText('[COLOR FFAAAAAA]Error loading[/COLOR]\n[COLOR FFAAAAAA]statistics[/COLOR]')
+
+    def _wait_for_stats_refresh(self, had_stats):
+        """Redraw the stats once the service has refreshed the cached file"""
+        from lib.utils.stats_cache import get_stats_cache
+        stats_cache = get_stats_cache()
+        for _ in range(60):
+            if self._closed.wait(0.5):
+                return
+            entry = stats_cache.load_entry()
+            if entry and not entry['stale']:
+                self._display_stats(entry['stats'], entry['age_seconds'], False)
+                return
+        if not had_stats and not self._closed.is_set():
+            self.stats_col1.setText('[COLOR FFAAAAAA]No statistics[/COLOR]\n[COLOR FFAAAAAA]available yet[/COLOR]')
+
+    def _format_age(self, age_seconds):
+        """Short 'updated ... ago' text for the stats age"""
+        if age_seconds is None:
+            return 'Updated: unknown'
+        minutes = int(age_seconds // 60)
+        if minutes < 1:
+            return 'Updated just now'
+        if minutes < 60:
+            return 'Updated {}m ago'.format(minutes)
+        if minutes < 48 * 60:
+            return 'Updated {}h ago'.format(minutes // 60)
+        return 'Updated {}d ago'.format(minutes // (24 * 60))
     
-    def _display_stats(self, stats):
-        """Format and display library statistics in 4 columns"""
+    def _display_stats(self, stats, age_seconds=None, stale=False):
+        """Format and display library statistics in 4 columns, with their age"""
         if not stats or not self.stats_col1:
             return
         
@@ -268,6 +308,11 @@ class AISearchPanel(xbmcgui.WindowXMLDialog):
                     col4_lines.append('Avg Collection: {:.0f} movies'.format(avg_movies))
                     col4_lines.append('Largest: {:,} movies'.format(largest))
             
+            age_text = self._format_age(age_seconds)
+            if stale:
+                age_text += ', refreshing...'
+            col1_lines.append('[COLOR FF888888]{}[/COLOR]'.format(age_text))
+            
             # Set text for each column
             self.stats_col1.setText('\n'.join(col1_lines))
             self.stats_col2.setText('\n'.join(col2_lines))
@@ -429,6 +474,7 @@ class AISearchPanel(xbmcgui.WindowXMLDialog):
         try:
             w._state['query'] = initial_query or w._state.get('query', '')
             w.doModal()
+            w._closed.set()
             xbmc.log('[LG-AISearchPanel] prompt() returning result: {}'.format(w._result), xbmc.LOGDEBUG)
             return w._result
         finally:
@@ -8,6 +8,8 @@ Provides custom search dialog with advanced options
 
 import json
 import os
+import threading
+import time
 import xbmc
 import xbmcaddon
 import xbmcgui
@@ -25,6 +27,65 @@ CONTENT_MOVIES, CONTENT_SERIES, CONTENT_ALL = 0, 1, 2
 FIELDS_TITLE, FIELDS_PLOT, FIELDS_BOTH = 0, 1, 2
 MATCH_ANY, MATCH_ALL, MATCH_PHRASE = 0, 1, 2
 
+# Search-as-you-type tuning (kept conservative for Raspberry Pi-class devices)
+LIVE_RESULTS_LIST_ID = 300
+LIVE_SEARCH_DEBOUNCE_S = 0.3
+LIVE_SEARCH_POLL_S = 0.1
+LIVE_SEARCH_PAGE_SIZE = 25
+
+
+class _LiveSearchWorker(threading.Thread):
+    """Polls the query edit control, debounces typing and runs title lookups off the GUI thread"""
+
+    def __init__(self, panel):
+        super(_LiveSearchWorker, self).__init__(name='LG-LiveSearch')
+        self.daemon = True
+        self._panel = panel
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        from lib.search.title_prefix_index import LiveSearchSession, get_title_prefix_index
+
+        index = get_title_prefix_index()
+        if not index.ensure_current():
+            return
+        session = LiveSearchSession(index)
+        monitor = xbmc.Monitor()
+
+        last_signature = None
+        changed_at = None
+        while not self._stop_event.is_set() and not monitor.abortRequested():
+            signature = self._panel._get_live_search_signature()
+            if signature != last_signature:
+                last_signature = signature
+                changed_at = time.monotonic()
+            elif changed_at is not None and time.monotonic() - changed_at >= LIVE_SEARCH_DEBOUNCE_S:
+                changed_at = None
+                self._search(session, signature)
+            self._stop_event.wait(LIVE_SEARCH_POLL_S)
+
+    def _search(self, session, signature):
+        text, media_types = signature
+
+        def is_current():
+            # Abandon the lookup as soon as the user has typed on or the panel closed
+            return not self._stop_event.is_set() and self._panel._get_live_search_signature() == signature
+
+        if not media_types:
+            session.reset()
+            result = {'items': [], 'total_count': 0}
+        else:
+            try:
+                result = session.search(text, list(media_types), limit=LIVE_SEARCH_PAGE_SIZE, is_current=is_current)
+            except Exception as e:
+                xbmc.log('[LG-SearchPanel] Live search failed: {}'.format(e), xbmc.LOGERROR)
+                return
+        if result is not None and is_current():
+            self._panel._render_live_results(result)
+
 
 class SearchPanel(xbmcgui.WindowXMLDialog):
     """Custom search panel dialog for LibraryGenie"""
@@ -51,6 +112,11 @@ class SearchPanel(xbmcgui.WindowXMLDialog):
             'match_mode': default_match,
             'query': ''  # Always start with empty query
         }
+
+        self._live_search_enabled = ADDON.getSettingBool('live_search_enabled')
+        self._live_worker = None
+        self._live_lock = threading.Lock()
+        self._live_items = []
         
         # Check if search history exists
         self._check_search_history_exists()
@@ -74,6 +140,8 @@ class SearchPanel(xbmcgui.WindowXMLDialog):
         # Focus on Query field by default
         self.setFocusId(200)
 
+        self._start_live_search()
+
     def onAction(self, action):
         """Handle actions"""
         if action.getId() in (xbmcgui.ACTION_NAV_BACK, xbmcgui.ACTION_PREVIOUS_MENU):
@@ -82,9 +150,11 @@ class SearchPanel(xbmcgui.WindowXMLDialog):
     
     def _cleanup_properties(self):
         """Clean up window properties when dialog closes"""
+        self._stop_live_search()
         try:
             self.clearProperty('SearchHistoryExists')
             self.clearProperty('AISearchActivated')
+            self.clearProperty('LiveResults')
             xbmc.log('[LG-SearchPanel] Cleaned up window properties on close', xbmc.LOGDEBUG)
         except Exception as e:
             xbmc.log('[LG-SearchPanel] Error cleaning up properties: {}'.format(e), xbmc.LOGERROR)
@@ -110,6 +180,8 @@ class SearchPanel(xbmcgui.WindowXMLDialog):
             self.close()
         elif control_id == 262:
             self._open_search_history()
+        elif control_id == LIVE_RESULTS_LIST_ID:
+            self._select_live_result()
 
     def _wire_controls(self):
         """Wire up all controls"""
@@ -126,6 +198,7 @@ class SearchPanel(xbmcgui.WindowXMLDialog):
         self.btn_set_default = self.getControl(252)
         self.btn_search = self.getControl(260)
         self.btn_cancel = self.getControl(261)
+        self.list_live = self.getControl(LIVE_RESULTS_LIST_ID) if self._live_search_enabled else None
 
     def _apply_state_to_controls(self):
         """Apply current state to dialog controls"""
@@ -187,6 +260,75 @@ class SearchPanel(xbmcgui.WindowXMLDialog):
         self._state['match_mode'] = {221: MATCH_ANY, 222: MATCH_ALL, 223: MATCH_PHRASE}[cid]
         self._apply_state_to_controls()
 
+    def _start_live_search(self):
+        """Start the search-as-you-type worker"""
+        if not self._live_search_enabled or self._live_worker is not None:
+            return
+        self._live_worker = _LiveSearchWorker(self)
+        self._live_worker.start()
+
+    def _stop_live_search(self):
+        """Stop the search-as-you-type worker; any in-flight lookup is discarded"""
+        worker = self._live_worker
+        self._live_worker = None
+        if worker is not None:
+            worker.stop()
+
+    def _get_live_search_signature(self):
+        """Get (typed text, media types) that live results are computed for"""
+        try:
+            text = self.q_edit.getText()
+        except Exception:
+            text = ''
+        if self._state['fields'] == FIELDS_PLOT:
+            # Live results only cover titles
+            return text, ()
+        media_types = {
+            CONTENT_MOVIES: ('movie',),
+            CONTENT_SERIES: ('episode',),
+        }.get(self._state['content_type'], ('movie', 'episode'))
+        return text, media_types
+
+    def _render_live_results(self, result):
+        """Render the first page of live title matches"""
+        items = result.get('items', [])
+        list_items = []
+        for item in items:
+            if item.get('media_type') == 'episode':
+                label = '{} S{:02d}E{:02d} - {}'.format(item.get('tvshowtitle') or '', item.get('season') or 0,
+                                                       item.get('episode') or 0, item.get('title') or '')
+            elif item.get('year'):
+                label = '{} ({})'.format(item.get('title'), item.get('year'))
+            else:
+                label = item.get('title') or ''
+            list_items.append(xbmcgui.ListItem(label=label))
+
+        with self._live_lock:
+            if self._live_worker is None or self.list_live is None:
+                return
+            self._live_items = items
+            self.list_live.reset()
+            if list_items:
+                self.list_live.addItems(list_items)
+                self.setProperty('LiveResults', str(result.get('total_count', len(items))))
+            else:
+                self.clearProperty('LiveResults')
+
+    def _select_live_result(self):
+        """Search for the selected live result's title as an exact phrase"""
+        with self._live_lock:
+            position = self.list_live.getSelectedPosition() if self.list_live is not None else -1
+            if position < 0 or position >= len(self._live_items):
+                return
+            item = self._live_items[position]
+        title = item.get('tvshowtitle') if item.get('media_type') == 'episode' else item.get('title')
+        if not title:
+            return
+        self._state['fields'] = FIELDS_TITLE
+        self._state['match_mode'] = MATCH_PHRASE
+        self.q_edit.setText(title)
+        self._finalize_and_close()
+
     # _open_keyboard method removed - now using native edit control which handles input directly
 
     def _load_presets(self):
@@ -476,4 +618,5 @@ class SearchPanel(xbmcgui.WindowXMLDialog):
             xbmc.log('[LG-SearchPanel] prompt() returning result: {}'.format(w._result), xbmc.LOGDEBUG)
             return w._result
         finally:
+            w._stop_live_search()
             del w
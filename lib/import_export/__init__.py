@@ -6,22 +6,27 @@ LibraryGenie - Import/Export Module
 Safe backup and sharing of lists, memberships, and library data
 """
 
-from lib.import_export.export_engine import get_export_engine
-from lib.import_export.import_engine import get_import_engine
-from lib.import_export.backup_manager import get_backup_manager
-from lib.import_export.timestamp_backup_manager import get_timestamp_backup_manager
-from lib.import_export.sqlite_backup import get_sqlite_backup_manager
-from lib.data.storage_manager import get_storage_manager
-from lib.import_export.shortlist_importer import get_shortlist_importer
-from lib.import_export.data_schemas import ExportSchema, ImportResult
+from lib.utils.lazy_exports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'get_export_engine': 'lib.import_export.export_engine',
+    'get_import_engine': 'lib.import_export.import_engine',
+    'get_backup_manager': 'lib.import_export.backup_manager',
+    'get_timestamp_backup_manager': 'lib.import_export.timestamp_backup_manager',
+    'get_sqlite_backup_manager': 'lib.import_export.sqlite_backup',
+    'get_storage_manager': 'lib.data.storage_manager',
+    'get_shortlist_importer': 'lib.import_export.shortlist_importer',
+    'ExportSchema': 'lib.import_export.data_schemas',
+    'ImportResult': 'lib.import_export.data_schemas',
+})
 
 __all__ = [
     'get_export_engine',
-    'get_import_engine', 
+    'get_import_engine',
     'get_backup_manager',
     'get_timestamp_backup_manager',
     'get_sqlite_backup_manager',
     'get_storage_manager',
     'ExportSchema',
-    'ImportResult'
-]
\ No newline at end of file
+    'ImportResult',
+]
@@ -580,6 +580,10 @@ class ImportEngine:
 
             success = len(errors) == 0 or (lists_created + items_added > 0)
 
+            # Cached list pages may show items or lists this import replaced
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().invalidate_all()
+
             self.logger.info("Import completed: %s lists created, %s items added", lists_created, items_added)
 
             return ImportResult(
@@ -930,6 +934,10 @@ class ImportEngine:
 
             success = len(errors) == 0 or (lists_created + items_added > 0)
 
+            # Cached list pages may show items or lists this import replaced
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().invalidate_all()
+
             self.logger.info("Backup restore completed: %s lists created, %s items added", lists_created, items_added)
 
             return {
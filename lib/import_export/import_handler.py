@@ -209,6 +209,8 @@ class ImportHandler:
                     affected_folders = [fid for fid in invalidate_results.keys() if fid != "error"]
                     self.logger.info("Invalidated %d folders in hierarchy for root folder %s: %s", 
                                    invalidated_count, results['root_folder_id'], affected_folders)
+                    from lib.ui.list_cache import get_list_cache
+                    get_list_cache().invalidate_all()
                     
                     # Synchronously rebuild cache for ALL folders in the hierarchy
                     # This ensures no stale caches remain when user navigates
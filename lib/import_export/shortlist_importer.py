@@ -493,6 +493,10 @@ class ShortListImporter:
             folder_cache.invalidate_folder(str(import_folder_id))
             self.logger.debug("Invalidated ShortList Import folder cache (ID: %s)", import_folder_id)
 
+            # The replaced lists' IDs can be reused by the new ones
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().invalidate_all()
+
             duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
 
             return {
@@ -217,6 +217,10 @@ class SQLiteBackupManager:
             # Replace database
             shutil.copy(temp_db, db_path)
             self.logger.info("Database restored successfully")
+
+            # Plugin interpreters kept by reuselanguageinvoker must not reuse the old database
+            from lib.utils.invocation_state import advance_generation
+            advance_generation()
             
             # Restore settings.xml if present
             if os.path.exists(temp_settings):
@@ -6,6 +6,12 @@ LibraryGenie - Kodi Module
 Kodi-specific functionality and API clients
 """
 
-from lib.kodi.json_rpc_client import get_kodi_client
+from lib.utils.lazy_exports import lazy_exports
 
-__all__ = ["get_kodi_client"]
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'get_kodi_client': 'lib.kodi.json_rpc_client',
+})
+
+__all__ = [
+    'get_kodi_client',
+]
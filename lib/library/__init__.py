@@ -6,6 +6,12 @@ LibraryGenie - Library Module
 Local library indexing and scanning functionality
 """
 
-from lib.library.scanner import LibraryScanner
+from lib.utils.lazy_exports import lazy_exports
 
-__all__ = ["LibraryScanner"]
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'LibraryScanner': 'lib.library.scanner',
+})
+
+__all__ = [
+    'LibraryScanner',
+]
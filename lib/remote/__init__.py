@@ -1,4 +1,3 @@
-
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
@@ -7,18 +6,16 @@ LibraryGenie - Remote Integration
 AI search client and cache functionality
 """
 
-from lib.remote.ai_search_client import AISearchClient, get_ai_search_client
-from lib.remote.cache import RemoteCache
+from lib.utils.lazy_exports import lazy_exports
 
-# Import deprecated modules for backward compatibility but don't export them
-try:
-    from lib.remote import search_client  # Keep for backward compatibility
-    from lib.remote import service  # Keep for backward compatibility
-except ImportError:
-    pass
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'AISearchClient': 'lib.remote.ai_search_client',
+    'get_ai_search_client': 'lib.remote.ai_search_client',
+    'RemoteCache': 'lib.remote.cache',
+})
 
 __all__ = [
     'AISearchClient',
     'get_ai_search_client',
-    'RemoteCache'
+    'RemoteCache',
 ]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - AI Search Result Cache
+Caches completed AI searches in RemoteCache and coalesces identical searches in flight
+"""
+
+import copy
+import time
+import hashlib
+import threading
+from typing import Dict, Any, Optional, Callable
+
+from lib.utils.kodi_log import get_kodi_logger
+from lib.remote.cache import get_remote_cache
+
+
+# Longest a search is waited for before the caller sends its own request
+INFLIGHT_WAIT_SECONDS = 35
+# Poll interval while another Kodi process runs the same search
+INFLIGHT_POLL_SECONDS = 0.2
+# Home window property prefix marking a search in flight in some process
+INFLIGHT_PROPERTY = 'librarygenie.ai_search.inflight.'
+# RemoteCache key prefix of cached searches
+KEY_PREFIX = 'ai_search:'
+# RemoteCache key prefix of cached similar_to results (kept apart from the
+# prefetcher's 'similar:last_facets', which outlives accounts)
+SIMILAR_KEY_PREFIX = 'similar:results:'
+
+
+def normalize_query(query: str) -> str:
+    """Case-folded query with whitespace collapsed"""
+    return ' '.join((query or '').casefold().split())
+
+
+def account_scope(server_url: str, api_key: str) -> str:
+    """Short fingerprint of the server and account a search ran against"""
+    identity = '%s\n%s' % ((server_url or '').rstrip('/'), api_key or '')
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class AISearchResultCache:
+    """Completed searches keyed by (account scope, normalized query, mode, use_llm, limit)
+
+    Results rank the library uploaded to one server account, so the key
+    includes the server URL and API key fingerprint, and clear() drops all
+    cached searches and similar_to results when the account signs out or its
+    library is uploaded.
+
+    Within a process, callers asking for a search that is already running wait
+    for it instead of sending their own request. Across Kodi processes (a
+    double-click starts a second plugin invocation) a home window property
+    marks the search as in flight, and the second process polls RemoteCache
+    until the first one stores the result.
+    """
+
+    def __init__(self):
+        self.logger = get_kodi_logger('lib.remote.ai_search_cache')
+        self.cache = get_remote_cache()
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def make_key(self, query: str, mode: str, use_llm: bool, limit: int, scope: str) -> str:
+        """
+        Args:
+            scope: account_scope() of the server and API key the search is sent with
+        """
+        digest = hashlib.sha1(normalize_query(query).encode('utf-8')).hexdigest()
+        return f"{KEY_PREFIX}{scope}:{mode}:{int(bool(use_llm))}:{limit}:{digest}"
+
+    def clear(self) -> int:
+        """Drop every cached search and similar_to result, returns number of entries deleted"""
+        deleted = self.cache.delete_prefix(KEY_PREFIX) + self.cache.delete_prefix(SIMILAR_KEY_PREFIX)
+        self.logger.debug("Cleared %s cached AI searches and similar movie results", deleted)
+        return deleted
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached response (a private copy) or None"""
+        cached = self.cache.get(key)
+        return copy.deepcopy(cached) if cached is not None else None
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Optional[Dict[str, Any]]],
+                     ttl_minutes: int) -> Optional[Dict[str, Any]]:
+        """Return the cached response, wait for an identical search in flight,
+        or run fetch() and cache a successful response for ttl_minutes"""
+        cached = self.get(key)
+        if cached is not None:
+            self.logger.debug("AI search cache hit for %s", key)
+            return cached
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            self.logger.debug("Waiting for identical AI search in flight: %s", key)
+            flight.done.wait(INFLIGHT_WAIT_SECONDS)
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = self._wait_for_other_process(key)
+            if flight.result is None:
+                flight.result = self._fetch_and_store(key, fetch, ttl_minutes)
+            return copy.deepcopy(flight.result)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _fetch_and_store(self, key: str, fetch: Callable[[], Optional[Dict[str, Any]]],
+                         ttl_minutes: int) -> Optional[Dict[str, Any]]:
+        window = self._home_window()
+        if window:
+            window.setProperty(INFLIGHT_PROPERTY + key, str(time.time()))
+        try:
+            response = fetch()
+            if response and response.get('success') and ttl_minutes > 0:
+                self.cache.set(key, response, ttl_hours=ttl_minutes / 60.0)
+            return response
+        finally:
+            if window:
+                window.clearProperty(INFLIGHT_PROPERTY + key)
+
+    def _wait_for_other_process(self, key: str) -> Optional[Dict[str, Any]]:
+        """Poll for the result of the same search running in another process"""
+        window = self._home_window()
+        if not window:
+            return None
+
+        deadline = time.time() + INFLIGHT_WAIT_SECONDS
+        while time.time() < deadline:
+            started = window.getProperty(INFLIGHT_PROPERTY + key)
+            try:
+                if not started or time.time() - float(started) > INFLIGHT_WAIT_SECONDS:
+                    return None
+            except ValueError:
+                return None
+            time.sleep(INFLIGHT_POLL_SECONDS)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.logger.debug("AI search completed by another process: %s", key)
+                return cached
+        return None
+
+    def _home_window(self):
+        try:
+            import xbmcgui
+            return xbmcgui.Window(10000)
+        except Exception:
+            return None
+
+
+# Global AI search result cache instance
+_ai_search_result_cache_instance = None
+_ai_search_result_cache_lock = threading.Lock()
+
+
+def get_ai_search_result_cache():
+    """Get global AI search result cache instance"""
+    global _ai_search_result_cache_instance
+    if _ai_search_result_cache_instance is None:
+        with _ai_search_result_cache_lock:
+            if _ai_search_result_cache_instance is None:
+                _ai_search_result_cache_instance = AISearchResultCache()
+    return _ai_search_result_cache_instance
@@ -7,18 +7,24 @@ Handles AI search server authentication and requests using OTP-based auth
 """
 
 import json
-import urllib.request
-import urllib.parse
-import urllib.error
-import time
+import threading
+import http.client
 from typing import Dict, Any, Optional, List
 
 from lib.config.settings import SettingsManager
 from lib.utils.kodi_log import get_kodi_logger
 from lib.auth.state import is_authorized, get_api_key
+from lib.remote.http_session import get_http_session
+from lib.remote.chunk_uploader import (
+    ChunkUploader, ChunkResponse, get_upload_checkpoints, ids_digest, parse_retry_after
+)
 # Removed import of otp_auth to resolve circular dependency
 # from lib.auth.otp_auth import exchange_otp_for_api_key, test_api_connection
 
+# Similar-movie results are kept this long in the remote cache, so titles
+# prefetched after playback stay instant for the rest of the day
+SIMILAR_CACHE_HOURS = 24
+
 
 class AISearchClient:
     """Client for AI search server integration using OTP authentication"""
@@ -75,31 +81,24 @@ class AISearchClient:
             if data:
                 json_data = json.dumps(data).encode('utf-8')
 
-            # Create request
-            req = urllib.request.Request(url, data=json_data, headers=request_headers)
-            req.get_method = lambda: method
+            # Make request over the shared keep-alive session
+            response = get_http_session().request(method, url, json_data, request_headers, timeout=timeout)
 
-            # Make request with configurable timeout
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                if response.getcode() == 200:
-                    response_data = response.read().decode('utf-8')
-                    return json.loads(response_data)
-                else:
-                    self.logger.error("HTTP %s from %s", response.getcode(), endpoint)
-                    return None
+            if response.status == 200:
+                return response.json()
+            elif response.status >= 400:
+                try:
+                    error_msg = response.json().get('error', 'Unknown')
+                    self.logger.error("HTTP %s error: %s", response.status, error_msg)
+                    return {'error': error_msg}
+                except Exception:
+                    self.logger.error("HTTP %s error from %s", response.status, endpoint)
+                    return {'error': f'HTTP {response.status} error'}
+            else:
+                self.logger.error("HTTP %s from %s", response.status, endpoint)
+                return None
 
-        except urllib.error.HTTPError as e:
-            try:
-                error_body = e.read().decode('utf-8')
-                error_data = json.loads(error_body)
-                error_msg = error_data.get('error', 'Unknown')
-                self.logger.error("HTTP %s error: %s", e.code, error_msg)
-                return {'error': error_msg}
-            except:
-                self.logger.error("HTTP %s error from %s", e.code, endpoint)
-                return {'error': f'HTTP {e.code} error'}
-
-        except urllib.error.URLError as e:
+        except (OSError, http.client.HTTPException) as e:
             self.logger.error("Network error: %s", e)
             return {'error': f'Network error: {str(e)}'}
 
@@ -108,8 +107,16 @@ class AISearchClient:
             return {'error': f'Request failed: {str(e)}'}
 
     def _make_request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None,
-                     headers: Optional[Dict[str, str]] = None, timeout: int = 30) -> Optional[Dict[str, Any]]:
-        """Make HTTP request to AI search server"""
+                     headers: Optional[Dict[str, str]] = None, timeout: int = 30,
+                     compress: bool = False, etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Make HTTP request to AI search server
+
+        Args:
+            compress: gzip the JSON request body (used for large uploads)
+            etag: Send If-None-Match; an unchanged resource returns
+                {'_not_modified': True}. The ETag of a 200 response is returned
+                as '_etag'.
+        """
         server_url = self.settings.get_remote_server_url()
         if not server_url:
             self.logger.error("No server URL configured")
@@ -117,6 +124,8 @@ class AISearchClient:
 
         url = f"{server_url.rstrip('/')}/{endpoint.lstrip('/')}"
         request_headers = self._get_headers(headers)
+        if etag:
+            request_headers['If-None-Match'] = etag
 
         # Log the complete URL for endpoint verification
         self.logger.info("🌐 API REQUEST: %s %s", method, url)
@@ -127,41 +136,37 @@ class AISearchClient:
             if data:
                 json_data = json.dumps(data).encode('utf-8')
 
-            # Create request
-            req = urllib.request.Request(url, data=json_data, headers=request_headers)
-            req.get_method = lambda: method
-
-            # Make request with configurable timeout
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                if response.getcode() == 200:
-                    response_data = response.read().decode('utf-8')
-                    return json.loads(response_data)
-                elif response.getcode() == 304:
-                    return {'_not_modified': True}
-                else:
-                    self.logger.error("HTTP %s from %s", response.getcode(), endpoint)
-                    return None
-
-        except urllib.error.HTTPError as e:
-            try:
-                error_body = e.read().decode('utf-8')
-                error_data = json.loads(error_body)
-                error_msg = error_data.get('error', 'Unknown')
+            # Make request over the shared keep-alive session
+            response = get_http_session().request(method, url, json_data, request_headers,
+                                                  timeout=timeout, compress=compress)
 
+            if response.status == 200:
+                result = response.json()
+                if isinstance(result, dict) and response.headers.get('etag'):
+                    result['_etag'] = response.headers['etag']
+                return result
+            elif response.status == 304:
+                return {'_not_modified': True}
+            elif response.status >= 400:
                 # Handle API key expiration/invalidation
-                if e.code == 401:
+                if response.status == 401:
                     self.logger.warning("API key appears to be invalid/expired")
                     # Clear invalid API key to prevent repeated failed requests
                     from lib.auth.state import clear_auth_data
                     clear_auth_data()
 
-                self.logger.error("HTTP %s error: %s", e.code, error_msg)
-                return {'error': error_msg}
-            except:
-                self.logger.error("HTTP %s error from %s", e.code, endpoint)
-                return {'error': f'HTTP {e.code} error'}
+                try:
+                    error_msg = response.json().get('error', 'Unknown')
+                    self.logger.error("HTTP %s error: %s", response.status, error_msg)
+                    return {'error': error_msg}
+                except Exception:
+                    self.logger.error("HTTP %s error from %s", response.status, endpoint)
+                    return {'error': f'HTTP {response.status} error'}
+            else:
+                self.logger.error("HTTP %s from %s", response.status, endpoint)
+                return None
 
-        except urllib.error.URLError as e:
+        except (OSError, http.client.HTTPException) as e:
             self.logger.error("Network error: %s", e)
             return {'error': f'Network error: {str(e)}'}
 
@@ -286,6 +291,12 @@ class AISearchClient:
         """
         Perform AI-powered movie search using /kodi/search/movies endpoint
 
+        Successful responses are cached for ai_search_cache_minutes, keyed by
+        the server and account, the normalized query, mode, use_llm and limit,
+        and identical searches
+        already in flight are joined instead of repeated. Searches with
+        debug_intent always go to the server.
+
         Args:
             query: Search query string
             limit: Maximum number of results (default: 50, max: 200)
@@ -300,10 +311,37 @@ class AISearchClient:
             self.logger.warning("AI search not activated - cannot perform search")
             return None
 
+        limit = min(limit, 200)
+        if debug_intent:
+            return self._search_movies_request(query, limit, mode, use_llm, debug_intent)
+
+        from lib.remote.ai_search_cache import get_ai_search_result_cache
+        result_cache = get_ai_search_result_cache()
+        return result_cache.get_or_fetch(
+            result_cache.make_key(query, mode, use_llm, limit, self._search_cache_scope()),
+            lambda: self._search_movies_request(query, limit, mode, use_llm, debug_intent),
+            self.settings.get_ai_search_cache_minutes()
+        )
+
+    def get_cached_search(self, query: str, limit: int = 50, mode: str = 'bm25',
+                          use_llm: bool = False) -> Optional[Dict[str, Any]]:
+        """Cached search_movies response, without touching the network"""
+        from lib.remote.ai_search_cache import get_ai_search_result_cache
+        result_cache = get_ai_search_result_cache()
+        return result_cache.get(result_cache.make_key(query, mode, use_llm, min(limit, 200),
+                                                      self._search_cache_scope()))
+
+    def _search_cache_scope(self) -> str:
+        from lib.remote.ai_search_cache import account_scope
+        return account_scope(self.settings.get_remote_server_url(), get_api_key())
+
+    def _search_movies_request(self, query: str, limit: int, mode: str, use_llm: bool,
+                               debug_intent: bool) -> Optional[Dict[str, Any]]:
+        """POST the search to the server and validate the response"""
         try:
             # Build request payload based on parameters
             search_data = {
-                'limit': min(limit, 200),
+                'limit': limit,
                 'mode': mode
             }
             
@@ -318,47 +356,22 @@ class AISearchClient:
             if debug_intent:
                 search_data['debug_intent'] = True
 
-            # DEBUG: Log raw request data being sent
-            self.logger.info("=" * 80)
-            self.logger.info("📤 AI SEARCH RAW REQUEST DATA:")
-            self.logger.info("  Endpoint: /kodi/search/movies")
-            self.logger.info("  Mode: %s", mode)
-            self.logger.info("  Use LLM: %s", use_llm)
-            self.logger.info("  Debug Intent: %s", debug_intent)
-            self.logger.info("  Full Payload:")
-            self.logger.info("%s", json.dumps(search_data, indent=2))
-            self.logger.info("=" * 80)
+            debug_logging = self.settings.get_ai_search_debug_logging()
+            if debug_logging:
+                self.logger.info("=" * 80)
+                self.logger.info("📤 AI SEARCH RAW REQUEST DATA:")
+                self.logger.info("  Endpoint: /kodi/search/movies")
+                self.logger.info("  Mode: %s", mode)
+                self.logger.info("  Use LLM: %s", use_llm)
+                self.logger.info("  Debug Intent: %s", debug_intent)
+                self.logger.info("  Full Payload:")
+                self.logger.info("%s", json.dumps(search_data, indent=2))
+                self.logger.info("=" * 80)
 
             response = self._make_request('kodi/search/movies', 'POST', search_data)
 
-            # DEBUG: Log raw response data received
-            self.logger.info("=" * 80)
-            self.logger.info("📥 AI SEARCH RAW RESPONSE DATA:")
-            if response:
-                self.logger.info("  Success: %s", response.get('success'))
-                self.logger.info("  Mode: %s", response.get('mode'))
-                self.logger.info("  Total Results: %s", response.get('total_results'))
-                self.logger.info("  Max Score: %s", response.get('max_score'))
-                self.logger.info("  Full Response:")
-                self.logger.info("%s", json.dumps(response, indent=2))
-                
-                # Log diagnostics separately for easier analysis
-                if 'diagnostics' in response:
-                    self.logger.info("-" * 80)
-                    self.logger.info("🔍 DIAGNOSTICS:")
-                    diagnostics = response['diagnostics']
-                    self.logger.info("  LLM Used: %s", diagnostics.get('llm_used'))
-                    self.logger.info("  Fallback Used: %s", diagnostics.get('fallback_used'))
-                    self.logger.info("  Fallback Reason: %s", diagnostics.get('fallback_reason'))
-                    self.logger.info("  Execution Mode: %s", diagnostics.get('execution_mode'))
-                    if 'vector_weights' in diagnostics:
-                        self.logger.info("  Vector Weights: %s", diagnostics.get('vector_weights'))
-                    if 'parsed_intent_summary' in diagnostics:
-                        self.logger.info("  Parsed Intent: %s", diagnostics.get('parsed_intent_summary'))
-                    self.logger.info("-" * 80)
-            else:
-                self.logger.info("  Response: None")
-            self.logger.info("=" * 80)
+            if debug_logging:
+                self._log_search_response(response)
 
             if response and response.get('success'):
                 # Validate response structure
@@ -379,6 +392,36 @@ class AISearchClient:
             self.logger.error("Error performing AI search: %s", e)
             return None
 
+    def _log_search_response(self, response: Optional[Dict[str, Any]]):
+        """Dump a search response (ai_search_debug_logging)"""
+        self.logger.info("=" * 80)
+        self.logger.info("📥 AI SEARCH RAW RESPONSE DATA:")
+        if response:
+            self.logger.info("  Success: %s", response.get('success'))
+            self.logger.info("  Mode: %s", response.get('mode'))
+            self.logger.info("  Total Results: %s", response.get('total_results'))
+            self.logger.info("  Max Score: %s", response.get('max_score'))
+            self.logger.info("  Full Response:")
+            self.logger.info("%s", json.dumps(response, indent=2))
+            
+            # Log diagnostics separately for easier analysis
+            if 'diagnostics' in response:
+                self.logger.info("-" * 80)
+                self.logger.info("🔍 DIAGNOSTICS:")
+                diagnostics = response['diagnostics']
+                self.logger.info("  LLM Used: %s", diagnostics.get('llm_used'))
+                self.logger.info("  Fallback Used: %s", diagnostics.get('fallback_used'))
+                self.logger.info("  Fallback Reason: %s", diagnostics.get('fallback_reason'))
+                self.logger.info("  Execution Mode: %s", diagnostics.get('execution_mode'))
+                if 'vector_weights' in diagnostics:
+                    self.logger.info("  Vector Weights: %s", diagnostics.get('vector_weights'))
+                if 'parsed_intent_summary' in diagnostics:
+                    self.logger.info("  Parsed Intent: %s", diagnostics.get('parsed_intent_summary'))
+                self.logger.info("-" * 80)
+        else:
+            self.logger.info("  Response: None")
+        self.logger.info("=" * 80)
+
     def get_library_version(self) -> Optional[Dict[str, Any]]:
         """
         Get current library hash for delta sync using Main API
@@ -399,15 +442,53 @@ class AISearchClient:
             self.logger.error("Error getting library hash: %s", e)
             return None
 
-    def sync_media_batch(self, media_items: List[Dict[str, Any]], batch_size: int = 500, use_replace_mode: bool = False, progress_callback=None) -> Optional[Dict[str, Any]]:
+    def _send_chunk(self, upload_id: str, chunk_index: int, imdb_ids: List[str],
+                    idempotency_key: str) -> ChunkResponse:
+        """PUT one batch chunk, keeping the status and Retry-After for the uploader"""
+        server_url = self.settings.get_remote_server_url()
+        url = f"{server_url.rstrip('/')}/library/batch/{upload_id}/chunk"
+        body = json.dumps({
+            'chunk_index': chunk_index,
+            'items': [{'imdb_id': imdb_id} for imdb_id in imdb_ids]
+        }).encode('utf-8')
+        headers = self._get_headers({'Idempotency-Key': idempotency_key})
+
+        try:
+            response = get_http_session().request('PUT', url, body, headers, timeout=30, compress=True)
+        except (OSError, http.client.HTTPException) as e:
+            return ChunkResponse(0, error=f'Network error: {str(e)}')
+
+        try:
+            payload = response.json() or {}
+        except ValueError:
+            payload = {}
+
+        if response.status == 200 and payload.get('success', True):
+            return ChunkResponse(200, payload)
+        if response.status == 401:
+            self.logger.warning("API key appears to be invalid/expired")
+            from lib.auth.state import clear_auth_data
+            clear_auth_data()
+        status = response.status if response.status != 200 else 400
+        return ChunkResponse(status, payload, parse_retry_after(response.headers.get('retry-after')),
+                             payload.get('error') or f'HTTP {response.status} error')
+
+    def sync_media_batch(self, media_items: List[Dict[str, Any]], batch_size: int = 500, use_replace_mode: bool = False,
+                         progress_callback=None, stop_event: Optional[threading.Event] = None) -> Optional[Dict[str, Any]]:
         """
         Sync a batch of media items with the AI search server using Main API
 
+        Chunks are uploaded by a small worker pool paced by an adaptive token
+        bucket (see lib.remote.chunk_uploader). Acknowledged chunk indexes are
+        checkpointed, so re-running an interrupted sync of the same items
+        continues the same upload session instead of starting over.
+
         Args:
             media_items: List of media item dictionaries with imdb_id
             batch_size: Items per chunk (max 1000)
             use_replace_mode: If True, use "replace" mode for authoritative sync
             progress_callback: Optional callback function(current, total, message) for progress updates
+            stop_event: Optional event that interrupts the upload (it can be resumed later)
 
         Returns:
             Sync result or None if sync fails
@@ -420,9 +501,6 @@ class AISearchClient:
             return {'success': True, 'results': {'accepted': 0, 'duplicates': 0, 'invalid': 0}}
 
         try:
-            # DEBUG: Log incoming media_items count
-            self.logger.info(f"[DEBUG] sync_media_batch received {len(media_items)} media_items")
-            
             # Extract IMDb IDs from media items
             imdb_ids = []
             invalid_count = 0
@@ -433,107 +511,82 @@ class AISearchClient:
                 else:
                     invalid_count += 1
 
-            # DEBUG: Log extraction results
-            self.logger.info(f"[DEBUG] Extracted {len(imdb_ids)} valid IMDb IDs, {invalid_count} invalid/missing")
+            self.logger.debug("sync_media_batch: %s valid IMDb IDs, %s invalid/missing", len(imdb_ids), invalid_count)
 
             if not imdb_ids:
                 self.logger.warning("No valid IMDb IDs found in media items")
                 return {'success': False, 'error': 'No valid IMDb IDs found'}
 
-            # Start batch upload session
             sync_mode = 'replace' if use_replace_mode else 'merge'
-            batch_start_data = {
-                'mode': sync_mode,
-                'total_count': len(imdb_ids),
-                'source': 'kodi'
-            }
-
-            # DEBUG: Log the exact count being sent to API
-            self.logger.info(f"[DEBUG] Preparing batch start request with total_count={len(imdb_ids)}")
-            self.logger.info("Starting batch sync in '%s' mode with %s items", sync_mode, len(imdb_ids))
-            start_response = self._make_request('library/batch/start', 'POST', batch_start_data)
-            if not start_response or not start_response.get('success'):
-                error_msg = start_response.get('error', 'Failed to start batch session') if start_response else 'No response'
-                self.logger.error("Failed to start batch upload session: %s", error_msg)
-                return {'success': False, 'error': error_msg}
-
-            # Get upload_id from start response
-            upload_id = start_response.get('upload_id')
-            if not upload_id:
-                self.logger.error("No upload_id received from batch start")
-                return {'success': False, 'error': 'No upload_id in start response'}
-
-            # Validate and adjust chunk size according to API limits
-            chunk_size = min(max(batch_size, 1), 1000)  # Main API max chunk size is 1000
-            results = {
-                'accepted': 0,
-                'duplicates': 0,
-                'invalid': 0
-            }
-
-            chunk_index = 0
-            total_chunks = (len(imdb_ids) + chunk_size - 1) // chunk_size
-            
-            for i in range(0, len(imdb_ids), chunk_size):
-                chunk_imdb_ids = imdb_ids[i:i + chunk_size]
-
-                # Update progress if callback provided
-                if progress_callback:
-                    progress_callback(chunk_index, total_chunks, f"Uploading batch {chunk_index + 1}/{total_chunks}")
-
-                # Prepare chunk data
-                chunk_items = [{'imdb_id': imdb_id} for imdb_id in chunk_imdb_ids]
-                chunk_data = {
-                    'chunk_index': chunk_index,
-                    'items': chunk_items
-                }
+            server_url = self.settings.get_remote_server_url() or ''
+            digest = ids_digest(imdb_ids)
+            checkpoints = get_upload_checkpoints()
 
-                # Generate idempotency key for this chunk
-                import uuid
-                idempotency_key = str(uuid.uuid4())
-
-                # Upload chunk using Main API
-                response = self._make_request(
-                    f'library/batch/{upload_id}/chunk',
-                    'PUT',
-                    chunk_data,
-                    {'Idempotency-Key': idempotency_key}
-                )
-
-                if response and response.get('success'):
-                    chunk_results = response.get('results', {})
-                    results['accepted'] += chunk_results.get('accepted', 0)
-                    results['duplicates'] += chunk_results.get('duplicates', 0)
-                    results['invalid'] += chunk_results.get('invalid', 0)
-
-                    self.logger.debug("Uploaded chunk %s: %s", chunk_index + 1, chunk_results)
-
-                    # Rate limiting - wait between chunks
-                    if i + chunk_size < len(imdb_ids):
-                        time.sleep(1)  # 1 second wait between chunks
-
-                else:
-                    error_msg = response.get('error', 'Unknown error') if response else 'No response'
-                    self.logger.warning("Chunk upload failed: %s", error_msg)
+            upload_id, chunk_size, acked = self._resume_upload(checkpoints.find(sync_mode, digest, server_url))
+            if upload_id:
+                self.logger.info("Resuming upload %s: %s chunks already acknowledged", upload_id, len(acked))
+            else:
+                # Start batch upload session
+                self.logger.info("Starting batch sync in '%s' mode with %s items", sync_mode, len(imdb_ids))
+                start_response = self._make_request('library/batch/start', 'POST', {
+                    'mode': sync_mode,
+                    'total_count': len(imdb_ids),
+                    'source': 'kodi'
+                })
+                if not start_response or not start_response.get('success'):
+                    error_msg = start_response.get('error', 'Failed to start batch session') if start_response else 'No response'
+                    self.logger.error("Failed to start batch upload session: %s", error_msg)
+                    return {'success': False, 'error': error_msg}
 
-                    # For certain errors, continue with next chunk instead of failing completely
-                    if 'rate limit' in error_msg.lower() or 'timeout' in error_msg.lower():
-                        self.logger.info("Recoverable error, continuing with next chunk after delay")
-                        time.sleep(30)  # Extended delay for rate limits
-                        continue
+                upload_id = start_response.get('upload_id')
+                if not upload_id:
+                    self.logger.error("No upload_id received from batch start")
+                    return {'success': False, 'error': 'No upload_id in start response'}
 
-                    return {'success': False, 'error': error_msg}
+                # Validate and adjust chunk size according to API limits
+                chunk_size = min(max(batch_size, 1), start_response.get('max_chunk') or 1000, 1000)
+                checkpoints.begin(upload_id, sync_mode, chunk_size, digest, server_url)
 
-                chunk_index += 1
+            total_chunks = (len(imdb_ids) + chunk_size - 1) // chunk_size
+            pending = [(index, imdb_ids[index * chunk_size:(index + 1) * chunk_size])
+                       for index in range(total_chunks) if index not in acked]
 
-            # Commit the batch - REQUIRED for replace-sync operations            
+            def on_ack(chunk_index, chunk_results):
+                acked.add(chunk_index)
+                checkpoints.save_acked(upload_id, acked)
+                self.logger.debug("Uploaded chunk %s: %s", chunk_index + 1, chunk_results)
+                if progress_callback:
+                    progress_callback(len(acked), total_chunks, f"Uploading batch {len(acked)}/{total_chunks}")
+
+            uploader = ChunkUploader(
+                upload_id,
+                lambda index, ids, key: self._send_chunk(upload_id, index, ids, key),
+                stop_event=stop_event
+            )
+            upload = uploader.upload(pending, on_ack)
+            results = upload['results']
+
+            if upload['stopped'] and len(acked) < total_chunks:
+                self.logger.info("Upload %s interrupted after %s/%s chunks", upload_id, len(acked), total_chunks)
+                return {'success': False, 'error': 'Sync interrupted', 'interrupted': True}
+            if upload['error']:
+                self.logger.warning("Upload %s stopped after %s/%s chunks: %s",
+                                    upload_id, len(acked), total_chunks, upload['error'])
+                return {'success': False, 'error': upload['error']}
+
+            self.logger.info("Uploaded %s chunks (%s throttled responses, final rate %s chunks/s)",
+                             len(pending), uploader.limiter.throttled,
+                             'unpaced' if uploader.limiter.rate is None else '%.1f' % uploader.limiter.rate)
+
+            # Commit the batch - REQUIRED for replace-sync operations
             self.logger.info("Committing batch upload for %s", upload_id)
             commit_response = self._make_request(f'library/batch/{upload_id}/commit', 'POST')
-            
+
             if not commit_response or not commit_response.get('success'):
                 error_msg = commit_response.get('error', 'Failed to commit batch') if commit_response else 'No response'
                 self.logger.error("Failed to commit batch: %s", error_msg)
                 return {'success': False, 'error': f'Commit failed: {error_msg}'}
+            checkpoints.finish(upload_id)
 
             # Get final results from commit response
             final_tallies = commit_response.get('final_tallies', results)
@@ -541,6 +594,13 @@ class AISearchClient:
             removed_count = commit_response.get('removed_count', 0)
 
             self.logger.info("Media batch sync completed: %s", final_tallies)
+
+            # Cached searches and similar movies ranked the library as it was before this upload
+            from lib.remote.ai_search_cache import get_ai_search_result_cache
+            get_ai_search_result_cache().clear()
+            # Reused plugin interpreters still hold them in RemoteCache's memory tier
+            from lib.utils.invocation_state import advance_generation
+            advance_generation()
             if use_replace_mode and removed_count > 0:
                 self.logger.info("Replace sync removed %s movies not in current batch", removed_count)
 
@@ -556,6 +616,121 @@ class AISearchClient:
             self.logger.error("Error performing media batch sync: %s", e)
             return {'success': False, 'error': f'Sync failed: {str(e)}'}
 
+    def _resume_upload(self, checkpoint: Optional[Dict[str, Any]]):
+        """Validate a stored checkpoint against the server's batch status
+
+        Returns:
+            (upload_id, chunk_size, acknowledged chunk indexes), or (None, None,
+            empty set) when there is nothing to resume
+        """
+        if not checkpoint:
+            return None, None, set()
+
+        upload_id = checkpoint['upload_id']
+        status = self._make_request(f'library/batch/{upload_id}/status', 'GET')
+        if not status or not status.get('success') or status.get('status') != 'active':
+            self.logger.info("Upload %s can no longer be resumed", upload_id)
+            get_upload_checkpoints().finish(upload_id)
+            return None, None, set()
+
+        # Chunks the server processed after our last checkpoint write count too
+        acked = set(checkpoint['acked']) | set(status.get('processed_chunks') or [])
+        return upload_id, checkpoint['chunk_size'], acked
+
+    def sync_library(self, media_items: List[Dict[str, Any]], authoritative: bool = True,
+                     force_replace: bool = False, batch_size: int = 500,
+                     progress_callback=None, stop_event: Optional[threading.Event] = None) -> Optional[Dict[str, Any]]:
+        """
+        Sync the library with the AI search server, uploading only what changed
+
+        The local manifest records the IMDb IDs committed last time together with
+        the server's library/hash signature seen right after that commit. If the
+        server still reports that signature, only additions are uploaded (merge);
+        otherwise, or when forced, the full set is uploaded.
+
+        Args:
+            media_items: List of media item dictionaries with imdb_id
+            authoritative: The library is the complete collection - removals are
+                applied and a mismatch falls back to a replace sync. When False
+                nothing is removed and the fallback is a full merge.
+            force_replace: Skip the delta check and replace the server collection
+            batch_size: Items per chunk
+            progress_callback: Optional callback function(current, total, message)
+            stop_event: Optional event that interrupts the upload
+
+        Returns:
+            sync_media_batch style result with 'sync_mode' ('unchanged', 'delta',
+            'merge' or 'replace') and 'added_count'/'removed_count', or None
+        """
+        from lib.remote.sync_manifest import get_ai_sync_manifest, server_signature
+
+        if not self.is_activated():
+            self.logger.warning("AI search not activated - cannot perform sync")
+            return None
+
+        local_ids = {item.get('imdb_id') for item in media_items
+                     if item.get('imdb_id') and item['imdb_id'].startswith('tt')}
+        server_url = self.settings.get_remote_server_url() or ''
+        manifest = get_ai_sync_manifest()
+
+        synced_ids = None
+        library_hash = None
+        if not force_replace:
+            library_hash = self.get_library_version()
+            synced_ids = manifest.get_trusted_ids(server_signature(library_hash), server_url)
+
+        if synced_ids is not None:
+            additions = local_ids - synced_ids
+            removals = (synced_ids - local_ids) if authoritative else set()
+            self.logger.info("AI delta sync: %s additions, %s removals against %s synced IDs",
+                             len(additions), len(removals), len(synced_ids))
+
+            if not additions and not removals:
+                return {
+                    'success': True,
+                    'sync_mode': 'unchanged',
+                    'results': {'accepted': 0, 'duplicates': 0, 'invalid': 0},
+                    'total_processed': 0,
+                    'user_movie_count': library_hash.get('count', len(synced_ids)),
+                    'added_count': 0,
+                    'removed_count': 0
+                }
+
+            if removals:
+                # The batch API has no per-item delete; removals need an authoritative replace
+                sync_mode, upload_ids, committed_ids = 'replace', local_ids, local_ids
+            else:
+                sync_mode, upload_ids, committed_ids = 'delta', additions, synced_ids | additions
+        elif authoritative or force_replace:
+            sync_mode, upload_ids, committed_ids = 'replace', local_ids, local_ids
+            additions, removals = local_ids, set()
+        else:
+            sync_mode, upload_ids, committed_ids = 'merge', local_ids, local_ids
+            additions, removals = local_ids, set()
+
+        self.logger.info("AI sync mode '%s': uploading %s of %s IDs", sync_mode, len(upload_ids), len(local_ids))
+        result = self.sync_media_batch(
+            [{'imdb_id': imdb_id} for imdb_id in sorted(upload_ids)],
+            batch_size=batch_size,
+            use_replace_mode=(sync_mode == 'replace'),
+            progress_callback=progress_callback,
+            stop_event=stop_event
+        )
+        if not result or not result.get('success'):
+            return result
+
+        # A full merge leaves server items we did not upload, so its signature is not recorded
+        signature = None
+        if sync_mode != 'merge':
+            signature = server_signature(self.get_library_version())
+        manifest.record_commit(committed_ids, signature, server_url)
+
+        result['sync_mode'] = sync_mode
+        result['added_count'] = len(additions)
+        if sync_mode == 'replace' and synced_ids is not None:
+            result['removed_count'] = len(removals)
+        return result
+
     def get_library_stats(self) -> Optional[Dict[str, Any]]:
         """
         Get comprehensive library statistics
@@ -563,6 +738,20 @@ class AISearchClient:
         Returns:
             Statistics or None if request fails
         """
+        result = self.fetch_library_stats()
+        return result['stats'] if result else None
+
+    def fetch_library_stats(self, etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get library statistics, revalidating a cached copy
+
+        Args:
+            etag: ETag of the cached statistics, if any
+
+        Returns:
+            Dict with 'not_modified' (True when etag still matches), 'stats'
+            and 'etag', or None if request fails
+        """
         if not self.is_activated():
             return None
 
@@ -570,13 +759,15 @@ class AISearchClient:
             # DEBUG: Log request
             self.logger.debug("📤 LIBRARY STATS REQUEST: GET /users/me/library/stats")
             
-            response = self._make_request('users/me/library/stats', 'GET')
+            response = self._make_request('users/me/library/stats', 'GET', etag=etag)
             
             # DEBUG: Log full response
             self.logger.debug("📥 LIBRARY STATS RESPONSE: %s", json.dumps(response, indent=2) if response else "None")
             
+            if response and response.get('_not_modified'):
+                return {'not_modified': True, 'stats': None, 'etag': etag}
             if response and response.get('success'):
-                return response.get('stats')
+                return {'not_modified': False, 'stats': response.get('stats'), 'etag': response.get('_etag')}
             return None
 
         except Exception as e:
@@ -588,6 +779,9 @@ class AISearchClient:
         Find movies similar to reference movie using /similar_to endpoint
         Note: Authentication is optional but recommended - if authenticated, results are filtered to only show movies in the user's library
 
+        Results are kept in the remote cache for SIMILAR_CACHE_HOURS per
+        server and account, reference movie and facet selection.
+
         Args:
             reference_imdb_id: IMDb ID of reference movie
             facets: Dict with keys: plot, mood, themes, genre (all bool)
@@ -615,12 +809,20 @@ class AISearchClient:
                 self.logger.warning("No facets selected for similarity search")
                 return None
 
+            cached = self.get_cached_similar(reference_imdb_id, facets)
+            if cached is not None:
+                self.logger.debug("Using cached similar movies for %s", reference_imdb_id)
+                return cached
+
             # Make request with authentication to get user-filtered results
             response = self._make_request('similar_to', 'POST', request_data)
 
             if response and response.get('success'):
                 results = response.get('results', [])
                 self.logger.info("Found %s similar movies for %s (with scores)", len(results), reference_imdb_id)
+                from lib.remote.cache import get_remote_cache
+                get_remote_cache().set(self._similar_cache_key(reference_imdb_id, facets), results,
+                                       ttl_hours=SIMILAR_CACHE_HOURS)
                 return results
 
             return None
@@ -629,6 +831,17 @@ class AISearchClient:
             self.logger.error("Error finding similar movies: %s", e)
             return None
 
+    def get_cached_similar(self, reference_imdb_id: str, facets: Dict[str, bool]) -> Optional[List[Dict[str, Any]]]:
+        """Cached search_similar_movies results (a private copy), without touching the network"""
+        from lib.remote.cache import get_remote_cache
+        cached = get_remote_cache().get(self._similar_cache_key(reference_imdb_id, facets))
+        return [dict(result) for result in cached] if isinstance(cached, list) else None
+
+    def _similar_cache_key(self, reference_imdb_id: str, facets: Dict[str, bool]) -> str:
+        from lib.remote.ai_search_cache import SIMILAR_KEY_PREFIX
+        selected = ','.join(sorted(name for name, enabled in facets.items() if enabled))
+        return f"{SIMILAR_KEY_PREFIX}{self._search_cache_scope()}:{reference_imdb_id}:{selected}"
+
     def _trigger_post_activation_sync(self):
         """Internal method to trigger post-activation sync operations."""
         self.logger.info("AI SEARCH: Triggering post-activation sync...")
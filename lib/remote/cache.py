@@ -7,79 +7,94 @@ Local caching for remote API results with TTL support
 """
 
 import json
+import time
+import atexit
+import threading
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
 from lib.utils.kodi_log import get_kodi_logger
+from lib.utils.invocation_state import on_invocation_end, on_generation_change
 from lib.data.connection_manager import get_connection_manager
 
 
+# In-process tier budget, counted in serialized (JSON) bytes
+MEMORY_MAX_BYTES = 2 * 1024 * 1024
+# Entries larger than this only live in SQLite
+MEMORY_MAX_ENTRY_BYTES = 256 * 1024
+# SQLite tier budget, enforced by cleanup_old_entries()
+DB_MAX_BYTES = 16 * 1024 * 1024
+# Buffered hits are written once this many keys are pending (the service also
+# flushes them on a schedule)
+HIT_FLUSH_THRESHOLD = 200
+
+
 class RemoteCache:
-    """Local cache for remote API results"""
+    """Local cache for remote API results
+
+    Two tiers: an in-process LRU of decoded values bounded by MEMORY_MAX_BYTES,
+    in front of the remote_cache table. A hit in either tier only updates
+    in-memory hit counters; flush_hits() writes them in one batch. Values
+    returned by get() are shared with the memory tier and must not be mutated.
+    """
 
     def __init__(self):
         self.logger = get_kodi_logger('lib.remote.cache')
         self.conn_manager = get_connection_manager()
-        self._ensure_cache_table()
-
-    def _ensure_cache_table(self):
-        """Ensure the remote cache table exists"""
-        try:
-            with self.conn_manager.transaction() as conn:
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS remote_cache (
-                        cache_key TEXT PRIMARY KEY,
-                        data TEXT NOT NULL,
-                        created_at TEXT NOT NULL,
-                        expires_at TEXT NOT NULL,
-                        hit_count INTEGER DEFAULT 0,
-                        last_accessed TEXT
-                    )
-                """)
-
-                # Create index for cleanup
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_remote_cache_expires 
-                    ON remote_cache(expires_at)
-                """)
-
-        except Exception as e:
-            self.logger.error("Failed to create remote cache table: %s", e)
+        self._lock = threading.Lock()
+        # cache_key -> (value, size_bytes, expires_ts)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_bytes = 0
+        # cache_key -> [hits, last_accessed]
+        self._pending_hits: Dict[str, list] = {}
+        self.stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0}
+        atexit.register(self.flush_hits)
 
     def get(self, cache_key: str) -> Optional[Any]:
         """Get cached data by key, returns None if not found or expired"""
-        try:
-            now = datetime.now().isoformat()
+        now_ts = time.time()
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                if entry[2] > now_ts:
+                    self._memory.move_to_end(cache_key)
+                    self.stats['memory_hits'] += 1
+                    self._record_hit(cache_key)
+                    return entry[0]
+                self._drop_memory(cache_key)
 
+        try:
             result = self.conn_manager.execute_single("""
-                SELECT data, expires_at, hit_count
-                FROM remote_cache 
+                SELECT data, expires_at
+                FROM remote_cache
                 WHERE cache_key = ? AND expires_at > ?
-            """, [cache_key, now])
-
-            if result:
-                # Update hit count and last accessed
-                with self.conn_manager.transaction() as conn:
-                    conn.execute("""
-                        UPDATE remote_cache 
-                        SET hit_count = hit_count + 1, last_accessed = ?
-                        WHERE cache_key = ?
-                    """, [now, cache_key])
-
-                # Parse and return data
-                try:
-                    return json.loads(result['data'])
-                except json.JSONDecodeError as e:
-                    self.logger.warning("Failed to parse cached data for %s: %s", cache_key, e)
-                    self.delete(cache_key)
+            """, [cache_key, datetime.now().isoformat()])
 
-            return None
+            if not result:
+                with self._lock:
+                    self.stats['misses'] += 1
+                return None
+
+            try:
+                data = json.loads(result['data'])
+            except json.JSONDecodeError as e:
+                self.logger.warning("Failed to parse cached data for %s: %s", cache_key, e)
+                self.delete(cache_key)
+                return None
+
+            expires_ts = datetime.fromisoformat(result['expires_at']).timestamp()
+            with self._lock:
+                self.stats['db_hits'] += 1
+                self._record_hit(cache_key)
+                self._remember(cache_key, data, len(result['data']), expires_ts)
+            return data
 
         except Exception as e:
             self.logger.error("Error getting cached data for %s: %s", cache_key, e)
             return None
 
-    def set(self, cache_key: str, data: Any, ttl_hours: int = 6) -> bool:
+    def set(self, cache_key: str, data: Any, ttl_hours: float = 6) -> bool:
         """Set cached data with TTL"""
         try:
             now = datetime.now()
@@ -95,17 +110,24 @@ class RemoteCache:
             # Store in cache
             with self.conn_manager.transaction() as conn:
                 conn.execute("""
-                    INSERT OR REPLACE INTO remote_cache 
-                    (cache_key, data, created_at, expires_at, hit_count, last_accessed)
-                    VALUES (?, ?, ?, ?, 0, ?)
+                    INSERT OR REPLACE INTO remote_cache
+                    (cache_key, data, created_at, expires_at, hit_count, last_accessed, size_bytes)
+                    VALUES (?, ?, ?, ?, 0, ?, ?)
                 """, [
                     cache_key,
                     serialized_data,
                     now.isoformat(),
                     expires_at.isoformat(),
-                    now.isoformat()
+                    now.isoformat(),
+                    len(serialized_data)
                 ])
 
+            # The memory tier keeps its own copy; the caller may go on to modify data
+            with self._lock:
+                self._pending_hits.pop(cache_key, None)
+                self._remember(cache_key, json.loads(serialized_data), len(serialized_data),
+                               expires_at.timestamp())
+
             self.logger.debug("Cached data for key %s (TTL: %sh)", cache_key, ttl_hours)
             return True
 
@@ -115,6 +137,10 @@ class RemoteCache:
 
     def delete(self, cache_key: str) -> bool:
         """Delete specific cache entry"""
+        with self._lock:
+            self._drop_memory(cache_key)
+            self._pending_hits.pop(cache_key, None)
+
         try:
             with self.conn_manager.transaction() as conn:
                 result = conn.execute("""
@@ -131,8 +157,35 @@ class RemoteCache:
             self.logger.error("Error deleting cache entry %s: %s", cache_key, e)
             return False
 
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every entry whose key starts with prefix, returns number of entries deleted"""
+        with self._lock:
+            for cache_key in [key for key in self._memory if key.startswith(prefix)]:
+                self._drop_memory(cache_key)
+            for cache_key in [key for key in self._pending_hits if key.startswith(prefix)]:
+                del self._pending_hits[cache_key]
+
+        try:
+            with self.conn_manager.transaction() as conn:
+                # substr() instead of LIKE: keys may contain '_' and '%'
+                result = conn.execute("""
+                    DELETE FROM remote_cache WHERE substr(cache_key, 1, ?) = ?
+                """, [len(prefix), prefix])
+
+                self.logger.debug("Deleted %s cache entries with prefix %s", result.rowcount, prefix)
+                return result.rowcount
+
+        except Exception as e:
+            self.logger.error("Error deleting cache entries with prefix %s: %s", prefix, e)
+            return 0
+
     def clear_all(self) -> bool:
         """Clear all cached data"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._pending_hits.clear()
+
         try:
             with self.conn_manager.transaction() as conn:
                 result = conn.execute("DELETE FROM remote_cache")
@@ -145,8 +198,19 @@ class RemoteCache:
             self.logger.error("Error clearing cache: %s", e)
             return False
 
+    def clear_memory(self):
+        """Drop the in-process tier; the next get() of each key reads SQLite"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
     def clear_expired(self) -> int:
-        """Clear expired cache entries, returns number of entries cleared"""
+        """Clear expired cache entries in bulk, returns number of entries cleared"""
+        now_ts = time.time()
+        with self._lock:
+            for cache_key in [k for k, entry in self._memory.items() if entry[2] <= now_ts]:
+                self._drop_memory(cache_key)
+
         try:
             now = datetime.now().isoformat()
 
@@ -165,37 +229,59 @@ class RemoteCache:
             self.logger.error("Error clearing expired cache: %s", e)
             return 0
 
+    def flush_hits(self) -> int:
+        """Write buffered hit counts and access times, returns number of keys updated"""
+        with self._lock:
+            if not self._pending_hits:
+                return 0
+            pending = self._pending_hits
+            self._pending_hits = {}
+
+        try:
+            with self.conn_manager.transaction() as conn:
+                conn.executemany("""
+                    UPDATE remote_cache
+                    SET hit_count = hit_count + ?, last_accessed = ?
+                    WHERE cache_key = ?
+                """, [(hits, last_accessed, cache_key) for cache_key, (hits, last_accessed) in pending.items()])
+            return len(pending)
+
+        except Exception as e:
+            self.logger.error("Error flushing cache hit counts: %s", e)
+            return 0
+
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         try:
             now = datetime.now().isoformat()
 
-            # Get total entries
-            total_result = self.conn_manager.execute_single("""
-                SELECT COUNT(*) as total FROM remote_cache
-            """)
-            total_entries = total_result['total'] if total_result else 0
-
-            # Get active (non-expired) entries
-            active_result = self.conn_manager.execute_single("""
-                SELECT COUNT(*) as active FROM remote_cache WHERE expires_at > ?
+            totals = self.conn_manager.execute_single("""
+                SELECT COUNT(*) as total,
+                       SUM(CASE WHEN expires_at > ? THEN 1 ELSE 0 END) as active,
+                       SUM(hit_count) as total_hits,
+                       SUM(size_bytes) as total_bytes
+                FROM remote_cache
             """, [now])
-            active_entries = active_result['active'] if active_result else 0
-
-            # Get expired entries
-            expired_entries = total_entries - active_entries
+            total_entries = totals['total'] if totals else 0
+            active_entries = (totals['active'] or 0) if totals else 0
 
-            # Get total hit count
-            hits_result = self.conn_manager.execute_single("""
-                SELECT SUM(hit_count) as total_hits FROM remote_cache
-            """)
-            total_hits = hits_result['total_hits'] if hits_result and hits_result['total_hits'] else 0
+            with self._lock:
+                pending_hits = sum(hits for hits, _ in self._pending_hits.values())
+                memory_entries = len(self._memory)
+                memory_bytes = self._memory_bytes
+                tier_stats = dict(self.stats)
 
             return {
                 'total_entries': total_entries,
                 'active_entries': active_entries,
-                'expired_entries': expired_entries,
-                'total_hits': total_hits,
+                'expired_entries': total_entries - active_entries,
+                'total_hits': ((totals['total_hits'] or 0) if totals else 0) + pending_hits,
+                'total_bytes': (totals['total_bytes'] or 0) if totals else 0,
+                'memory_entries': memory_entries,
+                'memory_bytes': memory_bytes,
+                'memory_hits': tier_stats['memory_hits'],
+                'db_hits': tier_stats['db_hits'],
+                'misses': tier_stats['misses'],
                 'cache_table_exists': True
             }
 
@@ -210,47 +296,106 @@ class RemoteCache:
                 'error': str(e)
             }
 
-    def cleanup_old_entries(self, max_entries: int = 1000) -> int:
-        """Clean up old entries when cache grows too large"""
+    def cleanup_old_entries(self, max_entries: int = 1000, max_bytes: int = DB_MAX_BYTES) -> int:
+        """Clean up expired entries, then least recently used ones until the
+        SQLite tier is within max_entries and max_bytes"""
         try:
-            # First clear expired entries
+            # Access times decide what goes, so write the buffered ones first
+            self.flush_hits()
             expired_cleared = self.clear_expired()
 
-            # Check if we still have too many entries
-            current_result = self.conn_manager.execute_single("""
-                SELECT COUNT(*) as count FROM remote_cache
+            totals = self.conn_manager.execute_single("""
+                SELECT COUNT(*) as count, SUM(size_bytes) as bytes FROM remote_cache
             """)
-            current_count = current_result['count'] if current_result else 0
+            current_count = totals['count'] if totals else 0
+            current_bytes = (totals['bytes'] or 0) if totals else 0
 
-            if current_count <= max_entries:
+            if current_count <= max_entries and current_bytes <= max_bytes:
                 return expired_cleared
 
-            # Remove oldest entries by last accessed time
-            entries_to_remove = current_count - max_entries
+            # Oldest access first, until both budgets are met
+            victims = []
+            rows = self.conn_manager.execute_query("""
+                SELECT cache_key, size_bytes FROM remote_cache ORDER BY last_accessed ASC
+            """)
+            for row in rows:
+                if current_count <= max_entries and current_bytes <= max_bytes:
+                    break
+                victims.append((row['cache_key'],))
+                current_count -= 1
+                current_bytes -= row['size_bytes'] or 0
 
             with self.conn_manager.transaction() as conn:
-                result = conn.execute("""
-                    DELETE FROM remote_cache 
-                    WHERE cache_key IN (
-                        SELECT cache_key FROM remote_cache 
-                        ORDER BY last_accessed ASC 
-                        LIMIT ?
-                    )
-                """, [entries_to_remove])
-
-                removed_count = result.rowcount
-                total_cleared = expired_cleared + removed_count
+                conn.executemany("DELETE FROM remote_cache WHERE cache_key = ?", victims)
 
-                if total_cleared > 0:
-                    self.logger.info("Cache cleanup: %s expired + %s old = %s entries removed", expired_cleared, removed_count, total_cleared)
+            with self._lock:
+                for (cache_key,) in victims:
+                    self._drop_memory(cache_key)
 
-                return total_cleared
+            total_cleared = expired_cleared + len(victims)
+            self.logger.info("Cache cleanup: %s expired + %s old = %s entries removed",
+                             expired_cleared, len(victims), total_cleared)
+            return total_cleared
 
         except Exception as e:
             self.logger.error("Error during cache cleanup: %s", e)
             return 0
 
+    def _record_hit(self, cache_key: str):
+        """Buffer a hit; caller holds self._lock"""
+        pending = self._pending_hits.get(cache_key)
+        if pending is None:
+            self._pending_hits[cache_key] = [1, datetime.now().isoformat()]
+        else:
+            pending[0] += 1
+            pending[1] = datetime.now().isoformat()
+        if len(self._pending_hits) >= HIT_FLUSH_THRESHOLD:
+            threading.Thread(target=self.flush_hits, daemon=True).start()
+
+    def _remember(self, cache_key: str, data: Any, size_bytes: int, expires_ts: float):
+        """Put a value in the memory tier, evicting LRU entries; caller holds self._lock"""
+        self._drop_memory(cache_key)
+        if size_bytes > MEMORY_MAX_ENTRY_BYTES:
+            return
+        self._memory[cache_key] = (data, size_bytes, expires_ts)
+        self._memory_bytes += size_bytes
+        while self._memory_bytes > MEMORY_MAX_BYTES:
+            _, (_, evicted_size, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def _drop_memory(self, cache_key: str):
+        """Remove a key from the memory tier; caller holds self._lock"""
+        entry = self._memory.pop(cache_key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[1]
+
+
+# Global remote cache instance
+_remote_cache_instance = None
+_remote_cache_lock = threading.Lock()
+
 
 def get_remote_cache():
     """Get global remote cache instance"""
-    return RemoteCache()
\ No newline at end of file
+    global _remote_cache_instance
+    if _remote_cache_instance is None:
+        with _remote_cache_lock:
+            if _remote_cache_instance is None:
+                _remote_cache_instance = RemoteCache()
+    return _remote_cache_instance
+
+
+def _flush_remote_cache_hits():
+    """A reused interpreter only exits with Kodi, so write hit counts after each call"""
+    if _remote_cache_instance is not None:
+        _remote_cache_instance.flush_hits()
+
+
+def _clear_remote_cache_memory():
+    """Another process may have deleted entries (sign-out, library upload) that this one still holds"""
+    if _remote_cache_instance is not None:
+        _remote_cache_instance.clear_memory()
+
+
+on_invocation_end(_flush_remote_cache_hits)
+on_generation_change(_clear_remote_cache_memory)
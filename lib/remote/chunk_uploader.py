@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Chunk Uploader
+Bounded-concurrency upload of library/batch chunks with adaptive rate limiting
+and resumable upload checkpoints
+"""
+
+import json
+import time
+import uuid
+import hashlib
+import threading
+from collections import deque
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Tuple, Callable, Set
+
+from lib.data.connection_manager import get_connection_manager
+from lib.utils.kodi_log import get_kodi_logger
+
+
+# Chunks in flight at once; the server rate limit, not the pool, sets the pace
+UPLOAD_WORKERS = 3
+# Attempts per chunk on network/server errors, and retries on 429/503, before
+# the upload is abandoned (it can be resumed later)
+MAX_CHUNK_ATTEMPTS = 5
+MAX_THROTTLE_RETRIES = 20
+
+# Token bucket defaults, in chunks per second. Uploads start unpaced; pacing
+# starts at the throughput seen so far (INITIAL_RATE if there is none yet)
+# once the server pushes back
+INITIAL_RATE = 4.0
+MIN_RATE = 0.2
+MAX_RATE = 20.0
+BURST = 4
+# Recent chunk completions the throughput estimate is taken from
+THROUGHPUT_WINDOW = 10
+
+# Rate multiplier on 429/503
+THROTTLE_BACKOFF = 0.7
+
+# Pause used when a 429/503 carries no usable Retry-After
+DEFAULT_RETRY_AFTER = 2.0
+MAX_RETRY_AFTER = 120.0
+# Observed latency above this multiple of the best seen counts as server congestion
+LATENCY_CONGESTION_FACTOR = 2.0
+
+
+class ChunkResponse:
+    """Outcome of one chunk PUT; status 0 means a network failure"""
+
+    def __init__(self, status: int, payload: Optional[Dict[str, Any]] = None,
+                 retry_after: Optional[float] = None, error: Optional[str] = None):
+        self.status = status
+        self.payload = payload or {}
+        self.retry_after = retry_after
+        self.error = error
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError, IndexError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def chunk_idempotency_key(upload_id: str, chunk_index: int) -> str:
+    """Stable per-chunk key, so a retried or resumed chunk is recognised by the server"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{upload_id}:{chunk_index}"))
+
+
+class AdaptiveRateLimiter:
+    """Token bucket shared by the upload workers
+
+    Without a rate (the default) workers are not paced at all until the server
+    pushes back: the first 429/503, or latency climbing past
+    LATENCY_CONGESTION_FACTOR times the best seen, starts pacing at the
+    throughput observed so far. From then on the rate grows additively while
+    chunks succeed at normal latency, shrinks by 20% on congestion and by
+    THROTTLE_BACKOFF on 429/503, when all workers also pause for Retry-After.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: int = BURST,
+                 min_rate: float = MIN_RATE, max_rate: float = MAX_RATE):
+        self._lock = threading.Lock()
+        # Chunks per second, or None while unpaced
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._latency = None
+        self._best_latency = None
+        self._throttled_rate = None
+        self._completions = deque(maxlen=THROUGHPUT_WINDOW)
+        self.throttled = 0
+
+    def acquire(self, stop_event: threading.Event) -> bool:
+        """Wait for a token; returns False if stop_event was set while waiting"""
+        while not stop_event.is_set():
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self.rate is None:
+                    return True
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return True
+                    delay = (1.0 - self._tokens) / self.rate
+            stop_event.wait(delay)
+        return False
+
+    def on_success(self, latency: float):
+        with self._lock:
+            now = time.monotonic()
+            self._completions.append(now)
+            self._latency = latency if self._latency is None else 0.7 * self._latency + 0.3 * latency
+            if self._best_latency is None or self._latency < self._best_latency:
+                self._best_latency = self._latency
+            congested = self._latency > self._best_latency * LATENCY_CONGESTION_FACTOR
+            if self.rate is None:
+                if congested:
+                    self._start_pacing(now)
+                    self.rate = max(self.min_rate, self.rate * 0.8)
+            elif congested:
+                self.rate = max(self.min_rate, self.rate * 0.8)
+            else:
+                # Additive increase of about one chunk/s per second of successful uploads,
+                # slowed down near the rate that was last throttled
+                step = 1.0 / self.rate
+                if self._throttled_rate and self.rate >= self._throttled_rate * 0.9:
+                    step *= 0.25
+                self.rate = min(self.max_rate, self.rate + step)
+
+    def on_throttle(self, retry_after: Optional[float]):
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            if self.rate is None:
+                self._start_pacing(now)
+            # Workers already in flight when the limit was hit get 429s too; only
+            # the first one of a pause lowers the rate
+            if now >= self._paused_until:
+                self._throttled_rate = self.rate
+                self.rate = max(self.min_rate, self.rate * THROTTLE_BACKOFF)
+            pause = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+            self._paused_until = max(self._paused_until, now + pause)
+            self._tokens = 0.0
+
+    def _start_pacing(self, now: float):
+        """Pace from now on at the recent throughput; caller holds self._lock"""
+        rate = INITIAL_RATE
+        if len(self._completions) >= 2:
+            span = self._completions[-1] - self._completions[0]
+            if span > 0:
+                rate = (len(self._completions) - 1) / span
+        self.max_rate = max(self.max_rate, rate)
+        self.rate = max(self.min_rate, rate)
+        self._tokens = 0.0
+        self._updated = now
+
+
+class ChunkUploader:
+    """Upload chunks through a small worker pool
+
+    send_chunk(chunk_index, items, idempotency_key) performs one PUT and returns
+    a ChunkResponse. Acknowledged chunks are reported to on_ack on the calling
+    thread, in completion order.
+    """
+
+    def __init__(self, upload_id: str, send_chunk: Callable[[int, List[Any], str], ChunkResponse],
+                 workers: Optional[int] = None, limiter: Optional[AdaptiveRateLimiter] = None,
+                 stop_event: Optional[threading.Event] = None):
+        self.logger = get_kodi_logger('lib.remote.chunk_uploader')
+        self.upload_id = upload_id
+        self.send_chunk = send_chunk
+        self.workers = workers or UPLOAD_WORKERS
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self._stop = stop_event or threading.Event()
+        # Set on the first unrecoverable failure so queued chunks are not sent
+        self._abort = threading.Event()
+
+    def upload(self, chunks: List[Tuple[int, List[Any]]],
+               on_ack: Optional[Callable[[int, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Upload (chunk_index, items) pairs
+
+        Returns:
+            Dict with 'acked' (set of chunk indexes), 'results' (summed chunk
+            tallies), 'error' (first failure or None) and 'stopped'
+        """
+        acked: Set[int] = set()
+        results = {'accepted': 0, 'duplicates': 0, 'invalid': 0}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._upload_one, index, items): index for index, items in chunks}
+            for future in as_completed(futures):
+                chunk_index = futures[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    response = ChunkResponse(0, error=str(e))
+                    self._abort.set()
+
+                if response is None:
+                    continue
+                if 200 <= response.status < 300:
+                    acked.add(chunk_index)
+                    chunk_results = response.payload.get('results', {})
+                    for key in results:
+                        results[key] += chunk_results.get(key, 0)
+                    if on_ack:
+                        on_ack(chunk_index, chunk_results)
+                elif error is None:
+                    error = response.error or f'HTTP {response.status} error'
+                    self.logger.warning("Chunk %s failed: %s", chunk_index, error)
+
+        return {
+            'acked': acked,
+            'results': results,
+            'error': error,
+            'stopped': self._stop.is_set()
+        }
+
+    def _upload_one(self, chunk_index: int, items: List[Any]) -> Optional[ChunkResponse]:
+        """Send one chunk, retrying throttling and network errors; None if cancelled"""
+        idempotency_key = chunk_idempotency_key(self.upload_id, chunk_index)
+        failures = throttles = 0
+        backoff = 1.0
+
+        while True:
+            if self._abort.is_set() or not self.limiter.acquire(self._stop) or self._abort.is_set():
+                return None
+
+            started = time.monotonic()
+            response = self.send_chunk(chunk_index, items, idempotency_key)
+
+            if 200 <= response.status < 300:
+                self.limiter.on_success(time.monotonic() - started)
+                return response
+
+            if response.status in (429, 503) and throttles < MAX_THROTTLE_RETRIES:
+                throttles += 1
+                self.logger.debug("Chunk %s throttled (HTTP %s), retry after %s",
+                                  chunk_index, response.status, response.retry_after)
+                self.limiter.on_throttle(response.retry_after)
+                continue
+
+            if (response.status == 0 or response.status >= 500) and failures + 1 < MAX_CHUNK_ATTEMPTS:
+                failures += 1
+                self.logger.debug("Chunk %s attempt %s failed: %s", chunk_index, failures, response.error)
+                if self._stop.wait(backoff):
+                    return None
+                backoff = min(backoff * 2, 30.0)
+                continue
+
+            # Other 4xx, or retries exhausted: the upload can only be resumed later
+            break
+
+        self._abort.set()
+        return response
+
+
+def ids_digest(imdb_ids: List[str]) -> str:
+    """Digest of the ordered upload list; chunk boundaries depend on the order"""
+    return hashlib.sha1('\n'.join(imdb_ids).encode('utf-8')).hexdigest()
+
+
+class UploadCheckpoints:
+    """Upload sessions in progress, so an interrupted upload resumes where it stopped
+
+    One row per upload in ai_upload_session, holding what is needed to rebuild
+    the same chunks (mode, chunk size and a digest of the ordered ID list) and
+    the chunk indexes the server acknowledged.
+    """
+
+    def __init__(self):
+        self.logger = get_kodi_logger('lib.remote.chunk_uploader')
+        self.conn_manager = get_connection_manager()
+
+    def find(self, mode: str, digest: str, server_url: str) -> Optional[Dict[str, Any]]:
+        row = self.conn_manager.execute_single("""
+            SELECT upload_id, chunk_size, acked_chunks
+            FROM ai_upload_session
+            WHERE mode = ? AND ids_digest = ? AND server_url = ?
+            ORDER BY created_at DESC
+            LIMIT 1
+        """, [mode, digest, server_url])
+        if not row:
+            return None
+        try:
+            acked = set(json.loads(row['acked_chunks'] or '[]'))
+        except ValueError:
+            acked = set()
+        return {'upload_id': row['upload_id'], 'chunk_size': row['chunk_size'], 'acked': acked}
+
+    def begin(self, upload_id: str, mode: str, chunk_size: int, digest: str, server_url: str):
+        with self.conn_manager.transaction() as conn:
+            # Only the latest upload can be resumed
+            conn.execute("DELETE FROM ai_upload_session")
+            conn.execute("""
+                INSERT INTO ai_upload_session (upload_id, mode, chunk_size, ids_digest, server_url, acked_chunks, created_at)
+                VALUES (?, ?, ?, ?, ?, '[]', ?)
+            """, (upload_id, mode, chunk_size, digest, server_url, datetime.now().isoformat()))
+
+    def save_acked(self, upload_id: str, acked: Set[int]):
+        with self.conn_manager.transaction() as conn:
+            conn.execute("UPDATE ai_upload_session SET acked_chunks = ? WHERE upload_id = ?",
+                         (json.dumps(sorted(acked)), upload_id))
+
+    def finish(self, upload_id: str):
+        with self.conn_manager.transaction() as conn:
+            conn.execute("DELETE FROM ai_upload_session WHERE upload_id = ?", (upload_id,))
+
+
+# Global upload checkpoints instance
+_upload_checkpoints_instance = None
+
+
+def get_upload_checkpoints():
+    """Get global upload checkpoints instance"""
+    global _upload_checkpoints_instance
+    if _upload_checkpoints_instance is None:
+        _upload_checkpoints_instance = UploadCheckpoints()
+    return _upload_checkpoints_instance
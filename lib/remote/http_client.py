@@ -8,12 +8,21 @@ Safe HTTP client wrapper with timeouts, retries, and error handling
 
 import json
 import time
+import http.client
 from typing import Dict, Any, Optional
 from urllib.parse import urljoin, urlencode
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
 from lib.utils.kodi_log import get_kodi_logger
 from lib.config.settings import get_phase12_remote_settings
+from lib.remote.http_session import get_http_session
+
+
+class RemoteHTTPError(Exception):
+    """Non-success HTTP status returned by the remote service"""
+
+    def __init__(self, code: int, reason: str):
+        super().__init__(f"HTTP Error {code}: {reason}")
+        self.code = code
+        self.reason = reason
 
 
 class RemoteHTTPClient:
@@ -172,30 +181,35 @@ class RemoteHTTPClient:
             url += '?' + urlencode(params)
         
         # Prepare request
-        request = Request(url)
-        request.add_header('User-Agent', 'LibraryGenie/1.0')
-        request.add_header('Accept', 'application/json')
+        headers = {
+            'User-Agent': 'LibraryGenie/1.0',
+            'Accept': 'application/json'
+        }
         
         # Add authentication if available
         if self.api_key:
-            request.add_header('Authorization', f'Bearer {self.api_key}')
+            headers['Authorization'] = f'Bearer {self.api_key}'
         
         # Add request body for POST/PUT
+        body = None
         if data:
-            request.add_header('Content-Type', 'application/json')
-            request.data = json.dumps(data).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+            body = json.dumps(data).encode('utf-8')
         
         if self.log_requests:
             self.logger.debug("Remote request: %s %s", method, url)
         
-        # Make request with retries
+        # Make request with retries over the shared keep-alive session
+        session = get_http_session()
         last_error = None
         start_time = time.time()
         
         for attempt in range(self.retry_count + 1):
             try:
-                with urlopen(request, timeout=self.timeout) as response:
-                    response_data = response.read().decode('utf-8')
+                response = session.request(method, url, body, headers, timeout=self.timeout)
+                
+                if response.status < 400:
+                    response_data = response.text()
                     
                     # Parse JSON response
                     try:
@@ -211,15 +225,14 @@ class RemoteHTTPClient:
                         self.logger.debug("Remote response: %s (%sms)", response.status, result.get('_response_time_ms'))
                     
                     return result
-                    
-            except HTTPError as e:
-                last_error = e
-                if e.code >= 400 and e.code < 500:
+                
+                last_error = RemoteHTTPError(response.status, response.reason)
+                if response.status < 500:
                     # Client error - don't retry
                     break
-                self.logger.warning("HTTP error on attempt %s: %s", attempt + 1, e)
+                self.logger.warning("HTTP error on attempt %s: %s", attempt + 1, last_error)
                 
-            except (URLError, OSError) as e:
+            except (OSError, http.client.HTTPException) as e:
                 last_error = e
                 self.logger.warning("Network error on attempt %s: %s", attempt + 1, e)
                 
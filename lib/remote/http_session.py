@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - HTTP Session
+Shared keep-alive HTTP(S) connections with gzip support for the remote API clients
+"""
+
+import gzip
+import json
+import ssl
+import threading
+import time
+import http.client
+import urllib.parse
+from typing import Dict, Any, Optional, Tuple, List
+
+from lib.utils.kodi_log import get_kodi_logger
+
+
+# Idle connections older than this are closed instead of reused; servers and
+# proxies commonly drop keep-alive connections after 30-60 seconds
+IDLE_TIMEOUT_SECONDS = 30
+MAX_IDLE_PER_HOST = 4
+# Request bodies smaller than this are sent uncompressed
+GZIP_MIN_BODY_BYTES = 1024
+# 4xx answers to a gzip request body that are not about the body itself;
+# anything else is retried uncompressed in case the server ignored Content-Encoding
+_NOT_ENCODING_ERRORS = (401, 403, 404, 405, 408, 409, 429)
+
+# Raised when a reused keep-alive connection turns out to be closed by the server
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class HTTPResponse:
+    """Fully read HTTP response with the body already decompressed"""
+
+    def __init__(self, status: int, reason: str, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode('utf-8')) if self.body else None
+
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+
+class HTTPSession:
+    """Per-host pool of keep-alive connections
+
+    Connections are checked out for the duration of one request, so the session
+    can be shared between threads. Responses are requested with gzip and
+    decompressed transparently; request bodies are gzip-compressed when the
+    caller asks for it, until the host rejects a compressed body: 415
+    Unsupported Media Type, or another 4xx (e.g. a 400 or 422 from a server
+    that parsed the gzip bytes as JSON) that the same body sent uncompressed
+    does not get.
+    """
+
+    def __init__(self):
+        self.logger = get_kodi_logger('lib.remote.http_session')
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._gzip_rejected = set()
+        self._ssl_context = None
+        self.stats = {
+            'requests': 0,
+            'connections_opened': 0,
+            'connections_reused': 0,
+            'body_bytes_sent': 0,
+            'body_bytes_received': 0,
+            'body_bytes_decoded': 0,
+        }
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+                compress: bool = False) -> HTTPResponse:
+        """Send a request and read the complete response
+
+        Args:
+            method: HTTP method
+            url: Absolute http:// or https:// URL
+            body: Request body
+            headers: Request headers
+            timeout: Socket timeout in seconds
+            compress: gzip the request body (if large enough and the host accepts it)
+
+        Returns:
+            HTTPResponse for any status code
+
+        Raises:
+            OSError or http.client.HTTPException on network failures
+        """
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme}")
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        request_headers = {'Accept-Encoding': 'gzip'}
+        if headers:
+            request_headers.update(headers)
+
+        payload = body
+        compressed = (compress and body is not None and len(body) >= GZIP_MIN_BODY_BYTES
+                      and key not in self._gzip_rejected)
+        if compressed:
+            payload = gzip.compress(body)
+            request_headers['Content-Encoding'] = 'gzip'
+
+        response = self._send(key, method, path, payload, request_headers, timeout)
+
+        if compressed and 400 <= response.status < 500 and response.status not in _NOT_ENCODING_ERRORS:
+            del request_headers['Content-Encoding']
+            compressed_status = response.status
+            response = self._send(key, method, path, body, request_headers, timeout)
+            if compressed_status == 415 or response.status < 400:
+                self.logger.info("%s does not accept gzip request bodies (HTTP %s), sending uncompressed",
+                                 parts.hostname, compressed_status)
+                with self._lock:
+                    self._gzip_rejected.add(key)
+
+        return response
+
+    def _send(self, key: Tuple[str, str, int], method: str, path: str, payload: Optional[bytes],
+              headers: Dict[str, str], timeout: float) -> HTTPResponse:
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                raw = conn.getresponse()
+                data = raw.read()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused:
+                    # The server closed the idle connection before our request reached it
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            break
+
+        response_headers = {name.lower(): value for name, value in raw.getheaders()}
+        encoded_size = len(data)
+        if response_headers.get('content-encoding', '').lower() == 'gzip':
+            data = gzip.decompress(data)
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['body_bytes_sent'] += len(payload or b'')
+            self.stats['body_bytes_received'] += encoded_size
+            self.stats['body_bytes_decoded'] += len(data)
+
+        if raw.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        return HTTPResponse(raw.status, raw.reason, response_headers, data)
+
+    def _acquire(self, key: Tuple[str, str, int], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """Get an idle connection for the host, or open a new one"""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, released_at = idle.pop()
+                if now - released_at < IDLE_TIMEOUT_SECONDS:
+                    self.stats['connections_reused'] += 1
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+            self.stats['connections_opened'] += 1
+
+        scheme, host, port = key
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < MAX_IDLE_PER_HOST:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def close_idle(self):
+        """Close all pooled connections (e.g. when a sync run is finished)"""
+        with self._lock:
+            pools = list(self._idle.values())
+            self._idle = {}
+        for idle in pools:
+            for conn, _ in idle:
+                conn.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+
+# Global HTTP session instance
+_http_session_instance = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> HTTPSession:
+    """Get global HTTP session instance"""
+    global _http_session_instance
+    if _http_session_instance is None:
+        with _http_session_lock:
+            if _http_session_instance is None:
+                _http_session_instance = HTTPSession()
+    return _http_session_instance
@@ -13,6 +13,14 @@ from lib.utils.kodi_log import get_kodi_logger
 from lib.data.connection_manager import get_connection_manager
 
 
+# Local fields merged into mapped results (artwork is in the art JSON column)
+LOCAL_COLUMNS = ("kodi_id, title, year, imdbnumber as imdb_id, tmdb_id, play as file_path, "
+                 "art, plot, rating, genre, director, duration as runtime")
+
+# Stay below SQLite's default host parameter limit (999 before 3.32)
+MAX_IN_PARAMS = 900
+
+
 class RemoteMapper:
     """Maps remote items to local library using various strategies"""
     
@@ -58,9 +66,8 @@ class RemoteMapper:
             # Check for IMDb ID
             imdb_id = self._extract_imdb_id(remote_item)
             if imdb_id:
-                result = self.conn_manager.execute_single("""
-                    SELECT kodi_id, title, year, imdbnumber as imdb_id, tmdb_id, play as file_path,
-                           poster, fanart, plot, rating, genre, director, duration as runtime
+                result = self.conn_manager.execute_single(f"""
+                    SELECT {LOCAL_COLUMNS}
                     FROM media_items 
                     WHERE imdbnumber = ? AND media_type = 'movie' AND is_removed = 0
                 """, [imdb_id])
@@ -71,9 +78,8 @@ class RemoteMapper:
             # Check for TMDb ID
             tmdb_id = self._extract_tmdb_id(remote_item)
             if tmdb_id:
-                result = self.conn_manager.execute_single("""
-                    SELECT kodi_id, title, year, imdbnumber as imdb_id, tmdb_id, play as file_path,
-                           poster, fanart, plot, rating, genre, director, duration as runtime
+                result = self.conn_manager.execute_single(f"""
+                    SELECT {LOCAL_COLUMNS}
                     FROM media_items 
                     WHERE tmdb_id = ? AND media_type = 'movie' AND is_removed = 0
                 """, [tmdb_id])
@@ -98,9 +104,8 @@ class RemoteMapper:
             
             # Try exact match with year
             if year:
-                result = self.conn_manager.execute_single("""
-                    SELECT kodi_id, title, year, imdbnumber as imdb_id, tmdb_id, play as file_path,
-                           poster, fanart, plot, rating, genre, director, duration as runtime
+                result = self.conn_manager.execute_single(f"""
+                    SELECT {LOCAL_COLUMNS}
                     FROM media_items 
                     WHERE LOWER(title) = LOWER(?) AND year = ? AND media_type = 'movie' AND is_removed = 0
                 """, [title, year])
@@ -109,9 +114,8 @@ class RemoteMapper:
                     return dict(result)
             
             # Try exact match without year
-            result = self.conn_manager.execute_single("""
-                SELECT kodi_id, title, year, imdbnumber as imdb_id, tmdb_id, play as file_path,
-                       poster, fanart, plot, rating, genre, director, duration as runtime
+            result = self.conn_manager.execute_single(f"""
+                SELECT {LOCAL_COLUMNS}
                 FROM media_items 
                 WHERE LOWER(title) = LOWER(?) AND media_type = 'movie' AND is_removed = 0
                 ORDER BY year DESC
@@ -139,9 +143,8 @@ class RemoteMapper:
             clean_title = self._clean_title_for_path(title)
             
             # Search for files that might contain this title
-            result = self.conn_manager.execute_single("""
-                SELECT kodi_id, title, year, imdbnumber as imdb_id, tmdb_id, play as file_path,
-                       poster, fanart, plot, rating, genre, director, duration as runtime
+            result = self.conn_manager.execute_single(f"""
+                SELECT {LOCAL_COLUMNS}
                 FROM media_items 
                 WHERE LOWER(play) LIKE LOWER(?) AND media_type = 'movie' AND is_removed = 0
                 ORDER BY LENGTH(play) ASC
@@ -223,24 +226,130 @@ class RemoteMapper:
         return ' '.join(significant_words) if significant_words else title
     
     def bulk_map_results(self, remote_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Map multiple remote items efficiently"""
+        """
+        Map multiple remote items with a handful of set-based queries
+
+        IMDb and TMDb IDs are each resolved with one IN query; items left over
+        are matched on normalized title + year against an index built from one
+        query for their titles. The title+path heuristic of map_to_local is not
+        used here, as it needs a LIKE scan per item.
+
+        Returns the items in input order, each with '_mapped' set
+        """
+        if not remote_items:
+            return []
+
+        try:
+            local_rows: List[Optional[Dict[str, Any]]] = [None] * len(remote_items)
+
+            imdb_ids = [self._extract_imdb_id(item) for item in remote_items]
+            by_imdb = self._fetch_by_column('imdbnumber', {i for i in imdb_ids if i})
+            for index, imdb_id in enumerate(imdb_ids):
+                if imdb_id:
+                    local_rows[index] = by_imdb.get(imdb_id)
+
+            pending = [index for index, row in enumerate(local_rows) if row is None]
+            tmdb_ids = {index: self._extract_tmdb_id(remote_items[index]) for index in pending}
+            by_tmdb = self._fetch_by_column('tmdb_id', {t for t in tmdb_ids.values() if t})
+            for index, tmdb_id in tmdb_ids.items():
+                if tmdb_id:
+                    local_rows[index] = by_tmdb.get(tmdb_id)
+
+            pending = [index for index, row in enumerate(local_rows) if row is None]
+            titles = {index: remote_items[index].get('title') for index in pending}
+            titles = {index: title.strip() for index, title in titles.items()
+                      if isinstance(title, str) and title.strip()}
+            title_year_index, title_index = self._build_title_index(set(titles.values()))
+            for index, title in titles.items():
+                title = self._normalize_title(title)
+                year = self._normalize_year(remote_items[index].get('year'))
+                local_rows[index] = title_year_index.get((title, year)) if year else None
+                if local_rows[index] is None:
+                    local_rows[index] = title_index.get(title)
+
+        except Exception as e:
+            self.logger.error("Error in bulk mapping: %s", e)
+            local_rows = [None] * len(remote_items)
+
         mapped_results = []
-        
-        for item in remote_items:
-            mapped = self.map_to_local(item)
-            if mapped:
+        for item, local in zip(remote_items, local_rows):
+            if local:
                 # Combine remote and local data
                 enhanced_item = {**item}
-                enhanced_item.update(mapped)
+                enhanced_item.update(local)
                 enhanced_item['_mapped'] = True
                 mapped_results.append(enhanced_item)
             else:
                 # Mark as unmapped
                 item['_mapped'] = False
                 mapped_results.append(item)
-        
+
+        self.logger.debug("Bulk mapped %s of %s remote items",
+                          sum(1 for row in local_rows if row), len(remote_items))
         return mapped_results
 
+    def _fetch_by_column(self, column: str, values: set) -> Dict[str, Dict[str, Any]]:
+        """Movies whose column value is in values, keyed by that value
+
+        Library rows win over other sources when a value occurs more than once.
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        values = list(values)
+        for offset in range(0, len(values), MAX_IN_PARAMS):
+            batch = values[offset:offset + MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn_manager.execute_query(f"""
+                SELECT {LOCAL_COLUMNS}, {column} AS match_key
+                FROM media_items
+                WHERE {column} IN ({placeholders}) AND media_type = 'movie' AND is_removed = 0
+                ORDER BY (source = 'lib') DESC, id
+            """, batch)
+            for row in rows:
+                found.setdefault(row['match_key'], self._local_row(row))
+        return found
+
+    def _build_title_index(self, titles: set):
+        """Hash indexes, keyed by normalized title, over the movies carrying one of the titles
+
+        Returns ({(title, year): row}, {title: row of the latest year})
+        """
+        title_year_index: Dict[tuple, Dict[str, Any]] = {}
+        title_index: Dict[str, Dict[str, Any]] = {}
+        titles = list(titles)
+        for offset in range(0, len(titles), MAX_IN_PARAMS):
+            batch = titles[offset:offset + MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(batch))
+            # title COLLATE NOCASE uses idx_media_items_title; LOWER(title) would scan
+            rows = self.conn_manager.execute_query(f"""
+                SELECT {LOCAL_COLUMNS}
+                FROM media_items
+                WHERE title COLLATE NOCASE IN ({placeholders}) AND media_type = 'movie' AND is_removed = 0
+                ORDER BY year DESC, id
+            """, batch)
+            for row in rows:
+                local = self._local_row(row)
+                title = self._normalize_title(local['title'])
+                title_year_index.setdefault((title, self._normalize_year(local['year'])), local)
+                title_index.setdefault(title, local)
+        return title_year_index, title_index
+
+    def _local_row(self, row) -> Dict[str, Any]:
+        local = dict(row)
+        local.pop('match_key', None)
+        return local
+
+    def _normalize_title(self, title: Any) -> Optional[str]:
+        """Trimmed, lower-cased title for the in-memory title index"""
+        if not title or not isinstance(title, str):
+            return None
+        return title.strip().lower() or None
+
+    def _normalize_year(self, year: Any) -> Optional[int]:
+        try:
+            return int(year) if year else None
+        except (TypeError, ValueError):
+            return None
+
 
 def get_remote_mapper():
     """Get global remote mapper instance"""
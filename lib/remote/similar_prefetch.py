@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Similar Movies Prefetch
+Fetches AI similar-movie results in the background for movies the user just
+finished watching, so Find Similar on them is answered from the remote cache
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from lib.utils.kodi_log import get_kodi_logger
+from lib.remote.cache import get_remote_cache
+from lib.remote.chunk_uploader import AdaptiveRateLimiter
+
+
+# Movies waiting to be prefetched; the oldest is dropped when full
+MAX_PENDING = 20
+# At most one similar_to request per this many seconds
+PREFETCH_INTERVAL_SECONDS = 30.0
+# Recheck interval while a video is playing
+PLAYBACK_POLL_SECONDS = 15.0
+# Facet selection prefetched until the user has picked one in Find Similar
+DEFAULT_FACETS = {'plot': True, 'mood': True, 'themes': True, 'genre': True}
+LAST_FACETS_KEY = 'similar:last_facets'
+LAST_FACETS_TTL_HOURS = 24 * 90
+
+
+def remember_facets(facets: Dict[str, bool]):
+    """Record the facet selection last used in Find Similar, for later prefetches"""
+    get_remote_cache().set(LAST_FACETS_KEY, {name: bool(enabled) for name, enabled in facets.items()},
+                           ttl_hours=LAST_FACETS_TTL_HOURS)
+
+
+def preferred_facets() -> Dict[str, bool]:
+    """Facet selection to prefetch: the last one used, else all facets"""
+    facets = get_remote_cache().get(LAST_FACETS_KEY)
+    if isinstance(facets, dict) and any(facets.values()):
+        return dict(facets)
+    return dict(DEFAULT_FACETS)
+
+
+class SimilarPrefetcher:
+    """Queue of recently watched movies and the worker that prefetches them
+
+    The service feeds it from Player.OnStop/OnAVEnd. The worker thread waits
+    while anything is playing and paces its requests through a token bucket
+    (backing off when a request fails), so prefetching never competes with
+    playback or floods the server.
+    """
+
+    def __init__(self):
+        self.logger = get_kodi_logger('lib.remote.similar_prefetch')
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._pending: "OrderedDict[str, None]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        rate = 1.0 / PREFETCH_INTERVAL_SECONDS
+        self.limiter = AdaptiveRateLimiter(rate=rate, burst=1, min_rate=rate / 10.0, max_rate=rate)
+        self.stats = {'queued': 0, 'fetched': 0, 'cached': 0, 'failed': 0}
+
+    def on_playback_ended(self, data: Optional[str]):
+        """Handle the JSON payload of a Player.OnStop/OnAVEnd notification"""
+        try:
+            payload = json.loads(data) if data else {}
+        except ValueError:
+            return
+        item = payload.get('item') or {}
+        if item.get('type') != 'movie' or not item.get('id'):
+            return
+
+        imdb_id = self._imdb_id_for_kodi_movie(item['id'])
+        if imdb_id:
+            self.enqueue(imdb_id)
+
+    def enqueue(self, imdb_id: str):
+        """Queue a movie for prefetching and make sure the worker runs"""
+        with self._lock:
+            self._pending.pop(imdb_id, None)
+            self._pending[imdb_id] = None
+            while len(self._pending) > MAX_PENDING:
+                self._pending.popitem(last=False)
+            self.stats['queued'] += 1
+
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='LibraryGenie-SimilarPrefetch',
+                                                daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+    def _run(self):
+        from lib.remote.ai_search_client import get_ai_search_client
+        client = get_ai_search_client()
+
+        while not self._stop.is_set():
+            imdb_id = self._next_pending()
+            if imdb_id is None:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            if not self._wait_for_idle() or not self.limiter.acquire(self._stop):
+                return
+            if not client.is_activated():
+                continue
+
+            facets = preferred_facets()
+            if client.get_cached_similar(imdb_id, facets) is not None:
+                self.stats['cached'] += 1
+                continue
+
+            if client.search_similar_movies(imdb_id, facets) is None:
+                self.stats['failed'] += 1
+                self.limiter.on_throttle(None)
+                self.logger.debug("Similar movies prefetch failed for %s", imdb_id)
+            else:
+                self.stats['fetched'] += 1
+                self.limiter.on_success(0.0)
+                self.logger.debug("Prefetched similar movies for %s", imdb_id)
+
+    def _next_pending(self) -> Optional[str]:
+        """Most recently watched movie first"""
+        with self._lock:
+            if not self._pending:
+                return None
+            imdb_id, _ = self._pending.popitem(last=True)
+            return imdb_id
+
+    def _wait_for_idle(self) -> bool:
+        """Wait until nothing is playing; False if stopped meanwhile"""
+        import xbmc
+        player = xbmc.Player()
+        while player.isPlaying():
+            if self._stop.wait(PLAYBACK_POLL_SECONDS):
+                return False
+        return not self._stop.is_set()
+
+    def _imdb_id_for_kodi_movie(self, kodi_id: int) -> Optional[str]:
+        try:
+            from lib.data.connection_manager import get_connection_manager
+            row = get_connection_manager().execute_single("""
+                SELECT imdbnumber FROM media_items
+                WHERE kodi_id = ? AND media_type = 'movie' AND imdbnumber LIKE 'tt%'
+                LIMIT 1
+            """, [kodi_id])
+            return row['imdbnumber'] if row else None
+        except Exception as e:
+            self.logger.debug("Could not look up IMDb ID for movie %s: %s", kodi_id, e)
+            return None
+
+
+# Global similar movies prefetcher instance
+_similar_prefetcher_instance = None
+_similar_prefetcher_lock = threading.Lock()
+
+
+def get_similar_prefetcher():
+    """Get global similar movies prefetcher instance"""
+    global _similar_prefetcher_instance
+    if _similar_prefetcher_instance is None:
+        with _similar_prefetcher_lock:
+            if _similar_prefetcher_instance is None:
+                _similar_prefetcher_instance = SimilarPrefetcher()
+    return _similar_prefetcher_instance
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - AI Sync Manifest
+Local record of the IMDb IDs committed to the AI search server, used for delta sync
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, Optional, Iterable, Set
+
+from lib.data.connection_manager import get_connection_manager
+from lib.utils.kodi_log import get_kodi_logger
+
+
+def imdb_fingerprint(imdb_id: str) -> int:
+    """64-bit fingerprint of one IMDb ID"""
+    return int(hashlib.sha1(imdb_id.encode('utf-8')).hexdigest()[:16], 16)
+
+
+def rolling_hash(imdb_ids: Iterable[str], start: int = 0) -> int:
+    """XOR of the ID fingerprints: order independent, and an ID is added or
+    removed by XOR-ing its fingerprint again"""
+    value = start
+    for imdb_id in imdb_ids:
+        value ^= imdb_fingerprint(imdb_id)
+    return value
+
+
+def server_signature(library_hash: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Condense a library/hash response into a comparable string
+
+    The server reports its collection as a count plus per-movie fingerprints; the
+    fingerprint scheme is the server's, so it is only compared with what the
+    server reported right after our last commit, never recomputed locally.
+    """
+    if not library_hash or not library_hash.get('success'):
+        return None
+    fingerprints = library_hash.get('fingerprints')
+    if fingerprints is not None:
+        digest = hashlib.sha1('\n'.join(sorted(str(f) for f in fingerprints)).encode('utf-8')).hexdigest()
+    elif library_hash.get('hash'):
+        digest = str(library_hash['hash'])
+    else:
+        return None
+    return f"{library_hash.get('count', 0)}:{digest}"
+
+
+class AISyncManifest:
+    """IMDb IDs known to be on the server after the last successful commit
+
+    The ID set lives in ai_sync_manifest; sync_state holds its rolling hash
+    (local_snapshot), the server signature seen after that commit
+    (server_version) and the server it belongs to (server_url).
+    """
+
+    def __init__(self):
+        self.logger = get_kodi_logger('lib.remote.sync_manifest')
+        self.conn_manager = get_connection_manager()
+
+    def get_synced_ids(self) -> Set[str]:
+        rows = self.conn_manager.execute_query("SELECT imdb_id FROM ai_sync_manifest") or []
+        return {row['imdb_id'] for row in rows}
+
+    def get_state(self) -> Optional[Dict[str, Any]]:
+        row = self.conn_manager.execute_single("""
+            SELECT local_snapshot, server_version, server_url, last_sync_at
+            FROM sync_state
+            ORDER BY id DESC
+            LIMIT 1
+        """)
+        if not row:
+            return None
+        return dict(row)
+
+    def get_trusted_ids(self, signature: Optional[str], server_url: str) -> Optional[Set[str]]:
+        """Get the manifest IDs if they still describe the server's collection
+
+        Returns None when there is no manifest, it belongs to another server,
+        the server changed since our last commit (signature mismatch), or the
+        stored rolling hash does not match the stored IDs.
+        """
+        state = self.get_state()
+        if not state or not signature:
+            return None
+        if state.get('server_url') != server_url or state.get('server_version') != signature:
+            self.logger.info("AI sync manifest does not match the server collection")
+            return None
+
+        synced_ids = self.get_synced_ids()
+        if f"{rolling_hash(synced_ids):016x}" != state.get('local_snapshot'):
+            self.logger.warning("AI sync manifest is inconsistent with its rolling hash")
+            return None
+        return synced_ids
+
+    def record_commit(self, imdb_ids: Set[str], signature: Optional[str], server_url: str):
+        """Store the ID set now on the server
+
+        Pass signature=None when the server may hold IDs we did not upload (merge
+        into an unknown collection); the next delta sync then starts with a
+        replace sync.
+        """
+        synced_ids = self.get_synced_ids()
+        additions = imdb_ids - synced_ids
+        removals = synced_ids - imdb_ids
+        state = self.get_state()
+        try:
+            previous_hash = int(state['local_snapshot'], 16) if state and state.get('local_snapshot') else 0
+        except ValueError:
+            previous_hash = rolling_hash(synced_ids)
+        new_hash = rolling_hash(additions, rolling_hash(removals, previous_hash))
+
+        with self.conn_manager.transaction() as conn:
+            if removals:
+                conn.executemany("DELETE FROM ai_sync_manifest WHERE imdb_id = ?", [(i,) for i in removals])
+            if additions:
+                conn.executemany("INSERT OR IGNORE INTO ai_sync_manifest (imdb_id) VALUES (?)",
+                                 [(i,) for i in additions])
+            conn.execute("DELETE FROM sync_state")
+            conn.execute("""
+                INSERT INTO sync_state (local_snapshot, server_version, server_url, last_sync_at)
+                VALUES (?, ?, ?, ?)
+            """, (f"{new_hash:016x}", signature, server_url, datetime.now().isoformat()))
+
+        self.logger.debug("AI sync manifest updated: +%s -%s, %s IDs", len(additions), len(removals), len(imdb_ids))
+
+    def clear(self):
+        with self.conn_manager.transaction() as conn:
+            conn.execute("DELETE FROM ai_sync_manifest")
+            conn.execute("DELETE FROM sync_state")
+
+
+# Global AI sync manifest instance
+_ai_sync_manifest_instance = None
+
+
+def get_ai_sync_manifest():
+    """Get global AI sync manifest instance"""
+    global _ai_sync_manifest_instance
+    if _ai_sync_manifest_instance is None:
+        _ai_sync_manifest_instance = AISyncManifest()
+    return _ai_sync_manifest_instance
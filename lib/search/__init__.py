@@ -6,17 +6,18 @@ LibraryGenie - Search Module
 Simple keyword-based search across title and plot fields
 """
 
-# Simple search components
-from lib.search.simple_query_interpreter import get_simple_query_interpreter
-from lib.search.simple_search_engine import get_simple_search_engine
-from lib.search.simple_search_query import SimpleSearchQuery
+from lib.utils.lazy_exports import lazy_exports
 
-# Utility classes
-from lib.search.normalizer import get_text_normalizer
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'get_simple_query_interpreter': 'lib.search.simple_query_interpreter',
+    'get_simple_search_engine': 'lib.search.simple_search_engine',
+    'SimpleSearchQuery': 'lib.search.simple_search_query',
+    'get_text_normalizer': 'lib.search.normalizer',
+})
 
 __all__ = [
     'get_simple_query_interpreter',
-    'get_simple_search_engine', 
+    'get_simple_search_engine',
     'SimpleSearchQuery',
-    'get_text_normalizer'
-]
\ No newline at end of file
+    'get_text_normalizer',
+]
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Local Similarity Engine
+Offline "find similar movies" using precomputed hashed TF-IDF vectors over media_items
+"""
+
+from __future__ import annotations
+
+import array
+import heapq
+import json
+import math
+import mmap
+import os
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+
+from lib.data.connection_manager import get_connection_manager
+from lib.data.storage_manager import get_storage_manager
+from lib.search.normalizer import get_text_normalizer
+from lib.utils.kodi_log import get_kodi_logger
+
+# NumPy is optional - Kodi only provides it through script.module.numpy
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on installed Kodi modules
+    np = None
+
+
+# Index format version - bump when vector layout, hashing or the row change key changes
+INDEX_VERSION = 2
+
+# Each facet owns its own block of hashed columns so facet switches can be
+# honoured at query time by slicing columns instead of rebuilding vectors.
+# Facet keys match AISearchHandler._show_facet_selection_dialog.
+FACET_BLOCKS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('plot', ('plot',)),
+    ('mood', ('genre', 'studio')),
+    ('themes', ('director', 'writer')),
+    ('genre', ('genre', 'decade')),
+)
+BLOCK_DIMS = 128
+TOTAL_DIMS = BLOCK_DIMS * len(FACET_BLOCKS)
+
+# Plot keywords kept per movie (highest term frequency first)
+MAX_PLOT_KEYWORDS = 24
+
+# Full rebuild instead of incremental update once this share of rows changed,
+# since document frequencies drift and old rows would use stale IDF weights
+FULL_REBUILD_CHANGE_RATIO = 0.2
+
+_PLOT_STOPWORDS = frozenset("""
+a about after again against all also an and any are as at be because been before being between both but by
+can could did do does during each few for from further had has have having he her here hers him his how i if
+in into is it its itself just me more most my no nor not now of off on once only or other our out over own
+same she should so some such than that the their them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your yours one two
+new life man woman young old find finds must becomes get gets takes world story film movie
+""".split())
+
+
+class LocalSimilarityEngine:
+    """Builds, stores and queries a memory-mapped float32 similarity matrix"""
+
+    MATRIX_FILENAME = "librarygenie_similarity.f32"
+    INDEX_FILENAME = "librarygenie_similarity.json"
+
+    def __init__(self):
+        self.logger = get_kodi_logger('lib.search.local_similarity')
+        self.conn_manager = get_connection_manager()
+        self.storage_manager = get_storage_manager()
+        self.normalizer = get_text_normalizer()
+
+        # Loaded state (lazy)
+        self._index: Optional[Dict[str, Any]] = None
+        self._index_mtime: float = 0.0
+        self._row_by_imdb: Dict[str, int] = {}
+        self._matrix = None        # numpy memmap (n, TOTAL_DIMS) or flat memoryview
+        self._block_norms = None   # numpy memmap (n, blocks) or flat memoryview
+        self._mmap_handle = None
+        self._file_handle = None
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _get_matrix_path(self) -> str:
+        """Matrix file lives next to the database"""
+        db_dir = os.path.dirname(self.storage_manager.get_database_path())
+        return os.path.join(db_dir, self.MATRIX_FILENAME)
+
+    def _get_index_path(self) -> str:
+        db_dir = os.path.dirname(self.storage_manager.get_database_path())
+        return os.path.join(db_dir, self.INDEX_FILENAME)
+
+    # ------------------------------------------------------------------
+    # Feature extraction
+    # ------------------------------------------------------------------
+
+    def _split_people_field(self, value: Any) -> List[str]:
+        """Split genre/director/writer/studio values stored as JSON list or delimited string"""
+        if not value:
+            return []
+        if isinstance(value, str):
+            text = value.strip()
+            if text.startswith('['):
+                try:
+                    value = json.loads(text)
+                except ValueError:
+                    value = text
+            else:
+                value = text
+        if isinstance(value, list):
+            parts = value
+        else:
+            parts = str(value).replace(' / ', ',').replace('/', ',').split(',')
+        return [self.normalizer.normalize(str(p)) for p in parts if p and str(p).strip()]
+
+    def _plot_keywords(self, plot: Optional[str]) -> List[str]:
+        """Extract the most frequent meaningful plot tokens"""
+        if not plot:
+            return []
+        counts: Dict[str, int] = {}
+        for token in self.normalizer.normalize_tokens(plot):
+            if len(token) < 3 or token in _PLOT_STOPWORDS or token.isdigit():
+                continue
+            counts[token] = counts.get(token, 0) + 1
+        ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [token for token, _ in ranked[:MAX_PLOT_KEYWORDS]]
+
+    def _extract_field_terms(self, row: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Extract normalized terms per source field"""
+        year = row.get('year') or 0
+        decade = [f"{(int(year) // 10) * 10}s"] if year and int(year) > 0 else []
+        return {
+            'genre': self._split_people_field(row.get('genre')),
+            'director': self._split_people_field(row.get('director')),
+            'writer': self._split_people_field(row.get('writer')),
+            'studio': self._split_people_field(row.get('studio')),
+            'decade': decade,
+            'plot': self._plot_keywords(row.get('plot')),
+        }
+
+    def _hashed_features(self, field_terms: Dict[str, List[str]]) -> Dict[int, float]:
+        """Map field terms to hashed column counts, one column block per facet"""
+        features: Dict[int, float] = {}
+        for block_index, (_, fields) in enumerate(FACET_BLOCKS):
+            offset = block_index * BLOCK_DIMS
+            for field in fields:
+                for term in field_terms.get(field, ()):
+                    # crc32 is stable across interpreter runs (unlike hash())
+                    column = offset + (zlib.crc32(f"{field}:{term}".encode('utf-8')) % BLOCK_DIMS)
+                    features[column] = features.get(column, 0.0) + 1.0
+        return features
+
+    def _weight_features(self, features: Dict[int, float], df: List[int], doc_count: int) -> Dict[int, float]:
+        """Apply sublinear TF and smoothed IDF weighting"""
+        weighted = {}
+        for column, tf in features.items():
+            idf = math.log((1.0 + doc_count) / (1.0 + df[column])) + 1.0
+            weighted[column] = (1.0 + math.log(tf)) * idf
+        return weighted
+
+    # ------------------------------------------------------------------
+    # Build / incremental refresh
+    # ------------------------------------------------------------------
+
+    def _fetch_movie_rows(self) -> List[Dict[str, Any]]:
+        rows = self.conn_manager.execute_query("""
+            SELECT id, imdbnumber, year, genre, director, writer, studio, plot,
+                   COALESCE(content_updated_at, created_at) AS content_updated_at
+            FROM media_items
+            WHERE media_type = 'movie' AND source = 'lib' AND is_removed = 0
+              AND imdbnumber IS NOT NULL AND imdbnumber LIKE 'tt%'
+            ORDER BY id
+        """)
+        return [dict(row) for row in rows or []]
+
+    def rebuild(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Build or incrementally refresh the similarity index
+
+        Unchanged rows are copied from the existing matrix; only new or updated
+        movies are re-vectorized. Rows are compared by content_updated_at, which
+        library scans leave alone when a movie is merely seen again. Falls back to a full rebuild when no usable
+        index exists, when forced, or when too many rows changed.
+
+        Returns:
+            Dict with success flag and row/change counts
+        """
+        try:
+            rows = self._fetch_movie_rows()
+            if not rows:
+                self.logger.debug("No movies with IMDb IDs - similarity index not built")
+                self.clear()
+                return {'success': True, 'rows': 0, 'changed': 0, 'mode': 'empty'}
+
+            previous = None if force else self._read_index_file()
+            prev_rows = {}
+            if previous:
+                prev_rows = {entry[0]: (position, entry[2]) for position, entry in enumerate(previous['rows'])}
+
+            changed_ids = set()
+            for row in rows:
+                prev = prev_rows.get(row['id'])
+                if prev is None or prev[1] != row.get('content_updated_at'):
+                    changed_ids.add(row['id'])
+            removed_count = len(set(prev_rows) - {row['id'] for row in rows})
+
+            if previous and not changed_ids and not removed_count:
+                self.logger.debug("Similarity index up to date (%s rows)", len(rows))
+                return {'success': True, 'rows': len(rows), 'changed': 0, 'mode': 'unchanged'}
+
+            change_ratio = (len(changed_ids) + removed_count) / float(len(rows))
+            incremental = bool(previous) and change_ratio <= FULL_REBUILD_CHANGE_RATIO
+
+            if incremental:
+                result = self._build_incremental(rows, previous, prev_rows, changed_ids)
+            else:
+                result = self._build_full(rows)
+
+            self.logger.info("Similarity index %s build: %s rows, %s changed, %s removed",
+                             result['mode'], len(rows), len(changed_ids), removed_count)
+            return result
+
+        except Exception as e:
+            self.logger.error("Error building similarity index: %s", e)
+            return {'success': False, 'error': str(e)}
+
+    def _build_full(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        features_per_row = [self._hashed_features(self._extract_field_terms(row)) for row in rows]
+
+        df = [0] * TOTAL_DIMS
+        for features in features_per_row:
+            for column in features:
+                df[column] += 1
+
+        vectors = [self._weight_features(features, df, len(rows)) for features in features_per_row]
+        self._write_index(rows, vectors, df, len(rows), lambda position: None)
+        return {'success': True, 'rows': len(rows), 'changed': len(rows), 'mode': 'full'}
+
+    def _build_incremental(self, rows: List[Dict[str, Any]], previous: Dict[str, Any],
+                           prev_rows: Dict[int, Tuple[int, Any]], changed_ids: set) -> Dict[str, Any]:
+        # Keep document frequencies consistent: remove contributions of changed/removed
+        # rows (recorded per row in the previous index) and add the new ones
+        df = list(previous['df'])
+        current_ids = {row['id'] for row in rows}
+        for media_id, (position, _) in prev_rows.items():
+            if media_id in changed_ids or media_id not in current_ids:
+                for column in previous['rows'][position][3]:
+                    df[column] -= 1
+
+        new_features = {}
+        for row in rows:
+            if row['id'] in changed_ids:
+                features = self._hashed_features(self._extract_field_terms(row))
+                new_features[row['id']] = features
+                for column in features:
+                    df[column] += 1
+
+        vectors: List[Optional[Dict[int, float]]] = []
+        for row in rows:
+            if row['id'] in new_features:
+                vectors.append(self._weight_features(new_features[row['id']], df, len(rows)))
+            else:
+                vectors.append(None)  # Copied from previous matrix
+
+        self._load()
+        old_matrix = self._matrix
+        old_norms = self._block_norms
+        if old_matrix is None:
+            return self._build_full(rows)
+
+        def copy_row(position):
+            old_position = prev_rows[rows[position]['id']][0]
+            return self._read_row(old_matrix, old_norms, old_position)
+
+        self._write_index(rows, vectors, df, len(rows), copy_row,
+                          row_columns={media_id: sorted(f) for media_id, f in new_features.items()},
+                          previous=previous, prev_rows=prev_rows)
+        return {'success': True, 'rows': len(rows), 'changed': len(changed_ids), 'mode': 'incremental'}
+
+    def _read_row(self, matrix, norms, position: int) -> Tuple[List[float], List[float]]:
+        block_count = len(FACET_BLOCKS)
+        if np is not None and hasattr(matrix, 'shape'):
+            return matrix[position].tolist(), norms[position].tolist()
+        start = position * TOTAL_DIMS
+        norm_start = position * block_count
+        return list(matrix[start:start + TOTAL_DIMS]), list(norms[norm_start:norm_start + block_count])
+
+    def _write_index(self, rows, vectors, df, doc_count, copy_row,
+                     row_columns=None, previous=None, prev_rows=None) -> None:
+        """Write matrix file then index file atomically (matrix first so index never points ahead)"""
+        matrix_path = self._get_matrix_path()
+        index_path = self._get_index_path()
+        block_count = len(FACET_BLOCKS)
+
+        matrix_rows = array.array('f')
+        norm_rows = array.array('f')
+        index_rows = []
+
+        for position, row in enumerate(rows):
+            vector = vectors[position]
+            if vector is None:
+                dense, norms = copy_row(position)
+                columns = previous['rows'][prev_rows[row['id']][0]][3]
+            else:
+                dense = [0.0] * TOTAL_DIMS
+                for column, weight in vector.items():
+                    dense[column] = weight
+                norms = [0.0] * block_count
+                for block_index in range(block_count):
+                    start = block_index * BLOCK_DIMS
+                    norms[block_index] = sum(w * w for w in dense[start:start + BLOCK_DIMS])
+                columns = (row_columns or {}).get(row['id'], sorted(vector))
+            matrix_rows.extend(dense)
+            norm_rows.extend(norms)
+            index_rows.append([row['id'], row.get('imdbnumber'), row.get('content_updated_at'), list(columns)])
+
+        # Release any mapping of the old file before replacing it
+        self._unload()
+
+        tmp_matrix = f"{matrix_path}.tmp"
+        with open(tmp_matrix, 'wb') as f:
+            matrix_rows.tofile(f)
+            norm_rows.tofile(f)
+        os.replace(tmp_matrix, matrix_path)
+
+        index_data = {
+            'version': INDEX_VERSION,
+            'block_dims': BLOCK_DIMS,
+            'facets': [name for name, _ in FACET_BLOCKS],
+            'doc_count': doc_count,
+            'df': df,
+            'rows': index_rows,
+        }
+        tmp_index = f"{index_path}.tmp"
+        with open(tmp_index, 'w', encoding='utf-8') as f:
+            json.dump(index_data, f, separators=(',', ':'))
+        os.replace(tmp_index, index_path)
+
+    def clear(self) -> None:
+        """Remove index files"""
+        self._unload()
+        for path in (self._get_matrix_path(), self._get_index_path()):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                self.logger.warning("Could not remove %s: %s", path, e)
+
+    # ------------------------------------------------------------------
+    # Loading (memory-mapped)
+    # ------------------------------------------------------------------
+
+    def _read_index_file(self) -> Optional[Dict[str, Any]]:
+        index_path = self._get_index_path()
+        if not os.path.exists(index_path) or not os.path.exists(self._get_matrix_path()):
+            return None
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if (data.get('version') != INDEX_VERSION or data.get('block_dims') != BLOCK_DIMS
+                    or data.get('facets') != [name for name, _ in FACET_BLOCKS]):
+                self.logger.debug("Similarity index format changed - full rebuild required")
+                return None
+            return data
+        except (OSError, ValueError) as e:
+            self.logger.warning("Could not read similarity index: %s", e)
+            return None
+
+    def _load(self) -> bool:
+        """Memory-map the matrix file, reloading if it was rebuilt by another process"""
+        index_path = self._get_index_path()
+        try:
+            mtime = os.path.getmtime(index_path)
+        except OSError:
+            self._unload()
+            return False
+
+        if self._index is not None and mtime == self._index_mtime:
+            return True
+
+        self._unload()
+        index = self._read_index_file()
+        if not index or not index['rows']:
+            return False
+
+        row_count = len(index['rows'])
+        block_count = len(FACET_BLOCKS)
+        matrix_path = self._get_matrix_path()
+        expected_bytes = row_count * (TOTAL_DIMS + block_count) * 4
+        if os.path.getsize(matrix_path) != expected_bytes:
+            self.logger.warning("Similarity matrix size mismatch - rebuild required")
+            return False
+
+        if np is not None:
+            self._matrix = np.memmap(matrix_path, dtype=np.float32, mode='r',
+                                     shape=(row_count, TOTAL_DIMS))
+            self._block_norms = np.memmap(matrix_path, dtype=np.float32, mode='r',
+                                          offset=row_count * TOTAL_DIMS * 4,
+                                          shape=(row_count, block_count))
+        else:
+            self._file_handle = open(matrix_path, 'rb')
+            self._mmap_handle = mmap.mmap(self._file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+            flat = memoryview(self._mmap_handle).cast('f')
+            self._matrix = flat[:row_count * TOTAL_DIMS]
+            self._block_norms = flat[row_count * TOTAL_DIMS:]
+
+        self._index = index
+        self._index_mtime = mtime
+        self._row_by_imdb = {entry[1]: position for position, entry in enumerate(index['rows']) if entry[1]}
+        return True
+
+    def _unload(self) -> None:
+        self._index = None
+        self._index_mtime = 0.0
+        self._row_by_imdb = {}
+        if self._matrix is not None and np is None:
+            # memoryviews must be released before the mmap can close
+            try:
+                self._matrix.release()
+                self._block_norms.release()
+            except (AttributeError, ValueError):
+                pass
+        self._matrix = None
+        self._block_norms = None
+        if self._mmap_handle is not None:
+            try:
+                self._mmap_handle.close()
+            except (BufferError, ValueError):
+                pass
+            self._mmap_handle = None
+        if self._file_handle is not None:
+            self._file_handle.close()
+            self._file_handle = None
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def is_available(self) -> bool:
+        """True if an index has been built"""
+        return self._load()
+
+    def has_movie(self, imdb_id: str) -> bool:
+        """True if the movie is part of the index"""
+        return self._load() and imdb_id in self._row_by_imdb
+
+    def find_similar(self, reference_imdb_id: str, facets: Dict[str, bool],
+                     limit: int = 50) -> Optional[List[Dict[str, Any]]]:
+        """
+        Find the top-k most similar library movies by cosine similarity
+
+        Args:
+            reference_imdb_id: IMDb ID of reference movie
+            facets: Dict with keys: plot, mood, themes, genre (all bool)
+            limit: Maximum number of results
+
+        Returns:
+            List of result dicts with imdb_id and score (0.0-1.0), same shape as
+            AISearchClient.search_similar_movies, or None if unavailable
+        """
+        if not reference_imdb_id or not reference_imdb_id.startswith('tt'):
+            self.logger.error("Invalid IMDb ID format")
+            return None
+
+        blocks = [i for i, (name, _) in enumerate(FACET_BLOCKS) if facets.get(name)]
+        if not blocks:
+            self.logger.warning("No facets selected for similarity search")
+            return None
+
+        if not self._load():
+            self.logger.debug("Similarity index not available")
+            return None
+
+        position = self._row_by_imdb.get(reference_imdb_id)
+        if position is None:
+            self.logger.debug("Reference movie %s not in similarity index", reference_imdb_id)
+            return None
+
+        if np is not None:
+            ranked = self._top_k_numpy(position, blocks, limit)
+        else:
+            ranked = self._top_k_sparse(position, blocks, limit)
+
+        rows = self._index['rows']
+        results = [{'imdb_id': rows[row][1], 'score': round(float(score), 4)}
+                   for row, score in ranked if score > 0.0]
+        self.logger.debug("Local similarity: %s results for %s", len(results), reference_imdb_id)
+        return results
+
+    def _top_k_numpy(self, position: int, blocks: List[int], limit: int) -> List[Tuple[int, float]]:
+        columns = np.concatenate([np.arange(b * BLOCK_DIMS, (b + 1) * BLOCK_DIMS) for b in blocks])
+        sub = self._matrix[:, columns]
+        query = sub[position]
+        norms = np.sqrt(self._block_norms[:, blocks].sum(axis=1))
+        query_norm = norms[position]
+        if query_norm == 0:
+            return []
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = (sub @ query) / (norms * query_norm)
+        scores = np.nan_to_num(scores, nan=0.0, posinf=0.0, neginf=0.0)
+        scores[position] = -1.0  # Exclude the reference movie
+
+        k = min(limit, len(scores) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def _top_k_sparse(self, position: int, blocks: List[int], limit: int) -> List[Tuple[int, float]]:
+        matrix = self._matrix
+        block_norms = self._block_norms
+        block_count = len(FACET_BLOCKS)
+        row_count = len(self._index['rows'])
+
+        # Sparse query: only columns that are non-zero for the reference movie
+        base = position * TOTAL_DIMS
+        query = []
+        for b in blocks:
+            for column in range(b * BLOCK_DIMS, (b + 1) * BLOCK_DIMS):
+                weight = matrix[base + column]
+                if weight:
+                    query.append((column, weight))
+        query_norm = math.sqrt(sum(block_norms[position * block_count + b] for b in blocks))
+        if not query or query_norm == 0:
+            return []
+
+        def scored():
+            for row in range(row_count):
+                if row == position:
+                    continue
+                row_base = row * TOTAL_DIMS
+                dot = 0.0
+                for column, weight in query:
+                    value = matrix[row_base + column]
+                    if value:
+                        dot += value * weight
+                if dot:
+                    norm = math.sqrt(sum(block_norms[row * block_count + b] for b in blocks))
+                    if norm:
+                        yield dot / (norm * query_norm), row
+
+        return [(row, score) for score, row in heapq.nlargest(limit, scored())]
+
+
+# Global local similarity engine instance
+_local_similarity_instance = None
+
+
+def get_local_similarity_engine():
+    """Get global local similarity engine instance"""
+    global _local_similarity_instance
+    if _local_similarity_instance is None:
+        _local_similarity_instance = LocalSimilarityEngine()
+    return _local_similarity_instance
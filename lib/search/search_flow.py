@@ -6,6 +6,7 @@ LibraryGenie - Search Flow Controller
 Consolidates all search flow logic into a single coordinator
 """
 
+import urllib.parse
 import xbmc
 import xbmcaddon
 from typing import Optional
@@ -53,6 +54,45 @@ class NavigationStrategy:
             xbmc.executebuiltin(f'ActivateWindow(videos,{list_url},return)')
             return True
 
+    def navigate_to_episode_groups(self, search_terms: str, match_logic: str, search_scope: str,
+                                   context: PluginContext, movies_list_id: Optional[int] = None,
+                                   movie_count: int = 0) -> bool:
+        """
+        Navigate to episode search hits grouped by show
+
+        Args:
+            search_terms: Search text, re-run by the grouped listing
+            match_logic: Keyword match logic of the search
+            search_scope: Title/plot scope of the search
+            context: Plugin context with addon_handle
+            movies_list_id: Search history list holding the movie hits, if any
+            movie_count: Number of movie hits in that list
+
+        Returns:
+            True if navigation successful
+        """
+        if context.addon_handle >= 0:
+            self.logger.debug(f"Valid handle {context.addon_handle}, rendering episode groups directly")
+            from lib.ui.handler_factory import get_handler_factory
+
+            factory = get_handler_factory()
+            factory.context = context
+            search_handler = factory.get_search_handler()
+            return search_handler.show_episode_groups(
+                context, search_terms, match_logic, search_scope,
+                movies_list_id=str(movies_list_id) if movies_list_id else None,
+                movie_count=movie_count
+            )
+        else:
+            params = {'action': 'search_show_groups', 'q': search_terms, 'match': match_logic, 'scope': search_scope}
+            if movies_list_id:
+                params['movies_list_id'] = movies_list_id
+                params['movies'] = movie_count
+            groups_url = f"plugin://{self.addon_id}/?{urllib.parse.urlencode(params)}"
+            self.logger.debug(f"Invalid handle {context.addon_handle}, using ActivateWindow")
+            xbmc.executebuiltin(f'ActivateWindow(videos,{groups_url},return)')
+            return True
+
 
 class SearchFlowController:
     """Coordinates the complete search flow from dialog to results"""
@@ -157,6 +197,7 @@ class SearchFlowController:
         from lib.search.simple_query_interpreter import get_simple_query_interpreter
         from lib.search.simple_search_engine import SimpleSearchEngine
         from lib.ui.handler_factory import get_handler_factory
+        from lib.config.settings import SettingsManager
         import xbmcgui
         
         local_result = search_result.get('result')
@@ -192,6 +233,11 @@ class SearchFlowController:
             else:
                 search_scope = 'both'
             
+            # Episode hits are shown as one folder per show when grouping is enabled
+            if 'episode' in media_types and SettingsManager().get_search_group_episodes():
+                if self._handle_grouped_episode_search(query_params, media_types, search_scope, context):
+                    return True
+
             # Parse query
             search_query = interpreter.parse_query(
                 query_params['q'],
@@ -210,7 +256,7 @@ class SearchFlowController:
                 factory.context = context
                 search_handler = factory.get_search_handler()
                 
-                list_id = search_handler._save_search_history(query_params['q'], {}, results)
+                list_id = search_handler.save_search_history(query_params['q'], {}, results)
                 
                 if list_id:
                     self.logger.info(f"Local search successful, navigating to list {list_id}")
@@ -222,3 +268,50 @@ class SearchFlowController:
         finally:
             # Always close progress dialog
             progress.close()
+
+    def _handle_grouped_episode_search(self, query_params: dict, media_types: list,
+                                       search_scope: str, context: PluginContext) -> bool:
+        """Run an episode search aggregated per show and navigate to the show folders
+
+        Movie hits (for 'all' searches) are saved to search history as usual and
+        linked from the grouped listing.
+
+        Returns:
+            True if grouped results were shown, False when no show matched and the
+            regular flat search should run instead
+        """
+        from lib.search.simple_query_interpreter import get_simple_query_interpreter
+        from lib.search.simple_search_engine import SimpleSearchEngine
+        from lib.ui.handler_factory import get_handler_factory
+
+        search_terms = query_params['q']
+        match_logic = query_params.get('match', 'all')
+
+        factory = get_handler_factory()
+        factory.context = context
+        search_handler = factory.get_search_handler()
+
+        groups = search_handler.search_episode_groups(search_terms, match_logic, search_scope)
+        if not groups:
+            return False
+
+        movies_list_id = None
+        movie_count = 0
+        if 'movie' in media_types:
+            movie_query = get_simple_query_interpreter().parse_query(
+                search_terms,
+                media_types=['movie'],
+                search_scope=search_scope,
+                match_logic=match_logic
+            )
+            movie_results = SimpleSearchEngine().search(movie_query)
+            if movie_results.total_count > 0:
+                movies_list_id = search_handler.save_search_history(search_terms, {}, movie_results)
+                movie_count = movie_results.total_count
+
+        self.logger.info(f"Local search matched episodes in {len(groups)} shows, navigating to grouped results")
+        self.navigation_strategy.navigate_to_episode_groups(
+            search_terms, match_logic, search_scope, context,
+            movies_list_id=movies_list_id, movie_count=movie_count
+        )
+        return True
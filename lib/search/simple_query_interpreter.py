@@ -43,6 +43,10 @@ class SimpleQueryInterpreter:
             query.search_scope = kwargs.get("search_scope", "both")
             query.match_logic = kwargs.get("match_logic", "all")
 
+            # Episode aggregation: one row per show, or the episodes of a single show
+            query.group_by_show = bool(kwargs.get("group_by_show", False))
+            query.tvshow_kodi_id = kwargs.get("tvshow_kodi_id")
+
             # Extract and normalize keywords
             if user_input and user_input.strip():
                 original_input = user_input.strip()
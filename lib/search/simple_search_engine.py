@@ -43,6 +43,8 @@ class SimpleSearchEngine:
         self.logger = get_kodi_logger('lib.search.simple_search_engine')
         self.conn_manager = get_connection_manager()
         self.normalizer = get_text_normalizer()
+        # SQL text per query shape, shared by all searches with that shape
+        self._sql_templates: Dict[Tuple[Any, ...], str] = {}
 
     def search(self, query: SimpleSearchQuery) -> SimpleSearchResult:
         """Execute simple search query with ranking"""
@@ -86,116 +88,172 @@ class SimpleSearchEngine:
             return result
 
     def _build_ranked_sql_query(self, query: SimpleSearchQuery) -> Tuple[str, List[Any]]:
-        """Build SQL query with ranking logic"""
-        params = []
-
-        # Build media type filter
-        media_type_placeholders = ",".join(["?" for _ in query.media_types])
-        media_type_filter = f"mi.media_type IN ({media_type_placeholders})"
+        """Build SQL query with ranking logic
+
+        The SQL text only depends on the shape of the query (see _get_template_key),
+        all keywords and paging values are bound as parameters so SQLite can reuse
+        the prepared statement across searches.
+        """
+        template_key = self._get_template_key(query)
+        sql_template = self._sql_templates.get(template_key)
+        if sql_template is None:
+            sql_template = self._build_sql_template(*template_key)
+            self._sql_templates[template_key] = sql_template
+
+        return sql_template, self._build_query_params(query)
+
+    def _get_search_patterns(self, query: SimpleSearchQuery) -> List[str]:
+        """Get LIKE patterns for the query keywords, in placeholder order"""
+        if query.match_logic == "phrase":
+            # Combine all keywords into a single phrase
+            keywords = [" ".join(query.keywords)]
+        else:
+            keywords = query.keywords
+        return [f"%{self.normalizer.normalize(keyword)}%" for keyword in keywords]
+
+    def _get_template_key(self, query: SimpleSearchQuery) -> Tuple[Any, ...]:
+        """Get the cache key describing the shape of the SQL for this query"""
+        pattern_count = 1 if query.match_logic == "phrase" else len(query.keywords)
+        match_logic = "all" if query.match_logic == "all" else "any"
+        return (
+            pattern_count,
+            match_logic,
+            query.search_scope,
+            query.scope_type == "list",
+            len(query.media_types),
+            "episode" in query.media_types,
+            query.page_size > 0,
+            query.group_by_show,
+            query.tvshow_kodi_id is not None
+        )
+
+    def _build_query_params(self, query: SimpleSearchQuery) -> List[Any]:
+        """Build the parameter list matching the numbered placeholders of the template"""
+        params: List[Any] = self._get_search_patterns(query)
+        if query.scope_type == "list":
+            params.append(query.scope_id)
+        params.extend(query.media_types)
+        if query.tvshow_kodi_id is not None:
+            params.append(query.tvshow_kodi_id)
+        if query.page_size > 0:
+            params.append(query.page_size)
+            params.append(query.page_offset)
+        return params
+
+    def _build_sql_template(self, pattern_count: int, match_logic: str, search_scope: str,
+                            list_scope: bool, media_type_count: int, include_episodes: bool,
+                            paginated: bool, group_by_show: bool = False, show_filter: bool = False) -> str:
+        """Build parameterized SQL for one query shape
+
+        Placeholders are numbered: ?1..?N are the keyword patterns (referenced by both
+        the WHERE clause and the ranking expression), followed by the list id when
+        searching a list, the media types, the show id when drilling into one show,
+        and finally LIMIT/OFFSET.
+
+        With group_by_show the statement returns one row per show (tvshow_kodi_id,
+        tvshowtitle, hit_count, best search_rank) instead of one row per episode.
+        """
+        pattern_refs = [f"?{i}" for i in range(1, pattern_count + 1)]
+        next_param = pattern_count + 1
 
         # Base SELECT with ranking calculation - include TV-specific fields
-        if query.scope_type == "list":
+        if group_by_show:
+            select_clause = """
+                SELECT mi.tvshow_kodi_id, MAX(mi.tvshowtitle) as tvshowtitle, MIN(mi.year) as year,
+                       COUNT(DISTINCT mi.id) as hit_count,
+                       MIN({ranking_expression}) as search_rank
+                FROM media_items mi
+            """
+            if list_scope:
+                select_clause += " INNER JOIN list_items li ON li.media_item_id = mi.id"
+                where_clauses = [f"li.list_id = ?{next_param}"]
+                next_param += 1
+            else:
+                where_clauses = []
+        elif list_scope:
             select_clause = """
                 SELECT DISTINCT mi.id, mi.kodi_id, mi.title, mi.year, mi.play as file_path, 
                        mi.imdbnumber as imdb_id, mi.tmdb_id, mi.created_at, 
                        mi.art, mi.plot, mi.rating, mi.duration as runtime,
                        mi.genre, mi.director, mi.media_type, mi.tvshowtitle, 
-                       mi.season, mi.episode, 0 as playcount, mi.kodi_id as itemid,
+                       mi.season, mi.episode, mi.tvshow_kodi_id, 0 as playcount, mi.kodi_id as itemid,
                        {ranking_expression} as search_rank
                 FROM media_items mi
                 INNER JOIN list_items li ON li.media_item_id = mi.id
             """
-            where_clauses = [
-                "li.list_id = ?",
-                media_type_filter,
-                "mi.source = 'lib'", 
-                "mi.is_removed = 0"
-            ]
-            params.append(query.scope_id)
-            params.extend(query.media_types)
+            where_clauses = [f"li.list_id = ?{next_param}"]
+            next_param += 1
         else:
             select_clause = """
                 SELECT mi.id, mi.kodi_id, mi.title, mi.year, mi.play as file_path, 
                        mi.imdbnumber as imdb_id, mi.tmdb_id, mi.created_at, 
                        mi.art, mi.plot, mi.rating, mi.duration as runtime,
                        mi.genre, mi.director, mi.media_type, mi.tvshowtitle,
-                       mi.season, mi.episode, 0 as playcount, mi.kodi_id as itemid,
+                       mi.season, mi.episode, mi.tvshow_kodi_id, 0 as playcount, mi.kodi_id as itemid,
                        {ranking_expression} as search_rank
                 FROM media_items mi
             """
-            where_clauses = [
-                media_type_filter,
-                "mi.source = 'lib'",
-                "mi.is_removed = 0"
-            ]
-            params.extend(query.media_types)
+            where_clauses = []
+
+        # Build media type filter
+        media_type_placeholders = ",".join(f"?{next_param + i}" for i in range(media_type_count))
+        next_param += media_type_count
+        where_clauses.extend([
+            f"mi.media_type IN ({media_type_placeholders})",
+            "mi.source = 'lib'",
+            "mi.is_removed = 0"
+        ])
+        if show_filter:
+            where_clauses.append(f"mi.tvshow_kodi_id = ?{next_param}")
+            next_param += 1
+        if group_by_show:
+            where_clauses.append("mi.tvshow_kodi_id IS NOT NULL")
 
         # Build search conditions and ranking expression
-        search_conditions, ranking_expr, search_params = self._build_search_conditions(query)
-        where_clauses.extend(search_conditions)
-        params.extend(search_params)
+        where_clauses.extend(self._build_search_conditions(pattern_refs, match_logic, search_scope, include_episodes))
+        ranking_expr = self._build_ranking_expression(pattern_refs, include_episodes)
 
         # Replace ranking placeholder
         select_clause = select_clause.format(ranking_expression=ranking_expr)
 
         # Build final query with ranking-based ordering
         where_clause = " AND ".join(where_clauses)
-        order_clause = "search_rank ASC, LOWER(mi.title) ASC"
-
-        full_query = f"{select_clause} WHERE {where_clause} ORDER BY {order_clause}"
+        if group_by_show:
+            full_query = (f"{select_clause} WHERE {where_clause} GROUP BY mi.tvshow_kodi_id"
+                          f" ORDER BY search_rank ASC, hit_count DESC, LOWER(tvshowtitle) ASC")
+        elif show_filter:
+            full_query = (f"{select_clause} WHERE {where_clause}"
+                          f" ORDER BY search_rank ASC, mi.season ASC, mi.episode ASC")
+        else:
+            order_clause = "search_rank ASC, LOWER(mi.title) ASC"
+            full_query = f"{select_clause} WHERE {where_clause} ORDER BY {order_clause}"
 
         # Add pagination
-        if query.page_size > 0:
-            full_query += f" LIMIT {query.page_size}"
-            if query.page_offset > 0:
-                full_query += f" OFFSET {query.page_offset}"
+        if paginated:
+            full_query += f" LIMIT ?{next_param} OFFSET ?{next_param + 1}"
 
-        return full_query, params
+        return full_query
 
-    def _build_search_conditions(self, query: SimpleSearchQuery) -> Tuple[List[str], str, List[str]]:
-        """Build search WHERE conditions and ranking expression"""
+    def _build_search_conditions(self, pattern_refs: List[str], match_logic: str,
+                                 search_scope: str, include_episodes: bool) -> List[str]:
+        """Build search WHERE conditions for the given keyword placeholders"""
         conditions = []
-        params = []
 
         # Build conditions based on search scope
         title_conditions = []
         tvshowtitle_conditions = []
         plot_conditions = []
 
-        # Handle exact phrase matching
-        if query.match_logic == "phrase":
-            # Combine all keywords into a single phrase
-            phrase = " ".join(query.keywords)
-            normalized_phrase = self.normalizer.normalize(phrase)
-
-            if query.search_scope in ["title", "both"]:
-                title_conditions.append("LOWER(mi.title) LIKE ?")
-                params.append(f"%{normalized_phrase}%")
-                
-                if "episode" in query.media_types:
-                    tvshowtitle_conditions.append("LOWER(mi.tvshowtitle) LIKE ?")
-                    params.append(f"%{normalized_phrase}%")
-
-            if query.search_scope in ["plot", "both"]:
-                plot_conditions.append("LOWER(mi.plot) LIKE ?")
-                params.append(f"%{normalized_phrase}%")
-        else:
-            # Keyword-based matching (any/all)
-            for keyword in query.keywords:
-                normalized_keyword = self.normalizer.normalize(keyword)
-
-                if query.search_scope in ["title", "both"]:
-                    title_conditions.append("LOWER(mi.title) LIKE ?")
-                    params.append(f"%{normalized_keyword}%")
-                    
-                    # Also search tvshowtitle for episodes
-                    if "episode" in query.media_types:
-                        tvshowtitle_conditions.append("LOWER(mi.tvshowtitle) LIKE ?")
-                        params.append(f"%{normalized_keyword}%")
-
-                if query.search_scope in ["plot", "both"]:
-                    plot_conditions.append("LOWER(mi.plot) LIKE ?")
-                    params.append(f"%{normalized_keyword}%")
+        for ref in pattern_refs:
+            if search_scope in ["title", "both"]:
+                title_conditions.append(f"LOWER(mi.title) LIKE {ref}")
+
+                # Also search tvshowtitle for episodes
+                if include_episodes:
+                    tvshowtitle_conditions.append(f"LOWER(mi.tvshowtitle) LIKE {ref}")
+
+            if search_scope in ["plot", "both"]:
+                plot_conditions.append(f"LOWER(mi.plot) LIKE {ref}")
 
         # Combine conditions based on match logic
         field_conditions = []
@@ -203,33 +261,30 @@ class SimpleSearchEngine:
         # Combine title and tvshowtitle conditions for title matching
         all_title_conditions = title_conditions + tvshowtitle_conditions
         if all_title_conditions:
-            if query.match_logic == "all":
+            if match_logic == "all":
                 field_conditions.append(f"({' AND '.join(all_title_conditions)})")
-            else:  # any
+            else:  # any / phrase
                 field_conditions.append(f"({' OR '.join(all_title_conditions)})")
 
         if plot_conditions:
-            if query.match_logic == "all":
+            if match_logic == "all":
                 field_conditions.append(f"({' AND '.join(plot_conditions)})")
-            else:  # any
+            else:  # any / phrase
                 field_conditions.append(f"({' OR '.join(plot_conditions)})")
 
         # Main search condition
         if field_conditions:
-            if query.search_scope == "both":
+            if search_scope == "both":
                 main_condition = f"({' OR '.join(field_conditions)})"
             else:
                 main_condition = field_conditions[0]
             conditions.append(main_condition)
 
-        # Build ranking expression
-        ranking_expr = self._build_ranking_expression(query)
+        return conditions
 
-        return conditions, ranking_expr, params
-
-    def _build_ranking_expression(self, query: SimpleSearchQuery) -> str:
+    def _build_ranking_expression(self, pattern_refs: List[str], include_episodes: bool) -> str:
         """Build SQL ranking expression that prioritizes title matches"""
-        if not query.keywords:
+        if not pattern_refs:
             return "999"  # Default low rank
 
         # Count keyword matches in title, tvshowtitle, and plot
@@ -237,21 +292,21 @@ class SimpleSearchEngine:
         tvshowtitle_matches = []
         plot_matches = []
 
-        for i, keyword in enumerate(query.keywords):
+        for ref in pattern_refs:
             # Using CASE WHEN for each keyword
-            title_matches.append(f"CASE WHEN LOWER(mi.title) LIKE '%{self.normalizer.normalize(keyword)}%' THEN 1 ELSE 0 END")
-            plot_matches.append(f"CASE WHEN LOWER(mi.plot) LIKE '%{self.normalizer.normalize(keyword)}%' THEN 1 ELSE 0 END")
-            
+            title_matches.append(f"CASE WHEN LOWER(mi.title) LIKE {ref} THEN 1 ELSE 0 END")
+            plot_matches.append(f"CASE WHEN LOWER(mi.plot) LIKE {ref} THEN 1 ELSE 0 END")
+
             # Include tvshowtitle for episodes
-            if "episode" in query.media_types:
-                tvshowtitle_matches.append(f"CASE WHEN LOWER(mi.tvshowtitle) LIKE '%{self.normalizer.normalize(keyword)}%' THEN 1 ELSE 0 END")
+            if include_episodes:
+                tvshowtitle_matches.append(f"CASE WHEN LOWER(mi.tvshowtitle) LIKE {ref} THEN 1 ELSE 0 END")
 
         title_count = " + ".join(title_matches)
         plot_count = " + ".join(plot_matches)
-        total_keywords = len(query.keywords)
+        total_keywords = len(pattern_refs)
 
         # Build ranking logic based on whether we're searching episodes
-        if "episode" in query.media_types and tvshowtitle_matches:
+        if include_episodes and tvshowtitle_matches:
             tvshowtitle_count = " + ".join(tvshowtitle_matches)
             # Combined title and tvshowtitle count for episodes
             combined_title_count = f"({title_count}) + ({tvshowtitle_count})"
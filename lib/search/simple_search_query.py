@@ -25,6 +25,8 @@ class SimpleSearchQuery:
         self.media_types: List[str] = ["movie"]  # Media types to search: ["movie"], ["episode", "tvshow"], etc.
         self.page_size: int = SettingsManager().get_search_page_size()
         self.page_offset: int = 0
+        self.group_by_show: bool = False     # Collapse episode hits into one row per show
+        self.tvshow_kodi_id: Optional[int] = None  # Restrict episode hits to one show (drill-down)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for logging/debugging"""
@@ -37,7 +39,9 @@ class SimpleSearchQuery:
             "scope_id": self.scope_id,
             "media_types": self.media_types,
             "page_size": self.page_size,
-            "page_offset": self.page_offset
+            "page_offset": self.page_offset,
+            "group_by_show": self.group_by_show,
+            "tvshow_kodi_id": self.tvshow_kodi_id
         }
 
     def is_valid(self) -> bool:
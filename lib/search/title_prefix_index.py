@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Title Prefix Index
+In-memory prefix index over normalized library titles for search-as-you-type
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from lib.search.normalizer import get_text_normalizer
+from lib.data.connection_manager import get_connection_manager
+from lib.utils.kodi_log import get_kodi_logger
+
+
+# Refining a huge candidate set token by token is slower than a fresh index lookup
+MAX_REFINE_CANDIDATES = 2000
+
+
+class TitlePrefixIndex:
+    """Sorted token table mapping normalized title tokens to library items
+
+    Every query token must be a prefix of some token of the item's title (or show
+    title for episodes), so a query that only grows can never gain matches. That
+    lets LiveSearchSession refine the previous candidate set instead of going back
+    to the index on every keystroke.
+    """
+
+    def __init__(self):
+        self.logger = get_kodi_logger('lib.search.title_prefix_index')
+        self.conn_manager = get_connection_manager()
+        self.normalizer = get_text_normalizer()
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[Any, ...]] = None
+        # Parallel per-item arrays, ordered by normalized title
+        self._items: List[Dict[str, Any]] = []
+        self._item_tokens: List[Tuple[str, ...]] = []
+        self._item_titles: List[str] = []
+        self._item_types: List[str] = []
+        # Sorted distinct tokens and their postings (item positions)
+        self._tokens: List[str] = []
+        self._postings: List[List[int]] = []
+
+    def _get_library_signature(self) -> Optional[Tuple[Any, ...]]:
+        """Cheap fingerprint of the indexed rows, used to detect library changes
+
+        content_updated_at only moves when a content column changes, so a sync
+        that rewrites rows unchanged (bumping updated_at) keeps the index.
+        """
+        row = self.conn_manager.execute_single("""
+            SELECT COUNT(*) AS item_count, MAX(COALESCE(content_updated_at, created_at)) AS last_update,
+                   MAX(id) AS max_id
+            FROM media_items
+            WHERE source = 'lib' AND is_removed = 0 AND media_type IN ('movie', 'episode')
+        """)
+        if not row:
+            return None
+        return (row['item_count'], row['last_update'], row['max_id'])
+
+    def ensure_current(self) -> bool:
+        """Build the index, or rebuild it if the library changed since the last build"""
+        try:
+            signature = self._get_library_signature()
+            with self._lock:
+                if signature is not None and signature == self._signature:
+                    return True
+                self._build()
+                self._signature = signature
+            return True
+        except Exception as e:
+            self.logger.error("Failed to build title prefix index: %s", e)
+            return False
+
+    def _build(self):
+        rows = self.conn_manager.execute_query("""
+            SELECT id, media_type, kodi_id, title, year, tvshowtitle, season, episode
+            FROM media_items
+            WHERE source = 'lib' AND is_removed = 0 AND media_type IN ('movie', 'episode')
+        """) or []
+
+        entries = []
+        for row in rows:
+            item = dict(row)
+            title = self.normalizer.normalize(item.get('title') or '')
+            searchable = title
+            if item['media_type'] == 'episode' and item.get('tvshowtitle'):
+                searchable = f"{self.normalizer.normalize(item['tvshowtitle'])} {title}"
+            tokens = tuple(sorted(set(searchable.split())))
+            if tokens:
+                entries.append((title, item, tokens))
+        entries.sort(key=lambda entry: entry[0])
+
+        token_postings: Dict[str, List[int]] = {}
+        self._items = []
+        self._item_tokens = []
+        self._item_titles = []
+        self._item_types = []
+        for position, (title, item, tokens) in enumerate(entries):
+            self._items.append(item)
+            self._item_tokens.append(tokens)
+            self._item_titles.append(title)
+            self._item_types.append(item['media_type'])
+            for token in tokens:
+                token_postings.setdefault(token, []).append(position)
+
+        self._tokens = sorted(token_postings)
+        self._postings = [token_postings[token] for token in self._tokens]
+        self.logger.debug("Title prefix index built: %s items, %s tokens", len(self._items), len(self._tokens))
+
+    def _positions_for_prefix(self, prefix: str) -> set:
+        positions = set()
+        start = bisect_left(self._tokens, prefix)
+        for index in range(start, len(self._tokens)):
+            if not self._tokens[index].startswith(prefix):
+                break
+            positions.update(self._postings[index])
+        return positions
+
+    def _matches(self, position: int, query_tokens: List[str]) -> bool:
+        item_tokens = self._item_tokens[position]
+        return all(any(token.startswith(q) for token in item_tokens) for q in query_tokens)
+
+    def find_candidates(self, query_tokens: List[str], media_types: List[str],
+                        within: Optional[List[int]] = None,
+                        is_current: Optional[Callable[[], bool]] = None) -> Optional[List[int]]:
+        """Get item positions matching all query tokens, ranked
+
+        Args:
+            query_tokens: Normalized query tokens, each treated as a prefix
+            media_types: Media types to keep
+            within: Previous candidate positions to refine instead of using the index
+            is_current: Checked between stages; returning False abandons the lookup
+
+        Returns:
+            Ranked list of item positions, or None if the lookup was abandoned
+        """
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            if within is None:
+                # Start from the most selective (longest) token
+                seed = max(query_tokens, key=len)
+                pool = self._positions_for_prefix(seed)
+                remaining = [token for token in query_tokens if token != seed]
+            else:
+                pool = within
+                remaining = query_tokens
+
+            if is_current is not None and not is_current():
+                return None
+
+            media_filter = set(media_types)
+            matched = [position for position in pool
+                       if self._item_types[position] in media_filter
+                       and (not remaining or self._matches(position, remaining))]
+
+            if is_current is not None and not is_current():
+                return None
+
+            # Titles that start with the query first, then alphabetical (positions are title-ordered)
+            query_text = " ".join(query_tokens)
+            matched.sort(key=lambda position: (not self._item_titles[position].startswith(query_text), position))
+            return matched
+
+    def get_items(self, positions: List[int]) -> List[Dict[str, Any]]:
+        """Get item dicts for candidate positions"""
+        with self._lock:
+            return [self._items[position] for position in positions]
+
+
+class LiveSearchSession:
+    """Per-panel search-as-you-type state: reuses the previous candidate set while the query only grows"""
+
+    def __init__(self, index: Optional[TitlePrefixIndex] = None):
+        self.index = index or get_title_prefix_index()
+        self.normalizer = get_text_normalizer()
+        self._last_text: Optional[str] = None
+        self._last_media_types: Optional[Tuple[str, ...]] = None
+        self._last_candidates: Optional[List[int]] = None
+
+    def reset(self):
+        self._last_text = None
+        self._last_media_types = None
+        self._last_candidates = None
+
+    def search(self, user_input: str, media_types: List[str], limit: int = 25,
+               is_current: Optional[Callable[[], bool]] = None) -> Optional[Dict[str, Any]]:
+        """Get the first page of title matches for the text typed so far
+
+        Returns:
+            Dict with 'items' (first page) and 'total_count', or None when the
+            search was abandoned because the input changed in the meantime
+        """
+        normalized = self.normalizer.normalize(user_input or '')
+        tokens = normalized.split()
+        if not tokens:
+            self.reset()
+            return {'items': [], 'total_count': 0}
+
+        media_key = tuple(media_types)
+        within = None
+        if (self._last_candidates is not None and self._last_media_types == media_key
+                and len(self._last_candidates) <= MAX_REFINE_CANDIDATES
+                and self._last_text and normalized.startswith(self._last_text)):
+            within = self._last_candidates
+
+        candidates = self.index.find_candidates(tokens, media_types, within=within, is_current=is_current)
+        if candidates is None:
+            return None
+
+        self._last_text = normalized
+        self._last_media_types = media_key
+        self._last_candidates = candidates
+        return {'items': self.index.get_items(candidates[:limit]), 'total_count': len(candidates)}
+
+
+# Global title prefix index instance
+_title_prefix_index_instance = None
+
+
+def get_title_prefix_index():
+    """Get global title prefix index instance"""
+    global _title_prefix_index_instance
+    if _title_prefix_index_instance is None:
+        _title_prefix_index_instance = TitlePrefixIndex()
+    return _title_prefix_index_instance
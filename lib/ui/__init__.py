@@ -5,10 +5,32 @@
 LibraryGenie - UI Package
 """
 
-from lib.ui.menu_builder import MenuBuilder
-from lib.ui.listitem_builder import ListItemBuilder
-from lib.ui.listitem_renderer import get_listitem_renderer
-from lib.ui.nav import get_navigator, push, replace, refresh, finish_directory
-from lib.ui.nav_policy import get_nav_policy, decide_mode, should_refresh
+from lib.utils.lazy_exports import lazy_exports
 
-__all__ = ["MenuBuilder", "ListItemBuilder", "get_listitem_renderer", "get_navigator", "push", "replace", "refresh", "finish_directory", "get_nav_policy", "decide_mode", "should_refresh"]
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'MenuBuilder': 'lib.ui.menu_builder',
+    'ListItemBuilder': 'lib.ui.listitem_builder',
+    'get_listitem_renderer': 'lib.ui.listitem_renderer',
+    'get_navigator': 'lib.ui.nav',
+    'push': 'lib.ui.nav',
+    'replace': 'lib.ui.nav',
+    'refresh': 'lib.ui.nav',
+    'finish_directory': 'lib.ui.nav',
+    'get_nav_policy': 'lib.ui.nav_policy',
+    'decide_mode': 'lib.ui.nav_policy',
+    'should_refresh': 'lib.ui.nav_policy',
+})
+
+__all__ = [
+    'MenuBuilder',
+    'ListItemBuilder',
+    'get_listitem_renderer',
+    'get_navigator',
+    'push',
+    'replace',
+    'refresh',
+    'finish_directory',
+    'get_nav_policy',
+    'decide_mode',
+    'should_refresh',
+]
@@ -6,19 +6,41 @@ LibraryGenie - AI Search Handler
 Handles AI search queries and creates search history lists with matching media items
 """
 
+import json
 import xbmcgui
 import xbmc
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable
 
 # AI search client is lazy loaded on first use for better startup performance
 from lib.data.query_manager import get_query_manager
 from lib.utils.kodi_log import get_kodi_logger
+from lib.utils.invocation_state import on_invocation_end
 from lib.ui.localization import L
 from lib.ui.dialog_service import get_dialog_service
 
 # Import the real PluginContext
 from lib.ui.plugin_context import PluginContext
 
+# AI results written to a new list before it is shown; the remainder is mapped
+# and written while Kodi opens the list
+FIRST_PAGE_RESULTS = 50
+# How long to wait for Kodi to finish opening the list before refreshing it
+# with the remaining results (100 ms steps)
+LIST_REFRESH_WAIT_STEPS = 50
+# SQLite's default limit on bound parameters is 999
+MAX_IN_PARAMS = 900
+
+# Whether this plugin call already brought the local similarity index up to date
+_local_index_refresh = {'done': False}
+
+
+def _reset_local_index_refresh():
+    _local_index_refresh['done'] = False
+
+
+on_invocation_end(_reset_local_index_refresh)
+
+
 class AISearchHandler:
     """Handler for AI search functionality with IMDb list matching"""
 
@@ -59,27 +81,34 @@ class AISearchHandler:
             # Show progress dialog
             progress = xbmcgui.DialogProgress()
             progress.create("AI Search", f"Searching for: {query}")
-            progress.update(20, "Connecting to AI search server...")
 
-            # Test connection first
-            connection_test = self.ai_client.test_connection()
-            if not connection_test.get('success'):
-                progress.close()
-                error_msg = connection_test.get('error', 'Connection failed')
-                self.logger.error("AI SEARCH: Connection test failed: %s", error_msg)
-                self.dialog.show_error(f"Connection failed: {error_msg}", title="AI Search", time_ms=5000)
-                return False
-
-            progress.update(40, "Performing AI search...")
-
-            # Perform AI search to get IMDb IDs (get limit from settings)
+            # Get result limit from settings
             import xbmcaddon
             addon = xbmcaddon.Addon()
             result_limit = addon.getSettingInt('ai_search_result_limit')
             if result_limit <= 0:
                 result_limit = 20  # Fallback default
-            
-            search_results = self.ai_client.search_movies(query, limit=result_limit)
+
+            # A repeated search is answered from the result cache, without the network
+            search_results = self.ai_client.get_cached_search(query, limit=result_limit)
+            if search_results:
+                self.logger.info("AI SEARCH: Using cached results for '%s'", query)
+            else:
+                progress.update(20, "Connecting to AI search server...")
+
+                # Test connection first
+                connection_test = self.ai_client.test_connection()
+                if not connection_test.get('success'):
+                    progress.close()
+                    error_msg = connection_test.get('error', 'Connection failed')
+                    self.logger.error("AI SEARCH: Connection test failed: %s", error_msg)
+                    self.dialog.show_error(f"Connection failed: {error_msg}", title="AI Search", time_ms=5000)
+                    return False
+
+                progress.update(40, "Performing AI search...")
+
+                # Perform AI search to get IMDb IDs
+                search_results = self.ai_client.search_movies(query, limit=result_limit)
 
             if not search_results or not search_results.get('success'):
                 progress.close()
@@ -98,48 +127,38 @@ class AISearchHandler:
 
             progress.update(60, "Matching with local library...")
 
-            # Extract IMDb IDs and scores from AI search results
-            imdb_ids = []
-            score_map = {}  # Maps imdb_id -> score
-            for result in ai_results:
-                imdb_id = result.get('imdb_id')
-                if imdb_id and imdb_id.startswith('tt'):
-                    imdb_ids.append(imdb_id)
-                    # Store score for this IMDb ID
-                    score = result.get('score', 0)
-                    score_map[imdb_id] = score
-
-            self.logger.info("AI SEARCH: Extracted %s IMDb IDs with scores from AI results", len(imdb_ids))
-
-            # Match IMDb IDs with local media items, including scores
-            matched_items = self._match_imdb_ids_to_media_items(imdb_ids, score_map)
+            ranked_results = self._rank_results(ai_results)
+            self.logger.info("AI SEARCH: Extracted %s IMDb IDs with scores from AI results", len(ranked_results))
 
-            progress.update(80, "Creating search history...")
+            first_page_count = []
 
-            # Create search history list
-            if matched_items:
-                list_id = self._create_ai_search_history_list(query, matched_items, len(ai_results))
-
-                if list_id:
-                    progress.close()
-                    self.logger.info("AI SEARCH: Successfully created search history list %s with %s items", list_id, len(matched_items))
-
-                    # Show success notification
-                    self.dialog.show_success(f"Found {len(matched_items)} matches in your library", title="AI Search", time_ms=5000)
-
-                    # Redirect to the created list
-                    self._redirect_to_search_list(list_id)
-                    return True
-                else:
-                    progress.close()
-                    self.logger.error("AI SEARCH: Failed to create search history list")
-                    self.dialog.show_error("Failed to save search results", title="AI Search", time_ms=5000)
-                    return False
-            else:
+            def show_first_page(list_id, count):
                 progress.close()
+                first_page_count.append(count)
+                self.logger.info("AI SEARCH: First %s items of list %s written, showing it", count, list_id)
+                self._redirect_to_search_list(list_id)
+
+            list_id, added_count = self._stream_results_to_list(
+                lambda: self._create_ai_search_history_list(query),
+                ranked_results, show_first_page)
+
+            if list_id and first_page_count and added_count > first_page_count[0]:
+                # The list was opened with the first batch only
+                self._refresh_search_list(list_id)
+
+            if list_id:
+                self.logger.info("AI SEARCH: Successfully created search history list %s with %s items", list_id, added_count)
+                self.dialog.show_success(f"Found {added_count} matches in your library", title="AI Search", time_ms=5000)
+                return True
+
+            progress.close()
+            if added_count < 0:
+                self.logger.error("AI SEARCH: Failed to create search history list")
+                self.dialog.show_error("Failed to save search results", title="AI Search", time_ms=5000)
+            else:
                 self.logger.info("AI SEARCH: No matches found in local library")
                 self.dialog.show_success(f"No matches found in your library (searched {len(ai_results)} movies)", title="AI Search", time_ms=5000)
-                return False
+            return False
 
         except Exception as e:
             progress = locals().get('progress')
@@ -151,37 +170,101 @@ class AISearchHandler:
             self.dialog.show_error("Search error occurred", title="AI Search", time_ms=5000)
             return False
 
+    def _rank_results(self, results: List[Dict[str, Any]]) -> List[Tuple[str, float]]:
+        """(imdb_id, score) pairs in server rank order, skipping invalid and repeated IDs"""
+        ranked = []
+        seen = set()
+        for result in results:
+            imdb_id = result.get('imdb_id')
+            if imdb_id and imdb_id.startswith('tt') and imdb_id not in seen:
+                seen.add(imdb_id)
+                ranked.append((imdb_id, result.get('score', 0)))
+        return ranked
+
+    def _stream_results_to_list(self, create_list: Callable[[], Optional[int]],
+                                ranked_results: List[Tuple[str, float]],
+                                on_first_page: Callable[[int, int], None]) -> Tuple[Optional[int], int]:
+        """
+        Map ranked results to library items and write them to a new list, first page first
+
+        The first FIRST_PAGE_RESULTS results are mapped and committed on their own,
+        then on_first_page(list_id, count) is called so the list can be shown
+        while the remaining results are mapped and written in one transaction.
+        The list is only created once there is something to put in it.
+
+        Returns:
+            (list_id, items written); (None, 0) when nothing matched and
+            (None, -1) when the list could not be created or written
+        """
+        list_id = None
+        written = 0
+        batches = (ranked_results[:FIRST_PAGE_RESULTS], ranked_results[FIRST_PAGE_RESULTS:])
+
+        for batch in batches:
+            if not batch:
+                continue
+            matched_items = self._match_imdb_ids_to_media_items([imdb_id for imdb_id, _ in batch], dict(batch))
+            if not matched_items:
+                continue
+
+            first_write = list_id is None
+            if first_write:
+                list_id = create_list()
+                if not list_id:
+                    return None, -1
+
+            added = self.query_manager.add_ranked_items_to_list(list_id, matched_items, start_position=written)
+            if first_write and not added:
+                self.query_manager.delete_list(list_id)
+                self.logger.warning("AI SEARCH HISTORY: No items were added to list, cleaning up")
+                return None, -1
+            written += added
+
+            if first_write:
+                on_first_page(list_id, written)
+
+        return list_id, written
+
     def _match_imdb_ids_to_media_items(self, imdb_ids: List[str], score_map: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
         """
         Match IMDb IDs to existing media items in the database and build standard media item format
 
         Args:
-            imdb_ids: List of IMDb IDs to match
+            imdb_ids: List of IMDb IDs to match, in rank order
             score_map: Optional dict mapping imdb_id to search score
 
         Returns:
-            List of matched media item dictionaries in standard format
+            List of matched media item dictionaries in standard format, in the
+            order of imdb_ids
         """
         if score_map is None:
             score_map = {}
         try:
-            # Use correct column names from schema
-            placeholders = ','.join(['?' for _ in imdb_ids])
-            query = f"""
-                SELECT id, title, year, imdbnumber, tmdb_id, plot, rating, 
-                       genre, duration, art, kodi_id, media_type, created_at
-                FROM media_items 
-                WHERE imdbnumber IN ({placeholders})
-                ORDER BY title
-            """
-
-            rows = self.query_manager.connection_manager.execute_query(query, imdb_ids)
+            rank = {}
+            for index, imdb_id in enumerate(imdb_ids):
+                rank.setdefault(imdb_id, index)
+            unique_ids = list(rank)
+
+            # Use correct column names from schema; one IN query per parameter-limit chunk
+            rows = []
+            for start in range(0, len(unique_ids), MAX_IN_PARAMS):
+                chunk = unique_ids[start:start + MAX_IN_PARAMS]
+                placeholders = ','.join(['?' for _ in chunk])
+                query = f"""
+                    SELECT id, title, year, imdbnumber, tmdb_id, plot, rating, 
+                           genre, duration, art, kodi_id, media_type, created_at
+                    FROM media_items 
+                    WHERE imdbnumber IN ({placeholders})
+                """
+                rows.extend(self.query_manager.connection_manager.execute_query(query, chunk))
+
+            rows.sort(key=lambda row: (rank.get(row['imdbnumber'], len(rank)), row['title'] or ''))
 
             # Convert rows to standard media item dictionaries  
             matched_items = []
             for row in rows:
                 item_dict = dict(row)
-                # Convert to standard format expected by add_search_results_to_list
+                # Convert to standard format expected by add_ranked_items_to_list
                 imdb_id = item_dict.get('imdbnumber', '')
                 standard_item = {
                     'id': item_dict.get('id'),  # Database ID from media_items table
@@ -202,10 +285,9 @@ class AISearchHandler:
                 art_data = item_dict.get('art')
                 if art_data:
                     try:
-                        import json
                         art = json.loads(art_data) if isinstance(art_data, str) else art_data
                         standard_item['art'] = art
-                    except:
+                    except (TypeError, ValueError):
                         standard_item['art'] = {}
                 else:
                     standard_item['art'] = {}
@@ -220,14 +302,12 @@ class AISearchHandler:
             self.logger.error("AI SEARCH MATCH: Error matching IMDb IDs: %s", e)
             return []
 
-    def _create_ai_search_history_list(self, query: str, matched_items: List[Dict[str, Any]], total_ai_results: int) -> Optional[int]:
+    def _create_ai_search_history_list(self, query: str) -> Optional[int]:
         """
-        Create a search history list for AI search results using standard pattern
+        Create an empty search history list for AI search results using standard pattern
 
         Args:
             query: Original search query
-            matched_items: List of matched media items
-            total_ai_results: Total number of results from AI search
 
         Returns:
             List ID if successful, None if failed
@@ -239,7 +319,7 @@ class AISearchHandler:
             list_id = self.query_manager.create_search_history_list(
                 query=query_desc,
                 search_type="ai_search",
-                result_count=len(matched_items)
+                result_count=0
             )
 
             if not list_id:
@@ -247,19 +327,7 @@ class AISearchHandler:
                 return None
 
             self.logger.debug("AI SEARCH HISTORY: Created search history list %s", list_id)
-
-            # Use standard method to add items to list - same as local search
-            search_results = {"items": matched_items}
-            added_count = self.query_manager.add_search_results_to_list(list_id, search_results)
-
-            if added_count > 0:
-                self.logger.debug("AI SEARCH HISTORY: Added %s/%s items to search history list %s", added_count, len(matched_items), list_id)
-                return list_id
-            else:
-                # Clean up empty list
-                self.query_manager.delete_list(list_id)
-                self.logger.warning("AI SEARCH HISTORY: No items were added to list, cleaning up")
-                return None
+            return list_id
 
         except Exception as e:
             self.logger.error("AI SEARCH HISTORY: Error creating search history list: %s", e)
@@ -282,6 +350,37 @@ class AISearchHandler:
         except Exception as e:
             self.logger.error("AI SEARCH: Failed to navigate to search list: %s", e)
 
+    def _refresh_search_list(self, list_id: int):
+        """
+        Refresh the search history list once Kodi shows it, so items written
+        after it was opened appear
+
+        Nothing is refreshed when the user has left the list by then; it is
+        complete the next time it is opened.
+        """
+        try:
+            monitor = xbmc.Monitor()
+            for _ in range(LIST_REFRESH_WAIT_STEPS):
+                if self._is_showing_list(list_id) and not xbmc.getCondVisibility('Container.IsUpdating'):
+                    xbmc.executebuiltin('Container.Refresh')
+                    self.logger.info("AI SEARCH: Refreshed list %s with the remaining results", list_id)
+                    return
+                if monitor.waitForAbort(0.1):
+                    return
+            self.logger.debug("AI SEARCH: List %s is not shown, no refresh needed", list_id)
+        except Exception as e:
+            self.logger.error("AI SEARCH: Failed to refresh search list: %s", e)
+
+    def _is_showing_list(self, list_id: int) -> bool:
+        """True if the current container is show_list for list_id"""
+        import urllib.parse
+        current_path = xbmc.getInfoLabel('Container.FolderPath')
+        if 'plugin.video.librarygenie' not in current_path:
+            return False
+        params = urllib.parse.parse_qs(urllib.parse.urlparse(current_path).query)
+        return (params.get('action', [''])[0] == 'show_list'
+                and params.get('list_id', [''])[0] == str(list_id))
+
     def prompt_and_search(self) -> bool:
         """
         Prompt user for AI search query and perform search
@@ -334,11 +433,15 @@ class AISearchHandler:
 
             self.logger.debug("SIMILAR MOVIES: Finding movies similar to %s (%s)", title, imdb_id)
 
-            # Check if AI search is activated
-            if not self.ai_client.is_activated():
-                self.logger.warning("SIMILAR MOVIES: AI search not activated")
-                self.dialog.show_warning("AI Search not activated", title="Similar Movies", time_ms=5000)
-                return False
+            # Fall back to the offline similarity engine when AI search is not activated
+            use_local = not self.ai_client.is_activated()
+            if use_local:
+                from lib.config.settings import SettingsManager
+                if not SettingsManager().get_local_similarity_enabled():
+                    self.logger.warning("SIMILAR MOVIES: AI search not activated and local similarity disabled")
+                    self.dialog.show_warning("AI Search not activated", title="Similar Movies", time_ms=5000)
+                    return False
+                self.logger.debug("SIMILAR MOVIES: AI search not activated - using local similarity index")
 
             # Show facet selection dialog
             facets = self._show_facet_selection_dialog()
@@ -346,25 +449,41 @@ class AISearchHandler:
                 self.logger.debug("SIMILAR MOVIES: User cancelled facet selection")
                 return False
 
+            if not use_local:
+                # Background prefetches after playback use the same selection
+                from lib.remote.similar_prefetch import remember_facets
+                remember_facets(facets)
+
             # Show progress dialog
             progress = xbmcgui.DialogProgress()
             movie_desc = f"{title} ({year})" if year else title
             progress.create("Similar Movies", f"Finding movies similar to: {movie_desc}")
-            progress.update(20, "Connecting to AI search server...")
 
-            # Test connection first
-            connection_test = self.ai_client.test_connection()
-            if not connection_test.get('success'):
-                progress.close()
-                error_msg = connection_test.get('error', 'Connection failed')
-                self.logger.error("SIMILAR MOVIES: Connection test failed: %s", error_msg)
-                self.dialog.show_error(f"Connection failed: {error_msg}", title="Similar Movies", time_ms=5000)
-                return False
+            # Prefetched after playback, or looked up earlier today
+            cached_results = None if use_local else self.ai_client.get_cached_similar(imdb_id, facets)
 
-            progress.update(40, "Searching for similar movies...")
+            if use_local:
+                progress.update(40, "Searching local library index...")
+                similar_results = self._find_similar_locally(imdb_id, facets)
+            elif cached_results is not None:
+                self.logger.debug("SIMILAR MOVIES: Using cached results for %s", imdb_id)
+                similar_results = cached_results
+            else:
+                progress.update(20, "Connecting to AI search server...")
+
+                # Test connection first
+                connection_test = self.ai_client.test_connection()
+                if not connection_test.get('success'):
+                    progress.close()
+                    error_msg = connection_test.get('error', 'Connection failed')
+                    self.logger.error("SIMILAR MOVIES: Connection test failed: %s", error_msg)
+                    self.dialog.show_error(f"Connection failed: {error_msg}", title="Similar Movies", time_ms=5000)
+                    return False
 
-            # Call similar movies endpoint
-            similar_results = self.ai_client.search_similar_movies(imdb_id, facets)
+                progress.update(40, "Searching for similar movies...")
+
+                # Call similar movies endpoint
+                similar_results = self.ai_client.search_similar_movies(imdb_id, facets)
 
             if not similar_results:
                 progress.close()
@@ -374,50 +493,32 @@ class AISearchHandler:
 
             progress.update(60, "Matching with local library...")
 
-            # Extract IMDb IDs and scores from similarity results
-            imdb_ids = []
-            score_map = {}  # Maps imdb_id -> score
-            for result in similar_results:
-                result_imdb_id = result.get('imdb_id')
-                if result_imdb_id and result_imdb_id.startswith('tt'):
-                    imdb_ids.append(result_imdb_id)
-                    # Store score for this IMDb ID (normalized 0.0-1.0)
-                    score = result.get('score', 0.0)
-                    score_map[result_imdb_id] = score
-
-            self.logger.info("SIMILAR MOVIES: Extracted %s IMDb IDs with scores from similarity results", len(imdb_ids))
-
-            # Match IMDb IDs with local media items, including scores
-            matched_items = self._match_imdb_ids_to_media_items(imdb_ids, score_map)
+            ranked_results = self._rank_results(similar_results)
+            self.logger.info("SIMILAR MOVIES: Extracted %s IMDb IDs with scores from similarity results", len(ranked_results))
 
-            progress.update(80, "Creating results list...")
-
-            # Create search history list for similar movies
-            if matched_items:
-                list_id = self._create_similar_movies_list(title, year, matched_items, len(similar_results), facets)
-
-                if list_id:
-                    progress.close()
-                    self.logger.debug("SIMILAR MOVIES: Successfully created list %s with %s items", list_id, len(matched_items))
+            def show_first_page(list_id, count):
+                progress.close()
+                # Always attempt to redirect to the created list
+                # The redirect logic will handle whether navigation is appropriate
+                self._redirect_to_search_list(list_id)
 
-                    # Show success notification
-                    self.dialog.show_success(f"Found {len(matched_items)} similar movies in your library", title="Similar Movies", time_ms=5000)
+            list_id, added_count = self._stream_results_to_list(
+                lambda: self._create_similar_movies_list(title, year, facets),
+                ranked_results, show_first_page)
 
-                    # Always attempt to redirect to the created list
-                    # The redirect logic will handle whether navigation is appropriate
-                    self._redirect_to_search_list(list_id)
+            if list_id:
+                self.logger.debug("SIMILAR MOVIES: Successfully created list %s with %s items", list_id, added_count)
+                self.dialog.show_success(f"Found {added_count} similar movies in your library", title="Similar Movies", time_ms=5000)
+                return True
 
-                    return True
-                else:
-                    progress.close()
-                    self.logger.error("SIMILAR MOVIES: Failed to create search history list")
-                    self.dialog.show_error("Failed to save results", title="Similar Movies", time_ms=5000)
-                    return False
+            progress.close()
+            if added_count < 0:
+                self.logger.error("SIMILAR MOVIES: Failed to create search history list")
+                self.dialog.show_error("Failed to save results", title="Similar Movies", time_ms=5000)
             else:
-                progress.close()
                 self.logger.debug("SIMILAR MOVIES: No matches found in local library")
                 self.dialog.show_success(f"No similar movies found in your library (searched {len(similar_results)} movies)", title="Similar Movies", time_ms=5000)
-                return False
+            return False
 
         except Exception as e:
             progress = locals().get('progress')
@@ -429,6 +530,33 @@ class AISearchHandler:
             self.dialog.show_error("Error occurred", title="Similar Movies", time_ms=5000)
             return False
 
+    def _find_similar_locally(self, imdb_id: str, facets: Dict[str, bool]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Find similar movies using the offline similarity index
+
+        Args:
+            imdb_id: IMDb ID of reference movie
+            facets: Selected similarity facets
+
+        Returns:
+            List of result dicts with imdb_id and score, or None if unavailable
+        """
+        try:
+            from lib.search.local_similarity import get_local_similarity_engine
+            engine = get_local_similarity_engine()
+
+            # Build (or catch up) the index on first use, e.g. before the service has run;
+            # at most once per plugin call, a movie outside the index stays outside it
+            if not engine.has_movie(imdb_id) and not _local_index_refresh['done']:
+                _local_index_refresh['done'] = True
+                engine.rebuild()
+
+            return engine.find_similar(imdb_id, facets)
+
+        except Exception as e:
+            self.logger.error("SIMILAR MOVIES: Local similarity search failed: %s", e)
+            return None
+
     def _show_facet_selection_dialog(self) -> Optional[Dict[str, bool]]:
         """
         Show dialog for user to select similarity facets
@@ -472,35 +600,29 @@ class AISearchHandler:
             self.logger.error("SIMILAR MOVIES: Error in facet selection: %s", e)
             return None
 
-    def _create_similar_movies_list(self, title: str, year: str, matched_items: List[Dict[str, Any]], 
-                                   total_results: int, facets: Dict[str, bool]) -> Optional[int]:
+    def _create_similar_movies_list(self, title: str, year: str, facets: Dict[str, bool]) -> Optional[int]:
         """
-        Create a search history list for similar movies results
+        Create an empty search history list for similar movies results
 
         Args:
             title: Original movie title
             year: Original movie year
-            matched_items: List of matched media items
-            total_results: Total number of similar movies found
             facets: Selected similarity facets
 
         Returns:
             List ID if successful, None if failed
         """
         try:
-            # Build facet description
-            selected_facets = [key.title() for key, selected in facets.items() if selected]
-            facet_desc = ", ".join(selected_facets)
-
             # Create search history list with similar movies description
             movie_desc = f"{title} ({year})" if year else title
             query_desc = f"Similar to: {movie_desc}"
-            description = f"Found {total_results} similar movies ({facet_desc}), {len(matched_items)} in your library"
+            self.logger.debug("SIMILAR MOVIES: Facets for '%s': %s", movie_desc,
+                              ", ".join(key.title() for key, selected in facets.items() if selected))
 
             list_id = self.query_manager.create_search_history_list(
                 query_desc,
                 "similar_movies",
-                len(matched_items)
+                0
             )
 
             if not list_id:
@@ -508,33 +630,7 @@ class AISearchHandler:
                 return None
 
             self.logger.debug("SIMILAR MOVIES: Created search history list %s", list_id)
-
-            # Add matched items to the list
-            added_count = 0
-            with self.query_manager.connection_manager.transaction() as conn:
-                for position, item in enumerate(matched_items):
-                    try:
-                        # Extract search score if present
-                        search_score = item.get('search_score')
-                        
-                        # Add item to list using direct database insert with score
-                        conn.execute("""
-                            INSERT OR IGNORE INTO list_items (list_id, media_item_id, position, search_score)
-                            VALUES (?, ?, ?, ?)
-                        """, [list_id, item['id'], position, search_score])
-                        added_count += 1
-
-                    except Exception as e:
-                        self.logger.error("SIMILAR MOVIES: Error adding item %s to list: %s", item.get('id', 'unknown'), e)
-
-            self.logger.debug("SIMILAR MOVIES: Added %s/%s items to search history list %s", added_count, len(matched_items), list_id)
-
-            if added_count > 0:
-                return list_id
-            else:
-                # Clean up empty list
-                self.query_manager.delete_list(list_id)
-                return None
+            return list_id
 
         except Exception as e:
             self.logger.error("SIMILAR MOVIES: Error creating search history list: %s", e)
@@ -662,10 +758,10 @@ class AISearchHandler:
                         dialog_bg.update(progress, "AI Search Replace Sync", message)
 
                 # Perform replace sync with progress callback
-                result = ai_client.sync_media_batch(
+                result = ai_client.sync_library(
                     movies_with_imdb, 
+                    force_replace=True,
                     batch_size=500, 
-                    use_replace_mode=True,
                     progress_callback=sync_progress_callback
                 )
 
@@ -753,11 +849,11 @@ class AISearchHandler:
 
                 progress.update(50, f"Syncing {len(movies)} movies...")
 
-                # Perform regular sync (use_replace_mode=False)
-                result = ai_client.sync_media_batch(
+                # Perform regular sync - uploads only movies added since the last sync, never removes
+                result = ai_client.sync_library(
                     movies, 
+                    authoritative=False,
                     batch_size=100, 
-                    use_replace_mode=False,
                     progress_callback=lambda current, total, msg: progress.update(
                         50 + int((current / total) * 40), 
                         msg
@@ -93,8 +93,9 @@ class ContextItem:
                 }
             })
 
-        # Add Similar Movies option if AI search is available and item has IMDb ID
-        if ai_search_available and has_imdb_id:
+        # Add Similar Movies option if AI search or local similarity is available and item has IMDb ID
+        local_similarity_available = self.settings and self.settings.get_local_similarity_enabled()
+        if (ai_search_available or local_similarity_available) and has_imdb_id:
             menu_items.append({
                 'label': f"🎬 {L(30085)}",  # Similar Movies
                 'action': 'find_similar_movies',
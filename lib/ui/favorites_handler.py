@@ -14,6 +14,7 @@ from lib.ui.plugin_context import PluginContext
 from lib.ui.response_types import DirectoryResponse, DialogResponse
 from lib.ui.localization import L
 from lib.utils.kodi_log import get_kodi_logger
+from lib.utils.directory_emitter import DirectoryEmitter
 # Error handling now consolidated in DialogService
 from lib.ui.dialog_service import get_dialog_service
 
@@ -137,6 +138,7 @@ class FavoritesHandler:
             from lib.config.config_manager import get_config
             config = get_config()
             show_tools_item = config.get_bool('show_tools_menu_item', True)
+            emitter = DirectoryEmitter(context.addon_handle)
             
             if show_tools_item:
                 breadcrumb_text, description_text = breadcrumb_helper.get_tools_breadcrumb_formatted("kodi_favorites", {}, None)
@@ -146,12 +148,7 @@ class FavoritesHandler:
                 tools_item.setProperty('IsPlayable', 'false')
                 tools_item.setArt({'icon': "DefaultAddonProgram.png", 'thumb': "DefaultAddonProgram.png"})
 
-                xbmcplugin.addDirectoryItem(
-                    context.addon_handle,
-                    context.build_url('show_list_tools', list_type='favorites'),
-                    tools_item,
-                    True
-                )
+                emitter.add(context.build_url('show_list_tools', list_type='favorites'), tools_item, True)
 
             menu_items = []
 
@@ -162,12 +159,8 @@ class FavoritesHandler:
                 # Add empty state message
                 empty_item = xbmcgui.ListItem(label=L(32006), offscreen=True)
                 self._set_listitem_plot(empty_item, 'No Kodi favorites found or none mapped to library.')
-                xbmcplugin.addDirectoryItem(
-                    context.addon_handle,
-                    context.build_url('noop'),
-                    empty_item,
-                    False
-                )
+                emitter.add(context.build_url('noop'), empty_item, False)
+                emitter.flush()
 
                 # Set content type and finish directory using Navigator
                 xbmcplugin.setContent(context.addon_handle, 'movies')
@@ -186,6 +179,7 @@ class FavoritesHandler:
             else:
                 # Use existing list building infrastructure for favorites
                 context.logger.info("Using ListItemRenderer to build %s favorites", len(favorites_items))
+                emitter.flush()
 
                 # Get query manager for content type detection
                 from lib.data.query_manager import get_query_manager
@@ -667,6 +661,8 @@ class FavoritesHandler:
                 else:
                     unmapped_favorites.append(fav)
 
+            emitter = DirectoryEmitter(self.plugin_context.addon_handle) if self.plugin_context else None
+
             # Render mapped favorites using enhanced media data
             for fav in mapped_favorites:
                 try:
@@ -687,12 +683,8 @@ class FavoritesHandler:
                         listitem, url = self._build_unmapped_favorite_item(fav)
 
                     # Add to response
-                    if self.plugin_context:
-                        self.plugin_context.add_item(
-                            url=url,
-                            listitem=listitem,
-                            isFolder=False
-                        )
+                    if emitter:
+                        emitter.add(url, listitem, False)
 
                 except Exception as e:
                     self.logger.error("Failed to render mapped favorite: %s", e)
@@ -702,18 +694,15 @@ class FavoritesHandler:
             for fav in unmapped_favorites:
                 try:
                     listitem, url = self._build_unmapped_favorite_item(fav)
-                    if self.plugin_context:
-                        self.plugin_context.add_item(
-                            url=url,
-                            listitem=listitem,
-                            isFolder=False
-                        )
+                    if emitter:
+                        emitter.add(url, listitem, False)
                 except Exception as e:
                     self.logger.error("Failed to render unmapped favorite: %s", e)
                     continue
 
             # Set content type
             if self.plugin_context:
+                emitter.flush()
                 self.plugin_context.set_content_type('files')
 
             self.logger.debug("Successfully rendered %s favorites", len(favorites))
@@ -7,25 +7,27 @@ Zero-database caching for folder view payloads with TTL and background refresh s
 """
 
 import os
-import json
 import time
 import threading
-import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
 
 from lib.utils.kodi_log import get_kodi_logger
-
-# Cache schema version - single source of truth
-# v7: Removed Tools & Options from cached items (added dynamically to respect visibility setting)
-CACHE_SCHEMA_VERSION = 13  # v13: Tools & Options never cached - added dynamically to prevent duplicates when serving via ultra-fast path
+from lib.utils.invocation_state import on_generation_change
+from lib.utils.folder_cache_store import (CACHE_SCHEMA_VERSION, CACHE_CODEC, GLOBAL_GENERATION_KEY,
+                                          FolderCacheStore, folder_key)
+from lib.utils import cache_codec
 
 
 class FolderCache:
     """
     File-based caching system for folder view payloads.
-    Eliminates database overhead by using JSON files with filesystem timestamps for TTL.
+    Eliminates library database overhead: payloads are encoded rows in a single
+    indexed store file whose build timestamps drive the TTL. Invalidation
+    advances per-folder or global generation counters instead of deleting
+    entries; outdated entries are rebuilt, or served stale while a rebuild
+    runs when folder_cache_serve_outdated is on.
     """
     
     def __init__(self, cache_dir: Optional[str] = None, schema_version: int = CACHE_SCHEMA_VERSION):
@@ -43,10 +45,13 @@ class FolderCache:
         
         self.cache_dir = cache_dir
         self._ensure_cache_dir()
+        self.store = FolderCacheStore(cache_dir)
         
         # Singleton lock for stampede protection (use RLock for re-entrant access)
         self._locks = {}
         self._locks_mutex = threading.Lock()
+        # Folder keys with a background refresh running in this process
+        self._refreshing = set()
         
         # Stats for monitoring
         self._stats = {
@@ -85,8 +90,11 @@ class FolderCache:
             self.cache_enabled = settings.get_folder_cache_enabled()
             self.fresh_ttl_hours = settings.get_folder_cache_fresh_ttl()
             self.hard_expiry_hours = settings.get_folder_cache_hard_expiry() * 24  # Convert days to hours
+            self.serve_outdated = settings.get_folder_cache_serve_outdated()
             self.prewarm_enabled = settings.get_folder_cache_prewarm_enabled()
             self.prewarm_max_folders = settings.get_folder_cache_prewarm_max_folders()
+            self.prewarm_seconds = settings.get_folder_cache_prewarm_seconds()
+            self.max_cache_mb = settings.get_folder_cache_max_mb()
             self.debug_logging = settings.get_folder_cache_debug_logging()
             
             if self.debug_logging:
@@ -99,8 +107,11 @@ class FolderCache:
             self.cache_enabled = True
             self.fresh_ttl_hours = 12
             self.hard_expiry_hours = 24 * 30  # 30 days
+            self.serve_outdated = False
             self.prewarm_enabled = True
             self.prewarm_max_folders = 10
+            self.prewarm_seconds = 10
+            self.max_cache_mb = 20
             self.debug_logging = False
 
     def _ensure_cache_dir(self):
@@ -112,70 +123,21 @@ class FolderCache:
         except Exception as e:
             self.logger.error("Failed to create cache directory %s: %s", self.cache_dir, e)
     
-    def _get_cache_file_path(self, folder_id: Optional[str]) -> str:
-        """Generate cache file path for folder ID"""
-        # Handle None folder_id (root level)
-        if folder_id is None:
-            safe_folder_id = "root"
-            folder_hash = hashlib.sha1("root".encode('utf-8')).hexdigest()[:8]
-        else:
-            # Sanitize folder_id for filename use
-            safe_folder_id = "".join(c for c in str(folder_id) if c.isalnum() or c in '-_').strip()
-            # Add hash of original folder_id to prevent collisions
-            folder_hash = hashlib.sha1(str(folder_id).encode('utf-8')).hexdigest()[:8]
-        filename = f"folder_{safe_folder_id}_{folder_hash}_anon_v{self.schema_version}.json"
-        return os.path.join(self.cache_dir, filename)
-    
-    def _is_file_fresh(self, file_path: str) -> bool:
-        """Check if cache file is within fresh TTL"""
-        try:
-            if not os.path.exists(file_path):
-                return False
-            
-            file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-            cutoff_time = datetime.now() - timedelta(hours=self.fresh_ttl_hours)
-            
-            is_fresh = file_time > cutoff_time
-            self.logger.debug("File freshness check - %s: %s (modified: %s)", 
-                            os.path.basename(file_path), is_fresh, file_time.isoformat())
-            return is_fresh
-            
-        except Exception as e:
-            self.logger.warning("Error checking file freshness for %s: %s", file_path, e)
-            return False
+    def _is_built_at_fresh(self, built_at: float) -> bool:
+        """Check if an entry built at this time is within fresh TTL"""
+        return built_at > time.time() - self.fresh_ttl_hours * 3600
     
-    def _is_file_expired(self, file_path: str) -> bool:
-        """Check if cache file is beyond hard expiry"""
-        try:
-            if not os.path.exists(file_path):
-                return True
-            
-            file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-            cutoff_time = datetime.now() - timedelta(hours=self.hard_expiry_hours)
-            
-            return file_time <= cutoff_time
-            
-        except Exception as e:
-            self.logger.warning("Error checking file expiry for %s: %s", file_path, e)
-            return True
+    def _is_built_at_expired(self, built_at: float) -> bool:
+        """Check if an entry built at this time is beyond hard expiry"""
+        return built_at <= time.time() - self.hard_expiry_hours * 3600
     
-    def _is_file_stale_but_usable(self, file_path: str) -> bool:
-        """Check if file is stale (past fresh TTL) but still usable (before hard expiry)"""
+    def _header(self, folder_id: Optional[str]):
+        """(schema_version, built_at, is_current) of the stored entry, or None"""
         try:
-            if not os.path.exists(file_path):
-                return False
-            
-            file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-            now = datetime.now()
-            fresh_cutoff = now - timedelta(hours=self.fresh_ttl_hours)
-            hard_cutoff = now - timedelta(hours=self.hard_expiry_hours)
-            
-            # Stale but usable: between fresh and hard expiry
-            return file_time <= fresh_cutoff and file_time > hard_cutoff
-            
+            return self.store.header(folder_key(folder_id))
         except Exception as e:
-            self.logger.warning("Error checking file staleness for %s: %s", file_path, e)
-            return False
+            self.logger.warning("Error reading cache header for folder %s: %s", folder_id, e)
+            return None
     
     @contextmanager
     def _singleton_lock(self, folder_id: Optional[str]):
@@ -222,36 +184,42 @@ class FolderCache:
             return None
             
         try:
-            file_path = self._get_cache_file_path(folder_id)
+            entry = self.store.get(folder_key(folder_id))
             
-            # Check if file exists and is not hard expired
-            if self._is_file_expired(file_path):
+            # Check if entry exists and is not hard expired
+            if entry is None or self._is_built_at_expired(entry[1]):
                 with self._stats_lock:
                     self._stats['misses'] += 1
-                self.logger.debug("Cache MISS for folder %s - file expired", folder_id)
+                self.logger.debug("Cache MISS for folder %s - no entry or expired", folder_id)
                 return None
+            schema_version, built_at, serialized, is_current = entry
             
-            # Check freshness - if not fresh and stale not allowed, miss
-            if not self._is_file_fresh(file_path) and not allow_stale:
+            # Check schema compatibility before decoding
+            if schema_version != self.schema_version:
+                self.logger.debug("Schema mismatch for folder %s - expected v%d, got v%s", 
+                                folder_id, self.schema_version, schema_version)
+                self.delete(folder_id)
+                return None
+            
+            # Entries built before the folder was invalidated are only served
+            # stale, and only when the serve-outdated policy is on
+            if not is_current and not (allow_stale and self.serve_outdated):
                 with self._stats_lock:
                     self._stats['misses'] += 1
-                self.logger.debug("Cache MISS for folder %s - file not fresh", folder_id)
+                self.logger.debug("Cache MISS for folder %s - entry built against an older generation", folder_id)
                 return None
             
-            # Read and parse cached data
-            with open(file_path, 'r', encoding='utf-8') as f:
-                payload = json.load(f)
-            
-            # Validate payload structure
-            if not isinstance(payload, dict) or '_schema' not in payload:
-                self.logger.warning("Invalid cache payload for folder %s - missing schema", folder_id)
-                self.delete(folder_id)
+            # Check freshness - if not fresh and stale not allowed, miss
+            is_fresh = is_current and self._is_built_at_fresh(built_at)
+            if not is_fresh and not allow_stale:
+                with self._stats_lock:
+                    self._stats['misses'] += 1
+                self.logger.debug("Cache MISS for folder %s - entry not fresh", folder_id)
                 return None
             
-            # Check schema compatibility
-            if payload.get('_schema') != self.schema_version:
-                self.logger.debug("Schema mismatch for folder %s - expected v%d, got v%s", 
-                                folder_id, self.schema_version, payload.get('_schema'))
+            payload = cache_codec.decode(serialized)
+            if not isinstance(payload, dict):
+                self.logger.warning("Invalid cache payload for folder %s", folder_id)
                 self.delete(folder_id)
                 return None
             
@@ -267,24 +235,6 @@ class FolderCache:
                 self.delete(folder_id)
                 return None
             
-            # Validate folder ID matches to prevent serving wrong cache due to filename collisions
-            cached_folder_id = payload.get('_folder_id')
-            
-            # Normalize both IDs for comparison (handle root folder special case)
-            def normalize_folder_id(fid):
-                if fid is None or fid == "root":
-                    return None
-                return str(fid)
-            
-            expected_folder_id = normalize_folder_id(folder_id)
-            actual_folder_id = normalize_folder_id(cached_folder_id)
-            
-            if actual_folder_id != expected_folder_id:
-                self.logger.warning("Folder ID mismatch in cache for %s - expected %s, got %s (filename collision)", 
-                                  folder_id, expected_folder_id, actual_folder_id)
-                self.delete(folder_id)
-                return None
-            
             with self._stats_lock:
                 self._stats['hits'] += 1
             
@@ -298,7 +248,7 @@ class FolderCache:
             else:
                 item_count = 0
                 
-            freshness = "fresh" if self._is_file_fresh(file_path) else "stale"
+            freshness = "fresh" if is_fresh else "stale"
             self.logger.debug("Cache HIT for folder %s - %d items (%s)", 
                             folder_id, item_count, freshness)
             return payload
@@ -309,7 +259,8 @@ class FolderCache:
             self.logger.error("Error reading cache for folder %s: %s", folder_id, e)
             return None
     
-    def set(self, folder_id: Optional[str], payload: Dict[str, Any], build_time_ms: Optional[int] = None) -> bool:
+    def set(self, folder_id: Optional[str], payload: Dict[str, Any], build_time_ms: Optional[int] = None,
+            generation: Optional[tuple] = None) -> bool:
         """
         Store folder payload in cache with stampede protection
         
@@ -317,6 +268,8 @@ class FolderCache:
             folder_id: Unique folder identifier
             payload: Folder data to cache (will be augmented with metadata)
             build_time_ms: Time taken to build folder (for metrics)
+            generation: generation(folder_id) taken before the payload was read from
+                the database; defaults to the generation at write time
             
         Returns:
             bool: True if successful
@@ -329,7 +282,7 @@ class FolderCache:
             
         try:
             with self._singleton_lock(folder_id):
-                return self._set_without_lock(folder_id, payload, build_time_ms)
+                return self._set_without_lock(folder_id, payload, build_time_ms, generation)
         except TimeoutError as e:
             # Downgrade timeout errors to warning to reduce noise
             with self._stats_lock:
@@ -342,7 +295,8 @@ class FolderCache:
             self.logger.error("Error acquiring lock for caching folder %s: %s", folder_id, e)
             return False
     
-    def _set_without_lock(self, folder_id: Optional[str], payload: Dict[str, Any], build_time_ms: Optional[int] = None) -> bool:
+    def _set_without_lock(self, folder_id: Optional[str], payload: Dict[str, Any], build_time_ms: Optional[int] = None,
+                          generation: Optional[tuple] = None) -> bool:
         """Internal set method that doesn't acquire locks (for use within existing locks)"""
         try:
             # VALIDATION: Prevent caching empty data that could corrupt the cache
@@ -394,15 +348,15 @@ class FolderCache:
             if build_time_ms is not None:
                 cache_payload['_build_time_ms'] = build_time_ms
             
-            file_path = self._get_cache_file_path(folder_id)
+            # An entry built from data read before an invalidation is recorded
+            # against the older generation, so it is outdated as soon as it lands
+            key = folder_key(folder_id)
+            if generation is None:
+                generation = self.store.generation(key)
             
-            # Write atomically using temp file
-            temp_path = file_path + '.tmp'
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_payload, f, ensure_ascii=False, indent=None, separators=(',', ':'))
-            
-            # Atomic move
-            os.replace(temp_path, file_path)
+            # Single-row replace in the store is atomic for readers
+            self.store.put(key, self.schema_version, time.time(), generation,
+                           cache_codec.encode(cache_payload, CACHE_CODEC))
             
             with self._stats_lock:
                 self._stats['writes'] += 1
@@ -415,13 +369,6 @@ class FolderCache:
             with self._stats_lock:
                 self._stats['errors'] += 1
             self.logger.error("Error caching folder %s: %s", folder_id, e)
-            # Clean up temp file if it exists
-            temp_path = self._get_cache_file_path(folder_id) + '.tmp'
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
             return False
     
     def delete(self, folder_id: Optional[str]) -> bool:
@@ -432,13 +379,10 @@ class FolderCache:
             folder_id: Folder identifier to remove
             
         Returns:
-            bool: True if file was deleted or didn't exist
+            bool: True if entry was deleted or didn't exist
         """
         try:
-            file_path = self._get_cache_file_path(folder_id)
-            
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            if self.store.delete(folder_key(folder_id)):
                 with self._stats_lock:
                     self._stats['deletes'] += 1
                 self.logger.debug("Deleted cache for folder %s", folder_id)
@@ -453,45 +397,40 @@ class FolderCache:
     
     def is_fresh(self, folder_id: Optional[str]) -> bool:
         """Check if folder cache is fresh (within fresh TTL)"""
-        file_path = self._get_cache_file_path(folder_id)
-        return self._is_file_fresh(file_path)
+        header = self._header(folder_id)
+        return bool(header) and header[0] == self.schema_version and bool(header[2]) \
+            and self._is_built_at_fresh(header[1])
     
     def is_stale_but_usable(self, folder_id: Optional[str]) -> bool:
         """Check if folder cache is stale but still usable for immediate serving"""
-        file_path = self._get_cache_file_path(folder_id)
-        return self._is_file_stale_but_usable(file_path)
+        header = self._header(folder_id)
+        if not header or header[0] != self.schema_version or self._is_built_at_expired(header[1]):
+            return False
+        if not header[2]:
+            return self.serve_outdated
+        return not self._is_built_at_fresh(header[1])
+    
+    def generation(self, folder_id: Optional[str]) -> Optional[tuple]:
+        """Current generation of a folder, to pass to set() after building it"""
+        try:
+            return self.store.generation(folder_key(folder_id))
+        except Exception as e:
+            self.logger.warning("Error reading cache generation for folder %s: %s", folder_id, e)
+            return None
     
     def cleanup_expired(self) -> int:
         """
-        Clean up expired cache files
+        Clean up expired cache entries
         
         Returns:
-            int: Number of files cleaned up
+            int: Number of entries cleaned up
         """
         cleaned_count = 0
         try:
-            if not os.path.exists(self.cache_dir):
-                return 0
-            
-            cutoff_time = datetime.now() - timedelta(hours=self.hard_expiry_hours)
-            
-            for filename in os.listdir(self.cache_dir):
-                if not filename.startswith('folder_') or not filename.endswith('.json'):
-                    continue
-                
-                file_path = os.path.join(self.cache_dir, filename)
-                try:
-                    file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    if file_time < cutoff_time:
-                        os.remove(file_path)
-                        cleaned_count += 1
-                        self.logger.debug("Cleaned expired cache file: %s", filename)
-                        
-                except Exception as e:
-                    self.logger.warning("Error cleaning cache file %s: %s", filename, e)
+            cleaned_count = self.store.delete_built_before(time.time() - self.hard_expiry_hours * 3600)
             
             if cleaned_count > 0:
-                self.logger.info("Cache cleanup completed - removed %d expired files", cleaned_count)
+                self.logger.info("Cache cleanup completed - removed %d expired entries", cleaned_count)
             
         except Exception as e:
             self.logger.error("Error during cache cleanup: %s", e)
@@ -500,45 +439,48 @@ class FolderCache:
     
     def cleanup_old_schemas(self, keep_current_only: bool = True) -> int:
         """
-        Clean up cache files from old schema versions
+        Clean up cache entries from old schema versions, and the per-folder
+        JSON files used before the single-file store
         
         Args:
             keep_current_only: If True, only keep current schema version
             
         Returns:
-            int: Number of files cleaned up
+            int: Number of entries and files cleaned up
         """
-        cleaned_count = 0
+        cleaned_count = self._remove_legacy_files()
+        try:
+            if keep_current_only:
+                cleaned_count += self.store.delete_other_schemas(self.schema_version)
+            
+            if cleaned_count > 0:
+                self.logger.info("Schema cleanup completed - removed %d old schema entries", cleaned_count)
+            
+        except Exception as e:
+            self.logger.error("Error during schema cleanup: %s", e)
+        
+        return cleaned_count
+    
+    def _remove_legacy_files(self) -> int:
+        """Remove folder_*.json files written by schema v13 and earlier"""
+        removed = 0
         try:
             if not os.path.exists(self.cache_dir):
                 return 0
             
             for filename in os.listdir(self.cache_dir):
-                if not filename.startswith('folder_') or not filename.endswith('.json'):
+                if not filename.startswith('folder_') or not filename.endswith(('.json', '.json.tmp')):
                     continue
-                
-                # Extract schema version from filename
                 try:
-                    # Format: folder_{id}_{hash}_anon_v{schema}.json (new) or folder_{id}_anon_v{schema}.json (old)
-                    parts = filename.replace('.json', '').split('_v')
-                    if len(parts) >= 2:
-                        file_schema = int(parts[-1])
-                        if keep_current_only and file_schema != self.schema_version:
-                            file_path = os.path.join(self.cache_dir, filename)
-                            os.remove(file_path)
-                            cleaned_count += 1
-                            self.logger.debug("Cleaned old schema cache file: %s (v%d)", filename, file_schema)
-                
-                except (ValueError, IndexError) as e:
-                    self.logger.debug("Could not parse schema from filename %s: %s", filename, e)
-            
-            if cleaned_count > 0:
-                self.logger.info("Schema cleanup completed - removed %d old schema files", cleaned_count)
-            
+                    os.remove(os.path.join(self.cache_dir, filename))
+                    removed += 1
+                except Exception as e:
+                    self.logger.warning("Error removing legacy cache file %s: %s", filename, e)
+        
         except Exception as e:
-            self.logger.error("Error during schema cleanup: %s", e)
+            self.logger.error("Error removing legacy cache files: %s", e)
         
-        return cleaned_count
+        return removed
     
     def get_resilient(self, folder_id: Optional[str]) -> Optional[Dict[str, Any]]:
         """
@@ -562,30 +504,17 @@ class FolderCache:
     
     def clear_all(self) -> int:
         """
-        Clear all folder cache files (force full rebuild)
+        Clear all folder cache entries (force full rebuild)
         
         Returns:
-            int: Number of files cleared
+            int: Number of entries cleared
         """
-        cleared_count = 0
+        cleared_count = self._remove_legacy_files()
         try:
-            if not os.path.exists(self.cache_dir):
-                return 0
-            
-            for filename in os.listdir(self.cache_dir):
-                if not filename.startswith('folder_') or not filename.endswith('.json'):
-                    continue
-                
-                file_path = os.path.join(self.cache_dir, filename)
-                try:
-                    os.remove(file_path)
-                    cleared_count += 1
-                    self.logger.debug("Cleared cache file: %s", filename)
-                except Exception as e:
-                    self.logger.warning("Error clearing cache file %s: %s", filename, e)
+            cleared_count += self.store.clear()
             
             if cleared_count > 0:
-                self.logger.info("Cleared all folder cache - removed %d files", cleared_count)
+                self.logger.info("Cleared all folder cache - removed %d entries", cleared_count)
             
         except Exception as e:
             self.logger.error("Error clearing all cache: %s", e)
@@ -594,17 +523,23 @@ class FolderCache:
     
     def cleanup(self) -> int:
         """
-        Full cache cleanup - removes expired files and old schema versions
+        Full cache cleanup - removes expired entries and old schema versions
         
         Returns:
-            int: Total number of files cleaned up
+            int: Total number of entries cleaned up
         """
         expired_count = self.cleanup_expired()
         schema_count = self.cleanup_old_schemas()
+        outdated_count = 0
+        if not self.serve_outdated:
+            try:
+                outdated_count = self.store.delete_outdated()
+            except Exception as e:
+                self.logger.error("Error removing outdated cache entries: %s", e)
         
-        total = expired_count + schema_count
+        total = expired_count + schema_count + outdated_count
         if total > 0:
-            self.logger.info("Full cache cleanup completed - %d total files removed", total)
+            self.logger.info("Full cache cleanup completed - %d total entries removed", total)
         
         return total
     
@@ -616,21 +551,26 @@ class FolderCache:
         total_requests = stats['hits'] + stats['misses']
         hit_rate = (stats['hits'] / total_requests * 100) if total_requests > 0 else 0
         
-        # Get cache directory info
+        # Get cache store info
         cache_info = {}
         try:
-            if os.path.exists(self.cache_dir):
-                cache_files = [f for f in os.listdir(self.cache_dir) 
-                             if f.startswith('folder_') and f.endswith('.json')]
-                cache_info = {
-                    'cached_folders': len(cache_files),
-                    'cache_dir_size_mb': sum(
-                        os.path.getsize(os.path.join(self.cache_dir, f)) 
-                        for f in cache_files
-                    ) / (1024 * 1024)
-                }
+            cached_folders, payload_bytes = self.store.summary()
+            cache_info = {
+                'cached_folders': cached_folders,
+                'payload_size_mb': payload_bytes / (1024 * 1024),
+                'cache_dir_size_mb': (os.path.getsize(self.store.path)
+                                      if os.path.exists(self.store.path) else 0) / (1024 * 1024)
+            }
+        except Exception as e:
+            self.logger.warning("Error getting cache store info: %s", e)
+        
+        # Navigation visits and how many were served by the cache-only path
+        navigation = {}
+        try:
+            from lib.utils.visit_telemetry import get_visit_telemetry
+            navigation = get_visit_telemetry().get_stats()
         except Exception as e:
-            self.logger.warning("Error getting cache directory info: %s", e)
+            self.logger.warning("Error getting navigation stats: %s", e)
         
         return {
             'performance': {
@@ -638,6 +578,7 @@ class FolderCache:
                 'hit_rate_percent': round(hit_rate, 2)
             },
             'cache_info': cache_info,
+            'navigation': navigation,
             'config': {
                 'schema_version': self.schema_version,
                 'fresh_ttl_hours': self.fresh_ttl_hours,
@@ -671,6 +612,9 @@ class FolderCache:
                         self.logger.debug("Pre-warm: folder %s became fresh while waiting for lock", folder_id)
                         return True
                     
+                    # Taken before reading, so a change made meanwhile outdates this build
+                    generation = self.generation(folder_id)
+                    
                     # Get data layer for folder information (no UI operations)
                     from lib.data.query_manager import get_query_manager
                     query_manager = get_query_manager()
@@ -751,6 +695,8 @@ class FolderCache:
                         # Pre-compute breadcrumb components for subfolder
                         breadcrumb_data = {
                             'directory_title': folder_name,
+                            'folder_name': folder_name,
+                            'folder_id': folder_id,
                             'tools_label': f"for '{folder_name}'",
                             'tools_description': f"Tools and options for this folder"
                         }
@@ -762,7 +708,7 @@ class FolderCache:
                         }
                     
                     # Cache the payload (without additional locking since we're already in a lock)
-                    self._set_without_lock(folder_id, cacheable_payload, int(warm_time_ms))
+                    self._set_without_lock(folder_id, cacheable_payload, int(warm_time_ms), generation)
                     
                     self.logger.debug("Pre-warm: folder %s completed in %.2f ms", folder_id, warm_time_ms)
                     return True
@@ -775,6 +721,38 @@ class FolderCache:
             self.logger.error("Error pre-warming folder %s: %s", folder_id, e)
             return False
     
+    def refresh_in_background(self, folder_id: Optional[str]) -> bool:
+        """
+        Rebuild a stale folder entry on a background thread (stale-while-revalidate)
+        
+        The rebuild is pre_warm_folder(): same payload as a foreground build,
+        under the folder's build lock, written as one atomic store row.
+        
+        Returns:
+            bool: False if a refresh of this folder is already running in this process
+        """
+        key = folder_key(folder_id)
+        with self._locks_mutex:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+        
+        def background_refresh():
+            try:
+                if self.pre_warm_folder(None if key == 'root' else key):
+                    self.logger.debug("Background refresh completed for folder %s", key)
+                else:
+                    self.logger.warning("Background refresh failed for folder %s", key)
+            finally:
+                with self._locks_mutex:
+                    self._refreshing.discard(key)
+        
+        # Not a daemon: a plugin invocation's interpreter waits for it after the
+        # directory has been handed to Kodi, so the entry is written before exit
+        refresh_thread = threading.Thread(target=background_refresh, name=f"FolderCacheRefresh-{key}")
+        refresh_thread.start()
+        return True
+    
     def _build_root_processed_items(self, all_lists, all_folders):
         """Build processed menu items for root folder with business logic applied
         
@@ -1030,39 +1008,71 @@ class FolderCache:
                 common_folders.append(str(startup_folder_id))
                 self.logger.debug("Pre-warm: included startup folder %s", startup_folder_id)
             
-            # Get root-level subfolders (most commonly accessed)
+            # Then the folders users open most, per recorded navigation visits
+            try:
+                from lib.utils.visit_telemetry import get_visit_telemetry, FOLDER
+                hot_ids = [folder_id for folder_id in get_visit_telemetry().hottest(FOLDER, max_folders)
+                           if folder_id != 'root' and folder_id not in common_folders]
+                if hot_ids:
+                    # Only folders that still exist, kept in visit order
+                    placeholders = ','.join('?' * len(hot_ids))
+                    existing = {str(row['id']) for row in query_manager.connection_manager.execute_query(
+                        f"SELECT id FROM folders WHERE id IN ({placeholders})", hot_ids)}
+                    for folder_id in hot_ids:
+                        if folder_id in existing and len(common_folders) < max_folders:
+                            common_folders.append(folder_id)
+            except Exception as e:
+                self.logger.warning("Pre-warm: failed to rank folders by visits: %s", e)
+            
+            # Fill up with root-level subfolders while few visits have been recorded
             try:
-                # Adjust limit to account for root and startup folder
+                # Adjust limit to account for the folders chosen so far
                 folders_remaining = max_folders - len(common_folders)
-                with query_manager.connection_manager.transaction() as conn:
-                    root_subfolders = conn.execute("""
-                        SELECT id, name
-                        FROM folders 
-                        WHERE parent_id IS NULL OR parent_id = ''
-                        ORDER BY name
-                        LIMIT ?
-                    """, [folders_remaining]).fetchall()
+                if folders_remaining > 0:
+                    with query_manager.connection_manager.transaction() as conn:
+                        root_subfolders = conn.execute("""
+                            SELECT id, name
+                            FROM folders 
+                            WHERE parent_id IS NULL OR parent_id = ''
+                            ORDER BY name
+                            LIMIT ?
+                        """, (max_folders,)).fetchall()
                     
                     for subfolder in root_subfolders:
                         folder_id = str(subfolder['id'])
-                        # Skip startup folder if already added
-                        if folder_id != startup_folder_id:
+                        if len(common_folders) >= max_folders:
+                            break
+                        # Skip folders already added
+                        if folder_id not in common_folders:
                             common_folders.append(folder_id)
                         
             except Exception as e:
                 self.logger.warning("Pre-warm: failed to get root subfolders: %s", e)
-                # Continue with root and startup folders
+                # Continue with the folders chosen so far
             
-            # Pre-warm folders
+            # Pre-warm folders within the time and disk budgets
             results = {
                 "success": True,
-                "folders_attempted": len(common_folders),
+                "folders_attempted": 0,
                 "folders_success": 0,
                 "folders_failed": 0,
                 "errors": []
             }
+            deadline = pre_warm_start + self.prewarm_seconds
+            max_bytes = self.max_cache_mb * 1024 * 1024
             
             for folder_id in common_folders:
+                if time.time() >= deadline:
+                    results["stopped"] = "time budget"
+                    break
+                try:
+                    if self.store.summary()[1] >= max_bytes:
+                        results["stopped"] = "disk budget"
+                        break
+                except Exception as e:
+                    self.logger.warning("Pre-warm: could not read cache size: %s", e)
+                
+                results["folders_attempted"] += 1
                 try:
                     self.logger.debug("Pre-warming cache for folder %s", folder_id)
                     if self.pre_warm_folder(folder_id):
@@ -1078,8 +1088,9 @@ class FolderCache:
             pre_warm_time = (time.time() - pre_warm_start) * 1000
             results["total_time_ms"] = int(pre_warm_time)
             
-            self.logger.info("Pre-warming completed: %d/%d folders warmed in %.2f ms", 
-                           results["folders_success"], results["folders_attempted"], pre_warm_time)
+            self.logger.info("Pre-warming completed: %d/%d folders warmed in %.2f ms%s", 
+                           results["folders_success"], results["folders_attempted"], pre_warm_time,
+                           f" (stopped at {results['stopped']})" if results.get("stopped") else "")
             
             return results
             
@@ -1100,10 +1111,10 @@ class FolderCache:
             # Ensure cache directory exists
             os.makedirs(self.cache_dir, exist_ok=True)
             
-            # Clean up expired files
-            cleaned_count = self.cleanup_expired()
+            # Clean up expired entries, old schemas and pre-store JSON files
+            cleaned_count = self.cleanup()
             if cleaned_count > 0:
-                self.logger.info("Cache service: cleaned up %d expired files", cleaned_count)
+                self.logger.info("Cache service: cleaned up %d expired entries", cleaned_count)
             
             # Use configuration setting if not explicitly specified
             if enable_pre_warming is None:
@@ -1137,18 +1148,28 @@ class FolderCache:
             return False
     
     def invalidate_folder(self, folder_id: Optional[str]) -> bool:
-        """Invalidate cache for a specific folder"""
+        """Invalidate cache for a specific folder by advancing its generation"""
+        return self.invalidate_folders([folder_id])
+    
+    def invalidate_folders(self, folder_ids) -> bool:
+        """Invalidate cache for several folders in one generation bump"""
+        folder_ids = list(folder_ids)
         try:
-            file_path = self._get_cache_file_path(folder_id)
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                self.logger.debug("Invalidated cache for folder %s", folder_id)
-                return True
-            else:
-                self.logger.debug("No cache file to invalidate for folder %s", folder_id)
-                return False
+            self.store.bump(folder_key(folder_id) for folder_id in folder_ids)
+            self.logger.debug("Invalidated cache for folders %s", folder_ids)
+            return True
+        except Exception as e:
+            self.logger.error("Error invalidating cache for folders %s: %s", folder_ids, e)
+            return False
+    
+    def invalidate_all(self) -> bool:
+        """Invalidate every cached folder by advancing the global generation"""
+        try:
+            self.store.bump([GLOBAL_GENERATION_KEY])
+            self.logger.debug("Invalidated cache for all folders")
+            return True
         except Exception as e:
-            self.logger.error("Error invalidating cache for folder %s: %s", folder_id, e)
+            self.logger.error("Error invalidating cache for all folders: %s", e)
             return False
     
     def invalidate_parent_folder(self, folder_id: Optional[str]) -> bool:
@@ -1212,9 +1233,10 @@ class FolderCache:
                         affected_folders.append(subfolder_id)
                         folders_to_check.append(subfolder_id)
             
-            # Invalidate all affected folders
+            # Invalidate all affected folders in one generation bump
+            invalidated = self.invalidate_folders(affected_folders)
             for affected_folder_id in affected_folders:
-                results[affected_folder_id] = self.invalidate_folder(affected_folder_id)
+                results[affected_folder_id] = invalidated
             
             invalidated_count = sum(1 for success in results.values() if success)
             self.logger.info("Invalidated %d/%d folders in hierarchy for %s", 
@@ -1324,4 +1346,16 @@ def get_folder_cache(schema_version: int = CACHE_SCHEMA_VERSION) -> FolderCache:
         if _folder_cache_instance is None or _folder_cache_instance.schema_version != schema_version:
             _folder_cache_instance = FolderCache(schema_version=schema_version)
     
-    return _folder_cache_instance
\ No newline at end of file
+    return _folder_cache_instance
+
+
+def _drop_folder_cache():
+    """Rebuild the instance with current settings on next use"""
+    global _folder_cache_instance
+    with _instance_lock:
+        if _folder_cache_instance is not None:
+            _folder_cache_instance.store.close()
+        _folder_cache_instance = None
+
+
+on_generation_change(_drop_folder_cache)
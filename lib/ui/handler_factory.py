@@ -9,6 +9,7 @@ Provides lazy instantiation of handlers to improve plugin startup performance
 import time
 from typing import Dict, Optional, Any, Callable
 from lib.utils.kodi_log import get_kodi_logger
+from lib.utils.invocation_state import on_invocation_end
 from lib.ui.plugin_context import PluginContext
 
 
@@ -83,4 +84,14 @@ def get_handler_factory() -> HandlerFactory:
     global _handler_factory
     if _handler_factory is None:
         _handler_factory = HandlerFactory()
-    return _handler_factory
\ No newline at end of file
+    return _handler_factory
+
+
+def _release_handlers():
+    """Handlers keep the PluginContext of the call that built them"""
+    if _handler_factory is not None:
+        _handler_factory.clear_cache()
+        _handler_factory.context = None
+
+
+on_invocation_end(_release_handlers)
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - List Page Cache
+Rendered list pages (ListItem render specs per page) with the folder cache's
+schema, TTL and generation semantics, plus the playback state overlay and
+render specs of single media items
+"""
+
+import os
+import time
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+from lib.utils.kodi_log import get_kodi_logger
+from lib.utils.invocation_state import on_generation_change
+from lib.utils.folder_cache_store import CACHE_SCHEMA_VERSION, CACHE_CODEC, GLOBAL_GENERATION_KEY
+from lib.utils import cache_codec
+from lib.utils.list_cache_store import ListPageStore, page_key, playback_key
+
+
+class ListPageCache:
+    """
+    Cache of rendered show_list pages.
+
+    A page payload holds one render spec per directory item, so plugin.py can
+    replay it with only xbmcgui and xbmcplugin. Lists are invalidated by
+    advancing their generation (or the global one); playcount and resume
+    points are kept apart and overlaid when a page is rendered.
+
+    Uses the folder cache settings: the master switch, fresh TTL, hard expiry
+    and pre-warm budgets.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.logger = get_kodi_logger('lib.ui.list_cache')
+        self._load_configuration()
+
+        if cache_dir is None:
+            import xbmcvfs
+            profile_dir = xbmcvfs.translatePath('special://profile/')
+            cache_dir = os.path.join(profile_dir, 'addon_data', 'plugin.video.librarygenie', 'cache', 'lists')
+
+        self.cache_dir = cache_dir
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError as e:
+            self.logger.error("Failed to create list cache directory %s: %s", cache_dir, e)
+        self.store = ListPageStore(cache_dir)
+
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+
+    def _load_configuration(self):
+        """Load cache configuration from the folder cache settings"""
+        try:
+            from lib.config.settings import SettingsManager
+            settings = SettingsManager()
+            self.cache_enabled = settings.get_folder_cache_enabled()
+            self.fresh_ttl_hours = settings.get_folder_cache_fresh_ttl()
+            self.hard_expiry_hours = settings.get_folder_cache_hard_expiry() * 24
+            self.prewarm_max_lists = settings.get_folder_cache_prewarm_max_folders()
+            self.prewarm_seconds = settings.get_folder_cache_prewarm_seconds()
+            self.max_cache_mb = settings.get_folder_cache_max_mb()
+        except Exception as e:
+            self.logger.warning("Failed to load list cache configuration, using defaults: %s", e)
+            self.cache_enabled = True
+            self.fresh_ttl_hours = 12
+            self.hard_expiry_hours = 24 * 30
+            self.prewarm_max_lists = 10
+            self.prewarm_seconds = 10
+            self.max_cache_mb = 20
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+    def generation(self, list_id) -> Optional[tuple]:
+        """Current (list, global) generation; pass to set_page when the page was read after it"""
+        try:
+            return self.store.generation(str(list_id))
+        except Exception as e:
+            self.logger.warning("Error reading generation for list %s: %s", list_id, e)
+            return None
+
+    def is_fresh(self, list_id, page: int = 1) -> bool:
+        """True if a current, unexpired page of the current schema is stored"""
+        try:
+            header = self.store.header(page_key(list_id, page))
+        except Exception as e:
+            self.logger.warning("Error reading list cache header for list %s: %s", list_id, e)
+            return False
+        return bool(header and header[0] == CACHE_SCHEMA_VERSION and header[2]
+                    and header[1] > time.time() - self.fresh_ttl_hours * 3600)
+
+    def get_page(self, list_id, page: int = 1) -> Optional[Tuple[Dict[str, Any], Dict[str, tuple]]]:
+        """(payload, playback_states) of a fresh page, or None"""
+        if not self.cache_enabled:
+            return None
+        try:
+            entry = self.store.get(page_key(list_id, page))
+            if (entry is None or entry[0] != CACHE_SCHEMA_VERSION or not entry[3]
+                    or entry[1] <= time.time() - self.fresh_ttl_hours * 3600):
+                self._count('misses')
+                return None
+            payload = cache_codec.decode(entry[2])
+            if payload is None:
+                self._count('misses')
+                return None
+            self._count('hits')
+            return payload, entry[4]
+        except Exception as e:
+            self._count('errors')
+            self.logger.error("Error reading cached page %s of list %s: %s", page, list_id, e)
+            return None
+
+    def set_page(self, list_id, page: int, payload: Dict[str, Any], generation: Optional[tuple] = None) -> bool:
+        """
+        Store a rendered page
+
+        Args:
+            generation: generation(list_id) taken before the list was read from
+                the database; defaults to the generation at write time
+        """
+        if not self.cache_enabled:
+            return False
+        try:
+            from lib.utils.render_spec import playback_keys
+            if generation is None:
+                generation = self.store.generation(str(list_id))
+            serialized = cache_codec.encode(payload, CACHE_CODEC)
+            self.store.put(page_key(list_id, page), str(list_id), CACHE_SCHEMA_VERSION, time.time(),
+                           generation, playback_keys(payload.get('items', [])), serialized)
+            self._count('writes')
+            self.logger.debug("Cached page %s of list %s (%d items, %d bytes)",
+                              page, list_id, len(payload.get('items', [])), len(serialized))
+            return True
+        except Exception as e:
+            self._count('errors')
+            self.logger.error("Error caching page %s of list %s: %s", page, list_id, e)
+            return False
+
+    def playback_states(self, keys: List[str]) -> Dict[str, tuple]:
+        """Last known (playcount, position, total) per playback key"""
+        try:
+            return self.store.playback_states(keys)
+        except Exception as e:
+            self.logger.warning("Error reading playback states: %s", e)
+            return {}
+
+    def record_playback(self, media_type: str, kodi_id, playcount: int, position: float, total: float) -> bool:
+        """Remember a library item's playcount and resume point for the overlay"""
+        try:
+            self.store.set_playback_state(playback_key(media_type, int(kodi_id)), int(playcount or 0),
+                                          float(position or 0), float(total or 0), time.time())
+            return True
+        except Exception as e:
+            self.logger.error("Error recording playback state for %s %s: %s", media_type, kodi_id, e)
+            return False
+
+    def item_specs(self, keys: Dict[int, Tuple[str, int]]) -> Dict[int, list]:
+        """
+        Stored render specs of media items
+
+        Args:
+            keys: (content_updated_at, kodi_major) per media_item_id; a spec built
+                from another content_updated_at or Kodi version is left out
+        """
+        if not self.cache_enabled or not keys:
+            return {}
+        try:
+            rows = self.store.item_specs(list(keys))
+        except Exception as e:
+            self.logger.warning("Error reading item render specs: %s", e)
+            return {}
+        specs = {}
+        for media_item_id, (content_updated_at, kodi_major, schema_version, data) in rows.items():
+            if (content_updated_at, kodi_major) == keys[media_item_id] and schema_version == CACHE_SCHEMA_VERSION:
+                spec = cache_codec.decode(data)
+                if spec is not None:
+                    specs[media_item_id] = spec
+        return specs
+
+    def set_item_specs(self, specs: List[Tuple[int, str, int, list]]) -> bool:
+        """Store (media_item_id, content_updated_at, kodi_major, spec) render specs"""
+        if not self.cache_enabled or not specs:
+            return False
+        try:
+            built_at = time.time()
+            self.store.put_item_specs([(media_item_id, content_updated_at, kodi_major, CACHE_SCHEMA_VERSION,
+                                        built_at, cache_codec.encode(spec, CACHE_CODEC))
+                                       for media_item_id, content_updated_at, kodi_major, spec in specs])
+            self.logger.debug("Cached render specs of %d media items", len(specs))
+            return True
+        except Exception as e:
+            self.logger.error("Error caching item render specs: %s", e)
+            return False
+
+    def invalidate_lists(self, list_ids) -> bool:
+        """Invalidate every page of several lists in one generation bump"""
+        list_ids = [str(list_id) for list_id in list_ids if list_id is not None]
+        try:
+            self.store.bump(list_ids)
+            self.logger.debug("Invalidated list cache for lists %s", list_ids)
+            return True
+        except Exception as e:
+            self.logger.error("Error invalidating list cache for lists %s: %s", list_ids, e)
+            return False
+
+    def invalidate_all(self) -> bool:
+        """Invalidate every cached page by advancing the global generation"""
+        try:
+            self.store.bump([GLOBAL_GENERATION_KEY])
+            self.logger.debug("Invalidated list cache for all lists")
+            return True
+        except Exception as e:
+            self.logger.error("Error invalidating list cache for all lists: %s", e)
+            return False
+
+    def cleanup(self) -> int:
+        """Remove expired, old-schema and outdated pages and trim playback states and item specs"""
+        removed = 0
+        try:
+            removed += self.store.delete_built_before(time.time() - self.hard_expiry_hours * 3600)
+            removed += self.store.delete_other_schemas(CACHE_SCHEMA_VERSION)
+            removed += self.store.delete_outdated()
+            self.store.trim_playback_states()
+            self.store.trim_item_specs(CACHE_SCHEMA_VERSION)
+            if removed:
+                self.logger.info("List cache cleanup removed %d pages", removed)
+        except Exception as e:
+            self.logger.error("Error during list cache cleanup: %s", e)
+        return removed
+
+    def clear_all(self) -> int:
+        try:
+            cleared = self.store.clear()
+            if cleared:
+                self.logger.info("Cleared list cache - removed %d pages", cleared)
+            return cleared
+        except Exception as e:
+            self.logger.error("Error clearing list cache: %s", e)
+            return 0
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        try:
+            pages, payload_bytes = self.store.summary()
+        except Exception as e:
+            self.logger.warning("Error summarizing list cache: %s", e)
+            pages, payload_bytes = 0, 0
+        return {
+            'performance': stats,
+            'cache_info': {
+                'cached_pages': pages,
+                'payload_size_mb': round(payload_bytes / (1024 * 1024), 2)
+            }
+        }
+
+    def pre_warm_list(self, list_id) -> bool:
+        """Build and store the first page of a list unless a fresh one is stored
+
+        False if the list could not be loaded; empty and uncacheable lists are
+        built but not stored.
+        """
+        if self.is_fresh(list_id, 1):
+            return True
+        from lib.ui.plugin_context import PluginContext
+        from lib.ui.lists_handler import ListsHandler
+        context = PluginContext()
+        context.params = {'action': 'show_list', 'list_id': str(list_id), 'page': '1'}
+        page = ListsHandler(context).build_list_page(context, str(list_id), 1)
+        return page is not None
+
+    def pre_warm_lists(self, max_lists: Optional[int] = None) -> Dict[str, Any]:
+        """Pre-warm the first page of the most visited lists within the time and disk budgets"""
+        results = {"success": True, "lists_attempted": 0, "lists_success": 0, "lists_failed": 0}
+        if not self.cache_enabled:
+            return dict(results, success=False, error="List cache disabled in settings")
+
+        from lib.utils.visit_telemetry import get_visit_telemetry, LIST
+        start = time.time()
+        deadline = start + self.prewarm_seconds
+        max_bytes = self.max_cache_mb * 1024 * 1024
+        for list_id in get_visit_telemetry().hottest(LIST, max_lists or self.prewarm_max_lists):
+            if time.time() >= deadline:
+                results["stopped"] = "time budget"
+                break
+            try:
+                if self.store.summary()[1] >= max_bytes:
+                    results["stopped"] = "disk budget"
+                    break
+            except Exception as e:
+                self.logger.warning("List pre-warm: could not read cache size: %s", e)
+
+            results["lists_attempted"] += 1
+            try:
+                if self.pre_warm_list(list_id):
+                    results["lists_success"] += 1
+                else:
+                    results["lists_failed"] += 1
+            except Exception as e:
+                results["lists_failed"] += 1
+                self.logger.error("Error pre-warming list %s: %s", list_id, e)
+
+        results["total_time_ms"] = int((time.time() - start) * 1000)
+        self.logger.info("List pre-warming completed: %d/%d lists warmed in %d ms",
+                         results["lists_success"], results["lists_attempted"], results["total_time_ms"])
+        return results
+
+
+# Global list page cache instance
+_list_cache_instance = None
+_list_cache_lock = threading.Lock()
+
+
+def get_list_cache() -> ListPageCache:
+    """Get global list page cache instance"""
+    global _list_cache_instance
+    if _list_cache_instance is None:
+        with _list_cache_lock:
+            if _list_cache_instance is None:
+                _list_cache_instance = ListPageCache()
+    return _list_cache_instance
+
+
+def _drop_list_cache():
+    """Rebuild the instance with current settings on next use"""
+    global _list_cache_instance
+    with _list_cache_lock:
+        if _list_cache_instance is not None:
+            _list_cache_instance.store.close()
+        _list_cache_instance = None
+
+
+on_generation_change(_drop_list_cache)
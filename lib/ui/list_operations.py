@@ -85,7 +85,10 @@ class ListOperations:
                         VALUES (?, ?, COALESCE((SELECT MAX(position) + 1 FROM list_items WHERE list_id = ?), 0))
                     """, [target_list_id, media_item_id, target_list_id])
                     self.logger.debug("Added library item to list %s", target_list_id)
-                    return {"success": True}
+
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().invalidate_lists([target_list_id])
+            return {"success": True}
         
         except Exception as e:
             self.logger.error("Error in _add_library_item_to_list_internal: %s", e, exc_info=True)
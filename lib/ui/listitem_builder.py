@@ -43,6 +43,14 @@ class ListItemBuilder:
         self.art_manager = ListItemArtManager(addon_id)
         self.context_menu_builder = ContextMenuBuilder(addon_id)
 
+        # ListItem class for built rows; build_specs swaps in a recording one
+        self._listitem_class = xbmcgui.ListItem
+
+        # Render specs of library rows for the batch being built, by media_item_id,
+        # and the (media_item_id, content_updated_at, kodi_major, spec) built during it
+        self._item_specs: Dict[int, list] = {}
+        self._new_item_specs: List[tuple] = []
+
     # -------- public API --------
     def build_directory(self, items: List[Dict[str, Any]], content_type: Optional[str] = None) -> bool:
         """
@@ -71,57 +79,12 @@ class ListItemBuilder:
             xbmcplugin.setContent(self.addon_handle, content_type)
 
             # Add a few sane sort methods once
-            sort_methods = [
-                ("SORT_METHOD_TITLE_IGNORE_THE", xbmcplugin.SORT_METHOD_TITLE_IGNORE_THE),
-                ("SORT_METHOD_DATEADDED", xbmcplugin.SORT_METHOD_DATEADDED),
-                ("SORT_METHOD_VIDEO_YEAR", xbmcplugin.SORT_METHOD_VIDEO_YEAR),
-            ]
-            for method_name, const in sort_methods:
+            for const in self._directory_sort_methods():
                 xbmcplugin.addSortMethod(self.addon_handle, const)
 
-            tuples: List[tuple] = []
-            ok = 0
-            fail = 0
-            
-            for idx, raw in enumerate(items, start=1):
-                try:
-                    item = self._normalize_item(raw)  # canonical shape
-                    built = self._build_single_item(item)
-                    if built:
-                        url, listitem, is_folder = built
-                        title = item.get('title', 'Unknown')
-                        
-                        # Critical check for empty URLs in directory build
-                        if not url or not url.strip():
-                            self.logger.error("PLAYBACK_DEBUG: ❌ CRITICAL - Empty URL being added to directory for '%s' at position %s!", title, idx)
-
-                        tuples.append((url, listitem, is_folder, item))  # Include item data for context menu
-                        ok += 1
-                    else:
-                        fail += 1
-                        self.logger.warning("DIRECTORY BUILD: failed to build #%s: '%s'", idx, raw.get('title','Unknown'))
-                except Exception as ie:
-                    fail += 1
-                    self.logger.error("DIRECTORY BUILD: exception for #%s: %s", idx, ie)
-
-            self.logger.info("DIRECTORY BUILD: Processed %s items - %s OK, %s failed", count, ok, fail)
-
-            # OPTIMIZED: Prepare items for batch rendering
-            batch_items = []
-            
-            for idx, (url, li, is_folder, item) in enumerate(tuples, start=1):
-                # Set properties for global context menu detection
-                media_item_id = item.get('media_item_id') or item.get('id')
-                if media_item_id:
-                    li.setProperty('media_item_id', str(media_item_id))
-
-                # Set list context if available
-                list_id = item.get('list_id') or self.context.get_param('list_id')
-                if list_id:
-                    li.setProperty('list_id', str(list_id))
-
-                batch_items.append((url, li, is_folder))
-
+            batch_items, tuples = self._build_batch(items)
+            ok = len(batch_items)
+            fail = count - ok
 
             # OPTIMIZED: Add all items in a single batch operation
             self.logger.debug("DIRECTORY BUILD: Adding %s directory items to Kodi in batch", len(batch_items))
@@ -163,7 +126,149 @@ class ListItemBuilder:
             self.logger.error("DIRECTORY BUILD: ❌ Failed to build directory - Complete build time: %.3f seconds", total_build_time)
             return False
 
+    def build_specs(self, items: List[Dict[str, Any]]) -> Tuple[str, List[int], List[list]]:
+        """
+        Build items as render specs instead of adding them to the directory.
+
+        Returns:
+            (content_type, sort_methods, specs) as build_directory would apply them;
+            specs replay through lib.utils.render_spec
+        """
+        from lib.data.query_manager import get_query_manager
+        from lib.utils.render_spec import RecordingListItem
+        content_type = get_query_manager().detect_content_type(items)
+
+        self._listitem_class = RecordingListItem
+        try:
+            batch_items, tuples = self._build_batch(items)
+        finally:
+            self._listitem_class = xbmcgui.ListItem
+
+        specs = []
+        for (url, li, is_folder), (_, _, _, item) in zip(batch_items, tuples):
+            specs.append(li.spec(url, is_folder, self._playback_key(item)))
+        self.logger.debug("DIRECTORY BUILD: Built %s render specs (content_type='%s')", len(specs), content_type)
+        return content_type, self._directory_sort_methods(), specs
+
     # -------- internals --------
+    def _directory_sort_methods(self) -> List[int]:
+        return [
+            xbmcplugin.SORT_METHOD_TITLE_IGNORE_THE,
+            xbmcplugin.SORT_METHOD_DATEADDED,
+            xbmcplugin.SORT_METHOD_VIDEO_YEAR,
+        ]
+
+    def _build_batch(self, items: List[Dict[str, Any]]) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Build each item and set its list context properties.
+
+        Returns:
+            (batch_items, tuples): (url, listitem, is_folder) per built item, and
+            the same with the normalized item dict appended
+        """
+        tuples: List[tuple] = []
+        fail = 0
+        self._load_item_specs(items)
+        
+        for idx, raw in enumerate(items, start=1):
+            try:
+                item = self._normalize_item(raw)  # canonical shape
+                built = self._build_single_item(item)
+                if built:
+                    url, listitem, is_folder = built
+                    title = item.get('title', 'Unknown')
+                    
+                    # Critical check for empty URLs in directory build
+                    if not url or not url.strip():
+                        self.logger.error("PLAYBACK_DEBUG: ❌ CRITICAL - Empty URL being added to directory for '%s' at position %s!", title, idx)
+
+                    tuples.append((url, listitem, is_folder, item))  # Include item data for context menu
+                else:
+                    fail += 1
+                    self.logger.warning("DIRECTORY BUILD: failed to build #%s: '%s'", idx, raw.get('title','Unknown'))
+            except Exception as ie:
+                fail += 1
+                self.logger.error("DIRECTORY BUILD: exception for #%s: %s", idx, ie)
+
+        self.logger.info("DIRECTORY BUILD: Processed %s items - %s OK, %s failed", len(items), len(tuples), fail)
+        self._store_item_specs()
+
+        # OPTIMIZED: Prepare items for batch rendering
+        batch_items = []
+        
+        for url, li, is_folder, item in tuples:
+            # Set properties for global context menu detection
+            media_item_id = item.get('media_item_id') or item.get('id')
+            if media_item_id:
+                li.setProperty('media_item_id', str(media_item_id))
+
+            # Set list context if available
+            list_id = item.get('list_id') or self.context.get_param('list_id')
+            if list_id:
+                li.setProperty('list_id', str(list_id))
+
+            batch_items.append((url, li, is_folder))
+
+        return batch_items, tuples
+
+    def _item_spec_key(self, item: Dict[str, Any]) -> Optional[Tuple[int, str, int]]:
+        """
+        (media_item_id, content_updated_at, kodi_major) for library rows whose render
+        spec depends only on their media_items row, else None.
+
+        Search history rows are excluded: their titles carry the list's score prefix.
+        """
+        media_item_id = item.get('media_item_id') or item.get('id')
+        content_updated_at = item.get('content_updated_at')
+        if (not media_item_id or not content_updated_at or item.get('search_score') is not None
+                or item.get('media_type') not in ('movie', 'episode')
+                or not self._is_valid_library_id(item.get('kodi_id'))):
+            return None
+        try:
+            return int(media_item_id), str(content_updated_at), get_kodi_major_version()
+        except (TypeError, ValueError):
+            return None
+
+    def _load_item_specs(self, items: List[Dict[str, Any]]):
+        """Fetch the stored render specs of the batch's library rows in one read"""
+        self._item_specs = {}
+        self._new_item_specs = []
+        keys = {}
+        for item in items:
+            key = self._item_spec_key(item)
+            if key:
+                keys[key[0]] = key[1:]
+        if not keys:
+            return
+        try:
+            from lib.ui.list_cache import get_list_cache
+            self._item_specs = get_list_cache().item_specs(keys)
+            self.logger.debug("DIRECTORY BUILD: %d of %d library rows have a stored render spec",
+                              len(self._item_specs), len(keys))
+        except Exception as e:
+            self.logger.warning("DIRECTORY BUILD: Could not load item render specs: %s", e)
+
+    def _store_item_specs(self):
+        """Store the render specs built during the batch"""
+        new_specs, self._new_item_specs = self._new_item_specs, []
+        self._item_specs = {}
+        if not new_specs:
+            return
+        try:
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().set_item_specs(new_specs)
+        except Exception as e:
+            self.logger.warning("DIRECTORY BUILD: Could not store item render specs: %s", e)
+
+    def _playback_key(self, item: Dict[str, Any]) -> Optional[str]:
+        """Playback state key for library movies and episodes, else None"""
+        media_type = item.get('media_type')
+        kodi_id = item.get('kodi_id')
+        if media_type in ('movie', 'episode') and self._is_valid_library_id(kodi_id):
+            from lib.utils.list_cache_store import playback_key
+            return playback_key(media_type, int(kodi_id))
+        return None
+
     def _get_resource_path(self, name: str) -> str:
         """Get absolute path to addon resource (cached for efficiency)"""
         import os
@@ -251,8 +356,48 @@ class ListItemBuilder:
     # ----- library & external builders -----
     def _create_library_listitem(self, item: Dict[str, Any]) -> Optional[tuple]:
         """
-        Build library-backed movie/episode row as (url, listitem, is_folder=False)
-        using direct file paths for reliable playback across all Kodi versions.
+        Build library-backed movie/episode row as (url, listitem, is_folder=False).
+
+        Everything but the list context menu comes from the row's render spec
+        when one is stored for it; otherwise the row is built and its spec
+        recorded for the next render.
+        """
+        key = self._item_spec_key(item)
+        spec = self._item_specs.get(key[0]) if key else None
+        if spec is not None:
+            from lib.utils.render_spec import apply_calls
+            playback_url, is_folder, label, calls = spec[:4]
+            li = self._listitem_class(label=label, offscreen=True)
+            apply_calls(li, calls)
+        else:
+            recording = key is not None and self._listitem_class is xbmcgui.ListItem
+            if recording:
+                from lib.utils.render_spec import RecordingListItem
+                self._listitem_class = RecordingListItem
+            try:
+                built = self._build_library_listitem(item)
+            finally:
+                if recording:
+                    self._listitem_class = xbmcgui.ListItem
+            if not built:
+                return None
+            playback_url, li, is_folder = built
+            if key is not None:
+                # The spec holds the row's calls only; the context menu below depends on the list
+                url, folder, label, calls, _ = li.spec(playback_url, is_folder)
+                self._new_item_specs.append(key + ([url, folder, label, list(calls), None],))
+            if recording:
+                li = li.listitem
+
+        # Add context menu options for list items
+        self._add_media_context_menu(li, item, item.get('media_type', 'movie'), item.get('kodi_id'),
+                                     item.get('title', 'Unknown'))
+        return playback_url, li, is_folder
+
+    def _build_library_listitem(self, item: Dict[str, Any]) -> Optional[tuple]:
+        """
+        Build the row part of a library-backed movie/episode item, using direct
+        file paths for reliable playback across all Kodi versions.
         """
         try:
             title = item.get('title', 'Unknown')
@@ -279,7 +424,7 @@ class ListItemBuilder:
                 # Movies and other media types - include year if present
                 display_label = f"{title} ({item['year']})" if item.get('year') else title
 
-            li = xbmcgui.ListItem(label=display_label, offscreen=True)
+            li = self._listitem_class(label=display_label, offscreen=True)
 
             # Use direct file path for consistent playback behavior across all Kodi versions
             file_path = item.get('file_path') or item.get('play')
@@ -373,9 +518,6 @@ class ListItemBuilder:
             except Exception as debug_e:
                 self.logger.warning("PLAYBACK_DEBUG: Failed final validation for '%s': %s", title, debug_e)
 
-            # Add context menu options for list items
-            self._add_media_context_menu(li, item, media_type, kodi_id, title)
-            
             return playback_url, li, is_folder
         except Exception as e:
             self.logger.error("LIB ITEM: failed for '%s': %s", item.get('title','Unknown'), e)
@@ -444,7 +586,7 @@ class ListItemBuilder:
             action = item.get('action', '')
 
             # Create folder ListItem that Kodi will treat as a navigable directory
-            li = xbmcgui.ListItem(label=title, offscreen=True)
+            li = self._listitem_class(label=title, offscreen=True)
 
             # Ensure it's treated as a folder, not a playable item
             li.setProperty('IsPlayable', 'false')
@@ -538,7 +680,7 @@ class ListItemBuilder:
             title = item.get('title', 'Unknown')
 
             display_label = f"{title} ({item['year']})" if item.get('year') else title
-            li = xbmcgui.ListItem(label=display_label, offscreen=True)
+            li = self._listitem_class(label=display_label, offscreen=True)
 
             # Apply metadata based on Kodi version - CONSOLIDATED
             plot_text = item.get('plot', '')
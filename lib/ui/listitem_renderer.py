@@ -11,6 +11,7 @@ import xbmcgui
 import xbmcplugin
 import xbmcvfs
 from lib.utils.kodi_log import get_kodi_logger
+from lib.utils.invocation_state import on_invocation_end
 from lib.ui.localization import L
 from lib.utils.kodi_version import get_kodi_major_version, is_kodi_v21_plus
 
@@ -556,4 +557,8 @@ def get_listitem_renderer(addon_handle: Optional[int] = None, addon_id: Optional
 def clear_renderer_cache():
     """Clear renderer cache - useful for testing and memory management"""
     global _renderer_cache
-    _renderer_cache.clear()
\ No newline at end of file
+    _renderer_cache.clear()
+
+
+# Renderers are keyed by the handle of one plugin call
+on_invocation_end(clear_renderer_cache)
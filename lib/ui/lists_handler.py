@@ -16,7 +16,8 @@ from lib.ui.plugin_context import PluginContext
 from lib.ui.response_types import DirectoryResponse, DialogResponse
 from lib.ui.localization import L
 from lib.ui.breadcrumb_helper import get_breadcrumb_helper
-from lib.utils.kodi_log import get_kodi_logger
+from lib.utils.kodi_log import get_kodi_logger, debug_enabled
+from lib.utils.directory_emitter import DirectoryEmitter
 from lib.data.query_manager import get_query_manager
 from lib.utils.kodi_version import get_kodi_major_version
 from lib.ui.dialog_service import get_dialog_service
@@ -24,7 +25,7 @@ from lib.ui.dialog_service import get_dialog_service
 # Import the specialized operation modules
 from lib.ui.list_operations import ListOperations
 from lib.ui.folder_operations import FolderOperations
-from lib.ui.folder_cache import get_folder_cache
+from lib.ui.folder_cache import get_folder_cache, CACHE_SCHEMA_VERSION
 from lib.ui.menu_helpers import (
     build_folder_context_menu,
     build_list_context_menu,
@@ -223,10 +224,11 @@ class ListsHandler:
                 
                 # Apply custom artwork if valid
                 if art_data and isinstance(art_data, dict):
-                    self.logger.info("LISTITEM ART: Applying custom art to %s '%s' with %d types: %s", 
-                                   item_type, item_name, len(art_data), list(art_data.keys()))
-                    for art_type, art_path in art_data.items():
-                        self.logger.debug("  - %s: %s", art_type, os.path.basename(art_path) if art_path and not art_path.startswith('http') else art_path[:50])
+                    if debug_enabled():
+                        self.logger.debug("LISTITEM ART: Applying custom art to %s '%s' with %d types: %s",
+                                          item_type, item_name, len(art_data), list(art_data.keys()))
+                        for art_type, art_path in art_data.items():
+                            self.logger.debug("  - %s: %s", art_type, os.path.basename(art_path) if art_path and not art_path.startswith('http') else art_path[:50])
                     renderer.art_manager.apply_art(list_item, art_data, fallback_icon='DefaultFolder.png')
                     return
 
@@ -390,7 +392,10 @@ class ListsHandler:
             folder_cache = get_folder_cache()
             folder_id = None  # Root folder
             cache_key = "root" if folder_id is None else folder_id
-            cached_data = folder_cache.get(cache_key)
+            cached_data = folder_cache.get(cache_key, allow_stale=True)
+            if cached_data and not folder_cache.is_fresh(cache_key):
+                # Serve the stale view now; the next visit gets the rebuilt one
+                folder_cache.refresh_in_background(cache_key)
             
             all_lists = None
             all_folders = None
@@ -413,6 +418,7 @@ class ListsHandler:
                 # CACHE MISS: Initialize DB and query, then cache the result
                 self.logger.debug("CACHE MISS: Root folder not cached, querying database")
                 processed_menu_items = None
+                generation = folder_cache.generation(cache_key)
                 all_lists = []
                 all_folders = []
                 
@@ -467,7 +473,7 @@ class ListsHandler:
                 )
                 
                 cache_key = "root" if folder_id is None else folder_id
-                cache_success = folder_cache.set(cache_key, cache_payload, int(db_query_time))
+                cache_success = folder_cache.set(cache_key, cache_payload, int(db_query_time), generation)
                 if cache_success:
                     self.logger.debug("CACHE UPDATE: Successfully stored root folder")
                 else:
@@ -523,21 +529,10 @@ class ListsHandler:
                     })
 
                     # Build directory items
+                    emitter = DirectoryEmitter(context.addon_handle)
                     for item in menu_items:
-                        list_item = xbmcgui.ListItem(label=item['label'], offscreen=True)
-
-                        if 'description' in item:
-                            self._set_listitem_plot(list_item, item['description'])
-
-                        if 'icon' in item:
-                            list_item.setArt({'icon': item['icon'], 'thumb': item['icon']})
-
-                        xbmcplugin.addDirectoryItem(
-                            context.addon_handle,
-                            item['url'],
-                            list_item,
-                            item['is_folder']
-                        )
+                        emitter.add_item(item, resource_fallback=False, playable=None)
+                    emitter.flush()
 
                     # Determine if this is a refresh or initial load
                     is_refresh = context.get_param('rt') is not None  # Refresh token indicates mutation/refresh
@@ -661,6 +656,7 @@ class ListsHandler:
             gui_build_start = time.time()
             self.logger.debug("TIMING: Starting GUI building for %d items", len(menu_items))
             
+            emitter = DirectoryEmitter(context.addon_handle)
             for i, item in enumerate(menu_items):
                 item_start = time.time()
                 
@@ -675,16 +671,12 @@ class ListsHandler:
                 if 'context_menu' in item:
                     list_item.addContextMenuItems(item['context_menu'])
 
-                xbmcplugin.addDirectoryItem(
-                    context.addon_handle,
-                    item['url'],
-                    list_item,
-                    item['is_folder']
-                )
+                emitter.add(item['url'], list_item, item['is_folder'])
                 
                 item_time = (time.time() - item_start) * 1000
                 if item_time > 5.0:  # Only log slow items to avoid spam
                     self.logger.debug("TIMING: Item %d ('%s') took %.2f ms", i, item['label'], item_time)
+            emitter.flush()
             
             gui_build_time = (time.time() - gui_build_start) * 1000
             self.logger.debug("TIMING: GUI building for %d items took %.2f ms (avg %.2f ms/item)", 
@@ -720,12 +712,15 @@ class ListsHandler:
 
             # CACHE-FIRST: Check cache before ANY database operations (zero-DB overhead on HIT)
             folder_cache = get_folder_cache()
-            cached_data = folder_cache.get(folder_id)
+            cached_data = folder_cache.get(folder_id, allow_stale=True)
+            if cached_data and not folder_cache.is_fresh(folder_id):
+                # Serve the stale view now; the next visit gets the rebuilt one
+                folder_cache.refresh_in_background(folder_id)
             
             # Check if using modern processed cache format (V4+)
             schema_version = cached_data.get('_schema') if cached_data else None
             
-            if cached_data and schema_version in [4, 6, 7, 8, 9, 10, 11, 12, 13]:
+            if cached_data and schema_version == CACHE_SCHEMA_VERSION:
                 # V4 CACHE HIT: Use pre-built processed menu items (ultra-fast)
                 cache_used = True
                 processed_items = cached_data.get('processed_items', [])
@@ -769,25 +764,11 @@ class ListsHandler:
                 # Convert processed items directly to ListItems for ultra-fast rendering
                 gui_build_start = time.time()
                 
+                # Same items and art as plugin.py's cache-only render of this folder
+                emitter = DirectoryEmitter(context.addon_handle)
                 for item in processed_items:
-                    list_item = xbmcgui.ListItem(label=item['label'], offscreen=True)
-                    
-                    if 'description' in item and item['description']:
-                        self._set_listitem_plot(list_item, item['description'])
-                    
-                    if 'icon' in item:
-                        list_item.setArt({'icon': item['icon'], 'thumb': item['icon']})
-                    
-                    # Add context menu if present
-                    if 'context_menu' in item and item['context_menu']:
-                        list_item.addContextMenuItems(item['context_menu'])
-                    
-                    xbmcplugin.addDirectoryItem(
-                        context.addon_handle,
-                        item['url'],
-                        list_item,
-                        item.get('is_folder', True)
-                    )
+                    emitter.add_item(item)
+                emitter.flush()
                 
                 gui_build_time = (time.time() - gui_build_start) * 1000
                 self.logger.debug("V4 CACHE: Rendered %d items in %.2f ms (avg %.2f ms/item)", 
@@ -843,6 +824,7 @@ class ListsHandler:
             else:
                 # CACHE MISS: Initialize DB and query, then cache the result
                 self.logger.debug("CACHE MISS: Folder %s not cached, querying database", folder_id)
+                generation = folder_cache.generation(folder_id)
                 
                 # Only initialize query manager on cache miss
                 query_manager = self.query_manager
@@ -870,6 +852,8 @@ class ListsHandler:
                 folder_name = folder_info.get('name', 'Unknown Folder') if folder_info else 'Unknown Folder'
                 cached_breadcrumbs = {
                     'directory_title': folder_name,
+                    'folder_name': folder_name,
+                    'folder_id': folder_id,
                     'tools_label': f"for '{folder_name}'",
                     'tools_description': f"Tools and options for this folder"
                 }
@@ -900,7 +884,7 @@ class ListsHandler:
                     folder_id, len(processed_menu_items), len(subfolders), len(lists_in_folder), folder_info is not None
                 )
                 
-                cache_success = folder_cache.set(folder_id, cache_payload, int(db_query_time))
+                cache_success = folder_cache.set(folder_id, cache_payload, int(db_query_time), generation)
                 if cache_success:
                     self.logger.debug("CACHE UPDATE: Successfully stored folder %s", folder_id)
                 else:
@@ -1059,6 +1043,7 @@ class ListsHandler:
                 )
 
             # Build directory items
+            emitter = DirectoryEmitter(context.addon_handle)
             for item in menu_items:
                 list_item = xbmcgui.ListItem(label=item['label'], offscreen=True)
 
@@ -1071,12 +1056,8 @@ class ListsHandler:
                 if 'context_menu' in item:
                     list_item.addContextMenuItems(item['context_menu'])
 
-                xbmcplugin.addDirectoryItem(
-                    context.addon_handle,
-                    item['url'],
-                    list_item,
-                    item['is_folder']
-                )
+                emitter.add(item['url'], list_item, item['is_folder'])
+            emitter.flush()
 
             # Use navigation policy to determine navigation mode
             from lib.ui.nav_policy import decide_mode
@@ -1121,175 +1102,36 @@ class ListsHandler:
                 # This will be used by Kodi for the ".." navigation
                 xbmcplugin.setProperty(context.addon_handle, 'ParentDir', parent_path)
 
-            # Initialize query manager
-            query_manager = get_query_manager()
-            if not query_manager.initialize():
-                context.logger.error("Failed to initialize query manager")
-                return DirectoryResponse(
-                    items=[],
-                    success=False
-                )
+            # Get pagination parameters
+            current_page = int(context.get_param('page', '1'))
 
-            # Get list info
-            list_info = query_manager.get_list_by_id(list_id)
-            if not list_info:
-                context.logger.error("List %s not found in database", list_id)
+            built = self.build_list_page(context, list_id, current_page)
+            if built is None:
                 return DirectoryResponse(
                     items=[],
                     success=False
                 )
+            page, list_items, _ = built
 
-            # Get pagination parameters
-            current_page = int(context.get_param('page', '1'))
-
-            # Import pagination manager
-            from lib.ui.pagination_manager import get_pagination_manager
-            pagination_manager = get_pagination_manager()
-
-            # Check if this is an intersection list
-            is_intersection = query_manager.is_intersection_list(int(list_id))
-            
-            # Get list items based on list type
-            if is_intersection:
-                # For intersection lists, get dynamically computed items (no pagination needed)
-                list_items = query_manager.get_intersection_list_items(int(list_id))
-                total_items = len(list_items)
-                
-                # Calculate pagination for intersection lists
-                pagination_info = pagination_manager.calculate_pagination(
-                    total_items=total_items,
-                    current_page=current_page,
-                    base_page_size=100  # Base size for auto mode calculation
-                )
-                
-                # Apply pagination to intersection list items
-                start_idx = pagination_info.start_index
-                end_idx = start_idx + pagination_info.page_size
-                list_items = list_items[start_idx:end_idx]
-                
-                context.logger.debug("Intersection list %s: %d total items, showing %d-%d", 
-                                   list_id, total_items, start_idx, end_idx)
-            else:
-                # For regular lists, use existing pagination logic
-                total_items = query_manager.get_list_item_count(int(list_id))
-
-                # Calculate pagination using settings-based page size
-                pagination_info = pagination_manager.calculate_pagination(
-                    total_items=total_items,
-                    current_page=current_page,
-                    base_page_size=100  # Base size for auto mode calculation
-                )
-
-                # Get list items with pagination
-                list_items = query_manager.get_list_items(
-                    list_id,
-                    limit=pagination_info.page_size,
-                    offset=pagination_info.start_index
-                )
-            
-            # Check if this is a search history list
-            search_folder_id = query_manager.get_or_create_search_history_folder()
-            is_search_history_list = (search_folder_id and 
-                                     str(list_info.get('folder_id')) == str(search_folder_id))
-            
-            # Initialize sort methods
-            sort_methods = None
-            
-            # For search history lists, add score prefix to titles and sort by title
-            if is_search_history_list:
-                for item in list_items:
-                    score = item.get('search_score')
-                    if score is not None:
-                        # Normalize score to 0-999 range (assuming API returns 0-1 float)
-                        # If score is already in 0-999 range, use it as is
-                        if 0 <= score <= 1:
-                            normalized_score = int(score * 999)
-                        else:
-                            normalized_score = int(score) if 0 <= score <= 999 else 0
-                        
-                        # Add zero-padded 3-digit prefix to title
-                        original_title = item.get('title', 'Unknown')
-                        item['title'] = f"{normalized_score:03d} {original_title}"
-                        context.logger.debug("Added score prefix to '%s': score=%.3f -> %03d", 
-                                           original_title, score, normalized_score)
-                
-                # Sort by title in descending order to show highest scores first
-                list_items.sort(key=lambda x: x.get('title', ''), reverse=True)
-                context.logger.debug("Sorted %d search history items by title (descending) - highest scores first", len(list_items))
-                
-                # Set UNSORTED sort method to preserve Python sort order and prevent skin from overriding
-                sort_methods = [xbmcplugin.SORT_METHOD_UNSORTED]
-                context.logger.debug("Set SORT_METHOD_UNSORTED to preserve score-based ordering")
-
-            context.logger.debug("List '%s' has %s items", list_info['name'], len(list_items))
-
-            # Set directory title with breadcrumb context (add intersection indicator)
-            directory_title = self.breadcrumb_helper.get_directory_title_breadcrumb("show_list", {"list_id": list_id}, query_manager)
-            if is_intersection and directory_title:
-                directory_title = f"∩ {directory_title}"
-            if directory_title:
-                try:
-                    # Set the directory title in Kodi using proper window property API
-                    window = xbmcgui.Window(10025)  # Video window
-                    window.setProperty('FolderName', directory_title)
-                    self.logger.debug("Set directory title: '%s'", directory_title)
-                except Exception as e:
-                    self.logger.debug("Could not set directory title: %s", e)
-
-            # Add Tools & Options using centralized builder with visibility check
-            breadcrumb_text, description_prefix = self.breadcrumb_helper.get_tools_breadcrumb_formatted("show_list", {"list_id": list_id}, query_manager)
-            
-            tools_menu_dict = self.breadcrumb_helper.build_tools_menu_item(
-                base_url=context.base_url,
-                list_type='user_list',
-                breadcrumb_text=breadcrumb_text,
-                description_text=description_prefix + "Tools and options for this list",
-                list_id=list_id
-            )
-            
-            # Only add if visibility setting allows it
-            if tools_menu_dict:
-                tools_item = xbmcgui.ListItem(label=tools_menu_dict['label'], offscreen=True)
-                self._set_listitem_plot(tools_item, tools_menu_dict.get('description', ''))
-                tools_item.setProperty('IsPlayable', 'false')
-                tools_item.setArt({'icon': tools_menu_dict['icon'], 'thumb': tools_menu_dict['icon']})
-
-                xbmcplugin.addDirectoryItem(
-                    context.addon_handle,
-                    tools_menu_dict['url'],
-                    tools_item,
-                    tools_menu_dict['is_folder']
-                )
+            # Use navigation mode for update_listing decision
+            update_listing = (nav_mode == 'replace')
+            from lib.ui.response_types import NavigationIntent
+            intent = NavigationIntent(mode=nav_mode if nav_mode != 'push' else None, url=None)
 
-            # Add "Save as a list" item for Search History lists
-            if is_search_history_list:
-                save_as_list_item = xbmcgui.ListItem(label=L(30371), offscreen=True)
-                self._set_listitem_plot(save_as_list_item, 'Convert this search history to a regular list')
-                save_as_list_item.setArt({'icon': 'DefaultFolder.png', 'thumb': 'DefaultFolder.png'})
-
-                save_url = context.build_url('save_search_history_as_list', list_id=list_id)
-                xbmcplugin.addDirectoryItem(
-                    context.addon_handle,
-                    save_url,
-                    save_as_list_item,
-                    True  # Set as folder item so it navigates instead of playing
-                )
+            from lib.utils.render_spec import add_items, render_page, playback_keys, VIDEO_WINDOW_ID
 
             # Handle empty lists using lightweight method to avoid loading full renderer
             if not list_items:
                 context.logger.debug("List is empty")
+                if page['directory_title']:
+                    xbmcgui.Window(VIDEO_WINDOW_ID).setProperty('FolderName', page['directory_title'])
+                add_items(context.addon_handle, page['items'], kodi_major=page['kodi_major'])
                 self._create_simple_empty_state_item(
                     context,
                     L(30602),
                     'This list contains no items'  # This string should also be localized
                 )
 
-                # Use navigation mode for update_listing decision
-                update_listing = (nav_mode == 'replace')
-
-                from lib.ui.response_types import NavigationIntent
-                intent = NavigationIntent(mode=nav_mode if nav_mode != 'push' else None, url=None)
-
                 return DirectoryResponse(
                     items=[],
                     success=True,
@@ -1298,58 +1140,12 @@ class ListsHandler:
                     intent=intent
                 )
 
-            # Add pagination controls if needed
-            if pagination_info.total_pages > 1:
-                # Build base URL for pagination navigation - use raw base URL and include all params
-                base_url = context.base_url.rstrip('/')
-                url_params = {
-                    'action': 'show_list',
-                    'list_id': list_id
-                }  # Include action and list_id in parameters
-
-                # Insert pagination controls into list_items
-                list_items = pagination_manager.insert_pagination_items(
-                    items=list_items,
-                    pagination_info=pagination_info,
-                    base_url=base_url,
-                    url_params=url_params,
-                    placement='bottom'
-                )
-                context.logger.debug("Added pagination controls to list (page %d/%d)",
-                                   pagination_info.current_page, pagination_info.total_pages)
-
-            # Set sort methods BEFORE building directory (must be set before endOfDirectory is called)
-            if sort_methods:
-                for sort_method in sort_methods:
-                    xbmcplugin.addSortMethod(context.addon_handle, sort_method)
-                context.logger.debug("Applied sort methods before building directory: %s", sort_methods)
-            
-            # Build media items using ListItemBuilder
+            # Render through the same specs the list cache stores, with playback state overlaid
             try:
-                from lib.ui.listitem_builder import ListItemBuilder
-                builder = ListItemBuilder(context.addon_handle, context.addon_id, context)
-                # Use auto-detect for content type (None) instead of hardcoding "movies"
-                success = builder.build_directory(list_items, None)
-                
-                if success:
-                    context.logger.debug("Successfully built directory with %s items", len(list_items))
-
-                    # Determine if this is a refresh or initial load
-                    is_refresh = context.get_param('rt') is not None  # Refresh token indicates mutation/refresh
-
-                    # Use navigation mode for update_listing decision
-                    update_listing = (nav_mode == 'replace')
-                    from lib.ui.response_types import NavigationIntent
-                    intent = NavigationIntent(mode=nav_mode if nav_mode != 'push' else None, url=None)
-
-                    # Return proper DirectoryResponse
-                    return DirectoryResponse(
-                        items=list_items,
-                        success=True,
-                        content_type="movies" if list_items and list_items[0].get('media_type') == 'movie' else "files",
-                        update_listing=update_listing, # REPLACE for same list, PUSH for different list
-                        intent=intent
-                    )
+                from lib.ui.list_cache import get_list_cache
+                states = get_list_cache().playback_states(playback_keys(page['items']))
+                render_page(context.addon_handle, page, states)
+                context.logger.debug("Successfully built directory with %s items", len(list_items))
             except Exception as e:
                 context.logger.error("Error building list items: %s", e)
                 return DirectoryResponse(
@@ -1357,35 +1153,12 @@ class ListsHandler:
                     success=False
                 )
 
-            # Determine content type for the list
-            detected_content_type = "files"  # Default
-            if list_items:
-                first_item = list_items[0]
-                media_type = first_item.get('media_type', 'unknown')
-                if media_type in ['movie', 'tvshow']:
-                    detected_content_type = "movies" if media_type == 'movie' else "tvshows"
-                elif media_type == 'episode':
-                    detected_content_type = "episodes"
-
-            context.logger.debug("Using content type: %s for list with %s items", detected_content_type, len(list_items))
-
-            # Set content type for better Kodi integration
-            xbmcplugin.setContent(context.addon_handle, detected_content_type)
-
-            # Determine if this is a refresh or initial load
-            is_refresh = context.get_param('rt') is not None  # Refresh token indicates mutation/refresh
-
-            # Use navigation mode for update_listing decision
-            update_listing = (nav_mode == 'replace')
-            from lib.ui.response_types import NavigationIntent
-            intent = NavigationIntent(mode=nav_mode if nav_mode != 'push' else None, url=None)
-
+            # Return proper DirectoryResponse
             return DirectoryResponse(
                 items=list_items,
                 success=True,
-                content_type=detected_content_type,
+                content_type="movies" if list_items and list_items[0].get('media_type') == 'movie' else "files",
                 update_listing=update_listing, # REPLACE for same list, PUSH for different list
-                sort_methods=sort_methods,
                 intent=intent
             )
 
@@ -1398,6 +1171,196 @@ class ListsHandler:
                 success=False
             )
 
+    def build_list_page(self, context: PluginContext, list_id: str, current_page: int = 1):
+        """
+        Build one page of a list as a render page (see lib.utils.render_spec.render_page)
+        and store it in the list cache when the list is cacheable.
+
+        Returns:
+            (page, list_items, cached), or None if the list could not be loaded.
+            For an empty list, page['items'] holds only the header items.
+        """
+        from lib.ui.list_cache import get_list_cache
+        list_cache = get_list_cache()
+        # Taken before reading the list so a change made meanwhile outdates the stored page
+        generation = list_cache.generation(list_id)
+
+        # Initialize query manager
+        query_manager = get_query_manager()
+        if not query_manager.initialize():
+            context.logger.error("Failed to initialize query manager")
+            return None
+
+        # Get list info
+        list_info = query_manager.get_list_by_id(list_id)
+        if not list_info:
+            context.logger.error("List %s not found in database", list_id)
+            return None
+
+        # Import pagination manager
+        from lib.ui.pagination_manager import get_pagination_manager
+        pagination_manager = get_pagination_manager()
+
+        # Check if this is an intersection list
+        is_intersection = query_manager.is_intersection_list(int(list_id))
+
+        # Get list items based on list type
+        if is_intersection:
+            # For intersection lists, get dynamically computed items (no pagination needed)
+            list_items = query_manager.get_intersection_list_items(int(list_id))
+            total_items = len(list_items)
+
+            # Calculate pagination for intersection lists
+            pagination_info = pagination_manager.calculate_pagination(
+                total_items=total_items,
+                current_page=current_page,
+                base_page_size=100  # Base size for auto mode calculation
+            )
+
+            # Apply pagination to intersection list items
+            start_idx = pagination_info.start_index
+            end_idx = start_idx + pagination_info.page_size
+            list_items = list_items[start_idx:end_idx]
+
+            context.logger.debug("Intersection list %s: %d total items, showing %d-%d",
+                               list_id, total_items, start_idx, end_idx)
+        else:
+            # For regular lists, use existing pagination logic
+            total_items = query_manager.get_list_item_count(int(list_id))
+
+            # Calculate pagination using settings-based page size
+            pagination_info = pagination_manager.calculate_pagination(
+                total_items=total_items,
+                current_page=current_page,
+                base_page_size=100  # Base size for auto mode calculation
+            )
+
+            # Get list items with pagination
+            list_items = query_manager.get_list_items(
+                list_id,
+                limit=pagination_info.page_size,
+                offset=pagination_info.start_index
+            )
+
+        # Check if this is a search history list
+        search_folder_id = query_manager.get_or_create_search_history_folder()
+        is_search_history_list = (search_folder_id and
+                                 str(list_info.get('folder_id')) == str(search_folder_id))
+
+        # Initialize sort methods
+        sort_methods = []
+
+        # For search history lists, add score prefix to titles and sort by title
+        if is_search_history_list:
+            for item in list_items:
+                score = item.get('search_score')
+                if score is not None:
+                    # Normalize score to 0-999 range (assuming API returns 0-1 float)
+                    # If score is already in 0-999 range, use it as is
+                    if 0 <= score <= 1:
+                        normalized_score = int(score * 999)
+                    else:
+                        normalized_score = int(score) if 0 <= score <= 999 else 0
+
+                    # Add zero-padded 3-digit prefix to title
+                    original_title = item.get('title', 'Unknown')
+                    item['title'] = f"{normalized_score:03d} {original_title}"
+                    context.logger.debug("Added score prefix to '%s': score=%.3f -> %03d",
+                                       original_title, score, normalized_score)
+
+            # Sort by title in descending order to show highest scores first
+            list_items.sort(key=lambda x: x.get('title', ''), reverse=True)
+            context.logger.debug("Sorted %d search history items by title (descending) - highest scores first", len(list_items))
+
+            # Set UNSORTED sort method to preserve Python sort order and prevent skin from overriding
+            sort_methods = [xbmcplugin.SORT_METHOD_UNSORTED]
+            context.logger.debug("Set SORT_METHOD_UNSORTED to preserve score-based ordering")
+
+        context.logger.debug("List '%s' has %s items", list_info['name'], len(list_items))
+
+        # Directory title with breadcrumb context (add intersection indicator)
+        directory_title = self.breadcrumb_helper.get_directory_title_breadcrumb("show_list", {"list_id": list_id}, query_manager)
+        if is_intersection and directory_title:
+            directory_title = f"∩ {directory_title}"
+
+        from lib.utils.render_spec import RecordingListItem
+        header_specs = []
+
+        # Add Tools & Options using centralized builder with visibility check
+        breadcrumb_text, description_prefix = self.breadcrumb_helper.get_tools_breadcrumb_formatted("show_list", {"list_id": list_id}, query_manager)
+
+        tools_menu_dict = self.breadcrumb_helper.build_tools_menu_item(
+            base_url=context.base_url,
+            list_type='user_list',
+            breadcrumb_text=breadcrumb_text,
+            description_text=description_prefix + "Tools and options for this list",
+            list_id=list_id
+        )
+
+        # Only add if visibility setting allows it
+        if tools_menu_dict:
+            tools_item = RecordingListItem(label=tools_menu_dict['label'], offscreen=True)
+            self._set_listitem_plot(tools_item, tools_menu_dict.get('description', ''))
+            tools_item.setProperty('IsPlayable', 'false')
+            tools_item.setArt({'icon': tools_menu_dict['icon'], 'thumb': tools_menu_dict['icon']})
+            header_specs.append(tools_item.spec(tools_menu_dict['url'], tools_menu_dict['is_folder']))
+
+        # Add "Save as a list" item for Search History lists
+        if is_search_history_list:
+            save_as_list_item = RecordingListItem(label=L(30371), offscreen=True)
+            self._set_listitem_plot(save_as_list_item, 'Convert this search history to a regular list')
+            save_as_list_item.setArt({'icon': 'DefaultFolder.png', 'thumb': 'DefaultFolder.png'})
+
+            save_url = context.build_url('save_search_history_as_list', list_id=list_id)
+            # Set as folder item so it navigates instead of playing
+            header_specs.append(save_as_list_item.spec(save_url, True))
+
+        page = {
+            'directory_title': directory_title or '',
+            'content_type': 'files',
+            'sort_methods': sort_methods,
+            'update': current_page > 1,  # page>1 is a morph (replace)
+            'kodi_major': get_kodi_major_version(),
+            'items': header_specs
+        }
+        if not list_items:
+            return page, list_items, False
+
+        # Add pagination controls if needed
+        if pagination_info.total_pages > 1:
+            # Build base URL for pagination navigation - use raw base URL and include all params
+            base_url = context.base_url.rstrip('/')
+            url_params = {
+                'action': 'show_list',
+                'list_id': list_id
+            }  # Include action and list_id in parameters
+
+            # Insert pagination controls into list_items
+            list_items = pagination_manager.insert_pagination_items(
+                items=list_items,
+                pagination_info=pagination_info,
+                base_url=base_url,
+                url_params=url_params,
+                placement='bottom'
+            )
+            context.logger.debug("Added pagination controls to list (page %d/%d)",
+                               pagination_info.current_page, pagination_info.total_pages)
+
+        # Build media items using ListItemBuilder; content type is auto-detected
+        from lib.ui.listitem_builder import ListItemBuilder
+        builder = ListItemBuilder(context.addon_handle, context.addon_id, context)
+        content_type, builder_sort_methods, specs = builder.build_specs(list_items)
+        page['content_type'] = content_type
+        page['sort_methods'] = sort_methods + builder_sort_methods
+        page['items'] = header_specs + specs
+
+        # Intersection lists are computed from other lists and Kodi Favorites follow
+        # Kodi's favourites file, so neither has a generation that tracks its changes
+        cached = False
+        if not is_intersection and list_info.get('name') != 'Kodi Favorites':
+            cached = list_cache.set_page(list_id, current_page, page, generation)
+        return page, list_items, cached
+
     def show_search_history(self, context: PluginContext) -> DirectoryResponse:
         """Display search history lists"""
         try:
@@ -1475,24 +1438,10 @@ class ListsHandler:
                 )
 
             # Build directory items
+            emitter = DirectoryEmitter(context.addon_handle)
             for item in menu_items:
-                list_item = xbmcgui.ListItem(label=item['label'], offscreen=True)
-
-                if 'description' in item:
-                    self._set_listitem_plot(list_item, item['description'])
-
-                if 'icon' in item:
-                    list_item.setArt({'icon': item['icon'], 'thumb': item['icon']})
-
-                if 'context_menu' in item:
-                    list_item.addContextMenuItems(item['context_menu'])
-
-                xbmcplugin.addDirectoryItem(
-                    context.addon_handle,
-                    item['url'],
-                    list_item,
-                    item['is_folder']
-                )
+                emitter.add_item(item, resource_fallback=False, playable=None)
+            emitter.flush()
 
             # Determine if this is a refresh or initial load
             is_refresh = context.get_param('rt') is not None  # Refresh token indicates mutation/refresh
@@ -11,6 +11,7 @@ from lib.ui.menu_builder import MenuBuilder
 from lib.ui.plugin_context import PluginContext
 from lib.utils.kodi_log import get_kodi_logger
 from lib.utils.kodi_version import get_kodi_major_version
+from lib.utils.directory_emitter import DirectoryEmitter
 import xbmcplugin
 import xbmcaddon
 
@@ -83,13 +84,10 @@ class MainMenuHandler:
             list_items = menu_builder.build()
             
             # Add items to directory
+            emitter = DirectoryEmitter(context.addon_handle)
             for url, listitem, is_folder in list_items:
-                xbmcplugin.addDirectoryItem(
-                    handle=context.addon_handle,
-                    url=url,
-                    listitem=listitem,
-                    isFolder=is_folder
-                )
+                emitter.add(url, listitem, is_folder)
+            emitter.flush()
             
             # Set content type and finish directory
             xbmcplugin.setContent(context.addon_handle, 'files')
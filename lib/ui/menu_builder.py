@@ -14,6 +14,7 @@ import xbmcplugin
 
 from lib.utils.kodi_log import get_kodi_logger
 from lib.utils.kodi_version import get_kodi_major_version
+from lib.utils.directory_emitter import DirectoryEmitter
 from lib.ui.listitem_renderer import get_listitem_renderer
 from lib.ui.localization import L
 
@@ -109,6 +110,7 @@ class MenuBuilder:
 
         successful_items = 0
         failed_items = 0
+        emitter = DirectoryEmitter(addon_handle)
 
         # Breadcrumb notifications deprecated - replaced by Tools & Options integration
 
@@ -158,12 +160,7 @@ class MenuBuilder:
                         tools_item.setProperty('IsPlayable', 'false')
                         tools_item.setArt({'icon': tools_menu_dict['icon'], 'thumb': tools_menu_dict['icon']})
                         
-                        xbmcplugin.addDirectoryItem(
-                            addon_handle,
-                            tools_menu_dict['url'],
-                            tools_item,
-                            tools_menu_dict['is_folder']
-                        )
+                        emitter.add(tools_menu_dict['url'], tools_item, tools_menu_dict['is_folder'])
                 except Exception as e:
                     self.logger.error("MENU BUILD: Failed to add Tools & Options: %s", e)
 
@@ -171,16 +168,17 @@ class MenuBuilder:
             try:
                 item_title = item.get('title', 'Unknown')
 
-                self._add_directory_item(item, addon_handle, base_url)
+                self._add_directory_item(item, emitter, base_url)
                 successful_items += 1
             except Exception as e:
                 failed_items += 1
                 self.logger.error("MENU BUILD: Failed to add menu item %s: %s", idx+1, e)
 
+        emitter.flush()
         xbmcplugin.endOfDirectory(addon_handle, succeeded=True, updateListing=True, cacheToDisc=False)
 
-    def _add_directory_item(self, item, addon_handle, base_url):
-        """Add a single directory item with context menu support"""
+    def _add_directory_item(self, item, emitter: DirectoryEmitter, base_url):
+        """Add a single directory item with context menu support to the emitter's batch"""
         title = item.get("label", item.get("title", "Unknown"))
         action = item.get("action", "")
         description = item.get("description", "")
@@ -247,9 +245,7 @@ class MenuBuilder:
             self.logger.debug("MENU ITEM: Total context menu items for '%s': %s", title, context_items_added)
 
         # Add to directory
-        xbmcplugin.addDirectoryItem(
-            handle=addon_handle, url=url, listitem=list_item, isFolder=is_folder
-        )
+        emitter.add(url, list_item, is_folder)
         self.logger.debug("MENU ITEM: Successfully added '%s' to directory", title)
 
     def _show_breadcrumb_if_needed(self, breadcrumb_path: str):
@@ -289,16 +285,18 @@ class MenuBuilder:
         # Build movie items
         successful_movies = 0
         failed_movies = 0
+        emitter = DirectoryEmitter(addon_handle)
 
         for idx, movie in enumerate(movies):
             try:
                 self.logger.debug("MOVIE MENU: Processing movie %s/%s: '%s'", idx+1, len(movies), movie.get('title', 'Unknown'))
-                self._add_movie_item(movie, addon_handle, base_url, **options)
+                self._add_movie_item(movie, emitter, base_url, **options)
                 successful_movies += 1
             except Exception as e:
                 failed_movies += 1
                 self.logger.error("MOVIE MENU: Failed to add movie %s: %s", idx+1, e)
 
+        emitter.flush()
         self.logger.debug("MOVIE MENU: Added %s movies successfully, %s failed", successful_movies, failed_movies)
 
         # Set view mode if specified
@@ -313,8 +311,8 @@ class MenuBuilder:
         xbmcplugin.endOfDirectory(addon_handle, succeeded=True, updateListing=True, cacheToDisc=False)
         self.logger.info("MOVIE MENU: Completed movie menu build with caching disabled")
 
-    def _add_movie_item(self, movie_data: Dict[str, Any], addon_handle, base_url, **options):
-        """Add a movie item with Phase 11 enhanced ListItem"""
+    def _add_movie_item(self, movie_data: Dict[str, Any], emitter: DirectoryEmitter, base_url, **options):
+        """Add a movie item with Phase 11 enhanced ListItem to the emitter's batch"""
 
         # Create enhanced ListItem using the renderer
         list_item = self.renderer.create_movie_listitem(movie_data, base_url, action="play_movie")
@@ -369,9 +367,7 @@ class MenuBuilder:
                     self._set_listitem_plot(list_item, movie_data['description'])
 
             # Add to directory
-            xbmcplugin.addDirectoryItem(
-                handle=addon_handle, url=url, listitem=list_item, isFolder=False
-            )
+            emitter.add(url, list_item, False)
         else:
             # Log error if list_item creation failed
             movie_title = movie_data.get('title', 'Unknown')
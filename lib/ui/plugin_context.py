@@ -13,7 +13,6 @@ from typing import Dict, Any, Optional
 
 import xbmcaddon
 from lib.utils.kodi_log import get_kodi_logger
-from lib.auth.state import is_authorized
 from lib.ui.localization import L
 
 
@@ -70,6 +69,7 @@ class PluginContext:
     def is_authorized(self) -> bool:
         """Get cached authorization state"""
         if self._auth_state is None:
+            from lib.auth.state import is_authorized
             self._auth_state = is_authorized()
         return self._auth_state
 
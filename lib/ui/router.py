@@ -11,7 +11,6 @@ from lib.ui.plugin_context import PluginContext
 import xbmcgui
 import xbmcplugin
 import time
-import threading
 from lib.utils.kodi_log import get_kodi_logger
 from lib.ui.dialog_service import get_dialog_service
 # Router uses manual error handling due to boolean return type
@@ -50,6 +49,16 @@ class Router:
             self.logger.warning("ROUTER: Error getting current route info: %s", e)
             return None, {}
 
+    def _record_navigation(self, action: str, params: Dict[str, Any]):
+        """Record folder and list visits that pre-warming ranks targets by"""
+        from lib.utils.visit_telemetry import record_visit, FOLDER, LIST
+        if action == 'show_folder' and params.get('folder_id'):
+            record_visit(FOLDER, params['folder_id'])
+        elif action == 'show_list' and params.get('list_id'):
+            record_visit(LIST, params['list_id'])
+        elif action in ('', 'main_menu', 'lists', 'show_lists_menu'):
+            record_visit(FOLDER, 'root')
+
     def _get_safe_return_location(self, current_path: str) -> Optional[str]:
         """Get a safe return location that won't create navigation loops"""
         try:
@@ -498,6 +507,9 @@ class Router:
             
             conn.commit()
             
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().invalidate_lists([list_id])
+            
             xbmcgui.Dialog().notification(
                 "LibraryGenie",
                 "Converted to regular list",
@@ -522,6 +534,7 @@ class Router:
         action = context.get_param('action', '')
         params = context.get_params() # Get all params for modular tools
         self.logger.debug("Router dispatching action: '%s'", action)
+        self._record_navigation(action, params)
 
         # Generate breadcrumb context for navigation (skip for Tools & Options for performance)
         if action != "show_list_tools":
@@ -1278,12 +1291,14 @@ class Router:
             config.invalidate()
             self.logger.debug("ConfigManager cache invalidated after toggling Tools & Options visibility")
             
-            # CRITICAL: Clear folder cache to force rebuild with new visibility setting
+            # CRITICAL: Invalidate folder cache to force rebuild with new visibility setting
             try:
                 from lib.ui.folder_cache import get_folder_cache
                 folder_cache = get_folder_cache()
-                folder_cache.clear_all()
-                self.logger.debug("Folder cache cleared after toggling Tools & Options visibility")
+                folder_cache.invalidate_all()
+                from lib.ui.list_cache import get_list_cache
+                get_list_cache().invalidate_all()
+                self.logger.debug("Folder cache invalidated after toggling Tools & Options visibility")
             except Exception as cache_error:
                 self.logger.warning("Failed to clear folder cache: %s", cache_error)
             
@@ -1773,6 +1788,10 @@ class Router:
                     WHERE id = ? AND source = 'bookmark'
                 """, [new_name.strip(), int(bookmark_id)])
                 
+                # Bookmarks can be in any list
+                from lib.ui.list_cache import get_list_cache
+                get_list_cache().invalidate_all()
+                
                 xbmcgui.Dialog().notification(
                     "LibraryGenie",
                     f"Renamed bookmark to '{new_name.strip()}'",
@@ -1859,6 +1878,9 @@ class Router:
                     WHERE id = ? AND source = 'bookmark'
                 """, [int(bookmark_id)])
                 
+                from lib.ui.list_cache import get_list_cache
+                get_list_cache().invalidate_all()
+                
                 xbmcgui.Dialog().notification(
                     "LibraryGenie",
                     f"Removed bookmark '{bookmark_name}'",
@@ -1992,105 +2014,8 @@ class Router:
     
     def _trigger_background_folder_refresh(self, folder_cache, folder_id: str):
         """Trigger background refresh for stale folder (non-blocking)"""
-        def background_refresh():
-            try:
-                self.logger.debug("Background refresh started for folder %s", folder_id)
-                
-                # Build fresh payload (no UI operations in background thread)
-                with folder_cache.with_build_lock(folder_id):
-                    refresh_start = time.time()
-                    
-                    # Create minimal context for data operations only
-                    from lib.data.query_manager import get_query_manager
-                    query_manager = get_query_manager()
-                    
-                    if not query_manager.initialize():
-                        self.logger.error("Failed to initialize query manager for background refresh")
-                        return
-                    
-                    # Get folder navigation data directly
-                    navigation_data = query_manager.get_folder_navigation_batch(folder_id)
-                    
-                    if navigation_data and navigation_data.get('folder_info'):
-                        folder_info = navigation_data['folder_info']
-                        subfolders = navigation_data['subfolders']
-                        lists_in_folder = navigation_data['lists']
-                        
-                        # Build menu items (data only, no Kodi UI calls)
-                        menu_items = []
-                        
-                        # Get toggle entry once for both folders and lists
-                        from lib.config.config_manager import get_config
-                        config = get_config()
-                        is_visible = config.get_bool('show_tools_menu_item', True)
-                        toggle_label = "Hide Tools & Options Menu Item" if is_visible else "Show Tools & Options Menu Item"
-                        
-                        # Add subfolders
-                        for subfolder in subfolders:
-                            subfolder_id = subfolder.get('id')
-                            subfolder_name = subfolder.get('name', 'Unnamed Folder')
-                            
-                            # Build URL and context menu data
-                            url = f"plugin://plugin.video.librarygenie/?action=show_folder&folder_id={subfolder_id}"
-                            
-                            context_menu = [
-                                (f"Rename '{subfolder_name}'", f"RunPlugin(plugin://plugin.video.librarygenie/?action=rename_folder&folder_id={subfolder_id})"),
-                                (f"Move '{subfolder_name}'", f"RunPlugin(plugin://plugin.video.librarygenie/?action=move_folder&folder_id={subfolder_id})"),
-                                (f"Delete '{subfolder_name}'", f"RunPlugin(plugin://plugin.video.librarygenie/?action=delete_folder&folder_id={subfolder_id})"),
-                                (toggle_label, f"RunPlugin(plugin://plugin.video.librarygenie/?action=toggle_tools_menu_item)")
-                            ]
-                            
-                            menu_items.append({
-                                'label': f"📁 {subfolder_name}",
-                                'url': url,
-                                'is_folder': True,
-                                'description': "Subfolder",
-                                'context_menu': context_menu,
-                                'icon': "DefaultFolder.png"
-                            })
-                        
-                        # Add lists
-                        for list_item in lists_in_folder:
-                            list_id = list_item.get('id')
-                            name = list_item.get('name', 'Unnamed List')
-                            description = list_item.get('description', '')
-                            
-                            url = f"plugin://plugin.video.librarygenie/?action=show_list&list_id={list_id}"
-                            
-                            # Get toggle entry (reuse config from subfolder loop above)
-                            context_menu = [
-                                (f"Rename '{name}'", f"RunPlugin(plugin://plugin.video.librarygenie/?action=rename_list&list_id={list_id})"),
-                                (f"Move '{name}' to Folder", f"RunPlugin(plugin://plugin.video.librarygenie/?action=move_list_to_folder&list_id={list_id})"),
-                                (f"Export '{name}'", f"RunPlugin(plugin://plugin.video.librarygenie/?action=export_list&list_id={list_id})"),
-                                (f"Delete '{name}'", f"RunPlugin(plugin://plugin.video.librarygenie/?action=delete_list&list_id={list_id})"),
-                                (toggle_label, f"RunPlugin(plugin://plugin.video.librarygenie/?action=toggle_tools_menu_item)")
-                            ]
-                            
-                            menu_items.append({
-                                'label': name,
-                                'url': url,
-                                'is_folder': True,
-                                'description': description,
-                                'icon': "DefaultPlaylist.png",
-                                'context_menu': context_menu
-                            })
-                        
-                        refresh_time_ms = (time.time() - refresh_start) * 1000
-                        
-                        # Note: Background refresh not needed - caching handled in lists_handler.py with raw data
-                        # Don't cache UI items here as it interferes with proper data caching
-                        
-                        self.logger.debug("Background refresh completed for folder %s in %.2f ms", 
-                                        folder_id, refresh_time_ms)
-                    else:
-                        self.logger.warning("Background refresh failed for folder %s - no data", folder_id)
-                        
-            except Exception as e:
-                self.logger.error("Error in background refresh for folder %s: %s", folder_id, e)
-        
-        # Start background thread
-        refresh_thread = threading.Thread(target=background_refresh, daemon=True)
-        refresh_thread.start()
+        if not folder_cache.refresh_in_background(folder_id):
+            self.logger.debug("Background refresh already running for folder %s", folder_id)
     
     def _fallback_to_normal_folder_handling(self, context, folder_id: str) -> bool:
         """Fallback to normal folder handling when caching fails"""
@@ -7,6 +7,7 @@ Simplified search interface with dialog-based options for keyword search across
 """
 
 from __future__ import annotations
+import urllib.parse
 from typing import Optional, Dict, Any, List, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -76,7 +77,7 @@ class SearchHandler:
             # Step 4: Save results and handle user's choice
             if results.total_count > 0:
                 # Save search history and get the created list ID
-                list_id = self._save_search_history(search_terms, search_options, results)
+                list_id = self.save_search_history(search_terms, search_options, results)
 
                 if list_id:
                     # Clear any tools return location to prevent confusion
@@ -178,7 +179,7 @@ class SearchHandler:
             result.query_summary = "Search error"
             return result
 
-    def _save_search_history(self, search_terms: str, options: Dict[str, str], results):
+    def save_search_history(self, search_terms: str, options: Dict[str, str], results):
         """Save search results to search history and return the created list ID"""
         try:
             if results.total_count == 0:
@@ -298,6 +299,125 @@ class SearchHandler:
         except Exception as e:
             self._error(f"Failed to add no matches item: {e}")
 
+    def search_episode_groups(self, search_terms: str, match_logic: str = "all",
+                              search_scope: str = "both") -> List[Dict[str, Any]]:
+        """Get episode hits aggregated per show, best matching show first
+
+        Returns:
+            List of dicts with tvshow_kodi_id, tvshowtitle, hit_count and search_rank
+        """
+        query = self.query_interpreter.parse_query(
+            search_terms,
+            media_types=["episode"],
+            search_scope=search_scope,
+            match_logic=match_logic,
+            group_by_show=True,
+            page_size=500
+        )
+        return self.search_engine.search(query).items
+
+    def show_episode_groups(self, context: PluginContext, search_terms: str, match_logic: str = "all",
+                            search_scope: str = "both", movies_list_id: Optional[str] = None,
+                            movie_count: int = 0) -> bool:
+        """Render one folder per show with its number of matching episodes
+
+        Movie hits of the same search (already saved to search history) are
+        offered as a single folder on top.
+        """
+        self._ensure_handle_from_context(context)
+        try:
+            groups = self.search_episode_groups(search_terms, match_logic, search_scope)
+            self._debug(f"Episode search '{search_terms}' matched {len(groups)} shows")
+
+            directory_items = []
+            if movies_list_id:
+                listitem = xbmcgui.ListItem(label=L(32340).format(movie_count), offscreen=True)
+                listitem.setArt({'icon': 'DefaultMovies.png', 'thumb': 'DefaultMovies.png'})
+                url = context.build_url('show_list', list_id=movies_list_id)
+                directory_items.append((url, listitem, True))
+
+            encoded_terms = urllib.parse.quote_plus(search_terms)
+            for group in groups:
+                show_title = group.get('tvshowtitle') or 'Unknown'
+                listitem = xbmcgui.ListItem(label=L(32339).format(show_title, group['hit_count']), offscreen=True)
+                listitem.setArt({'icon': 'DefaultTVShows.png', 'thumb': 'DefaultTVShows.png'})
+                url = context.build_url(
+                    'search_show_episodes',
+                    q=encoded_terms,
+                    match=match_logic,
+                    scope=search_scope,
+                    tvshow_kodi_id=group['tvshow_kodi_id'],
+                    hits=group['hit_count']
+                )
+                directory_items.append((url, listitem, True))
+
+            xbmcplugin.setContent(self.addon_handle, 'tvshows')
+            xbmcplugin.addDirectoryItems(self.addon_handle, directory_items)
+            from lib.ui.nav import finish_directory
+            finish_directory(self.addon_handle, succeeded=True, update=False)
+            return True
+
+        except Exception as e:
+            self._error(f"Failed to show episode groups: {e}")
+            self._end_directory(succeeded=False, update=False)
+            return False
+
+    def show_episode_hits(self, context: PluginContext) -> bool:
+        """Render one page of the matching episodes of a single show"""
+        self._ensure_handle_from_context(context)
+        try:
+            search_terms = context.get_param('q', '')
+            match_logic = context.get_param('match', 'all')
+            search_scope = context.get_param('scope', 'both')
+            tvshow_kodi_id = int(context.get_param('tvshow_kodi_id'))
+            total_hits = int(context.get_param('hits', '0'))
+            current_page = int(context.get_param('page', '1'))
+
+            from lib.ui.pagination_manager import get_pagination_manager
+            pagination_manager = get_pagination_manager()
+            pagination_info = pagination_manager.calculate_pagination(
+                total_items=total_hits,
+                current_page=current_page,
+                base_page_size=self.query_interpreter.settings.get_search_page_size()
+            )
+
+            query = self.query_interpreter.parse_query(
+                search_terms,
+                media_types=["episode"],
+                search_scope=search_scope,
+                match_logic=match_logic,
+                tvshow_kodi_id=tvshow_kodi_id,
+                page_size=pagination_info.page_size,
+                page_offset=pagination_info.start_index
+            )
+            results = self.search_engine.search(query)
+            items = self.query_manager.get_media_items_by_ids([item['id'] for item in results.items])
+
+            if pagination_info.total_pages > 1:
+                items = pagination_manager.insert_pagination_items(
+                    items=items,
+                    pagination_info=pagination_info,
+                    base_url=context.base_url.rstrip('/'),
+                    url_params={
+                        'action': 'search_show_episodes',
+                        'q': search_terms,
+                        'match': match_logic,
+                        'scope': search_scope,
+                        'tvshow_kodi_id': str(tvshow_kodi_id),
+                        'hits': str(total_hits)
+                    },
+                    placement='bottom'
+                )
+
+            from lib.ui.listitem_builder import ListItemBuilder
+            builder = ListItemBuilder(context.addon_handle, context.addon_id, context)
+            return builder.build_directory(items, "episodes")
+
+        except Exception as e:
+            self._error(f"Failed to show episode hits: {e}")
+            self._end_directory(succeeded=False, update=False)
+            return False
+
     # Helper methods
     def _ensure_handle_from_context(self, context):
         """Extract addon handle from context if provided"""
@@ -1488,7 +1488,7 @@ class ToolsHandler:
 
             # Save results and handle
             if results.total_count > 0:
-                list_id = search_handler._save_search_history(
+                list_id = search_handler.save_search_history(
                     search_params['q'],
                     search_options,
                     results
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Cache Payload Codecs
+Serializers for folder and list cache payloads. Standard library only, so
+plugin.py's cache-only path can decode a row without loading the addon.
+
+Each encoded payload starts with a one-byte codec tag and decode() dispatches
+on it. A payload written by a codec this build does not know, or a marshal
+payload a different Python cannot read, decodes to None and is rebuilt.
+"""
+
+import json
+import struct
+import marshal
+from typing import Any, Dict, List, Optional
+
+JSON = 'json'
+MARSHAL = 'marshal'
+STRING_TABLE = 'strtab'
+
+_TAGS = {JSON: b'J', MARSHAL: b'M', STRING_TABLE: b'S'}
+
+# marshal format written; 4 is readable by every Python 3 Kodi has shipped
+_MARSHAL_VERSION = 4
+
+# String table tree tokens: uint32 of (argument << 3) | kind
+_STR = 0         # argument: string table index
+_INT = 1         # argument: value
+_NEG_INT = 2     # argument: -value
+_LIST = 3        # argument: item count, items follow
+_DICT = 4        # argument: entry count, key (a _STR token) and value follow per entry
+_CONST = 5       # argument: index into _CONSTANTS
+_FLOAT = 6       # argument: float table index
+_BIG_INT = 7     # argument: string table index of the decimal digits
+
+_CONSTANTS = (None, False, True)
+_MAX_ARGUMENT = (1 << 29) - 1
+
+
+def encode(obj: Any, codec: str) -> bytes:
+    """Serialize a JSON-compatible payload with the given codec"""
+    if codec == JSON:
+        body = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    elif codec == MARSHAL:
+        body = marshal.dumps(obj, _MARSHAL_VERSION)
+    elif codec == STRING_TABLE:
+        body = _StringTableEncoder().encode(obj)
+    else:
+        raise ValueError('Unknown cache codec: %s' % codec)
+    return _TAGS[codec] + body
+
+
+def decode(data) -> Optional[Any]:
+    """Payload from encode() output, or None if it cannot be decoded here; never raises"""
+    try:
+        if isinstance(data, str):
+            # Rows written before payloads were tagged held JSON text
+            return json.loads(data)
+        tag = data[:1]
+        if tag == b'M':
+            return marshal.loads(data[1:])
+        if tag == b'J':
+            return json.loads(bytes(data[1:]).decode('utf-8'))
+        if tag == b'S':
+            return _decode_string_table(data)
+    except Exception:
+        pass
+    return None
+
+
+class _StringTableEncoder:
+    """Interns every distinct string (keys, labels, action URLs, icon paths) once
+
+    Layout after the tag, all little endian:
+        uint32 string count, uint32 character length per string,
+        uint32 byte length of the UTF-8 string blob, the blob,
+        uint32 float count, float64 per float,
+        uint32 token count, uint32 per tree token
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.string_index: Dict[str, int] = {}
+        self.floats: List[float] = []
+        self.tokens: List[int] = []
+
+    def _string(self, value: str) -> int:
+        index = self.string_index.get(value)
+        if index is None:
+            index = self.string_index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def _add(self, obj: Any):
+        tokens = self.tokens
+        if isinstance(obj, str):
+            tokens.append(self._string(obj) << 3 | _STR)
+        elif obj is None or obj is False or obj is True:
+            tokens.append(_CONSTANTS.index(obj) << 3 | _CONST)
+        elif isinstance(obj, int):
+            if 0 <= obj <= _MAX_ARGUMENT:
+                tokens.append(obj << 3 | _INT)
+            elif -_MAX_ARGUMENT <= obj < 0:
+                tokens.append(-obj << 3 | _NEG_INT)
+            else:
+                tokens.append(self._string(str(obj)) << 3 | _BIG_INT)
+        elif isinstance(obj, float):
+            tokens.append(len(self.floats) << 3 | _FLOAT)
+            self.floats.append(obj)
+        elif isinstance(obj, (list, tuple)):
+            tokens.append(len(obj) << 3 | _LIST)
+            for item in obj:
+                self._add(item)
+        elif isinstance(obj, dict):
+            tokens.append(len(obj) << 3 | _DICT)
+            for key, value in obj.items():
+                if not isinstance(key, str):
+                    raise TypeError('String table codec needs string keys, got %r' % (key,))
+                tokens.append(self._string(key) << 3 | _STR)
+                self._add(value)
+        else:
+            raise TypeError('Cannot encode %s in a cache payload' % type(obj).__name__)
+
+    def encode(self, obj: Any) -> bytes:
+        self._add(obj)
+        if len(self.strings) > _MAX_ARGUMENT or len(self.floats) > _MAX_ARGUMENT:
+            raise ValueError('Payload too large for the string table codec')
+        blob = ''.join(self.strings).encode('utf-8')
+        count = len(self.strings)
+        return b''.join((
+            struct.pack('<I%dI' % count, count, *[len(s) for s in self.strings]),
+            struct.pack('<I', len(blob)), blob,
+            struct.pack('<I%dd' % len(self.floats), len(self.floats), *self.floats),
+            struct.pack('<I%dI' % len(self.tokens), len(self.tokens), *self.tokens),
+        ))
+
+
+def _decode_string_table(data) -> Any:
+    offset = 1
+    (count,) = struct.unpack_from('<I', data, offset)
+    lengths = struct.unpack_from('<%dI' % count, data, offset + 4)
+    offset += 4 + 4 * count
+    (blob_size,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    blob = bytes(data[offset:offset + blob_size]).decode('utf-8')
+    offset += blob_size
+
+    strings = []
+    position = 0
+    for length in lengths:
+        strings.append(blob[position:position + length])
+        position += length
+
+    (float_count,) = struct.unpack_from('<I', data, offset)
+    floats = struct.unpack_from('<%dd' % float_count, data, offset + 4)
+    offset += 4 + 8 * float_count
+    (token_count,) = struct.unpack_from('<I', data, offset)
+    tokens = iter(struct.unpack_from('<%dI' % token_count, data, offset + 4))
+
+    def value(token):
+        kind = token & 7
+        argument = token >> 3
+        if kind == _STR:
+            return strings[argument]
+        if kind == _DICT:
+            result = {}
+            for _ in range(argument):
+                key = strings[next(tokens) >> 3]
+                result[key] = value(next(tokens))
+            return result
+        if kind == _LIST:
+            return [value(next(tokens)) for _ in range(argument)]
+        if kind == _INT:
+            return argument
+        if kind == _CONST:
+            return _CONSTANTS[argument]
+        if kind == _NEG_INT:
+            return -argument
+        if kind == _FLOAT:
+            return floats[argument]
+        return int(strings[argument])
+
+    return value(next(tokens))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Directory Emitter
+Collects directory items and hands them to Kodi in one addDirectoryItems call.
+The addon path and resource artwork are looked up once per process. Only
+Kodi modules and the standard library are imported, so plugin.py's cache-only
+path can use it without loading the addon.
+"""
+
+import os
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import xbmcaddon
+import xbmcgui
+import xbmcplugin
+
+from lib.utils.kodi_log import get_kodi_logger, debug_enabled
+
+# Resource files per art kind: (icon, thumb and poster)
+_RESOURCE_FILES = {
+    'folder': ('list_folder_icon.png', 'list_folder.jpg'),
+    'list': ('list_playlist_icon.png', 'list_playlist.jpg'),
+}
+
+_addon_path: Optional[str] = None
+_resource_art: Dict[str, Dict[str, str]] = {}
+
+logger = get_kodi_logger('lib.utils.directory_emitter')
+
+
+def addon_path() -> str:
+    """Install path of the addon, read once per process"""
+    global _addon_path
+    if _addon_path is None:
+        _addon_path = xbmcaddon.Addon().getAddonInfo('path')
+    return _addon_path
+
+
+def resource_art(kind: str) -> Dict[str, str]:
+    """Art dict for 'folder' or 'list' items from the addon's resources, or {}
+
+    The files are checked once per process; callers get their own copy.
+    """
+    art = _resource_art.get(kind)
+    if art is None:
+        art = {}
+        files = _RESOURCE_FILES.get(kind)
+        if files:
+            try:
+                resources_dir = os.path.join(addon_path(), 'resources')
+                icon_path = os.path.join(resources_dir, files[0])
+                thumb_path = os.path.join(resources_dir, files[1])
+                if os.path.exists(icon_path):
+                    art['icon'] = icon_path
+                if os.path.exists(thumb_path):
+                    art['thumb'] = thumb_path
+                    art['poster'] = thumb_path
+            except Exception as e:
+                logger.warning("Could not resolve resource art for %s: %s", kind, e)
+        _resource_art[kind] = art
+    return dict(art)
+
+
+def url_art_kind(url: str) -> Optional[str]:
+    """'folder' or 'list' for plugin URLs that open a folder or list"""
+    if 'action=show_folder' in url:
+        return 'folder'
+    if 'action=show_list' in url:
+        return 'list'
+    return None
+
+
+def set_plot(listitem, plot: str, kodi_major: int):
+    """Set the plot without the setInfo() deprecation warnings of Kodi 21"""
+    if kodi_major >= 21:
+        listitem.getVideoInfoTag().setPlot(plot)
+    else:
+        listitem.setInfo('video', {'plot': plot})
+
+
+def parse_art_data(art_data) -> Optional[Dict[str, str]]:
+    """Custom art of an imported folder or list (a dict or its JSON text), or None"""
+    if isinstance(art_data, str):
+        try:
+            art_data = json.loads(art_data)
+        except ValueError:
+            return None
+    return art_data if art_data and isinstance(art_data, dict) else None
+
+
+class DirectoryEmitter:
+    """
+    Batches the items of one directory listing.
+
+    Items are added to Kodi in order by flush(), which must run before
+    endOfDirectory; several emitters for the same handle may flush in turn.
+    Nothing is added for a negative handle (not invoked as a directory).
+    """
+
+    def __init__(self, handle: int, kodi_major: Optional[int] = None):
+        self.handle = handle
+        if kodi_major is None:
+            from lib.utils.kodi_version import get_kodi_major_version
+            kodi_major = get_kodi_major_version()
+        self.kodi_major = kodi_major
+        self.items: List[Tuple[str, Any, bool]] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, url: str, listitem, is_folder: bool = True):
+        self.items.append((url, listitem, bool(is_folder)))
+
+    def add_item(self, item: Dict[str, Any], resource_fallback: bool = True, playable: Optional[bool] = False):
+        """
+        Build and add a navigation item from a menu item dict
+
+        Uses label, url, is_folder (default True), description, art_data,
+        icon and context_menu. Art is the item's art_data, else the addon's
+        folder or list art for show_folder/show_list URLs when
+        resource_fallback is set, else icon, else Kodi's default folder or
+        video icon. IsPlayable is set when playable is not None.
+
+        Returns the ListItem.
+        """
+        label = item.get('label', 'Unknown Item')
+        url = item.get('url', '')
+        is_folder = item.get('is_folder', True)
+        listitem = xbmcgui.ListItem(label=label, offscreen=True)
+
+        if item.get('description'):
+            set_plot(listitem, item['description'], self.kodi_major)
+
+        art = parse_art_data(item.get('art_data'))
+        if art is not None:
+            if debug_enabled():
+                logger.debug("Custom art for '%s': %s", label, art)
+        elif resource_fallback:
+            kind = url_art_kind(url)
+            art = resource_art(kind) if kind else None
+        if not art and item.get('icon'):
+            art = {'icon': item['icon'], 'thumb': item['icon']}
+        if not art:
+            default_icon = 'DefaultFolder.png' if is_folder else 'DefaultVideo.png'
+            art = {'icon': default_icon, 'thumb': default_icon}
+        listitem.setArt(art)
+
+        if item.get('context_menu'):
+            listitem.addContextMenuItems(item['context_menu'])
+        if playable is not None:
+            listitem.setProperty('IsPlayable', 'true' if playable else 'false')
+
+        self.add(url, listitem, is_folder)
+        return listitem
+
+    def flush(self) -> int:
+        """Add the collected items to the directory; returns how many were added"""
+        count = len(self.items)
+        if count and self.handle >= 0:
+            xbmcplugin.addDirectoryItems(self.handle, self.items, count)
+            if debug_enabled():
+                logger.debug("Added %d directory items to handle %s", count, self.handle)
+        self.items = []
+        return count
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Folder Cache Store
+Single-file keyed store for folder view payloads. Has no Kodi imports and no
+addon imports beyond the payload codecs, so plugin.py's cache-only path can
+read an entry without loading FolderCache.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Iterable, Optional, Tuple
+
+from lib.utils.cache_codec import MARSHAL
+
+# Cache schema version - single source of truth
+# v7: Removed Tools & Options from cached items (added dynamically to respect visibility setting)
+# v13: Tools & Options never cached - added dynamically to prevent duplicates when serving via ultra-fast path
+# v14: Entries moved from one JSON file per folder into a single indexed store
+# v15: Payloads are encoded with CACHE_CODEC instead of JSON text
+CACHE_SCHEMA_VERSION = 15
+
+# Codec for folder and list cache payloads (see lib.utils.cache_codec and
+# tools/bench_cache_codec.py); changing it requires a CACHE_SCHEMA_VERSION bump
+CACHE_CODEC = MARSHAL
+
+STORE_FILENAME = 'folders.db'
+
+# Table layout of the store file (PRAGMA user_version); older files are recreated
+STORE_FORMAT = 3
+
+# Generation manifest key of the counter that invalidates every folder at once
+GLOBAL_GENERATION_KEY = '*'
+
+# Seconds a reader or writer waits for another Kodi process holding the write lock
+BUSY_TIMEOUT_SECONDS = 5.0
+
+
+def folder_key(folder_id) -> str:
+    """Store key for a folder ID; None, '' and 'root' all mean the root folder"""
+    if folder_id is None or folder_id == '' or folder_id == 'root':
+        return 'root'
+    return str(folder_id)
+
+
+def store_path(cache_dir: str) -> str:
+    return os.path.join(cache_dir, STORE_FILENAME)
+
+
+# Entry row plus whether it was built against the current folder and global generations
+_ENTRY_SELECT = """
+    SELECT c.schema_version, c.built_at, c.payload,
+           c.generation = COALESCE(f.generation, 0)
+           AND c.global_generation = COALESCE(g.generation, 0)
+    FROM folder_cache c
+    LEFT JOIN generations f ON f.folder_key = c.folder_key
+    LEFT JOIN generations g ON g.folder_key = '%s'
+    WHERE c.folder_key = ?
+""" % GLOBAL_GENERATION_KEY
+
+
+def read_entry(path: str, key: str) -> Optional[Tuple[int, float, bytes, int]]:
+    """(schema_version, built_at, payload, is_current) for one key, or None
+
+    One connection and one primary key lookup; the payload is returned
+    undecoded so callers can reject on the header columns first. Never
+    creates the store and never raises.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS)
+    except sqlite3.Error:
+        return None
+    try:
+        return conn.execute(_ENTRY_SELECT, (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+class FolderCacheStore:
+    """SQLite key/value file holding one row per cached folder
+
+    The schema version and build time are indexed columns next to the
+    serialized payload, so freshness and compatibility checks never decode
+    it. Each write is a single-row transaction, which makes replacing an
+    entry atomic for readers in other Kodi processes.
+
+    The same file holds the generation manifest: a counter per folder plus
+    a global one. Entries record the counters they were built against, and
+    invalidating a folder (or everything) is a counter bump; an entry whose
+    counters no longer match is outdated but stays readable.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.path = store_path(cache_dir)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the store on first use; caller holds self._lock"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != STORE_FORMAT:
+                self._create_tables(conn)
+            self._conn = conn
+        return self._conn
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        """(Re)create the tables; cached entries are disposable"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != STORE_FORMAT:
+                conn.execute("DROP TABLE IF EXISTS folder_cache")
+                conn.execute("DROP TABLE IF EXISTS generations")
+                conn.execute("""
+                    CREATE TABLE folder_cache (
+                        folder_key TEXT PRIMARY KEY,
+                        schema_version INTEGER NOT NULL,
+                        built_at REAL NOT NULL,
+                        generation INTEGER NOT NULL,
+                        global_generation INTEGER NOT NULL,
+                        payload BLOB NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE generations (
+                        folder_key TEXT PRIMARY KEY,
+                        generation INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("PRAGMA user_version = %d" % STORE_FORMAT)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> Optional[Tuple[int, float, bytes, int]]:
+        """(schema_version, built_at, payload, is_current) or None"""
+        with self._lock:
+            return self._connection().execute(_ENTRY_SELECT, (key,)).fetchone()
+
+    def header(self, key: str) -> Optional[Tuple[int, float, int]]:
+        """(schema_version, built_at, is_current) without reading the payload, or None"""
+        with self._lock:
+            return self._connection().execute("""
+                SELECT c.schema_version, c.built_at,
+                       c.generation = COALESCE(f.generation, 0)
+                       AND c.global_generation = COALESCE(g.generation, 0)
+                FROM folder_cache c
+                LEFT JOIN generations f ON f.folder_key = c.folder_key
+                LEFT JOIN generations g ON g.folder_key = ?
+                WHERE c.folder_key = ?
+            """, (GLOBAL_GENERATION_KEY, key)).fetchone()
+
+    def generation(self, key: str) -> Tuple[int, int]:
+        """Current (folder, global) generation for a key"""
+        with self._lock:
+            folder_generation, global_generation = self._connection().execute("""
+                SELECT (SELECT generation FROM generations WHERE folder_key = ?),
+                       (SELECT generation FROM generations WHERE folder_key = ?)
+            """, (key, GLOBAL_GENERATION_KEY)).fetchone()
+            return folder_generation or 0, global_generation or 0
+
+    def bump(self, keys: Iterable[str]) -> int:
+        """Advance the generation of each key in one transaction; returns keys bumped"""
+        keys = sorted(set(keys))
+        if not keys:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("INSERT OR IGNORE INTO generations (folder_key, generation) VALUES (?, 0)",
+                                 [(key,) for key in keys])
+                conn.executemany("UPDATE generations SET generation = generation + 1 WHERE folder_key = ?",
+                                 [(key,) for key in keys])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return len(keys)
+
+    def put(self, key: str, schema_version: int, built_at: float, generation: Tuple[int, int], payload: bytes):
+        """Store an entry built against generation (as returned by generation())"""
+        with self._lock:
+            self._connection().execute("""
+                INSERT OR REPLACE INTO folder_cache
+                (folder_key, schema_version, built_at, generation, global_generation, payload)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (key, schema_version, built_at, generation[0], generation[1], payload))
+
+    def delete(self, key: str) -> bool:
+        """True if an entry was removed"""
+        with self._lock:
+            return self._connection().execute(
+                "DELETE FROM folder_cache WHERE folder_key = ?", (key,)).rowcount > 0
+
+    def delete_built_before(self, cutoff: float) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "DELETE FROM folder_cache WHERE built_at < ?", (cutoff,)).rowcount
+
+    def delete_other_schemas(self, schema_version: int) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "DELETE FROM folder_cache WHERE schema_version != ?", (schema_version,)).rowcount
+
+    def delete_outdated(self) -> int:
+        """Delete entries built against an older generation"""
+        with self._lock:
+            return self._connection().execute("""
+                DELETE FROM folder_cache
+                WHERE generation != COALESCE(
+                          (SELECT g.generation FROM generations g WHERE g.folder_key = folder_cache.folder_key), 0)
+                   OR global_generation != COALESCE(
+                          (SELECT g.generation FROM generations g WHERE g.folder_key = ?), 0)
+            """, (GLOBAL_GENERATION_KEY,)).rowcount
+
+    def clear(self) -> int:
+        with self._lock:
+            return self._connection().execute("DELETE FROM folder_cache").rowcount
+
+    def summary(self) -> Tuple[int, int]:
+        """(entry count, payload bytes)"""
+        with self._lock:
+            count, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM folder_cache").fetchone()
+            return count, size
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Invocation State
+addon.xml sets reuselanguageinvoker, so Kodi runs plugin.py calls in a
+reused interpreter where module-level singletons and caches outlive a
+plugin call. Modules register how to drop their state:
+
+- on_invocation_end: state tied to one call (its handle, PluginContext and
+  the handlers built for it), dropped when the call finishes
+- on_generation_change: state built from settings or the open database,
+  dropped at the start of the first call after the state generation moved
+
+The state generation is a home window property, so a settings change seen
+by the service or a database restore in another interpreter reaches every
+reused plugin interpreter. Unless the keep_plugin_state setting is on, the
+generation callbacks run at the start of every reused call, which leaves
+only the imported modules in place. Only Kodi modules and the standard
+library are imported, so the cache-only path can use it.
+"""
+
+import time
+from typing import Callable, List
+
+from lib.utils.kodi_log import get_kodi_logger
+
+GENERATION_PROPERTY = 'librarygenie.state_generation'
+
+_invocation_end_callbacks: List[Callable[[], None]] = []
+_generation_callbacks: List[Callable[[], None]] = []
+_state = {'generation': None, 'invocations': 0}
+
+logger = get_kodi_logger('lib.utils.invocation_state')
+
+
+def on_invocation_end(callback: Callable[[], None]):
+    """Run callback after every plugin call of this interpreter"""
+    _invocation_end_callbacks.append(callback)
+
+
+def on_generation_change(callback: Callable[[], None]):
+    """Run callback before the first plugin call that sees a new state generation"""
+    _generation_callbacks.append(callback)
+
+
+def current_generation() -> str:
+    try:
+        import xbmcgui
+        return xbmcgui.Window(10000).getProperty(GENERATION_PROPERTY)
+    except Exception:
+        return ''
+
+
+def advance_generation():
+    """Mark settings or the database as changed for every plugin interpreter
+
+    Reused interpreters, including this one, drop their registered state at
+    the start of their next call; nothing is reset while a call is running.
+    """
+    try:
+        import xbmcgui
+        xbmcgui.Window(10000).setProperty(GENERATION_PROPERTY, '%.6f' % time.time())
+    except Exception as e:
+        logger.warning("Could not advance state generation: %s", e)
+
+
+def begin_invocation(keep_state: bool = True) -> bool:
+    """
+    Start a plugin call; True if this interpreter already served an earlier one
+
+    Args:
+        keep_state: keep settings and database state of earlier calls while the
+            state generation is unchanged; when False it is dropped every call
+    """
+    _state['invocations'] += 1
+    generation = current_generation()
+    if _state['generation'] is not None and (not keep_state or generation != _state['generation']):
+        logger.debug("%s - dropping settings and database state",
+                     "State generation changed" if keep_state else "Plugin state is not kept")
+        _run(_generation_callbacks)
+    _state['generation'] = generation
+    return _state['invocations'] > 1
+
+
+def end_invocation():
+    """Finish a plugin call and drop the state tied to it"""
+    _run(_invocation_end_callbacks)
+
+
+def invocation_count() -> int:
+    """Plugin calls served by this interpreter"""
+    return _state['invocations']
+
+
+def _run(callbacks: List[Callable[[], None]]):
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            logger.warning("Invocation state reset %s failed: %s", getattr(callback, '__qualname__', callback), e)
@@ -6,8 +6,14 @@ LibraryGenie - Pure Kodi Standard Logging
 Minimal direct xbmc.log() wrapper functions for maximum efficiency and Kodi compliance
 """
 
+import time
+
 import xbmc
 
+# How long a debug_enabled() answer is reused before Kodi is asked again
+_DEBUG_CHECK_SECONDS = 30.0
+_debug_state = {'enabled': False, 'checked_at': None}
+
 
 def log(message, level=xbmc.LOGDEBUG):
     """Standard Kodi logging - direct to xbmc.log()
@@ -19,6 +25,23 @@ def log(message, level=xbmc.LOGDEBUG):
     xbmc.log(f"[LG-LibraryGenie] {message}", level)
 
 
+def debug_enabled():
+    """True while Kodi's debug logging setting is on
+    
+    Guards debug messages inside per-item loops, where building the message
+    costs more than Kodi discarding it. The answer is reused for 30 seconds.
+    """
+    now = time.monotonic()
+    checked_at = _debug_state['checked_at']
+    if checked_at is None or now - checked_at >= _DEBUG_CHECK_SECONDS:
+        try:
+            _debug_state['enabled'] = bool(xbmc.getCondVisibility('System.GetBool(debug.showloginfo)'))
+        except Exception:
+            _debug_state['enabled'] = True
+        _debug_state['checked_at'] = now
+    return _debug_state['enabled']
+
+
 def log_error(message):
     """Error logging shorthand"""
     xbmc.log(f"[LG-LibraryGenie] {message}", xbmc.LOGERROR)
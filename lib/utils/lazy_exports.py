@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Lazy Package Exports
+Module-level __getattr__ (PEP 562) for packages that re-export names from
+their modules. Importing lib.data.connection_manager then no longer imports
+lib.data.query_manager and the rest of the package, but
+`from lib.data import get_query_manager` still works; each module is
+imported the first time one of its names is used.
+"""
+
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    (__getattr__, __dir__) for a package's __init__
+
+    Args:
+        package: the package's __name__
+        exports: defining module per exported name
+    """
+    def __getattr__(name: str):
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError("module %r has no attribute %r" % (package, name))
+        value = getattr(importlib.import_module(module_name), name)
+        # Later lookups find the name in the package without calling __getattr__
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(importlib.import_module(package))) | set(exports))
+
+    return __getattr__, __dir__
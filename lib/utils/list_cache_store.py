@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - List Page Cache Store
+Single-file keyed store for rendered list pages, the playback state laid
+over them and the render specs of single media items. Has no Kodi or addon imports so plugin.py's cache-only path can
+read a page without loading the list pipeline.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lib.utils.folder_cache_store import BUSY_TIMEOUT_SECONDS, GLOBAL_GENERATION_KEY
+
+STORE_FILENAME = 'lists.db'
+
+# Table layout of the store file (PRAGMA user_version); older files are recreated
+STORE_FORMAT = 4
+
+# Most playback states kept; the least recently updated are dropped beyond this
+MAX_PLAYBACK_STATES = 2000
+
+# Most media item render specs kept; the least recently built are dropped beyond this
+MAX_ITEM_SPECS = 10000
+
+
+def page_key(list_id, page) -> str:
+    """Store key for one page of a list"""
+    return '%s:%d' % (list_id, int(page))
+
+
+def playback_key(media_type: str, kodi_id) -> str:
+    """Playback state key of a Kodi library item"""
+    return '%s:%s' % (media_type, kodi_id)
+
+
+def store_path(cache_dir: str) -> str:
+    return os.path.join(cache_dir, STORE_FILENAME)
+
+
+# Page row plus whether it was built against the current list and global generations
+_PAGE_SELECT = """
+    SELECT p.schema_version, p.built_at, p.payload,
+           p.generation = COALESCE(l.generation, 0)
+           AND p.global_generation = COALESCE(g.generation, 0),
+           p.playback_keys
+    FROM list_pages p
+    LEFT JOIN generations l ON l.list_id = p.list_id
+    LEFT JOIN generations g ON g.list_id = '%s'
+    WHERE p.page_key = ?
+""" % GLOBAL_GENERATION_KEY
+
+
+def _playback_states(conn: sqlite3.Connection, keys: List[str]) -> Dict[str, Tuple[int, float, float]]:
+    states = {}
+    # Stay well below SQLite's bound parameter limit
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        rows = conn.execute("SELECT playback_key, playcount, position, total FROM playback_state "
+                            "WHERE playback_key IN (%s)" % ','.join('?' * len(chunk)), chunk).fetchall()
+        for key, playcount, position, total in rows:
+            states[key] = (playcount, position, total)
+    return states
+
+
+def _page_with_playback(conn: sqlite3.Connection, key: str):
+    row = conn.execute(_PAGE_SELECT, (key,)).fetchone()
+    if row is None:
+        return None
+    keys = json.loads(row[4]) if row[4] else []
+    return row[:4] + (_playback_states(conn, keys) if keys else {},)
+
+
+def read_page(path: str, key: str) -> Optional[Tuple[int, float, bytes, int, Dict[str, Tuple[int, float, float]]]]:
+    """(schema_version, built_at, payload, is_current, playback_states) for one key, or None
+
+    playback_states maps the playback keys of the page's library items to
+    their last known (playcount, position, total). One connection; never
+    creates the store and never raises.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS)
+    except sqlite3.Error:
+        return None
+    try:
+        return _page_with_playback(conn, key)
+    except (sqlite3.Error, ValueError):
+        return None
+    finally:
+        conn.close()
+
+
+class ListPageStore:
+    """SQLite key/value file holding one row per cached list page
+
+    Pages follow the folder cache store's rules: schema version and build
+    time are columns next to the payload, and a generation counter per list
+    plus a global one mark pages outdated when their list changes.
+
+    The playback_state table holds playcount and resume point of library
+    items as reported by the service after playback. They change too often
+    to rebuild pages for, so they are read with the page and overlaid when
+    it is rendered.
+
+    The item_specs table holds one render spec per media item together with
+    the content_updated_at and Kodi major version it was built from; a row
+    whose media item has changed since is simply rebuilt and replaced.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.path = store_path(cache_dir)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the store on first use; caller holds self._lock"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != STORE_FORMAT:
+                self._create_tables(conn)
+            self._conn = conn
+        return self._conn
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        """(Re)create the tables; cached pages and playback states are disposable"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != STORE_FORMAT:
+                conn.execute("DROP TABLE IF EXISTS list_pages")
+                conn.execute("DROP TABLE IF EXISTS generations")
+                conn.execute("DROP TABLE IF EXISTS playback_state")
+                conn.execute("DROP TABLE IF EXISTS item_specs")
+                conn.execute("""
+                    CREATE TABLE list_pages (
+                        page_key TEXT PRIMARY KEY,
+                        list_id TEXT NOT NULL,
+                        schema_version INTEGER NOT NULL,
+                        built_at REAL NOT NULL,
+                        generation INTEGER NOT NULL,
+                        global_generation INTEGER NOT NULL,
+                        playback_keys TEXT,
+                        payload BLOB NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX idx_list_pages_list ON list_pages (list_id)")
+                conn.execute("""
+                    CREATE TABLE generations (
+                        list_id TEXT PRIMARY KEY,
+                        generation INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE playback_state (
+                        playback_key TEXT PRIMARY KEY,
+                        playcount INTEGER NOT NULL,
+                        position REAL NOT NULL,
+                        total REAL NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE item_specs (
+                        media_item_id INTEGER PRIMARY KEY,
+                        content_updated_at TEXT NOT NULL,
+                        kodi_major INTEGER NOT NULL,
+                        schema_version INTEGER NOT NULL,
+                        built_at REAL NOT NULL,
+                        spec BLOB NOT NULL
+                    )
+                """)
+                conn.execute("PRAGMA user_version = %d" % STORE_FORMAT)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str):
+        """(schema_version, built_at, payload, is_current, playback_states) or None"""
+        with self._lock:
+            return _page_with_playback(self._connection(), key)
+
+    def header(self, key: str) -> Optional[Tuple[int, float, int]]:
+        """(schema_version, built_at, is_current) without reading the payload, or None"""
+        with self._lock:
+            return self._connection().execute("""
+                SELECT p.schema_version, p.built_at,
+                       p.generation = COALESCE(l.generation, 0)
+                       AND p.global_generation = COALESCE(g.generation, 0)
+                FROM list_pages p
+                LEFT JOIN generations l ON l.list_id = p.list_id
+                LEFT JOIN generations g ON g.list_id = ?
+                WHERE p.page_key = ?
+            """, (GLOBAL_GENERATION_KEY, key)).fetchone()
+
+    def generation(self, list_id: str) -> Tuple[int, int]:
+        """Current (list, global) generation for a list"""
+        with self._lock:
+            list_generation, global_generation = self._connection().execute("""
+                SELECT (SELECT generation FROM generations WHERE list_id = ?),
+                       (SELECT generation FROM generations WHERE list_id = ?)
+            """, (list_id, GLOBAL_GENERATION_KEY)).fetchone()
+            return list_generation or 0, global_generation or 0
+
+    def bump(self, list_ids: Iterable[str]) -> int:
+        """Advance the generation of each list in one transaction; returns lists bumped"""
+        list_ids = sorted(set(list_ids))
+        if not list_ids:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("INSERT OR IGNORE INTO generations (list_id, generation) VALUES (?, 0)",
+                                 [(list_id,) for list_id in list_ids])
+                conn.executemany("UPDATE generations SET generation = generation + 1 WHERE list_id = ?",
+                                 [(list_id,) for list_id in list_ids])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return len(list_ids)
+
+    def put(self, key: str, list_id: str, schema_version: int, built_at: float, generation: Tuple[int, int],
+            playback_keys: List[str], payload: bytes):
+        """Store a page built against generation (as returned by generation())"""
+        with self._lock:
+            self._connection().execute("""
+                INSERT OR REPLACE INTO list_pages
+                (page_key, list_id, schema_version, built_at, generation, global_generation, playback_keys, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (key, list_id, schema_version, built_at, generation[0], generation[1],
+                  json.dumps(playback_keys) if playback_keys else None, payload))
+
+    def playback_states(self, keys: List[str]) -> Dict[str, Tuple[int, float, float]]:
+        with self._lock:
+            return _playback_states(self._connection(), list(keys)) if keys else {}
+
+    def set_playback_state(self, key: str, playcount: int, position: float, total: float, updated_at: float):
+        with self._lock:
+            self._connection().execute("""
+                INSERT OR REPLACE INTO playback_state (playback_key, playcount, position, total, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (key, playcount, position, total, updated_at))
+
+    def item_specs(self, media_item_ids: List[int]) -> Dict[int, Tuple[str, int, int, bytes]]:
+        """(content_updated_at, kodi_major, schema_version, spec) per stored media item"""
+        specs = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(media_item_ids), 500):
+                chunk = media_item_ids[start:start + 500]
+                rows = conn.execute("SELECT media_item_id, content_updated_at, kodi_major, schema_version, spec "
+                                    "FROM item_specs WHERE media_item_id IN (%s)" % ','.join('?' * len(chunk)),
+                                    chunk).fetchall()
+                for row in rows:
+                    specs[row[0]] = row[1:]
+        return specs
+
+    def put_item_specs(self, rows: List[Tuple[int, str, int, int, float, bytes]]):
+        """
+        Store (media_item_id, content_updated_at, kodi_major, schema_version, built_at, spec)
+        rows in one transaction
+        """
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO item_specs
+                    (media_item_id, content_updated_at, kodi_major, schema_version, built_at, spec)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def trim_item_specs(self, schema_version: int, keep: int = MAX_ITEM_SPECS) -> int:
+        """Drop item specs of other schemas and all but the most recently built"""
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute("DELETE FROM item_specs WHERE schema_version != ?", (schema_version,)).rowcount
+            removed += conn.execute("""
+                DELETE FROM item_specs WHERE media_item_id NOT IN (
+                    SELECT media_item_id FROM item_specs ORDER BY built_at DESC LIMIT ?)
+            """, (keep,)).rowcount
+            return removed
+
+    def delete_list(self, list_id: str) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "DELETE FROM list_pages WHERE list_id = ?", (list_id,)).rowcount
+
+    def delete_built_before(self, cutoff: float) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "DELETE FROM list_pages WHERE built_at < ?", (cutoff,)).rowcount
+
+    def delete_other_schemas(self, schema_version: int) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "DELETE FROM list_pages WHERE schema_version != ?", (schema_version,)).rowcount
+
+    def delete_outdated(self) -> int:
+        """Delete pages built against an older generation"""
+        with self._lock:
+            return self._connection().execute("""
+                DELETE FROM list_pages
+                WHERE generation != COALESCE(
+                          (SELECT g.generation FROM generations g WHERE g.list_id = list_pages.list_id), 0)
+                   OR global_generation != COALESCE(
+                          (SELECT g.generation FROM generations g WHERE g.list_id = ?), 0)
+            """, (GLOBAL_GENERATION_KEY,)).rowcount
+
+    def trim_playback_states(self, keep: int = MAX_PLAYBACK_STATES) -> int:
+        """Drop all but the most recently updated playback states"""
+        with self._lock:
+            return self._connection().execute("""
+                DELETE FROM playback_state WHERE playback_key NOT IN (
+                    SELECT playback_key FROM playback_state ORDER BY updated_at DESC LIMIT ?)
+            """, (keep,)).rowcount
+
+    def clear(self) -> int:
+        """Delete every page and item spec; returns pages deleted"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM item_specs")
+            return conn.execute("DELETE FROM list_pages").rowcount
+
+    def summary(self) -> Tuple[int, int]:
+        """(page count, payload bytes)"""
+        with self._lock:
+            count, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM list_pages").fetchone()
+            return count, size
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
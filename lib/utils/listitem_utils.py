@@ -13,6 +13,9 @@ from lib.utils.kodi_log import get_kodi_logger
 
 logger = get_kodi_logger('lib.utils.listitem_utils')
 
+# Resource art dicts by (item type, resources directory)
+_resource_art_memo: Dict[Tuple[str, str], Dict[str, str]] = {}
+
 class ListItemMetadataManager:
     """Unified metadata manager for Kodi ListItems with version-aware handling"""
     
@@ -600,8 +603,12 @@ class ListItemArtManager:
             if not resource_path_func:
                 return self._apply_fallback_art(list_item, default_fallbacks[item_type])
             
-            # Build comprehensive art dict from resources
-            art_dict = self._build_resource_art_dict(item_type, resource_path_func)
+            # Build comprehensive art dict from resources, checking the files once per process
+            memo_key = (item_type, resource_path_func(''))
+            art_dict = _resource_art_memo.get(memo_key)
+            if art_dict is None:
+                art_dict = _resource_art_memo[memo_key] = self._build_resource_art_dict(item_type, resource_path_func)
+            art_dict = dict(art_dict)
             
             if art_dict:
                 list_item.setArt(art_dict)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - ListItem Render Specs
+Records the calls a builder makes on a ListItem as plain data, so a rendered
+directory can be stored and later replayed with only xbmcgui and xbmcplugin.
+
+A spec is [url, is_folder, label, calls, playback_key]; each call is
+[target, method, args] with target LISTITEM or INFOTAG, plus a kwargs dict
+when the call used keyword arguments.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import xbmcgui
+import xbmcplugin
+
+LISTITEM = 0
+INFOTAG = 1
+
+# Video window whose FolderName property carries the directory title
+VIDEO_WINDOW_ID = 10025
+
+
+class _RecordingInfoTag:
+    """InfoTagVideo stand-in that records setter calls and forwards them"""
+
+    def __init__(self, tag, calls: List[list]):
+        self._tag = tag
+        self._calls = calls
+
+    def __getattr__(self, name):
+        attr = getattr(self._tag, name)
+        if not name.startswith(('set', 'add')):
+            return attr
+
+        def record(*args, **kwargs):
+            self._calls.append([INFOTAG, name, list(args), kwargs] if kwargs else [INFOTAG, name, list(args)])
+            return attr(*args, **kwargs)
+        return record
+
+
+class RecordingListItem:
+    """xbmcgui.ListItem stand-in that records setter calls and forwards them
+
+    The real ListItem is in .listitem; pass that to xbmcplugin.
+    """
+
+    def __init__(self, label: str = '', label2: str = '', path: str = '', offscreen: bool = True):
+        self.listitem = xbmcgui.ListItem(label=label, label2=label2, path=path, offscreen=offscreen)
+        self.calls: List[list] = []
+        if label2:
+            self.calls.append([LISTITEM, 'setLabel2', [label2]])
+        if path:
+            self.calls.append([LISTITEM, 'setPath', [path]])
+        self._label = label
+        self._tag = None
+
+    def getVideoInfoTag(self):
+        if self._tag is None:
+            self._tag = _RecordingInfoTag(self.listitem.getVideoInfoTag(), self.calls)
+        return self._tag
+
+    def __getattr__(self, name):
+        attr = getattr(self.listitem, name)
+        if not name.startswith(('set', 'add')):
+            return attr
+
+        def record(*args, **kwargs):
+            if name == 'setLabel' and args:
+                self._label = args[0]
+                return attr(*args, **kwargs)
+            self.calls.append([LISTITEM, name, list(args), kwargs] if kwargs else [LISTITEM, name, list(args)])
+            return attr(*args, **kwargs)
+        return record
+
+    def spec(self, url: str, is_folder: bool, playback_key: Optional[str] = None) -> list:
+        return [url, bool(is_folder), self._label, self.calls, playback_key]
+
+
+def _apply_playback_state(listitem, tag, state: Tuple[int, float, float], kodi_major: int):
+    """Overlay the last known playcount and resume point"""
+    playcount, position, total = state
+    if kodi_major >= 20:
+        tag = tag or listitem.getVideoInfoTag()
+        tag.setPlaycount(int(playcount))
+        tag.setResumePoint(float(position), float(total))
+    else:
+        listitem.setInfo('video', {'playcount': int(playcount)})
+        listitem.setProperty('ResumeTime', str(int(position)))
+        listitem.setProperty('TotalTime', str(int(total)))
+
+
+def apply_calls(listitem, calls: List[list]):
+    """Replay recorded calls on a ListItem (or a RecordingListItem); returns its info tag if one was used"""
+    tag = None
+    for call in calls:
+        kwargs = call[3] if len(call) > 3 else {}
+        if call[0] == INFOTAG:
+            if tag is None:
+                tag = listitem.getVideoInfoTag()
+            getattr(tag, call[1])(*call[2], **kwargs)
+        elif call[1] == 'addContextMenuItems':
+            # JSON turned the (label, action) tuples into lists
+            getattr(listitem, call[1])([tuple(entry) for entry in call[2][0]], *call[2][1:], **kwargs)
+        else:
+            getattr(listitem, call[1])(*call[2], **kwargs)
+    return tag
+
+
+def build_listitem(spec: list, playback_states: Optional[Dict[str, Tuple[int, float, float]]] = None,
+                   kodi_major: int = 20) -> Tuple[str, Any, bool]:
+    """(url, ListItem, is_folder) replayed from a spec"""
+    url, is_folder, label, calls, playback_key = spec
+    listitem = xbmcgui.ListItem(label=label, offscreen=True)
+    tag = apply_calls(listitem, calls)
+    if playback_states and playback_key in playback_states:
+        _apply_playback_state(listitem, tag, playback_states[playback_key], kodi_major)
+    return url, listitem, is_folder
+
+
+def add_items(handle: int, specs: List[list], playback_states=None, kodi_major: int = 20) -> int:
+    """Add replayed specs to the directory in one call; returns items added"""
+    items = [build_listitem(spec, playback_states, kodi_major) for spec in specs]
+    xbmcplugin.addDirectoryItems(handle, items, len(items))
+    return len(items)
+
+
+def playback_keys(specs: List[list]) -> List[str]:
+    """Playback keys of the library items among specs"""
+    return [spec[4] for spec in specs if spec[4]]
+
+
+def render_page(handle: int, page: Dict[str, Any], playback_states=None) -> int:
+    """Render a stored directory page and end the directory; returns items added
+
+    page holds 'items' (specs), 'content_type', 'sort_methods',
+    'directory_title', 'update' and the 'kodi_major' it was built on.
+    """
+    if page.get('directory_title'):
+        try:
+            xbmcgui.Window(VIDEO_WINDOW_ID).setProperty('FolderName', page['directory_title'])
+        except Exception:
+            pass
+    xbmcplugin.setContent(handle, page.get('content_type') or 'files')
+    for sort_method in page.get('sort_methods') or []:
+        xbmcplugin.addSortMethod(handle, sort_method)
+    count = add_items(handle, page.get('items', []), playback_states, page.get('kodi_major', 20))
+    xbmcplugin.endOfDirectory(handle, succeeded=True, updateListing=bool(page.get('update')), cacheToDisc=False)
+    return count
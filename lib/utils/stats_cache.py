@@ -8,6 +8,7 @@ Handles caching of library statistics to avoid redundant API calls
 
 import json
 import os
+import threading
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -15,14 +16,27 @@ from lib.utils.kodi_log import get_kodi_logger
 from lib.data.storage_manager import get_storage_manager
 
 
+# Home window property asking the service to refresh the stats file
+REFRESH_REQUEST_PROPERTY = 'librarygenie.stats.refresh_requested'
+
+
 class StatsCache:
-    """Manages library statistics caching"""
+    """Manages library statistics caching
+
+    Stale-while-revalidate: readers always get the file as it is, with its age,
+    and never touch the network. The service refreshes the file in the
+    background once it is older than library_stats_ttl_minutes (or when a
+    reader asks for it), revalidating with If-None-Match so unchanged stats
+    cost a 304.
+    """
     
     STATS_FILENAME = "library_stats.json"
     
     def __init__(self):
         self.logger = get_kodi_logger('lib.utils.stats_cache')
         self.storage_manager = get_storage_manager()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
         
     def _get_stats_file_path(self) -> str:
         """Get the full path to the stats cache file"""
@@ -32,9 +46,12 @@ class StatsCache:
     def fetch_and_save_stats(self) -> bool:
         """
         Fetch library stats from AI server and save to file
-        
+
+        The ETag of the cached stats is sent along; a 304 only marks the cached
+        stats as checked.
+
         Returns:
-            bool: True if successfully fetched and saved, False otherwise
+            bool: True if the file now holds current stats, False otherwise
         """
         try:
             from lib.remote.ai_search_client import get_ai_search_client
@@ -46,31 +63,35 @@ class StatsCache:
                 self.logger.debug("AI search not activated, skipping stats fetch")
                 return False
             
+            cached = self._read_file()
+            etag = cached.get('etag') if cached else None
+
             # Fetch stats from API
             self.logger.info("Fetching library stats from AI server...")
-            stats = ai_client.get_library_stats()
+            result = ai_client.fetch_library_stats(etag)
             
-            if not stats:
+            if not result:
                 self.logger.warning("Failed to fetch library stats from server")
                 return False
             
+            now = datetime.now().isoformat()
+            if result['not_modified'] and cached:
+                cached['checked_at'] = now
+                self._write_file(cached)
+                self.logger.info("Library stats unchanged on server")
+                return True
+
             # Add metadata
             stats_data = {
-                "stats": stats,
-                "fetched_at": datetime.now().isoformat(),
-                "version": 1
+                "stats": result['stats'],
+                "fetched_at": now,
+                "checked_at": now,
+                "etag": result.get('etag'),
+                "version": 2
             }
+            self._write_file(stats_data)
             
-            # Save to file
-            stats_file = self._get_stats_file_path()
-            
-            # Ensure parent directory exists
-            os.makedirs(os.path.dirname(stats_file), exist_ok=True)
-            
-            with open(stats_file, 'w') as f:
-                json.dump(stats_data, f, indent=2)
-            
-            self.logger.info("Library stats saved to: %s", stats_file)
+            self.logger.info("Library stats saved to: %s", self._get_stats_file_path())
             return True
             
         except Exception as e:
@@ -84,6 +105,88 @@ class StatsCache:
         Returns:
             Dict with stats data or None if not available
         """
+        entry = self.load_entry()
+        return entry['stats'] if entry else None
+
+    def load_entry(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the cached stats with their age, without any network access
+
+        Returns:
+            Dict with 'stats', 'fetched_at', 'age_seconds' (since the stats were
+            last confirmed by the server) and 'stale', or None if not available
+        """
+        stats_data = self._read_file()
+        if not stats_data:
+            return None
+
+        checked_at = stats_data.get('checked_at') or stats_data.get('fetched_at')
+        try:
+            age_seconds = max(0.0, (datetime.now() - datetime.fromisoformat(checked_at)).total_seconds())
+        except (TypeError, ValueError):
+            age_seconds = None
+
+        return {
+            'stats': stats_data['stats'],
+            'fetched_at': stats_data.get('fetched_at'),
+            'age_seconds': age_seconds,
+            'stale': age_seconds is None or age_seconds > self._ttl_seconds()
+        }
+
+    def refresh_if_stale(self) -> bool:
+        """
+        Fetch stats when the cached file is missing or older than the TTL
+
+        Returns:
+            bool: True if a fetch was made and succeeded
+        """
+        entry = self.load_entry()
+        if entry and not entry['stale']:
+            return False
+        return self.fetch_and_save_stats()
+
+    def refresh_async(self, force: bool = False) -> bool:
+        """
+        Refresh in a background thread (force: even if the file is fresh)
+
+        Returns:
+            bool: False if a refresh is already running in this process
+        """
+        with self._refresh_lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return False
+            target = self.fetch_and_save_stats if force else self.refresh_if_stale
+            self._refresh_thread = threading.Thread(target=target, name='LibraryGenie-StatsRefresh',
+                                                    daemon=True)
+            self._refresh_thread.start()
+            return True
+
+    def request_refresh(self):
+        """Ask the service to refresh the stats in the background"""
+        try:
+            import xbmcgui
+            xbmcgui.Window(10000).setProperty(REFRESH_REQUEST_PROPERTY, 'true')
+        except Exception as e:
+            self.logger.debug("Could not request stats refresh: %s", e)
+
+    def take_refresh_request(self) -> bool:
+        """Consume a pending refresh request (service side)"""
+        try:
+            import xbmcgui
+            window = xbmcgui.Window(10000)
+            if window.getProperty(REFRESH_REQUEST_PROPERTY) != 'true':
+                return False
+            window.clearProperty(REFRESH_REQUEST_PROPERTY)
+            return True
+        except Exception:
+            return False
+
+    def _ttl_seconds(self) -> int:
+        from lib.config.settings import SettingsManager
+        return SettingsManager().get_library_stats_ttl_minutes() * 60
+
+    def _read_file(self) -> Optional[Dict[str, Any]]:
+        """Parsed stats file, or None if missing or invalid"""
         try:
             stats_file = self._get_stats_file_path()
             
@@ -97,18 +200,30 @@ class StatsCache:
                 stats_data = json.load(f)
             
             # Validate structure
-            if "stats" not in stats_data:
+            if not isinstance(stats_data, dict) or "stats" not in stats_data:
                 self.logger.warning("Invalid stats cache format")
                 return None
             
             self.logger.debug("Loaded stats from cache (fetched: %s)", 
                             stats_data.get('fetched_at', 'unknown'))
             
-            return stats_data.get("stats")
+            return stats_data
             
         except Exception as e:
             self.logger.error("Error loading stats from cache: %s", e)
             return None
+
+    def _write_file(self, stats_data: Dict[str, Any]):
+        """Write the stats file atomically, so readers never see a partial file"""
+        stats_file = self._get_stats_file_path()
+        
+        # Ensure parent directory exists
+        os.makedirs(os.path.dirname(stats_file), exist_ok=True)
+        
+        tmp_file = stats_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(stats_data, f, indent=2)
+        os.replace(tmp_file, stats_file)
     
     def clear_stats(self) -> bool:
         """
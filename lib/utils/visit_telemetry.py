@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Navigation Visit Telemetry
+Decayed visit counts per folder and list, used to choose what the service pre-warms.
+Plugin invocations only append a line to a log; the service folds the log into
+scores in batches, so recording a visit costs one small append.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Optional, Dict, Any, List
+
+VISIT_LOG_FILENAME = 'visits.log'
+VISIT_SCORES_FILENAME = 'visit_scores.json'
+
+# A visit counts half as much after this many days
+HALF_LIFE_DAYS = 14.0
+# Most targets kept per kind; the lowest scores are dropped beyond this
+MAX_TRACKED = 300
+
+FOLDER = 'folder'
+LIST = 'list'
+
+
+def telemetry_dir() -> Optional[str]:
+    """Addon cache directory holding the visit log and scores"""
+    try:
+        import xbmcvfs
+        profile_dir = xbmcvfs.translatePath('special://profile/')
+        return os.path.join(profile_dir, 'addon_data', 'plugin.video.librarygenie', 'cache')
+    except Exception:
+        return None
+
+
+def record_visit(kind: str, item_id, cache_only: bool = False):
+    """Append one navigation to the visit log; never raises
+
+    cache_only marks visits served by plugin.py's cache-only path, which is
+    what pre-warming tries to maximize.
+    """
+    try:
+        directory = telemetry_dir()
+        if not directory:
+            return
+        line = '%d\t%s\t%s\t%d\n' % (int(time.time()), kind, item_id, 1 if cache_only else 0)
+        with open(os.path.join(directory, VISIT_LOG_FILENAME), 'a', encoding='utf-8') as f:
+            f.write(line)
+    except Exception:
+        pass
+
+
+class VisitTelemetry:
+    """Visit scores folded from the log, plus cache-only hit rate counters"""
+
+    def __init__(self, directory: Optional[str] = None):
+        from lib.utils.kodi_log import get_kodi_logger
+        self.logger = get_kodi_logger('lib.utils.visit_telemetry')
+        self.directory = directory or telemetry_dir()
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _load(self) -> Dict[str, Any]:
+        """Scores file contents, read once per process; caller holds self._lock"""
+        if self._data is None:
+            data = None
+            try:
+                with open(self._path(VISIT_SCORES_FILENAME), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                pass
+            if not isinstance(data, dict) or data.get('version') != 1:
+                data = {'version': 1, 'scores': {FOLDER: {}, LIST: {}},
+                        'totals': {'visits': 0, 'cache_only': 0, 'since': time.time()}}
+            self._data = data
+        return self._data
+
+    def fold(self) -> int:
+        """Move logged visits into the decayed scores; returns visits folded"""
+        if not self.directory:
+            return 0
+        log_path = self._path(VISIT_LOG_FILENAME)
+        folding_path = log_path + '.folding'
+        try:
+            # Plugin processes that append after the rename start a new log
+            if not os.path.exists(folding_path):
+                if not os.path.exists(log_path):
+                    return 0
+                os.replace(log_path, folding_path)
+            with open(folding_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError as e:
+            self.logger.warning("Could not read visit log: %s", e)
+            return 0
+
+        now = time.time()
+        half_life = HALF_LIFE_DAYS * 86400.0
+        folded = 0
+        with self._lock:
+            data = self._load()
+            for kind, scores in data['scores'].items():
+                for item_id, (score, updated_at) in list(scores.items()):
+                    scores[item_id] = [score * 0.5 ** ((now - updated_at) / half_life), now]
+
+            for line in lines:
+                try:
+                    visited_at, kind, item_id, cache_only = line.rstrip('\n').split('\t')
+                    weight = 0.5 ** (max(0.0, now - float(visited_at)) / half_life)
+                except ValueError:
+                    continue
+                scores = data['scores'].get(kind)
+                if scores is None:
+                    continue
+                entry = scores.setdefault(item_id, [0.0, now])
+                entry[0] += weight
+                data['totals']['visits'] += 1
+                data['totals']['cache_only'] += cache_only == '1'
+                folded += 1
+
+            for kind, scores in data['scores'].items():
+                if len(scores) > MAX_TRACKED:
+                    keep = sorted(scores.items(), key=lambda kv: kv[1][0], reverse=True)[:MAX_TRACKED]
+                    data['scores'][kind] = dict(keep)
+
+            try:
+                self._save(data)
+                os.remove(folding_path)
+            except OSError as e:
+                self.logger.warning("Could not save visit scores: %s", e)
+                return 0
+
+        if folded:
+            self.logger.debug("Folded %d visits into navigation scores", folded)
+        return folded
+
+    def _save(self, data: Dict[str, Any]):
+        """Write the scores file atomically; caller holds self._lock"""
+        path = self._path(VISIT_SCORES_FILENAME)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    def hottest(self, kind: str, limit: int) -> List[str]:
+        """IDs of the most visited targets of a kind, hottest first"""
+        with self._lock:
+            scores = self._load()['scores'].get(kind, {})
+            ranked = sorted(scores.items(), key=lambda kv: kv[1][0], reverse=True)
+            return [item_id for item_id, _ in ranked[:limit]]
+
+    def record_prewarm(self, result: Dict[str, Any]):
+        """Keep the outcome of the last pre-warm run with the stats"""
+        with self._lock:
+            data = self._load()
+            data['last_prewarm'] = dict(result, finished_at=time.time())
+            try:
+                self._save(data)
+            except OSError as e:
+                self.logger.warning("Could not save visit scores: %s", e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Visit totals, cache-only hit rate and the last pre-warm run"""
+        with self._lock:
+            data = self._load()
+            totals = data['totals']
+            visits = totals['visits']
+            return {
+                'visits': visits,
+                'cache_only': totals['cache_only'],
+                'hit_rate_percent': round(totals['cache_only'] * 100.0 / visits, 1) if visits else 0.0,
+                'since': totals['since'],
+                'tracked_folders': len(data['scores'][FOLDER]),
+                'tracked_lists': len(data['scores'][LIST]),
+                'last_prewarm': data.get('last_prewarm')
+            }
+
+
+# Global visit telemetry instance
+_visit_telemetry_instance = None
+_visit_telemetry_lock = threading.Lock()
+
+
+def get_visit_telemetry():
+    """Get global visit telemetry instance"""
+    global _visit_telemetry_instance
+    if _visit_telemetry_instance is None:
+        with _visit_telemetry_lock:
+            if _visit_telemetry_instance is None:
+                _visit_telemetry_instance = VisitTelemetry()
+    return _visit_telemetry_instance
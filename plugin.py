@@ -75,74 +75,57 @@ def _get_cache_dir_direct():
     except Exception:
         return None
 
-def _get_cache_file_direct(folder_id):
-    """Get cache file path directly without FolderCache class"""
+# Folder cache rows read during this invocation, so the check and the render share one lookup
+_direct_cache_entries = {}
+
+def _get_cache_entry_direct(folder_id):
+    """Read a folder's cache row (schema, built_at, payload) without FolderCache class"""
     try:
-        import os
-        import hashlib
-        import glob
+        from lib.utils.folder_cache_store import folder_key, read_entry, store_path
         
-        cache_dir = _get_cache_dir_direct()
-        if not cache_dir or not os.path.exists(cache_dir):
-            return None
-            
-        # Handle root directory
-        if folder_id in [None, '', 'root']:
-            # Look for root cache files (both anon and user-scoped)
-            patterns = [
-                os.path.join(cache_dir, "folder_root_*_anon_v*.json"),
-                os.path.join(cache_dir, "folder_root_*_v*.json")
-            ]
-            all_files = []
-            for pattern in patterns:
-                all_files.extend(glob.glob(pattern))
-            
-            if not all_files:
-                return None
-                
-            # Select newest file by modification time
-            return max(all_files, key=lambda f: os.path.getmtime(f))
-        else:
-            # Handle specific folder ID
-            safe_folder_id = "".join(c for c in str(folder_id) if c.isalnum() or c in '-_').strip()
-            folder_hash = hashlib.sha1(str(folder_id).encode('utf-8')).hexdigest()[:8]
-            patterns = [
-                os.path.join(cache_dir, f"folder_{safe_folder_id}_{folder_hash}_anon_v*.json"),
-                os.path.join(cache_dir, f"folder_{safe_folder_id}_{folder_hash}_v*.json")
-            ]
-            all_files = []
-            for pattern in patterns:
-                all_files.extend(glob.glob(pattern))
-                
-            if not all_files:
-                return None
-                
-            # Select newest file by modification time
-            return max(all_files, key=lambda f: os.path.getmtime(f))
+        key = folder_key(folder_id)
+        if key not in _direct_cache_entries:
+            cache_dir = _get_cache_dir_direct()
+            _direct_cache_entries[key] = read_entry(store_path(cache_dir), key) if cache_dir else None
+        return _direct_cache_entries[key]
     except Exception:
         return None
 
-def _is_cache_fresh_direct(cache_file, ttl_hours=12):
-    """Check if cache file is fresh without loading settings"""
+# List cache pages read during this invocation, keyed by (list_id, page)
+_direct_list_pages = {}
+
+def _get_list_page_direct(list_id, page):
+    """Read a list page's cache row (schema, built_at, payload, is_current, playback states)"""
     try:
-        import os
-        from datetime import datetime, timedelta
+        key = (str(list_id), int(page or 1))
+        if key not in _direct_list_pages:
+            import os
+            from lib.utils.list_cache_store import page_key, read_page, store_path
+            cache_dir = _get_cache_dir_direct()
+            cache_dir = os.path.join(os.path.dirname(cache_dir), 'lists') if cache_dir else None
+            _direct_list_pages[key] = read_page(store_path(cache_dir), page_key(*key)) if cache_dir else None
+        return _direct_list_pages[key]
+    except Exception:
+        return None
+
+def _is_cache_fresh_direct(cache_entry, ttl_hours=12):
+    """Check schema, generation and build time from the row header without decoding the payload"""
+    try:
+        import time
+        from lib.utils.folder_cache_store import CACHE_SCHEMA_VERSION
         
-        if not cache_file or not os.path.exists(cache_file):
+        # Entries outdated by an invalidation go through the full pipeline
+        if not cache_entry or cache_entry[0] != CACHE_SCHEMA_VERSION or not cache_entry[3]:
             return False
-            
-        file_time = datetime.fromtimestamp(os.path.getmtime(cache_file))
-        cutoff_time = datetime.now() - timedelta(hours=ttl_hours)
-        return file_time > cutoff_time
+        return cache_entry[1] > time.time() - ttl_hours * 3600
     except Exception:
         return False
 
-def _load_cache_direct(cache_file):
-    """Load cache file directly without FolderCache class"""
+def _load_cache_direct(cache_entry):
+    """Decode a cache row payload directly without FolderCache class"""
     try:
-        import json
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        from lib.utils.cache_codec import decode
+        return decode(cache_entry[2])
     except Exception:
         return None
 
@@ -165,8 +148,7 @@ def _can_serve_from_cache_only(action, params=None):
             log_error(f"Error checking startup folder setting: {e}")
             pass  # If check fails, continue with normal cache logic
         
-        cache_file = _get_cache_file_direct(None)  # Root folder
-        return cache_file and _is_cache_fresh_direct(cache_file)
+        return _is_cache_fresh_direct(_get_cache_entry_direct(None))  # Root folder
     
     # Handle folder navigation cache serving
     if action == 'show_folder':
@@ -186,8 +168,13 @@ def _can_serve_from_cache_only(action, params=None):
             pass  # If check fails, continue with normal cache logic
         
         if folder_id:
-            cache_file = _get_cache_file_direct(folder_id)
-            return cache_file and _is_cache_fresh_direct(cache_file)
+            return _is_cache_fresh_direct(_get_cache_entry_direct(folder_id))
+    
+    # Handle list contents cache serving; a nav_mode asks for the full pipeline's navigation intent
+    if action in ['show_list', 'view_list']:
+        list_id = params.get('list_id') if params else None
+        if list_id and not params.get('nav_mode'):
+            return _is_cache_fresh_direct(_get_list_page_direct(list_id, params.get('page')))
     
     return False
 
@@ -201,79 +188,67 @@ def _serve_from_cache_ultra_fast(action, params=None):
         if addon_handle < 0:
             return False
             
+        if action in ['show_list', 'view_list']:
+            return _serve_list_page_ultra_fast(addon_handle, params)
+            
         # Determine folder ID
         folder_id = None
         if action == 'show_folder':
             folder_id = params.get('folder_id') if params else None
             
-        # Load cached data
-        cache_file = _get_cache_file_direct(folder_id)
-        if not cache_file:
-            log("No cache file found")
+        # Load cached data (the row read by _can_serve_from_cache_only)
+        cache_entry = _get_cache_entry_direct(folder_id)
+        if not cache_entry:
+            log("No cache entry found")
             return False
-            
-        cached_data = _load_cache_direct(cache_file)
-        if not cached_data:
-            log("Failed to load cache data")
+        
+        # CRITICAL: Check schema version - reject old cache entries
+        from lib.utils.folder_cache_store import CACHE_SCHEMA_VERSION
+        if cache_entry[0] != CACHE_SCHEMA_VERSION:
+            log(f"Cache schema mismatch: cached={cache_entry[0]}, current={CACHE_SCHEMA_VERSION} - rejecting cache")
             return False
         
-        # CRITICAL: Check schema version - reject old cache files
-        from lib.ui.folder_cache import CACHE_SCHEMA_VERSION
-        cached_schema = cached_data.get('_schema')
-        if cached_schema != CACHE_SCHEMA_VERSION:
-            log(f"Cache schema mismatch: cached={cached_schema}, current={CACHE_SCHEMA_VERSION} - rejecting cache")
+        cached_data = _load_cache_direct(cache_entry)
+        if not cached_data:
+            log("Failed to load cache data")
             return False
             
-        log(f"Serving from cache: {cache_file}")
+        log(f"Serving from cache: folder {folder_id or 'root'}")
         
         # Render cached items directly
         _render_cached_items_direct(cached_data, addon_handle)
+        
+        # Count the visit as served without the plugin architecture
+        from lib.utils.visit_telemetry import record_visit, FOLDER
+        record_visit(FOLDER, folder_id or 'root', cache_only=True)
         return True
         
     except Exception as e:
         log_error(f"Ultra-fast cache serving failed: {e}")
         return False
 
-def _get_simple_resource_art(item_type):
-    """
-    Get resource artwork for folders/lists without requiring full renderer.
-    Simple implementation for ultra-fast rendering.
+def _serve_list_page_ultra_fast(addon_handle, params):
+    """Replay a cached list page with the stored playback state overlaid"""
+    list_id = params.get('list_id')
+    cache_entry = _get_list_page_direct(list_id, params.get('page'))
+    cached_data = _load_cache_direct(cache_entry) if cache_entry else None
+    if not cached_data:
+        log("Failed to load cached list page")
+        return False
     
-    Args:
-        item_type: 'folder' or 'list'
-        
-    Returns:
-        Dict of art paths or empty dict
-    """
-    try:
-        import os
-        addon = xbmcaddon.Addon()
-        addon_path = addon.getAddonInfo('path')
-        resources_dir = os.path.join(addon_path, 'resources')
-        
-        # Map type to resource files
-        if item_type == 'folder':
-            icon_file = 'list_folder_icon.png'
-            thumb_file = 'list_folder.jpg'
-        elif item_type == 'list':
-            icon_file = 'list_playlist_icon.png'
-            thumb_file = 'list_playlist.jpg'
-        else:
-            return {}
-        
-        icon_path = os.path.join(resources_dir, icon_file)
-        thumb_path = os.path.join(resources_dir, thumb_file)
-        
-        art = {}
-        if os.path.exists(icon_path):
-            art['icon'] = icon_path
-        if os.path.exists(thumb_path):
-            art['thumb'] = thumb_path
-            art['poster'] = thumb_path
-        
-        return art
-    except Exception:
-        return {}
+    log(f"Serving from cache: list {list_id} page {params.get('page') or 1}")
+    
+    # Used by Kodi for the ".." navigation from search results
+    parent_path = params.get('parent_path')
+    if parent_path:
+        xbmcplugin.setProperty(addon_handle, 'ParentDir', parent_path)
+    
+    from lib.utils.render_spec import render_page
+    render_page(addon_handle, cached_data, cache_entry[4])
+    
+    from lib.utils.visit_telemetry import record_visit, LIST
+    record_visit(LIST, list_id, cache_only=True)
+    return True
 
 def _render_cached_items_direct(cached_data, addon_handle):
     """Render cached processed items directly to Kodi without full plugin infrastructure"""
@@ -322,85 +297,12 @@ def _render_cached_items_direct(cached_data, addon_handle):
             # Insert at beginning
             processed_items = [tools_item] + processed_items
         
-        total_items = 0
-        
+        # One addDirectoryItems call; resource art is resolved once per process
+        from lib.utils.directory_emitter import DirectoryEmitter
+        emitter = DirectoryEmitter(addon_handle)
         for item_data in processed_items:
-            listitem = xbmcgui.ListItem(label=item_data.get('label', 'Unknown Item'))
-            
-            # Set description/plot if available
-            if item_data.get('description'):
-                listitem.setInfo('video', {'plot': item_data['description']})
-            
-            # Apply comprehensive artwork from art_data if available
-            art_applied = False
-            art_data = item_data.get('art_data')
-            if art_data:
-                try:
-                    import json
-                    # Parse if it's a JSON string
-                    if isinstance(art_data, str):
-                        try:
-                            art_data = json.loads(art_data)
-                        except (json.JSONDecodeError, ValueError) as e:
-                            log_error(f"Failed to parse art_data JSON: {e}")
-                            art_data = None
-                    
-                    # Apply the art dictionary if valid
-                    if art_data and isinstance(art_data, dict):
-                        # Debug logging for cache-served artwork
-                        item_label = item_data.get('label', 'Unknown')
-                        art_types = list(art_data.keys())
-                        log(f"CACHE LISTITEM ART: Applying artwork to '{item_label}' with {len(art_types)} types: {art_types}")
-                        for art_type, art_path in art_data.items():
-                            log(f"  - {art_type}: {art_path}")
-                        
-                        listitem.setArt(art_data)
-                        art_applied = True
-                except Exception as e:
-                    log_error(f"Failed to apply art_data: {e}")
-            
-            # Fallback: compute resource art based on item type
-            if not art_applied:
-                item_label = item_data.get('label', 'Unknown')
-                log(f"CACHE LISTITEM ART: No custom art_data for '{item_label}' - using fallback")
-                
-                # Determine item type from URL
-                url = item_data.get('url', '')
-                if 'action=show_folder' in url:
-                    resource_art = _get_simple_resource_art('folder')
-                elif 'action=show_list' in url:
-                    resource_art = _get_simple_resource_art('list')
-                else:
-                    resource_art = {}
-                
-                # Apply resource art if found
-                if resource_art:
-                    listitem.setArt(resource_art)
-                    art_applied = True
-                # Use icon field if available
-                elif item_data.get('icon'):
-                    listitem.setArt({'icon': item_data['icon'], 'thumb': item_data['icon']})
-                    art_applied = True
-            
-            # Ultimate fallback if still no art
-            if not art_applied:
-                default_icon = 'DefaultFolder.png' if item_data.get('is_folder') else 'DefaultVideo.png'
-                listitem.setArt({'icon': default_icon, 'thumb': default_icon})
-            
-            # Add context menu if available
-            if item_data.get('context_menu'):
-                listitem.addContextMenuItems(item_data['context_menu'])
-            
-            # Set properties
-            listitem.setProperty('IsPlayable', 'false')
-            
-            xbmcplugin.addDirectoryItem(
-                handle=addon_handle,
-                url=item_data.get('url', ''),
-                listitem=listitem,
-                isFolder=item_data.get('is_folder', True)
-            )
-            total_items += 1
+            emitter.add_item(item_data)
+        total_items = emitter.flush()
         
         # Set content type and finish
         content_type = cached_data.get('content_type', 'files')
@@ -845,10 +747,29 @@ def _standard_startup_initialization(context: 'PluginContext'):
     log("=== STANDARD STARTUP INITIALIZATION COMPLETE ===")
 
 
+def _reset_invocation_state():
+    """Drop what an earlier call in a reused interpreter (reuselanguageinvoker) left behind"""
+    global _cached_config
+    _cached_config = None
+    _direct_cache_entries.clear()
+    _direct_list_pages.clear()
+
+
+def _keep_plugin_state() -> bool:
+    """keep_plugin_state setting, read straight from Kodi before any config is loaded"""
+    try:
+        return xbmcaddon.Addon().getSettingBool('keep_plugin_state')
+    except Exception:
+        return False
+
+
 def main():
     """Main plugin entry point with ultra-fast cache optimization"""
-    
-    log("=== PLUGIN INVOCATION (CACHE-OPTIMIZED) ===")
+    from lib.utils.invocation_state import begin_invocation, end_invocation
+
+    reused = begin_invocation(keep_state=_keep_plugin_state())
+    _reset_invocation_state()
+    log(f"=== PLUGIN INVOCATION (CACHE-OPTIMIZED{', REUSED INTERPRETER' if reused else ''}) ===")
     log(f"Full sys.argv: {sys.argv}")
     
     try:
@@ -926,6 +847,8 @@ def main():
             )
         except Exception:
             pass
+    finally:
+        end_invocation()
 
 
 def _log_window_state(context: 'PluginContext'):
@@ -1153,6 +1076,8 @@ def _register_all_handlers(router: 'Router'):
     # Register handlers with true lazy instantiation - factory only created when route is invoked
     router.register_handler('search', lambda ctx: _get_factory().get_search_handler().prompt_and_search(ctx))
     router.register_handler('ai_search_prompt', lambda ctx: _get_factory().get_search_handler().ai_search_prompt(ctx))
+    router.register_handler('search_show_groups', _handle_search_show_groups)
+    router.register_handler('search_show_episodes', lambda ctx: _get_factory().get_search_handler().show_episode_hits(ctx))
     router.register_handler('lists', lambda ctx: _get_factory().get_lists_handler().show_lists_menu(ctx))
     router.register_handler('kodi_favorites', lambda ctx: _handle_directory_response(ctx, _get_factory().get_favorites_handler().show_favorites_menu(ctx)))
 
@@ -1325,6 +1250,18 @@ def _handle_remove_from_list(context: 'PluginContext', lists_handler):
     return _handle_dialog_response(context, response)
 
 
+def _handle_search_show_groups(context: 'PluginContext'):
+    """Handle search_show_groups - episode search hits aggregated per show"""
+    return _get_factory().get_search_handler().show_episode_groups(
+        context,
+        context.get_param('q', ''),
+        match_logic=context.get_param('match', 'all'),
+        search_scope=context.get_param('scope', 'both'),
+        movies_list_id=context.get_param('movies_list_id'),
+        movie_count=int(context.get_param('movies', '0'))
+    )
+
+
 def _handle_directory_response(context: 'PluginContext', response):
     """Handle DirectoryResponse objects from handler methods"""
     from lib.ui.response_types import DirectoryResponse
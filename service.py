@@ -9,6 +9,7 @@ Handles periodic tasks, cache management, and AI search synchronization
 import xbmc
 import xbmcaddon
 import xbmcgui
+import json
 import time
 import threading
 from typing import Optional
@@ -16,8 +17,6 @@ from typing import Optional
 from lib.utils.kodi_log import log, log_info, log_error, log_warning
 from lib.config.settings import SettingsManager
 from lib.config.config_manager import get_config
-from lib.remote.ai_search_client import get_ai_search_client
-from lib.library.scanner import LibraryScanner
 from lib.data.storage_manager import get_storage_manager
 from lib.data.migrations import initialize_database
 from lib.data.db_config import get_db_config_calculator
@@ -25,13 +24,23 @@ from lib.ui.localization import L
 
 addon = xbmcaddon.Addon()
 
+# Minimum seconds between navigation pre-warm runs
+PREWARM_INTERVAL_SECONDS = 30 * 60
+# Seconds without user input before a pre-warm run may start
+PREWARM_IDLE_SECONDS = 60
+
+# Seconds to wait after a stop before reading the saved resume point
+PLAYBACK_STATE_DELAY_SECONDS = 2.0
+
 
 class LibraryGenieMonitor(xbmc.Monitor):
-    """Custom monitor that handles settings changes"""
+    """Custom monitor that handles settings changes and playback notifications"""
     
-    def __init__(self):
+    def __init__(self, on_playback_ended=None, on_playback_state=None):
         super().__init__()
         self.config_manager = get_config()
+        self.on_playback_ended = on_playback_ended
+        self.on_playback_state = on_playback_state
     
     def onSettingsChanged(self):
         """Called when addon settings are changed"""
@@ -40,19 +49,50 @@ class LibraryGenieMonitor(xbmc.Monitor):
             # Brief delay to ensure settings file is fully written by Kodi
             xbmc.sleep(200)
             self.config_manager.reload()
+            
+            # Cached list pages depend on settings such as page size and art
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().invalidate_all()
+
+            # Plugin interpreters kept by reuselanguageinvoker reload on their next call
+            from lib.utils.invocation_state import advance_generation
+            advance_generation()
         except Exception as e:
             log_error(f"Failed to reload settings cache: {e}")
 
+    def onNotification(self, sender, method, data):
+        """Called for Kodi notifications; forwards the end of playback and playcount changes"""
+        if method in ('Player.OnStop', 'Player.OnAVEnd') and self.on_playback_ended:
+            try:
+                self.on_playback_ended(data)
+            except Exception as e:
+                log_error(f"Error handling {method}: {e}")
+        if self.on_playback_state and (method == 'Player.OnStop'
+                                       or (method == 'VideoLibrary.OnUpdate' and '"playcount"' in (data or ''))):
+            try:
+                self.on_playback_state(data)
+            except Exception as e:
+                log_error(f"Error handling {method}: {e}")
+
 
 class LibraryGenieService:
     """Background service for LibraryGenie addon"""
 
+    @property
+    def ai_client(self):
+        """AI search client, imported on first use so startup does not load the HTTP stack"""
+        if self._ai_client is None:
+            from lib.remote.ai_search_client import get_ai_search_client
+            self._ai_client = get_ai_search_client()
+        return self._ai_client
+
     def __init__(self):
         self.settings = SettingsManager()
-        self.ai_client = get_ai_search_client()
+        self._ai_client = None
         self.storage_manager = get_storage_manager()
         self.db_config = get_db_config_calculator()
-        self.monitor = LibraryGenieMonitor()
+        self.monitor = LibraryGenieMonitor(on_playback_ended=self._on_playback_ended,
+                                           on_playback_state=self._on_playback_state)
         self.sync_thread = None
         self.sync_stop_event = threading.Event()
         
@@ -66,6 +106,10 @@ class LibraryGenieService:
         self._library_sync_in_progress = False
         self._service_start_time = time.time()
         
+        # Visit-driven folder cache pre-warming
+        self._prewarm_thread = None
+        self._last_prewarm_time = 0
+        
         
         log_info("LibraryGenie service initialized")
 
@@ -143,6 +187,9 @@ class LibraryGenieService:
             # Initialize cache service with optional pre-warming
             success = folder_cache.initialize_cache_service(enable_pre_warming=enable_pre_warming)
             
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().cleanup()
+            
             if success:
                 log_info("Service: Folder cache service initialized successfully")
             else:
@@ -258,6 +305,7 @@ class LibraryGenieService:
                 log_info("First run not completed - skipping automatic scan until user configures sync options")
                 return
                 
+            from lib.library.scanner import LibraryScanner
             scanner = LibraryScanner()
 
             if not scanner.is_library_indexed():
@@ -329,7 +377,7 @@ class LibraryGenieService:
                 log_info("AI Search sync conditions met - starting sync thread")
                 self._start_ai_sync_thread()
                 
-                # Fetch library stats at startup (one-time)
+                # Refresh library stats at startup if the cached ones are stale
                 self._fetch_startup_stats()
             else:
                 log_info("AI Search sync conditions not met - sync disabled")
@@ -340,6 +388,8 @@ class LibraryGenieService:
 
             # Cleanup
             self._stop_ai_sync_thread()
+            self._stop_similar_prefetch()
+            self._flush_remote_cache_hits()
             log_info("LibraryGenie background service stopped")
 
         except Exception as e:
@@ -400,6 +450,22 @@ class LibraryGenieService:
                 # Check for periodic library sync (every 30 seconds)
                 if tick_count % 30 == 0:  # Every 30 seconds
                     self._check_and_perform_periodic_library_sync()
+
+                # Refresh library stats on request, or when stale (every 5 minutes)
+                if tick_count % 5 == 0:
+                    self._check_library_stats_refresh(check_age=(tick_count % 300 == 0))
+
+                # Write buffered remote cache hit counts (every 60 seconds)
+                if tick_count % 60 == 0:
+                    self._flush_remote_cache_hits()
+
+                # Purge expired remote cache entries and trim it to size (every hour)
+                if tick_count % 3600 == 0:
+                    self._perform_remote_cache_maintenance()
+
+                # Fold navigation visits and pre-warm hot folders when idle (every 5 minutes)
+                if tick_count % 300 == 0:
+                    self._check_navigation_prewarm()
                 
 
 
@@ -525,6 +591,7 @@ class LibraryGenieService:
             sync_controller = SyncController()
             
             # Check if library is indexed first
+            from lib.library.scanner import LibraryScanner
             scanner = LibraryScanner()
             if not scanner.is_library_indexed():
                 log_info("Library not indexed, performing initial scan...")
@@ -554,6 +621,9 @@ class LibraryGenieService:
                                 log_info("Library stats updated after periodic sync")
                         except Exception as e:
                             log_error(f"Failed to update stats cache after periodic sync: {e}")
+
+                        self._refresh_local_similarity_index()
+                        self._invalidate_list_pages()
                     else:
                         message = "No new movies found"
                         log("Periodic library sync: No changes detected")
@@ -576,6 +646,148 @@ class LibraryGenieService:
             self._library_sync_in_progress = False
             log_info("Background library sync thread completed")
 
+    def _refresh_local_similarity_index(self):
+        """Incrementally rebuild the offline similar-movies index after library changes"""
+        try:
+            if not self.settings.get_local_similarity_enabled():
+                return
+
+            from lib.search.local_similarity import get_local_similarity_engine
+            result = get_local_similarity_engine().rebuild()
+            if result.get('success'):
+                log(f"Local similarity index refreshed ({result.get('mode')}): "
+                    f"{result.get('rows', 0)} rows, {result.get('changed', 0)} changed")
+            else:
+                log_warning(f"Local similarity index refresh failed: {result.get('error')}")
+        except Exception as e:
+            log_error(f"Error refreshing local similarity index: {e}")
+
+    def _on_playback_ended(self, data):
+        """Queue the movie that just stopped for a background similar-movies prefetch"""
+        if not self.settings.get_similar_prefetch_enabled() or not self.ai_client.is_activated():
+            return
+        from lib.remote.similar_prefetch import get_similar_prefetcher
+        get_similar_prefetcher().on_playback_ended(data)
+
+    def _on_playback_state(self, data):
+        """Refresh the playcount and resume point overlaid on cached list pages"""
+        try:
+            item = (json.loads(data) if data else {}).get('item') or {}
+        except ValueError:
+            return
+        if item.get('type') not in ('movie', 'episode') or not item.get('id'):
+            return
+        # Kodi writes the resume point around the time it reports the stop
+        timer = threading.Timer(PLAYBACK_STATE_DELAY_SECONDS, self._record_playback_state,
+                                args=(item['type'], item['id']))
+        timer.daemon = True
+        timer.start()
+
+    def _record_playback_state(self, media_type, kodi_id):
+        """Read a library item's playcount and resume point and store them for the list cache"""
+        try:
+            method, id_key, result_key = {
+                'movie': ('VideoLibrary.GetMovieDetails', 'movieid', 'moviedetails'),
+                'episode': ('VideoLibrary.GetEpisodeDetails', 'episodeid', 'episodedetails'),
+            }[media_type]
+            request = {"jsonrpc": "2.0", "id": 1, "method": method,
+                       "params": {id_key: int(kodi_id), "properties": ["playcount", "resume"]}}
+            details = json.loads(xbmc.executeJSONRPC(json.dumps(request))).get('result', {}).get(result_key)
+            if not details:
+                return
+            resume = details.get('resume') or {}
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().record_playback(media_type, kodi_id, details.get('playcount', 0),
+                                             resume.get('position', 0), resume.get('total', 0))
+        except Exception as e:
+            log_error(f"Error recording playback state for {media_type} {kodi_id}: {e}")
+
+    def _invalidate_list_pages(self):
+        """Outdate every cached list page after the library index changed"""
+        try:
+            from lib.ui.list_cache import get_list_cache
+            get_list_cache().invalidate_all()
+        except Exception as e:
+            log_error(f"Error invalidating list cache: {e}")
+
+    def _stop_similar_prefetch(self):
+        """Stop the similar-movies prefetch worker, if it was started"""
+        try:
+            from lib.remote.similar_prefetch import get_similar_prefetcher
+            get_similar_prefetcher().stop()
+        except Exception as e:
+            log_error(f"Error stopping similar movies prefetch: {e}")
+
+    def _flush_remote_cache_hits(self):
+        """Write the remote cache hit counters buffered in this process"""
+        try:
+            from lib.remote.cache import get_remote_cache
+            flushed = get_remote_cache().flush_hits()
+            if flushed:
+                log(f"Remote cache: flushed hit counts for {flushed} keys")
+        except Exception as e:
+            log_error(f"Error flushing remote cache hits: {e}")
+
+    def _perform_remote_cache_maintenance(self):
+        """Bulk-purge expired remote cache entries and evict by size"""
+        try:
+            from lib.remote.cache import get_remote_cache
+            removed = get_remote_cache().cleanup_old_entries()
+            if removed:
+                log_info(f"Remote cache maintenance removed {removed} entries")
+        except Exception as e:
+            log_error(f"Error during remote cache maintenance: {e}")
+
+    def _check_navigation_prewarm(self):
+        """Fold recorded visits and pre-warm the most visited folders while Kodi is idle"""
+        try:
+            from lib.utils.visit_telemetry import get_visit_telemetry
+            get_visit_telemetry().fold()
+
+            if not self.settings.get_folder_cache_enabled() or not self.settings.get_folder_cache_prewarm_enabled():
+                return
+            if self._prewarm_thread and self._prewarm_thread.is_alive():
+                return
+            if time.time() - self._last_prewarm_time < PREWARM_INTERVAL_SECONDS:
+                return
+            if not self._is_safe_to_sync_library() or xbmc.getGlobalIdleTime() < PREWARM_IDLE_SECONDS:
+                return
+
+            self._last_prewarm_time = time.time()
+            self._prewarm_thread = threading.Thread(
+                target=self._perform_navigation_prewarm,
+                daemon=True,
+                name="FolderCachePrewarm"
+            )
+            self._prewarm_thread.start()
+        except Exception as e:
+            log_error(f"Error checking navigation pre-warm: {e}")
+
+    def _perform_navigation_prewarm(self):
+        """Rebuild the most visited folders within the configured budgets"""
+        try:
+            from lib.ui.folder_cache import get_folder_cache
+            from lib.utils.visit_telemetry import get_visit_telemetry
+            result = get_folder_cache().pre_warm_common_folders()
+            if result.get('success') and not result.get('stopped'):
+                from lib.ui.list_cache import get_list_cache
+                list_result = get_list_cache().pre_warm_lists()
+                result['lists_success'] = list_result.get('lists_success', 0)
+                result['stopped'] = list_result.get('stopped')
+            telemetry = get_visit_telemetry()
+            telemetry.record_prewarm({key: result.get(key) for key in
+                                      ('folders_attempted', 'folders_success', 'lists_success',
+                                       'total_time_ms', 'stopped')})
+            if result.get('success'):
+                log_info(f"Navigation pre-warm: {result.get('folders_success', 0)}/"
+                         f"{result.get('folders_attempted', 0)} folders in {result.get('total_time_ms', 0)} ms, "
+                         f"{result.get('lists_success', 0)} lists, "
+                         f"cache-only hit rate {telemetry.get_stats()['hit_rate_percent']}%")
+            else:
+                log(f"Navigation pre-warm skipped: {result.get('error')}")
+        except Exception as e:
+            log_error(f"Error during navigation pre-warm: {e}")
+
     def _should_start_ai_sync(self, force_log=False) -> bool:
         """Check if AI search sync should be started"""
         # Read settings directly from Kodi to bypass inter-process caching issues
@@ -639,18 +851,36 @@ class LibraryGenieService:
         return True
 
     def _fetch_startup_stats(self):
-        """Fetch and cache library stats at service startup (one-time)"""
+        """Refresh cached library stats at service startup when missing or stale"""
         try:
-            log_info("Fetching library stats at service startup...")
             from lib.utils.stats_cache import get_stats_cache
             
+            get_stats_cache().refresh_async()
+        except Exception as e:
+            log_error(f"Error fetching stats at startup: {e}")
+
+    def _check_library_stats_refresh(self, check_age=False):
+        """Refresh library stats in the background when a reader asked for it,
+        or (check_age) when the cached stats are older than their TTL
+
+        Checked whenever AI search is activated, not only while the AI sync
+        thread runs: that thread starts up to 30 seconds after activation and
+        only once the addon setting and server URL are in place as well.
+        """
+        try:
+            from lib.utils.stats_cache import get_stats_cache
+
             stats_cache = get_stats_cache()
-            if stats_cache.fetch_and_save_stats():
-                log_info("Library stats cached at startup")
+            requested = stats_cache.take_refresh_request()
+            if not (requested or check_age) or not self.ai_client.is_activated():
+                return
+            if requested:
+                log("Library stats refresh requested")
+                stats_cache.refresh_async(force=True)
             else:
-                log("Failed to fetch stats at startup (will retry after next sync)")
+                stats_cache.refresh_async()
         except Exception as e:
-            log_error(f"Error fetching stats at startup: {e}")
+            log_error(f"Error checking library stats refresh: {e}")
 
     def _start_ai_sync_thread(self):
         """Start the AI search sync background thread"""
@@ -769,6 +999,9 @@ class LibraryGenieService:
                             log_info("Library stats updated after startup sync")
                     except Exception as e:
                         log_error(f"Failed to update stats cache after startup sync: {e}")
+
+                    self._refresh_local_similarity_index()
+                    self._invalidate_list_pages()
                 else:
                     log("Startup sync completed: no changes detected")
             else:
@@ -903,6 +1136,9 @@ class LibraryGenieService:
                             log_info("Library stats updated after initial sync")
                     except Exception as e:
                         log_error(f"Failed to update stats cache after initial sync: {e}")
+
+                    self._refresh_local_similarity_index()
+                    self._invalidate_list_pages()
                 
                 self._show_notification(
                     f"Initial sync complete: {message}",
@@ -939,12 +1175,8 @@ class LibraryGenieService:
                 self._show_notification(f"{L(30084)}: {error_msg}", xbmcgui.NOTIFICATION_ERROR)  # "Sync failed: ..."
                 return
 
-            # Get current library version for delta sync (optional - endpoint may not exist)
-            server_version = self.ai_client.get_library_version()
-            if not server_version:
-                log_info("Server library version not available (proceeding with full sync)")
-
             # Scan library for movies with IMDb IDs
+            from lib.library.scanner import LibraryScanner
             scanner = LibraryScanner()
             movies_with_imdb = []
 
@@ -972,44 +1204,26 @@ class LibraryGenieService:
                 self._show_notification(L(30016), xbmcgui.NOTIFICATION_WARNING)  # "No results found" (reusing existing string)
                 return
 
-            # Sync in batches with rate limiting
-            batch_size = 500  # Conservative batch size
-            total_batches = (len(movies_with_imdb) + batch_size - 1) // batch_size
-
-            for i in range(0, len(movies_with_imdb), batch_size):
-                if self.sync_stop_event.is_set():
-                    log_info("Sync cancelled by stop event")
-                    return
-
-                batch = movies_with_imdb[i:i + batch_size]
-                batch_num = (i // batch_size) + 1
-
-                log_info(f"Syncing batch {batch_num}/{total_batches} ({len(batch)} movies)")
-
-                result = self.ai_client.sync_media_batch(batch, batch_size)
+            # Delta sync: only IDs added/removed since the last commit are uploaded
+            result = self.ai_client.sync_library(movies_with_imdb, authoritative=True,
+                                                 stop_event=self.sync_stop_event)
 
-                if result and result.get('success'):
-                    results = result.get('results', {})
-                    log_info(f"Batch {batch_num} sync completed: {results.get('added', 0)} added, {results.get('already_present', 0)} existing, {results.get('invalid', 0)} invalid")
+            if result and result.get('interrupted'):
+                # Acknowledged chunks are checkpointed; the next run resumes the upload
+                log_info("AI sync interrupted, will resume on the next run")
+                return
 
-                    # Show progress notification for significant batches
-                    if total_batches > 1:
-                        self._show_notification(
-                            f"{L(30113)} {batch_num}/{total_batches}",  # "Processing... X/Y"
-                            time_ms=3000
-                        )
-                else:
-                    error_msg = result.get('error', 'Unknown error') if result else 'No response'
-                    log_error(f"Batch {batch_num} sync failed: {error_msg}")
-                    self._show_notification(
-                        f"{L(30084)}: {error_msg}",  # "Sync failed: ..."
-                        xbmcgui.NOTIFICATION_ERROR
-                    )
+            if not result or not result.get('success'):
+                error_msg = result.get('error', 'Unknown error') if result else 'No response'
+                log_error(f"AI sync failed: {error_msg}")
+                self._show_notification(
+                    f"{L(30084)}: {error_msg}",  # "Sync failed: ..."
+                    xbmcgui.NOTIFICATION_ERROR
+                )
+                return
 
-                # Rate limiting: 1 second wait between batches
-                if batch_num < total_batches and not self.sync_stop_event.is_set():
-                    log("Waiting 1 second before next batch...")
-                    self.sync_stop_event.wait(1)
+            log_info(f"AI sync ({result.get('sync_mode')}): {result.get('added_count', 0)} added, "
+                     f"{result.get('removed_count', 0)} removed, {result.get('total_processed', 0)} uploaded")
 
             log_info("AI search synchronization completed")
             
@@ -1035,6 +1249,14 @@ class LibraryGenieService:
                 xbmcgui.NOTIFICATION_ERROR,
                 time_ms=8000
             )
+        finally:
+            # All requests of the run share keep-alive connections; drop them until the next run
+            from lib.remote.http_session import get_http_session
+            http_session = get_http_session()
+            stats = http_session.get_stats()
+            log(f"HTTP session totals: {stats['requests']} requests over {stats['connections_opened']} connections, "
+                f"{stats['body_bytes_sent']} bytes sent, {stats['body_bytes_received']} bytes received")
+            http_session.close_idle()
 
 
 if __name__ == '__main__':
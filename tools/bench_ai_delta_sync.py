@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - AI Delta Sync Benchmark
+Runs AISearchClient.sync_library against the local stand-in server through a
+sequence of library changes and reports, per step, the sync mode chosen, the
+requests made and the bytes on the wire:
+
+  initial     first sync, no manifest yet (replace)
+  unchanged   nothing changed
+  added       a few movies added
+  removed     a movie removed (needs a replace: the batch API has no delete)
+  external    the server collection changed behind our back (replace)
+
+    python tools/bench_ai_delta_sync.py [--movies 10000] [--changed 2]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+import mock_ai_server  # noqa: E402
+
+
+def _movies(imdb_ids):
+    return [{'imdb_id': imdb_id} for imdb_id in sorted(imdb_ids)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movies', type=int, default=10000)
+    parser.add_argument('--changed', type=int, default=2)
+    args = parser.parse_args()
+
+    server = mock_ai_server.start_server()
+    kodi_stubs.install(settings={'remote_server_url': server.url})
+
+    from lib.data.migrations import get_migration_manager
+    from lib.auth.state import save_api_key
+    import lib.remote.ai_search_client as ai_search_client
+
+    get_migration_manager().ensure_initialized()
+    save_api_key('bench-key')
+    client = ai_search_client.AISearchClient()
+
+    library = {'tt%07d' % (2000000 + i * 3) for i in range(args.movies)}
+    extra = ['tt%07d' % (9000000 + i) for i in range(args.changed)]
+
+    def external_change():
+        with server.state_lock:
+            server.library.add('tt0000001')
+
+    steps = [
+        ('initial', lambda: None),
+        ('unchanged', lambda: None),
+        ('added', lambda: library.update(extra)),
+        ('removed', lambda: library.discard(extra[0])),
+        ('external', external_change),
+    ]
+
+    print('%-10s %-9s %8s %9s %12s %12s %9s' % ('step', 'mode', 'ids', 'requests', 'bytes sent', 'bytes recv', 'time ms'))
+    for name, change in steps:
+        change()
+        server.stats.reset()
+        start = time.perf_counter()
+        result = client.sync_library(_movies(library), authoritative=True)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        stats = server.stats.snapshot()
+        if not result or not result.get('success'):
+            print('%s: sync failed: %s' % (name, result), file=sys.stderr)
+            return 1
+        if server.library != library:
+            print('%s: server collection differs from the library' % name, file=sys.stderr)
+            return 1
+        print('%-10s %-9s %8d %9d %12d %12d %9.1f' % (name, result.get('sync_mode'), result.get('total_processed', 0),
+                                                     stats['requests'], stats['bytes_in'], stats['bytes_out'],
+                                                     elapsed_ms))
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
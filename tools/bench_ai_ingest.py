@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - AI Result Ingestion Benchmark
+Writes AI search style results (IMDb IDs with scores) into new search history
+lists, once the previous way (map everything, then add_search_results_to_list
+item by item) and once through AISearchHandler._stream_results_to_list.
+Reports the time until the list could be shown, the total time and the SQL
+statements executed (each executemany row counts as one).
+
+    python tools/bench_ai_ingest.py [--movies 5000] [--results 200] [--runs 5]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movies', type=int, default=5000)
+    parser.add_argument('--results', type=int, default=200)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    kodi_stubs.install()
+
+    import synthetic_library
+    from lib.data.connection_manager import get_connection_manager
+    from lib.ui.ai_search_handler import AISearchHandler
+
+    synthetic_library.create_library_database(movies=args.movies)
+    movies = list(synthetic_library.generate_movies(args.movies))
+    conn = get_connection_manager().get_connection()
+    handler = AISearchHandler()
+    query_manager = handler.query_manager
+
+    rng = random.Random(11)
+    # 80% of the results are in the library
+    results = []
+    for index, movie in enumerate(rng.sample(movies, args.results)):
+        imdb_id = movie['imdbnumber'] if index % 5 else 'tt98%05d' % index
+        results.append({'imdb_id': imdb_id, 'score': round(1.0 - index / float(args.results), 3)})
+
+    # List names must be unique within the Search History folder
+    run_names = ('AI: bench %d' % n for n in range(1000000))
+
+    def previous():
+        ranked = handler._rank_results(results)
+        items = handler._match_imdb_ids_to_media_items([i for i, _ in ranked], dict(ranked))
+        list_id = query_manager.create_search_history_list(next(run_names), 'ai_search', len(items))
+        query_manager.add_search_results_to_list(list_id, {'items': items})
+        return time.perf_counter()
+
+    def streaming():
+        shown = []
+        handler._stream_results_to_list(
+            lambda: query_manager.create_search_history_list(next(run_names), 'ai_search', 0),
+            handler._rank_results(results),
+            lambda list_id, count: shown.append(time.perf_counter()))
+        return shown[0]
+
+    print('%d results, %d movies in the library, median of %d runs' % (args.results, args.movies, args.runs))
+    print('%-12s %14s %10s %11s' % ('', 'first page ms', 'total ms', 'statements'))
+    for name, run in (('previous', previous), ('streaming', streaming)):
+        first, total, queries = [], [], []
+        for _ in range(args.runs):
+            statements = []
+            conn.set_trace_callback(statements.append)
+            try:
+                start = time.perf_counter()
+                shown_at = run()
+                end = time.perf_counter()
+            finally:
+                conn.set_trace_callback(None)
+            first.append((shown_at - start) * 1000.0)
+            total.append((end - start) * 1000.0)
+            queries.append(len(statements))
+        print('%-12s %14.1f %10.1f %11d' % (name, statistics.median(first), statistics.median(total),
+                                           statistics.median(queries)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
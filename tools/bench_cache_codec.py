@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Cache Payload Codec Benchmark
+Encoded size and decode time of folder cache payloads under each codec in
+lib.utils.cache_codec, for folders with 10, 200 and 2,000 entries built by
+FolderCache's own processed-item builder. Decoding is what plugin.py's
+cache-only path pays on every navigation; encoding happens once per build.
+
+Run it with each Python that Kodi ships (3.8 on Kodi 19/20 for most
+platforms, 3.11 on Kodi 21) to compare, e.g.:
+
+    python3.8 tools/bench_cache_codec.py [--sizes 10,200,2000] [--runs 300]
+"""
+
+import os
+import sys
+import time
+import argparse
+import platform
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+
+
+def _lists(count, folder_name):
+    return [{'id': 1000 + i, 'name': 'List %d' % i, 'description': '%d items' % (i * 7 % 300),
+             'folder_name': folder_name} for i in range(count)]
+
+
+def _folders(count, parent_id):
+    return [{'id': 10 + i, 'name': 'Folder %d' % i, 'parent_id': parent_id} for i in range(count)]
+
+
+def _median_ms(function, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10,200,2000', help='entries per folder payload')
+    parser.add_argument('--runs', type=int, default=300)
+    args = parser.parse_args()
+
+    profile_dir = kodi_stubs.install()
+
+    from lib.ui.folder_cache import FolderCache
+    from lib.utils import cache_codec
+    from lib.utils.folder_cache_store import CACHE_CODEC
+
+    cache = FolderCache(cache_dir=os.path.join(profile_dir, 'bench-folders'))
+    codecs = (cache_codec.JSON, cache_codec.MARSHAL, cache_codec.STRING_TABLE)
+
+    print('Python %s (%s), current codec: %s, median of %d runs'
+          % (platform.python_version(), platform.machine(), CACHE_CODEC, args.runs))
+    print('%7s %-8s %10s %12s %12s' % ('entries', 'codec', 'bytes', 'decode ms', 'encode ms'))
+    for size in [int(s) for s in args.sizes.split(',')]:
+        folder_info = {'id': '4242', 'name': 'Folder 4242'}
+        payload = {
+            'processed_items': cache._build_subfolder_processed_items(
+                folder_info, _folders(min(size, 5), '4242'), _lists(max(size - 5, 0), folder_info['name'])),
+            'breadcrumbs': {'directory_title': folder_info['name'], 'tools_label': "for '%s'" % folder_info['name'],
+                            'tools_description': 'Tools and options for this folder', 'folder_id': '4242'},
+            'content_type': 'files',
+            '_built_at': '2026-01-01T00:00:00', '_folder_id': '4242', '_schema': 0, '_show_tools': True
+        }
+        reference = cache_codec.decode(cache_codec.encode(payload, cache_codec.JSON))
+        for codec in codecs:
+            encoded = cache_codec.encode(payload, codec)
+            # marshal keeps tuples that JSON turns into lists; compare through JSON
+            decoded = cache_codec.decode(cache_codec.encode(cache_codec.decode(encoded), cache_codec.JSON))
+            if decoded != reference:
+                raise RuntimeError('%s did not round-trip the %d entry payload' % (codec, size))
+            decode_ms = _median_ms(lambda: cache_codec.decode(encoded), args.runs)
+            encode_ms = _median_ms(lambda: cache_codec.encode(payload, codec), max(args.runs // 10, 5))
+            print('%7d %-8s %10d %12.3f %12.3f' % (size, codec, len(encoded), decode_ms, encode_ms))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
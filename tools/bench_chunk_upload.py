@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Chunk Upload Benchmark
+Uploads a library through AISearchClient.sync_media_batch against the local
+stand-in server with per-chunk latency and a server-side chunk rate limit
+(429 + Retry-After), once with a single upload worker and once with the
+default pool. The previous fixed pacing (one chunk, then sleep 1s) is shown as
+an estimate. A last run is interrupted part-way and resumed, reporting how
+many chunks had to be sent again.
+
+    python tools/bench_chunk_upload.py [--movies 20000] [--chunk-size 500]
+                                       [--latency 0.1] [--server-rate 6]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+import mock_ai_server  # noqa: E402
+
+
+def _count_chunk_puts(server):
+    """Wrap the chunk route so accepted and throttled PUTs are counted"""
+    counts = {'accepted': 0}
+    routes = []
+    for method, pattern, handler in server.routes:
+        if handler is mock_ai_server._handle_batch_chunk:
+            def counting(srv, data, upload_id, _handler=handler):
+                response = _handler(srv, data, upload_id)
+                if response[0] == 200:
+                    with srv.state_lock:
+                        counts['accepted'] += 1
+                return response
+            handler = counting
+        routes.append((method, pattern, handler))
+    server.routes = routes
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movies', type=int, default=20000)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.1, help='server seconds per chunk PUT')
+    parser.add_argument('--server-rate', type=float, default=6.0, help='chunk PUTs per second the server allows')
+    args = parser.parse_args()
+
+    server = mock_ai_server.start_server(chunk_rate=args.server_rate, chunk_latency=args.latency)
+    chunk_puts = _count_chunk_puts(server)
+    kodi_stubs.install(settings={'remote_server_url': server.url})
+
+    from lib.data.migrations import get_migration_manager
+    from lib.auth.state import save_api_key
+    import lib.remote.chunk_uploader as chunk_uploader
+    from lib.remote.ai_search_client import AISearchClient
+
+    get_migration_manager().ensure_initialized()
+    save_api_key('bench-key')
+    client = AISearchClient()
+    default_workers = chunk_uploader.UPLOAD_WORKERS
+
+    items = [{'imdb_id': 'tt%07d' % (3000000 + i * 11)} for i in range(args.movies)]
+    total_chunks = (args.movies + args.chunk_size - 1) // args.chunk_size
+
+    def run(workers, stop_event=None, progress_callback=None):
+        chunk_uploader.UPLOAD_WORKERS = workers
+        # Let the server's rate limit bucket refill between runs
+        time.sleep(2.0)
+        server.stats.reset()
+        chunk_puts['accepted'] = 0
+        start = time.perf_counter()
+        result = client.sync_media_batch(items, batch_size=args.chunk_size, use_replace_mode=True,
+                                         progress_callback=progress_callback, stop_event=stop_event)
+        elapsed = time.perf_counter() - start
+        stats = server.stats.snapshot()
+        return result, elapsed, chunk_puts['accepted'], stats['throttled']
+
+    print('%d IMDb ids in %d chunks of %d; server: %.0f ms per chunk, %.1f chunks/s limit' % (
+        args.movies, total_chunks, args.chunk_size, args.latency * 1000, args.server_rate))
+    print('%-30s %9s %8s %9s %10s' % ('', 'time s', 'chunks', '429s', 'chunks/s'))
+
+    estimate = total_chunks * args.latency + (total_chunks - 1) * 1.0
+    print('%-30s %9.2f %8d %9s %10.2f' % ('fixed 1s pacing (estimated)', estimate, total_chunks, '-',
+                                           total_chunks / estimate))
+
+    for workers in (1, default_workers):
+        result, elapsed, sent, throttled = run(workers)
+        if not result or not result.get('success'):
+            print('sync failed: %s' % result, file=sys.stderr)
+            return 1
+        print('%-30s %9.2f %8d %9d %10.2f' % ('%d worker(s)' % workers, elapsed, sent, throttled, sent / elapsed))
+
+    # Interrupt after roughly 40% of the chunks, then run the same sync again
+    stop_event = threading.Event()
+    stop_after = max(1, int(total_chunks * 0.4))
+
+    def progress(current, total, message):
+        if current >= stop_after:
+            stop_event.set()
+
+    result, first_elapsed, first_sent, _ = run(default_workers, stop_event, progress)
+    if not result or not result.get('interrupted'):
+        print('expected an interrupted sync: %s' % result, file=sys.stderr)
+        return 1
+    result, second_elapsed, second_sent, _ = run(default_workers)
+    if not result or not result.get('success'):
+        print('resumed sync failed: %s' % result, file=sys.stderr)
+        return 1
+    print('%-30s %9.2f %8d' % ('interrupted run', first_elapsed, first_sent))
+    print('%-30s %9.2f %8d   (%d chunks sent twice)' % ('resumed run', second_elapsed, second_sent,
+                                                        first_sent + second_sent - total_chunks))
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
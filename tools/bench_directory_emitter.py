@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Directory Emission Benchmark
+Cost per directory item of turning cached folder items into ListItems and
+handing them to xbmcplugin. "previous" replays the loop plugin.py's cache-only
+path used before lib.utils.directory_emitter: one addDirectoryItem call per
+item, xbmcaddon.Addon() and two os.path.exists checks for every folder or list
+item without custom art, and debug messages per art key. "emitter" is the
+current DirectoryEmitter.add_item loop with one addDirectoryItems call.
+
+Runs against the xbmcgui/xbmcplugin stubs in kodi_stubs.py, whose calls cost
+next to nothing; inside Kodi every addDirectoryItem call also crosses into
+C++, so the real saving from batching is larger than shown. --art-share sets
+the fraction of items that carry imported custom art.
+
+    python tools/bench_directory_emitter.py [--sizes 10,200,2000] [--runs 200]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+
+
+def _items(count, art_share):
+    items = []
+    art_every = int(round(1 / art_share)) if art_share > 0 else 0
+    for i in range(count):
+        kind = 'show_folder&folder_id' if i % 10 == 0 else 'show_list&list_id'
+        item = {'label': 'Entry %d' % i, 'url': 'plugin://plugin.video.librarygenie/?action=%s=%d' % (kind, i),
+                'is_folder': True, 'description': '%d items' % (i * 7 % 300), 'icon': 'DefaultFolder.png',
+                'context_menu': [('Rename', 'RunPlugin(rename=%d)' % i), ('Delete', 'RunPlugin(delete=%d)' % i)]}
+        if art_every and i % art_every == 0:
+            item['art_data'] = json.dumps({'poster': '/art/%d/poster.jpg' % i, 'fanart': '/art/%d/fanart.jpg' % i})
+        items.append(item)
+    return items
+
+
+def _previous_resource_art(item_type):
+    """plugin.py's _get_simple_resource_art before the emitter"""
+    import xbmcaddon
+    try:
+        addon = xbmcaddon.Addon()
+        resources_dir = os.path.join(addon.getAddonInfo('path'), 'resources')
+        if item_type == 'folder':
+            icon_file, thumb_file = 'list_folder_icon.png', 'list_folder.jpg'
+        elif item_type == 'list':
+            icon_file, thumb_file = 'list_playlist_icon.png', 'list_playlist.jpg'
+        else:
+            return {}
+        icon_path = os.path.join(resources_dir, icon_file)
+        thumb_path = os.path.join(resources_dir, thumb_file)
+        art = {}
+        if os.path.exists(icon_path):
+            art['icon'] = icon_path
+        if os.path.exists(thumb_path):
+            art['thumb'] = thumb_path
+            art['poster'] = thumb_path
+        return art
+    except Exception:
+        return {}
+
+
+def _previous_render(items, handle):
+    """The per-item loop of _render_cached_items_direct before the emitter"""
+    import xbmcgui
+    import xbmcplugin
+    from lib.utils.kodi_log import log, log_error
+    for item_data in items:
+        listitem = xbmcgui.ListItem(label=item_data.get('label', 'Unknown Item'))
+        if item_data.get('description'):
+            listitem.setInfo('video', {'plot': item_data['description']})
+        art_applied = False
+        art_data = item_data.get('art_data')
+        if art_data:
+            if isinstance(art_data, str):
+                try:
+                    art_data = json.loads(art_data)
+                except ValueError as e:
+                    log_error(f"Failed to parse art_data JSON: {e}")
+                    art_data = None
+            if art_data and isinstance(art_data, dict):
+                item_label = item_data.get('label', 'Unknown')
+                art_types = list(art_data.keys())
+                log(f"CACHE LISTITEM ART: Applying artwork to '{item_label}' with {len(art_types)} types: {art_types}")
+                for art_type, art_path in art_data.items():
+                    log(f"  - {art_type}: {art_path}")
+                listitem.setArt(art_data)
+                art_applied = True
+        if not art_applied:
+            item_label = item_data.get('label', 'Unknown')
+            log(f"CACHE LISTITEM ART: No custom art_data for '{item_label}' - using fallback")
+            url = item_data.get('url', '')
+            if 'action=show_folder' in url:
+                resource_art = _previous_resource_art('folder')
+            elif 'action=show_list' in url:
+                resource_art = _previous_resource_art('list')
+            else:
+                resource_art = {}
+            if resource_art:
+                listitem.setArt(resource_art)
+                art_applied = True
+            elif item_data.get('icon'):
+                listitem.setArt({'icon': item_data['icon'], 'thumb': item_data['icon']})
+                art_applied = True
+        if not art_applied:
+            default_icon = 'DefaultFolder.png' if item_data.get('is_folder') else 'DefaultVideo.png'
+            listitem.setArt({'icon': default_icon, 'thumb': default_icon})
+        if item_data.get('context_menu'):
+            listitem.addContextMenuItems(item_data['context_menu'])
+        listitem.setProperty('IsPlayable', 'false')
+        xbmcplugin.addDirectoryItem(handle=handle, url=item_data.get('url', ''), listitem=listitem,
+                                    isFolder=item_data.get('is_folder', True))
+
+
+def _emitter_render(items, handle):
+    from lib.utils.directory_emitter import DirectoryEmitter
+    emitter = DirectoryEmitter(handle)
+    for item_data in items:
+        emitter.add_item(item_data)
+    emitter.flush()
+
+
+def _median_us_per_item(function, items, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(items, 1)
+        timings.append((time.perf_counter() - start) * 1e6 / max(len(items), 1))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10,200,2000', help='items per directory')
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--art-share', type=float, default=0.1, help='fraction of items with custom art')
+    args = parser.parse_args()
+
+    kodi_stubs.install()
+
+    import xbmc
+    from lib.utils import kodi_log
+
+    print('median us per item over %d runs, %d%% of items with custom art'
+          % (args.runs, int(args.art_share * 100)))
+    print('%7s %-10s %12s %12s %8s' % ('items', 'debug log', 'previous', 'emitter', 'speedup'))
+    for debug in (False, True):
+        xbmc.getCondVisibility = lambda condition, debug=debug: debug
+        kodi_log._debug_state['checked_at'] = None
+        for size in [int(s) for s in args.sizes.split(',')]:
+            items = _items(size, args.art_share)
+            runs = max(args.runs * 10 // max(size, 10), 5)
+            before = kodi_stubs.directory_item_count()
+            _previous_render(items, 1)
+            _emitter_render(items, 1)
+            if kodi_stubs.directory_item_count() - before != 2 * size:
+                raise RuntimeError('renderers did not add %d items each' % size)
+            previous_us = _median_us_per_item(_previous_render, items, runs)
+            emitter_us = _median_us_per_item(_emitter_render, items, runs)
+            print('%7d %-10s %12.2f %12.2f %7.1fx' % (size, 'on' if debug else 'off', previous_us, emitter_us,
+                                                      previous_us / emitter_us if emitter_us else 0))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Folder Navigation Benchmark
+Time from plugin invocation to endOfDirectory for cache-served folders, through
+plugin.py's ultra-fast path. "previous" replays the per-folder JSON file lookup
+(two glob patterns, getmtime per match, json.load, importing lib.ui.folder_cache
+for the schema check) against files in the old naming scheme; "store" is the
+current path reading one row of the single-file folder cache store. Both render
+through the same _render_cached_items_direct.
+
+    python tools/bench_folder_navigation.py [--folders 300] [--root-items 60]
+                                            [--nested-items 200] [--runs 200]
+"""
+
+import os
+import sys
+import json
+import time
+import glob
+import hashlib
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+
+
+def _lists(count, folder_name=None):
+    return [{'id': 1000 + i, 'name': 'List %d' % i, 'description': '%d items' % (i * 7 % 300),
+             'folder_name': folder_name} for i in range(count)]
+
+
+def _folders(count, parent_id=None):
+    return [{'id': 10 + i, 'name': 'Folder %d' % i, 'parent_id': parent_id} for i in range(count)]
+
+
+def _legacy_file_path(cache_dir, folder_id, schema_version):
+    """File name the per-folder JSON cache used"""
+    if folder_id is None:
+        safe_folder_id, source = 'root', 'root'
+    else:
+        safe_folder_id = ''.join(c for c in str(folder_id) if c.isalnum() or c in '-_').strip()
+        source = str(folder_id)
+    folder_hash = hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(cache_dir, 'folder_%s_%s_anon_v%d.json' % (safe_folder_id, folder_hash, schema_version))
+
+
+def _previous_serve(plugin, cache_dir, folder_id, handle):
+    """The glob/mtime/json lookup the ultra-fast path did before the store"""
+    if folder_id is None:
+        patterns = [os.path.join(cache_dir, 'folder_root_*_anon_v*.json'),
+                    os.path.join(cache_dir, 'folder_root_*_v*.json')]
+    else:
+        safe_folder_id = ''.join(c for c in str(folder_id) if c.isalnum() or c in '-_').strip()
+        folder_hash = hashlib.sha1(str(folder_id).encode('utf-8')).hexdigest()[:8]
+        patterns = [os.path.join(cache_dir, 'folder_%s_%s_anon_v*.json' % (safe_folder_id, folder_hash)),
+                    os.path.join(cache_dir, 'folder_%s_%s_v*.json' % (safe_folder_id, folder_hash))]
+    files = []
+    for pattern in patterns:
+        files.extend(glob.glob(pattern))
+    cache_file = max(files, key=os.path.getmtime)
+    if os.path.getmtime(cache_file) < time.time() - 12 * 3600:
+        raise RuntimeError('stale benchmark file')
+    # _can_serve_from_cache_only and _serve_from_cache_ultra_fast each ran the glob
+    files = []
+    for pattern in patterns:
+        files.extend(glob.glob(pattern))
+    cache_file = max(files, key=os.path.getmtime)
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        cached_data = json.load(f)
+    from lib.ui.folder_cache import CACHE_SCHEMA_VERSION
+    if cached_data.get('_schema') != CACHE_SCHEMA_VERSION:
+        raise RuntimeError('schema mismatch')
+    plugin._render_cached_items_direct(cached_data, handle)
+
+
+def _store_serve(plugin, action, params):
+    plugin._direct_cache_entries.clear()
+    if not plugin._can_serve_from_cache_only(action, params):
+        raise RuntimeError('store entry not servable')
+    if not plugin._serve_from_cache_ultra_fast(action, params):
+        raise RuntimeError('store serve failed')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--folders', type=int, default=300, help='cached folders besides root and the nested one')
+    parser.add_argument('--root-items', type=int, default=60, help='lists at the root')
+    parser.add_argument('--nested-items', type=int, default=200, help='lists in the nested folder')
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    kodi_stubs.install()
+
+    import xbmcplugin
+    import plugin
+    from lib.ui.folder_cache import FolderCache, CACHE_SCHEMA_VERSION
+
+    cache_dir = plugin._get_cache_dir_direct()
+    cache = FolderCache(cache_dir=cache_dir)
+
+    root_payload = {
+        'processed_items': cache._build_root_processed_items(_lists(args.root_items), _folders(20)),
+        'breadcrumbs': {'directory_title': 'Lists', 'tools_label': 'Lists',
+                        'tools_description': 'Search, Favorites, Import/Export & Settings'},
+        'content_type': 'files'
+    }
+    nested_id = '4242'
+
+    def folder_payload(folder_id, item_count):
+        folder_info = {'id': folder_id, 'name': 'Folder %s' % folder_id}
+        return {
+            'processed_items': cache._build_subfolder_processed_items(
+                folder_info, _folders(5, folder_id), _lists(item_count, folder_info['name'])),
+            'breadcrumbs': {'directory_title': folder_info['name'], 'tools_label': "for '%s'" % folder_info['name'],
+                            'tools_description': 'Tools and options for this folder', 'folder_id': folder_id},
+            'content_type': 'files'
+        }
+
+    entries = {None: root_payload, nested_id: folder_payload(nested_id, args.nested_items)}
+    for n in range(args.folders):
+        entries[str(100 + n)] = folder_payload(str(100 + n), 20)
+
+    # Same payloads in both layouts; the legacy files exist only for the replay
+    for folder_id, payload in entries.items():
+        cache.set(folder_id, payload)
+        legacy = dict(payload, _schema=CACHE_SCHEMA_VERSION, _folder_id=folder_id, _show_tools=True)
+        with open(_legacy_file_path(cache_dir, folder_id, CACHE_SCHEMA_VERSION), 'w', encoding='utf-8') as f:
+            json.dump(legacy, f, ensure_ascii=False, separators=(',', ':'))
+
+    ended = []
+    xbmcplugin.endOfDirectory = lambda handle, succeeded=True, updateListing=False, cacheToDisc=True: \
+        ended.append(time.perf_counter())
+    sys.argv = ['plugin://plugin.video.librarygenie/', '1', '']
+
+    cases = (
+        ('root', None, '', {}, len(root_payload['processed_items'])),
+        ('nested', nested_id, 'show_folder', {'action': 'show_folder', 'folder_id': nested_id},
+         len(entries[nested_id]['processed_items'])),
+    )
+
+    print('%d cached folders, median of %d runs, ms until endOfDirectory' % (len(entries), args.runs))
+    print('%-8s %6s %10s %10s' % ('', 'items', 'previous', 'store'))
+    for name, folder_id, action, params, item_count in cases:
+        timings = {'previous': [], 'store': []}
+        for _ in range(args.runs):
+            for label, run in (('previous', lambda: _previous_serve(plugin, cache_dir, folder_id, 1)),
+                               ('store', lambda: _store_serve(plugin, action, params))):
+                del ended[:]
+                start = time.perf_counter()
+                run()
+                timings[label].append((ended[0] - start) * 1000.0)
+        print('%-8s %6d %10.2f %10.2f' % (name, item_count, statistics.median(timings['previous']),
+                                         statistics.median(timings['store'])))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
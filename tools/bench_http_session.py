@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - HTTP Session Benchmark
+Runs a full AI library sync (test, hash, batch start, N chunks, commit) against
+the local stand-in server twice: once with a new urllib connection and plain
+JSON per request (the previous client behaviour) and once through
+AISearchClient on the shared keep-alive session with gzip. Reports TCP
+connections accepted by the server (one handshake each, plus TLS against a real
+server) and bytes on the wire in both directions.
+
+    python tools/bench_http_session.py [--movies 20000] [--chunk-size 1000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+import mock_ai_server  # noqa: E402
+
+
+def _fake_imdb_ids(count):
+    return ['tt%07d' % (1000000 + i * 7) for i in range(count)]
+
+
+def _legacy_request(server_url, endpoint, method='GET', data=None):
+    """One request the way the clients used to send it: new connection, uncompressed"""
+    body = json.dumps(data).encode('utf-8') if data else None
+    request = urllib.request.Request('%s/%s' % (server_url, endpoint), data=body, headers={
+        'Content-Type': 'application/json',
+        'User-Agent': 'LibraryGenie-Kodi/1.0',
+        'Authorization': 'ApiKey bench-key',
+    })
+    request.get_method = lambda: method
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def _legacy_sync(server_url, imdb_ids, chunk_size):
+    _legacy_request(server_url, 'kodi/test')
+    _legacy_request(server_url, 'library/hash')
+    start = _legacy_request(server_url, 'library/batch/start', 'POST',
+                            {'mode': 'merge', 'total_count': len(imdb_ids), 'source': 'kodi'})
+    upload_id = start['upload_id']
+    for chunk_index, offset in enumerate(range(0, len(imdb_ids), chunk_size)):
+        _legacy_request(server_url, 'library/batch/%s/chunk' % upload_id, 'PUT', {
+            'chunk_index': chunk_index,
+            'items': [{'imdb_id': imdb_id} for imdb_id in imdb_ids[offset:offset + chunk_size]],
+        })
+    _legacy_request(server_url, 'library/batch/%s/commit' % upload_id, 'POST')
+
+
+def _session_sync(client, imdb_ids, chunk_size):
+    client.test_connection()
+    client.get_library_version()
+    result = client.sync_media_batch([{'imdb_id': imdb_id} for imdb_id in imdb_ids], chunk_size)
+    if not result or not result.get('success'):
+        raise RuntimeError('sync failed: %s' % result)
+
+
+def _measure(server, run):
+    server.stats.reset()
+    start = time.perf_counter()
+    run()
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    stats = server.stats.snapshot()
+    stats['elapsed_ms'] = elapsed_ms
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movies', type=int, default=20000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--no-gzip-requests', action='store_true',
+                        help='stand-in server rejects gzip request bodies (exercises the 415 fallback)')
+    args = parser.parse_args()
+
+    server = mock_ai_server.start_server(accept_gzip=not args.no_gzip_requests)
+    kodi_stubs.install(settings={'remote_server_url': server.url})
+
+    from lib.data.migrations import get_migration_manager
+    from lib.auth.state import save_api_key
+    import lib.remote.ai_search_client as ai_search_client
+    from lib.remote import chunk_uploader
+    from lib.remote.http_session import get_http_session
+
+    # Measure the HTTP session, not upload pacing: never wait for a token
+    chunk_uploader.AdaptiveRateLimiter.acquire = lambda self, stop_event: not stop_event.is_set()
+
+    get_migration_manager().ensure_initialized()
+    save_api_key('bench-key')
+
+    imdb_ids = _fake_imdb_ids(args.movies)
+    legacy = _measure(server, lambda: _legacy_sync(server.url, imdb_ids, args.chunk_size))
+    server.library.clear()
+    session = _measure(server, lambda: _session_sync(ai_search_client.AISearchClient(), imdb_ids, args.chunk_size))
+    get_http_session().close_idle()
+
+    print('sync of %d IMDb ids in chunks of %d against %s' % (args.movies, args.chunk_size, server.url))
+    print('%-26s %9s %11s %12s %12s %10s' % ('', 'requests', 'handshakes', 'bytes sent', 'bytes recv', 'time ms'))
+    for name, stats in (('urllib, new connection', legacy), ('keep-alive session, gzip', session)):
+        print('%-26s %9d %11d %12d %12d %10.1f' % (name, stats['requests'], stats['connections'],
+                                                     stats['bytes_in'], stats['bytes_out'], stats['elapsed_ms']))
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
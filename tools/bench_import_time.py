@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Import Time Benchmark and Budget
+Import cost of each entry point and plugin action. Every plugin call in Kodi
+is a fresh interpreter, so everything a click imports is paid again on the
+next click.
+
+Each scenario runs the entry point in a new interpreter under
+`python -X importtime` with the xbmc stubs, against a profile holding a small
+synthetic library (first run completed, caches warmed by an unmeasured first
+call; "full" scenarios remove the folder and list caches before each call).
+Reported per scenario: modules imported by the entry point, how many of them
+are addon modules, and the import time (sum of -X importtime self times,
+median over --runs). service.py is imported without starting the service.
+
+--check compares against golden/import_budget.json and exits 1 when a
+scenario imports more addon modules than its budget, imports a module it
+must not (e.g. the router on a cache hit), or takes more than --time-factor
+times its import time budget. --update rewrites the budget file from this
+run (addon module counts exact, times doubled, at least 5 ms).
+
+    python tools/bench_import_time.py [--runs 5] [--check] [--update] [--verbose]
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import argparse
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', 'import_budget.json')
+
+PLUGIN_URL = 'plugin://plugin.video.librarygenie/'
+
+# Addon modules that only full routing, the database layer or other actions need
+_ARCHITECTURE = ('lib.ui.router', 'lib.ui.handler_factory', 'lib.data.query_manager')
+_HANDLERS = ('lib.ui.lists_handler', 'lib.ui.search_handler', 'lib.ui.favorites_handler',
+             'lib.ui.tools_handler', 'lib.ui.main_menu_handler')
+
+
+def _others(*keep):
+    return tuple(module for module in _HANDLERS if module not in keep)
+
+
+# name: (script, argv, cold (folder and list caches removed first), modules that must not be imported)
+SCENARIOS = {
+    'plugin:root (cached)': ('plugin.py', [PLUGIN_URL, '1', '?'], False, _ARCHITECTURE + _HANDLERS),
+    'plugin:root (full)': ('plugin.py', [PLUGIN_URL, '1', '?'], True, _others('lib.ui.lists_handler')),
+    'plugin:show_list (cached)': ('plugin.py', [PLUGIN_URL, '1', '?action=show_list&list_id={list_id}'], False,
+                                  _ARCHITECTURE + _HANDLERS),
+    'plugin:show_list (full)': ('plugin.py', [PLUGIN_URL, '1', '?action=show_list&list_id={list_id}'], True,
+                                _others('lib.ui.lists_handler')),
+    'plugin:lists': ('plugin.py', [PLUGIN_URL, '1', '?action=lists'], False, _others('lib.ui.lists_handler')),
+    'plugin:kodi_favorites': ('plugin.py', [PLUGIN_URL, '1', '?action=kodi_favorites'], False,
+                              _others('lib.ui.favorites_handler')),
+    'plugin:search': ('plugin.py', [PLUGIN_URL, '1', '?action=search'], False, _others('lib.ui.search_handler')),
+    'context.py': ('context.py', ['context.py'], False, _ARCHITECTURE + _HANDLERS),
+    'search.py': ('search.py', ['search.py'], False, _ARCHITECTURE + _HANDLERS),
+    'utilities.py:clear_folder_cache': ('utilities.py', ['utilities.py', 'clear_folder_cache'], False, _HANDLERS),
+    'service.py (import)': ('service.py', ['service.py'], False, _HANDLERS),
+}
+
+# Runs one scenario; the stubs and runpy are imported before the marker line
+_BOOTSTRAP = r'''
+import os, sys, json, runpy, pkgutil
+sys.path.insert(0, os.path.join(%(root)r, 'tools'))
+import kodi_stubs
+kodi_stubs.install(profile_dir=%(profile)r)
+if %(cold)r:
+    import shutil, xbmcvfs
+    shutil.rmtree(os.path.join(xbmcvfs.translatePath('special://profile/'), 'addon_data',
+                               'plugin.video.librarygenie', 'cache'), ignore_errors=True)
+with open(%(window_path)r) as f:
+    kodi_stubs._state['window_properties'] = {int(k): v for k, v in json.load(f).items()}
+sys.argv = %(argv)r
+before = set(sys.modules)
+sys.stderr.write('-- entry --\n')
+sys.stderr.flush()
+try:
+    runpy.run_path(os.path.join(%(root)r, %(script)r), run_name=%(run_name)r)
+except SystemExit:
+    pass
+sys.stderr.write('-- done --\n')
+sys.stderr.write('MODULES %%s\n' %% json.dumps(sorted(set(sys.modules) - before)))
+'''
+
+_IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+\d+ \|')
+
+
+def _run(script, argv, cold, profile_dir, window_path):
+    """(import ms, imported module names) of one run in a fresh interpreter"""
+    run_name = 'librarygenie_service' if script == 'service.py' else '__main__'
+    code = _BOOTSTRAP % dict(root=kodi_stubs.ADDON_ROOT, profile=profile_dir, cold=cold,
+                             argv=argv, script=script, run_name=run_name, window_path=window_path)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=kodi_stubs.ADDON_ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, timeout=120)
+    self_us, started, modules = 0, False, None
+    for line in result.stderr.splitlines():
+        if line == '-- entry --':
+            started = True
+        elif line == '-- done --':
+            started = False
+        elif line.startswith('MODULES '):
+            modules = json.loads(line[len('MODULES '):])
+        elif started:
+            match = _IMPORT_LINE.match(line)
+            if match:
+                self_us += int(match.group(1))
+    if modules is None:
+        raise RuntimeError('%s %s did not finish:\n%s' % (script, argv, result.stderr[-2000:]))
+    return self_us / 1000.0, modules
+
+
+def _prepare_profile():
+    """Profile with a synthetic library, the first run marker and the service's window properties
+
+    Returns (profile dir, list id, path of the window properties every run starts with).
+    """
+    profile_dir = kodi_stubs.install()
+    import synthetic_library
+    info = synthetic_library.create_library_database(movies=400, shows=4, list_size=120)
+
+    import xbmcvfs
+    marker = xbmcvfs.translatePath('special://userdata/addon_data/plugin.video.librarygenie/.first_run_complete')
+    os.makedirs(os.path.dirname(marker), exist_ok=True)
+    with open(marker, 'w') as f:
+        f.write('1')
+
+    # What the running service publishes for plugin calls
+    from lib.data.storage_manager import get_storage_manager
+    from lib.data.db_config import get_db_config_calculator
+    metadata = get_db_config_calculator().create_service_metadata(get_storage_manager().get_database_path())
+    window_path = os.path.join(profile_dir, 'window_properties.json')
+    with open(window_path, 'w') as f:
+        json.dump({10000: {'librarygenie.db.optimized': json.dumps(metadata)}}, f)
+    return profile_dir, info['list_id'], window_path
+
+
+def _load_budget():
+    try:
+        with open(BUDGET_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--check', action='store_true', help='exit 1 when a scenario is over budget')
+    parser.add_argument('--update', action='store_true', help='write golden/import_budget.json from this run')
+    parser.add_argument('--time-factor', type=float, default=1.0,
+                        help='allowed multiple of the time budget (slow CI machines)')
+    parser.add_argument('--verbose', action='store_true', help='list the addon modules of each scenario')
+    parser.add_argument('--only', help='run scenarios whose name contains this text')
+    args = parser.parse_args()
+
+    profile_dir, list_id, window_path = _prepare_profile()
+    budget = _load_budget()
+    measured = {}
+    failures = []
+    try:
+        print('%-32s %8s %6s %10s %10s' % ('scenario', 'modules', 'addon', 'import ms', 'budget ms'))
+        for name, (script, argv, cold, forbidden) in SCENARIOS.items():
+            if args.only and args.only not in name:
+                continue
+            argv = [arg.format(list_id=list_id) for arg in argv]
+            # The unmeasured first run fills the caches a cached scenario reads
+            _run(script, argv, cold, profile_dir, window_path)
+            timings, modules = [], []
+            for _ in range(args.runs):
+                import_ms, modules = _run(script, argv, cold, profile_dir, window_path)
+                timings.append(import_ms)
+            addon_modules = [m for m in modules if m.startswith('lib.') or m in ('utilities', 'context')]
+            import_ms = statistics.median(timings)
+            measured[name] = {'addon_modules': len(addon_modules), 'import_ms': round(max(import_ms * 2, 5.0), 1)}
+
+            limits = budget.get(name, {})
+            print('%-32s %8d %6d %10.1f %10s' % (name, len(modules), len(addon_modules), import_ms,
+                                                 limits.get('import_ms', '-')))
+            if args.verbose:
+                print('    ' + ' '.join(addon_modules))
+            if limits and len(addon_modules) > limits['addon_modules']:
+                failures.append('%s: %d addon modules, budget %d' % (name, len(addon_modules),
+                                                                    limits['addon_modules']))
+            if limits and import_ms > limits['import_ms'] * args.time_factor:
+                failures.append('%s: %.1f ms, budget %.1f ms' % (name, import_ms,
+                                                               limits['import_ms'] * args.time_factor))
+            for module in forbidden:
+                if module in modules:
+                    failures.append('%s: imports %s' % (name, module))
+    finally:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+    if args.update:
+        with open(BUDGET_PATH, 'w') as f:
+            json.dump(dict(budget, **measured), f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('Wrote %s' % BUDGET_PATH)
+
+    if failures:
+        print('\nOver budget:')
+        for failure in failures:
+            print('  ' + failure)
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Media Item Render Spec Benchmark
+Cost per row of turning library rows of a list page into ListItems with
+ListItemBuilder: "cold" builds every row through the metadata, art and
+property managers and stores its render spec; "warm" finds the stored spec
+for (media_item_id, content_updated_at, Kodi major) and only replays it. Both include
+the per-render context menu and the store read or write.
+
+Runs against the xbmcgui stubs in kodi_stubs.py; inside Kodi every ListItem
+setter crosses into C++, which cold and warm pay alike.
+
+    python tools/bench_item_specs.py [--page-size 200] [--runs 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page-size', type=int, default=200, help='rows per list page')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    kodi_stubs.install()
+
+    import synthetic_library
+    info = synthetic_library.create_library_database(movies=max(args.page_size * 2, 500), shows=5,
+                                                     list_size=args.page_size)
+
+    from lib.data.query_manager import get_query_manager
+    from lib.ui.plugin_context import PluginContext
+    from lib.ui.listitem_builder import ListItemBuilder
+    from lib.ui.list_cache import get_list_cache
+
+    query_manager = get_query_manager()
+    query_manager.initialize()
+    list_id = info['list_id']
+    items = query_manager.get_list_items(list_id, limit=args.page_size, offset=0)
+    context = PluginContext()
+    context.params = {'action': 'show_list', 'list_id': str(list_id)}
+    store = get_list_cache().store
+
+    def build():
+        builder = ListItemBuilder(1, 'plugin.video.librarygenie', context)
+        start = time.perf_counter()
+        built, _ = builder._build_batch([dict(item) for item in items])
+        elapsed = (time.perf_counter() - start) * 1e6 / max(len(items), 1)
+        if len(built) != len(items):
+            raise RuntimeError('built %d of %d rows' % (len(built), len(items)))
+        return elapsed
+
+    cold, warm = [], []
+    for _ in range(args.runs):
+        store.clear()
+        cold.append(build())
+        warm.append(build())
+
+    print('%d library rows per page, median us per row over %d runs' % (len(items), args.runs))
+    print('%12s %12s %8s' % ('cold', 'warm', 'speedup'))
+    cold_us, warm_us = statistics.median(cold), statistics.median(warm)
+    print('%12.1f %12.1f %7.1fx' % (cold_us, warm_us, cold_us / warm_us if warm_us else 0))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
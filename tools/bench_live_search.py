@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Search-As-You-Type Benchmark
+Builds the title prefix index over the synthetic library and replays typing,
+one keystroke at a time, through LiveSearchSession. Reports index build time
+and per-keystroke latency for fresh lookups vs. refinements of the previous
+candidate set.
+
+    python tools/bench_live_search.py [--movies 5000] [--shows 12]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+from bench_search import _percentile  # noqa: E402
+
+TYPED_QUERIES = [
+    ('the dark knight', ('movie',)),
+    ('silent station', ('movie',)),
+    ('golden harbor returns', ('movie', 'episode')),
+    ('midnight protocol', ('episode',)),
+    ('frozen empire of the north', ('movie',)),
+    ('iron coast', ('movie', 'episode')),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movies', type=int, default=5000)
+    parser.add_argument('--shows', type=int, default=12)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    kodi_stubs.install()
+
+    import synthetic_library
+    from lib.search.title_prefix_index import TitlePrefixIndex, LiveSearchSession, MAX_REFINE_CANDIDATES
+
+    synthetic_library.create_library_database(movies=args.movies, shows=args.shows)
+
+    index = TitlePrefixIndex()
+    start = time.perf_counter()
+    index.ensure_current()
+    build_ms = (time.perf_counter() - start) * 1000.0
+    start = time.perf_counter()
+    index.ensure_current()
+    check_ms = (time.perf_counter() - start) * 1000.0
+
+    fresh, refined = [], []
+    for _ in range(args.rounds):
+        for text, media_types in TYPED_QUERIES:
+            session = LiveSearchSession(index)
+            for length in range(1, len(text) + 1):
+                will_refine = (session._last_candidates is not None
+                               and len(session._last_candidates) <= MAX_REFINE_CANDIDATES)
+                start = time.perf_counter()
+                session.search(text[:length], list(media_types))
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+                (refined if will_refine else fresh).append(elapsed_ms)
+
+    print('index build: %.1f ms, freshness check: %.2f ms' % (build_ms, check_ms))
+    print('fresh lookup:  n=%-5d p50 %7.3f ms  p95 %7.3f ms  max %7.3f ms' % (
+        len(fresh), _percentile(fresh, 0.5), _percentile(fresh, 0.95), max(fresh)))
+    print('refinement:    n=%-5d p50 %7.3f ms  p95 %7.3f ms  max %7.3f ms' % (
+        len(refined), _percentile(refined, 0.5), _percentile(refined, 0.95), max(refined)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
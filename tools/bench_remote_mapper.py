@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Remote Mapper Benchmark
+Maps AI search style results to the local library, once item by item through
+RemoteMapper.map_to_local (the previous bulk_map_results behaviour) and once
+through the set-based bulk_map_results. Reports SQL statements executed, time,
+and whether both agree on the local match of every item.
+
+The remote items mix IMDb hits, TMDb-only hits, title+year-only hits and
+items that are not in the library.
+
+    python tools/bench_remote_mapper.py [--movies 5000] [--sizes 200,1000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+
+
+def _remote_items(movies, count, seed=5):
+    """(60% IMDb, 15% TMDb only, 15% title+year only, 10% unknown), shuffled"""
+    rng = random.Random(seed)
+    picks = rng.sample(movies, count)
+    items = []
+    for index, movie in enumerate(picks):
+        kind = index % 20
+        if kind < 12:
+            items.append({'imdb_id': movie['imdbnumber'], 'title': movie['title'], 'score': 0.9})
+        elif kind < 15:
+            items.append({'tmdb_id': movie['tmdb_id'], 'title': movie['title'], 'score': 0.8})
+        elif kind < 18:
+            items.append({'title': movie['title'].upper(), 'year': movie['year'], 'score': 0.7})
+        else:
+            items.append({'imdb_id': 'tt99%05d' % index, 'title': 'Unknown Feature %d' % index, 'score': 0.5})
+    rng.shuffle(items)
+    return items
+
+
+def _per_item(mapper, items):
+    results = []
+    for item in items:
+        local = mapper.map_to_local(item)
+        results.append({**item, **local, '_mapped': True} if local else dict(item, _mapped=False))
+    return results
+
+
+def _measure(conn, run):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        start = time.perf_counter()
+        results = run()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+    finally:
+        conn.set_trace_callback(None)
+    return results, len(statements), elapsed_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movies', type=int, default=5000)
+    parser.add_argument('--sizes', default='200,1000')
+    args = parser.parse_args()
+
+    kodi_stubs.install()
+
+    import synthetic_library
+    from lib.data.connection_manager import get_connection_manager
+    from lib.remote.mapper import RemoteMapper
+
+    synthetic_library.create_library_database(movies=args.movies)
+    movies = list(synthetic_library.generate_movies(args.movies))
+    conn = get_connection_manager().get_connection()
+    mapper = RemoteMapper()
+
+    print('%-6s %-14s %10s %10s %8s %6s' % ('items', 'mapper', 'queries', 'time ms', 'mapped', 'agree'))
+    for size in [int(s) for s in args.sizes.split(',')]:
+        items = _remote_items(movies, size)
+        old, old_queries, old_ms = _measure(conn, lambda: _per_item(mapper, [dict(i) for i in items]))
+        new, new_queries, new_ms = _measure(conn, lambda: mapper.bulk_map_results([dict(i) for i in items]))
+        agree = all(a.get('kodi_id') == b.get('kodi_id') and a['_mapped'] == b['_mapped']
+                    for a, b in zip(old, new))
+        in_order = all(a.get('score') == b.get('score') for a, b in zip(items, new))
+        for name, results, queries, elapsed in (('per item', old, old_queries, old_ms),
+                                                ('bulk', new, new_queries, new_ms)):
+            print('%-6d %-14s %10d %10.1f %8d %6s' % (size, name, queries, elapsed,
+                                                      sum(1 for r in results if r['_mapped']),
+                                                      'yes' if agree and in_order else 'NO'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
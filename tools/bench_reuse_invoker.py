@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Reused Interpreter Benchmark
+Navigation latency of plugin.py with and without reuselanguageinvoker.
+"fresh" starts a new interpreter for every call, as Kodi does without
+<reuselanguageinvoker>; "reused" runs every call in one interpreter that
+keeps its imported modules but drops settings, connections and caches
+(keep_plugin_state off, the default); "kept" also keeps those between calls
+(keep_plugin_state on).
+
+Every mode replays the same navigation sequence against a profile holding a small
+synthetic library: cache hits, full builds ("full" steps remove the folder
+and list caches first) and a settings change, after which the kept state
+has to be dropped. Reported per step: median time of the plugin call itself
+and wall time including interpreter start (fresh) or the round trip to the
+running interpreter. Each step must add the same number of directory items
+in every mode.
+
+    python tools/bench_reuse_invoker.py [--rounds 5]
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import statistics
+import subprocess
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+from bench_import_time import PLUGIN_URL, _prepare_profile  # noqa: E402
+
+# (step, query, full (caches removed first), settings changed first)
+SEQUENCE = [
+    ('root', '?', False, False),
+    ('show_list', '?action=show_list&list_id={list_id}', False, False),
+    ('lists', '?action=lists', False, False),
+    ('kodi_favorites', '?action=kodi_favorites', False, False),
+    ('show_list (full)', '?action=show_list&list_id={list_id}', True, False),
+    ('root (full)', '?', True, False),
+    ('show_list (settings changed)', '?action=show_list&list_id={list_id}', False, True),
+    ('root', '?', False, False),
+]
+
+MODES = ('fresh', 'reused', 'kept')
+
+# Serves one plugin call per line of stdin until stdin closes
+_WORKER = r'''
+import os, sys, json, time, runpy, shutil
+sys.path.insert(0, os.path.join(%(root)r, 'tools'))
+import kodi_stubs
+kodi_stubs.install(profile_dir=%(profile)r, settings={'keep_plugin_state': %(keep_state)r})
+with open(%(window_path)r) as f:
+    kodi_stubs._state['window_properties'] = {int(k): v for k, v in json.load(f).items()}
+import xbmcvfs
+cache_dir = os.path.join(xbmcvfs.translatePath('special://profile/'), 'addon_data',
+                         'plugin.video.librarygenie', 'cache')
+for line in sys.stdin:
+    request = json.loads(line)
+    if request['full']:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    if request['full'] or request['settings_changed']:
+        # What the service does on a settings change; a fresh interpreter has nothing to drop
+        kodi_stubs._state['window_properties'].setdefault(10000, {})[
+            'librarygenie.state_generation'] = repr(time.time())
+    sys.argv = request['argv']
+    kodi_stubs._state['directory_items'] = 0
+    start = time.perf_counter()
+    try:
+        runpy.run_path(os.path.join(%(root)r, 'plugin.py'), run_name='__main__')
+    except SystemExit:
+        pass
+    elapsed = (time.perf_counter() - start) * 1000.0
+    sys.stdout.write('RESULT %%s\n' %% json.dumps({'ms': elapsed, 'items': kodi_stubs.directory_item_count()}))
+    sys.stdout.flush()
+'''
+
+
+def _result(line):
+    if not line.startswith('RESULT '):
+        raise RuntimeError('unexpected worker output: %r' % line)
+    return json.loads(line[len('RESULT '):])
+
+
+class _Worker:
+    """A running interpreter serving plugin calls"""
+
+    def __init__(self, code):
+        self.process = subprocess.Popen([sys.executable, '-c', code], cwd=kodi_stubs.ADDON_ROOT,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, universal_newlines=True)
+
+    def call(self, request):
+        self.process.stdin.write(json.dumps(request) + '\n')
+        self.process.stdin.flush()
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError('worker exited during %s' % request['argv'])
+            # plugin.py may print; only RESULT lines belong to the benchmark
+            if line.startswith('RESULT '):
+                return _result(line.rstrip('\n'))
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait(timeout=60)
+
+
+def _fresh_call(code, request):
+    """(call result, wall ms) of one call in a new interpreter"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=kodi_stubs.ADDON_ROOT,
+                            input=json.dumps(request) + '\n', stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, universal_newlines=True, timeout=120)
+    wall = (time.perf_counter() - start) * 1000.0
+    lines = [line for line in result.stdout.splitlines() if line.startswith('RESULT ')]
+    if not lines:
+        raise RuntimeError('%s did not finish' % request['argv'])
+    return _result(lines[-1]), wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=5, help='times the navigation sequence is replayed')
+    args = parser.parse_args()
+
+    profile_dir, list_id, window_path = _prepare_profile()
+    codes = {keep_state: _WORKER % dict(root=kodi_stubs.ADDON_ROOT, profile=profile_dir, window_path=window_path,
+                                        keep_state=keep_state)
+             for keep_state in (False, True)}
+    code = codes[False]
+    requests = [dict(argv=[PLUGIN_URL, '1', query.format(list_id=list_id)], full=full, settings_changed=changed)
+                for _, query, full, changed in SEQUENCE]
+
+    timings = {mode: [[] for _ in SEQUENCE] for mode in MODES}
+    items = {mode: [None for _ in SEQUENCE] for mode in MODES}
+    mismatches = []
+
+    def record(mode, index, result, wall):
+        timings[mode][index].append((result['ms'], wall))
+        if items[mode][index] not in (None, result['items']):
+            mismatches.append('%s %s: %d items, earlier %d' % (mode, SEQUENCE[index][0], result['items'],
+                                                             items[mode][index]))
+        items[mode][index] = result['items']
+
+    try:
+        # Unmeasured pass so every mode starts from warm caches and compiled bytecode
+        for request in requests:
+            _fresh_call(code, request)
+
+        for _ in range(args.rounds):
+            for index, request in enumerate(requests):
+                result, wall = _fresh_call(code, request)
+                record('fresh', index, result, wall)
+
+            for mode, keep_state in (('reused', False), ('kept', True)):
+                worker = _Worker(codes[keep_state])
+                try:
+                    # The first call of a reused interpreter is a fresh start; Kodi pays it once
+                    worker.call(requests[0])
+                    for index, request in enumerate(requests):
+                        start = time.perf_counter()
+                        result = worker.call(request)
+                        record(mode, index, result, (time.perf_counter() - start) * 1000.0)
+                finally:
+                    worker.close()
+    finally:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+    print('median ms over %d rounds (call / wall)' % args.rounds)
+    print('%-30s %6s %17s %17s %17s' % (('step', 'items') + MODES))
+    totals = dict.fromkeys(MODES, 0.0)
+    for index, (step, _, _, _) in enumerate(SEQUENCE):
+        columns = []
+        for mode in MODES:
+            call_ms = statistics.median(t[0] for t in timings[mode][index])
+            wall_ms = statistics.median(t[1] for t in timings[mode][index])
+            totals[mode] += wall_ms
+            columns.append('%7.1f / %7.1f' % (call_ms, wall_ms))
+        print('%-30s %6s %17s %17s %17s' % ((step, items['fresh'][index]) + tuple(columns)))
+        for mode in MODES[1:]:
+            if items['fresh'][index] != items[mode][index]:
+                mismatches.append('%s: %s items fresh, %s %s' % (step, items['fresh'][index],
+                                                               items[mode][index], mode))
+    print('%-30s %6s %17.1f %17.1f %17.1f' % (('sequence wall total', '') + tuple(totals[mode] for mode in MODES)))
+
+    if mismatches:
+        print('\nDirectory items differ:')
+        for mismatch in mismatches:
+            print('  ' + mismatch)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
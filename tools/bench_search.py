@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Local Search Benchmark
+Replays a fixed query corpus through SimpleQueryInterpreter -> SimpleSearchEngine.search
+against the synthetic library and reports p50/p95 latency per query class together
+with top-10 overlap against a recorded golden set.
+
+    python tools/bench_search.py                  # run and compare with golden set
+    python tools/bench_search.py --update-golden  # re-record the golden set
+    python tools/bench_search.py --json           # machine readable output
+
+Exits non-zero when any query's top-10 overlap drops below --min-overlap.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', 'search_top10.json')
+
+# (name, query class, user input, interpreter kwargs)
+QUERY_CORPUS = [
+    ('word_title', 'single', 'knight', {}),
+    ('word_plot', 'single', 'detective', {}),
+    ('word_rare', 'single', 'lighthouse', {}),
+    ('word_title_only', 'single', 'storm', {'search_scope': 'title'}),
+    ('word_missing', 'single', 'zeppelin', {}),
+    ('any_two', 'any', 'dark river', {'match_logic': 'any'}),
+    ('any_three', 'any', 'frozen empire dragon', {'match_logic': 'any'}),
+    ('all_two', 'all', 'dark knight', {'match_logic': 'all'}),
+    ('all_plot', 'all', 'captain island', {'match_logic': 'all'}),
+    ('all_four', 'all', 'silent station space agent', {'match_logic': 'all'}),
+    ('phrase_title', 'phrase', 'Golden Harbor', {'match_logic': 'phrase'}),
+    ('phrase_plot', 'phrase', 'crime syndicate', {'match_logic': 'phrase'}),
+    ('phrase_suffix', 'phrase', 'Part II', {'match_logic': 'phrase', 'search_scope': 'title'}),
+    ('episode_show', 'episode', 'harbor', {'media_types': ['episode'], 'match_logic': 'any'}),
+    ('episode_all', 'episode', 'midnight protocol', {'media_types': ['episode'], 'match_logic': 'all'}),
+    ('episode_plot', 'episode', 'astronaut', {'media_types': ['episode'], 'search_scope': 'plot'}),
+    ('list_word', 'list', 'shadow', {'scope_type': 'list'}),
+    ('list_any', 'list', 'iron legacy', {'scope_type': 'list', 'match_logic': 'any'}),
+    ('list_phrase', 'list', 'time machine', {'scope_type': 'list', 'match_logic': 'phrase'}),
+]
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _result_key(item):
+    """Stable identity for a result row that does not depend on autoincrement ids"""
+    if item.get('media_type') == 'episode':
+        return '%s S%02dE%02d' % (item.get('tvshowtitle'), item.get('season') or 0, item.get('episode') or 0)
+    return '%s (%s) %s' % (item.get('title'), item.get('year'), item.get('imdb_id'))
+
+
+def _overlap(current, golden):
+    if not golden:
+        return 1.0 if not current else 0.0
+    return len(set(current) & set(golden)) / float(len(golden))
+
+
+def run(args):
+    kodi_stubs.install(profile_dir=args.profile_dir)
+
+    import synthetic_library
+    from lib.search.simple_query_interpreter import SimpleQueryInterpreter
+    from lib.search.simple_search_engine import SimpleSearchEngine
+
+    library = synthetic_library.create_library_database(movies=args.movies, shows=args.shows)
+    interpreter = SimpleQueryInterpreter()
+    engine = SimpleSearchEngine()
+
+    golden = {}
+    if os.path.exists(GOLDEN_PATH) and not args.update_golden:
+        with open(GOLDEN_PATH, 'r', encoding='utf-8') as f:
+            golden = json.load(f)
+        if golden.get('library') != {'movies': args.movies, 'shows': args.shows}:
+            print('warning: golden set was recorded for %s, overlap is not comparable' % golden.get('library'),
+                  file=sys.stderr)
+    golden_queries = golden.get('queries', {})
+
+    per_query = []
+    for name, query_class, text, kwargs in QUERY_CORPUS:
+        kwargs = dict(kwargs)
+        if kwargs.get('scope_type') == 'list':
+            kwargs['scope_id'] = library['list_id']
+        kwargs.setdefault('page_size', args.page_size)
+
+        samples = []
+        result = None
+        for iteration in range(args.warmup + args.repeat):
+            start = time.perf_counter()
+            query = interpreter.parse_query(text, **kwargs)
+            result = engine.search(query)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            if iteration >= args.warmup:
+                samples.append(elapsed_ms)
+
+        top10 = [_result_key(item) for item in result.items[:10]]
+        per_query.append({
+            'name': name,
+            'class': query_class,
+            'query': text,
+            'results': result.total_count,
+            'p50_ms': round(_percentile(samples, 0.50), 3),
+            'p95_ms': round(_percentile(samples, 0.95), 3),
+            'top10': top10,
+            'overlap': None if name not in golden_queries else round(_overlap(top10, golden_queries[name]), 3),
+        })
+
+    if args.update_golden:
+        os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+        with open(GOLDEN_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'library': {'movies': args.movies, 'shows': args.shows},
+                       'queries': {entry['name']: entry['top10'] for entry in per_query}},
+                      f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    per_class = {}
+    for query_class in sorted({entry['class'] for entry in per_query}):
+        entries = [entry for entry in per_query if entry['class'] == query_class]
+        per_class[query_class] = {
+            'p50_ms': round(_percentile([e['p50_ms'] for e in entries], 0.50), 3),
+            'p95_ms': round(max(e['p95_ms'] for e in entries), 3),
+            'min_overlap': min((e['overlap'] for e in entries if e['overlap'] is not None), default=None),
+        }
+
+    return {'library': library, 'queries': per_query, 'classes': per_class}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movies', type=int, default=5000)
+    parser.add_argument('--shows', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per query')
+    parser.add_argument('--warmup', type=int, default=2, help='untimed runs per query')
+    parser.add_argument('--page-size', type=int, default=200)
+    parser.add_argument('--min-overlap', type=float, default=0.8,
+                        help='fail when a query keeps less than this fraction of its golden top-10')
+    parser.add_argument('--profile-dir', default=None, help='profile directory (default: fresh temp dir)')
+    parser.add_argument('--update-golden', action='store_true')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    report = run(args)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print('library: %(movies)d movies, %(episodes)d episodes, %(list_items)d list items' % report['library'])
+        print('%-16s %-8s %7s %9s %9s %8s' % ('query', 'class', 'results', 'p50 ms', 'p95 ms', 'overlap'))
+        for entry in report['queries']:
+            overlap = '-' if entry['overlap'] is None else '%.2f' % entry['overlap']
+            print('%-16s %-8s %7d %9.2f %9.2f %8s' % (entry['name'], entry['class'], entry['results'],
+                                                       entry['p50_ms'], entry['p95_ms'], overlap))
+        print()
+        print('%-8s %9s %9s %12s' % ('class', 'p50 ms', 'p95 ms', 'min overlap'))
+        for query_class, stats in report['classes'].items():
+            overlap = '-' if stats['min_overlap'] is None else '%.2f' % stats['min_overlap']
+            print('%-8s %9.2f %9.2f %12s' % (query_class, stats['p50_ms'], stats['p95_ms'], overlap))
+
+    regressions = [e['name'] for e in report['queries'] if e['overlap'] is not None and e['overlap'] < args.min_overlap]
+    if regressions:
+        print('relevance regression in: %s' % ', '.join(regressions), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
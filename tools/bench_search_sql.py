@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Search SQL Construction Benchmark
+Measures the per-search overhead that sits in front of the actual table scan:
+building the ranked SQL in SimpleSearchEngine and preparing it in SQLite.
+
+For a stream of randomized keyword queries it reports
+  * SQL build time (template miss vs. template hit),
+  * how many distinct statements the stream produced,
+  * prepare+run time against an empty copy of the schema, once with the shared
+    template text and once with a unique statement per search (the behaviour when
+    keywords were interpolated into the SQL), where the difference is the prepare
+    cost that template reuse avoids.
+
+    python tools/bench_search_sql.py [--queries 500] [--movies 5000]
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+from bench_search import QUERY_CORPUS, _percentile  # noqa: E402
+
+
+def _random_queries(count, list_id, seed=11):
+    import synthetic_library
+
+    vocabulary = [word.lower() for word in synthetic_library.TITLE_ADJECTIVES + synthetic_library.TITLE_NOUNS]
+    vocabulary += ['detective', 'island', 'virus', 'captain', 'dragon', "o'brien", 'berlin', 'ghost']
+    rng = random.Random(seed)
+    for _ in range(count):
+        _, _, _, kwargs = rng.choice(QUERY_CORPUS)
+        kwargs = dict(kwargs)
+        if kwargs.get('scope_type') == 'list':
+            kwargs['scope_id'] = list_id
+        text = ' '.join(rng.sample(vocabulary, rng.randint(1, 3)))
+        yield text, kwargs
+
+
+def _empty_schema_copy(db_path):
+    """In-memory database with the same tables and indexes but no rows, so that
+    executing a statement costs little more than preparing it"""
+    source = sqlite3.connect(db_path)
+    try:
+        ddl = [row[0] for row in source.execute(
+            "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+            "ORDER BY CASE type WHEN 'table' THEN 0 ELSE 1 END")]
+    finally:
+        source.close()
+    conn = sqlite3.connect(':memory:', cached_statements=128)
+    for statement in ddl:
+        conn.execute(statement)
+    return conn
+
+
+def _time_statements(conn, statements):
+    samples = []
+    for sql, params in statements:
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movies', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    profile_dir = kodi_stubs.install()
+
+    import synthetic_library
+    from lib.search.simple_query_interpreter import SimpleQueryInterpreter
+    from lib.search.simple_search_engine import SimpleSearchEngine
+
+    library = synthetic_library.create_library_database(movies=args.movies)
+    interpreter = SimpleQueryInterpreter()
+    engine = SimpleSearchEngine()
+
+    parsed = []
+    for text, kwargs in _random_queries(args.queries, library['list_id']):
+        kwargs.setdefault('page_size', args.page_size)
+        parsed.append(interpreter.parse_query(text, **kwargs))
+
+    miss_us, hit_us, statements = [], [], []
+    for query in parsed:
+        is_miss = engine._get_template_key(query) not in engine._sql_templates
+        start = time.perf_counter()
+        sql, params = engine._build_ranked_sql_query(query)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        (miss_us if is_miss else hit_us).append(elapsed_us)
+        statements.append((sql, params))
+
+    db_path = os.path.join(profile_dir, 'librarygenie.db')
+    conn = _empty_schema_copy(db_path)
+    try:
+        _time_statements(conn, statements[:20])  # warm up
+        shared = _time_statements(conn, statements)
+        # Unique SQL text per search, as produced when keywords were interpolated into the statement
+        unique = _time_statements(conn, [('%s /* %d */' % (sql, i), params)
+                                         for i, (sql, params) in enumerate(statements)])
+    finally:
+        conn.close()
+
+    print('queries: %d, distinct SQL statements: %d' % (len(statements), len({sql for sql, _ in statements})))
+    print('build (template miss):       n=%-4d p50 %8.1f us  p95 %8.1f us' % (
+        len(miss_us), _percentile(miss_us, 0.5), _percentile(miss_us, 0.95)))
+    print('build (template hit):        n=%-4d p50 %8.1f us  p95 %8.1f us' % (
+        len(hit_us), _percentile(hit_us, 0.5), _percentile(hit_us, 0.95)))
+    print('prepare+run, shared SQL:     n=%-4d p50 %8.1f us  p95 %8.1f us' % (
+        len(shared), _percentile(shared, 0.5), _percentile(shared, 0.95)))
+    print('prepare+run, unique SQL:     n=%-4d p50 %8.1f us  p95 %8.1f us' % (
+        len(unique), _percentile(unique, 0.5), _percentile(unique, 0.95)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Kodi Module Stubs
+Minimal stand-ins for xbmc, xbmcaddon, xbmcgui, xbmcplugin and xbmcvfs so the
+addon packages can be imported and exercised outside Kodi by the developer tools
+in this directory. Never shipped with the addon.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import types
+import xml.etree.ElementTree as ET
+
+ADDON_ID = 'plugin.video.librarygenie'
+ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_state = {
+    'profile_dir': None,
+    'settings': {},
+    'window_properties': {},
+    'log_level': None,
+    'directory_items': 0,
+}
+
+
+def _load_setting_defaults():
+    """Read default values from resources/settings.xml"""
+    defaults = {}
+    settings_path = os.path.join(ADDON_ROOT, 'resources', 'settings.xml')
+    try:
+        tree = ET.parse(settings_path)
+    except Exception:
+        return defaults
+
+    for setting in tree.iter('setting'):
+        setting_id = setting.get('id')
+        if not setting_id:
+            continue
+        default = setting.find('default')
+        value = default.text if default is not None and default.text is not None else ''
+        defaults[setting_id] = (setting.get('type', 'string'), value)
+    return defaults
+
+
+def _translate_path(path):
+    if not path:
+        return path
+    if path.startswith('special://profile/addon_data/%s' % ADDON_ID):
+        suffix = path[len('special://profile/addon_data/%s' % ADDON_ID):].lstrip('/')
+        return os.path.join(_state['profile_dir'], suffix)
+    if path.startswith('special://'):
+        suffix = path[len('special://'):].split('/', 1)
+        rest = suffix[1] if len(suffix) > 1 else ''
+        return os.path.join(_state['profile_dir'], '_special', suffix[0], rest)
+    return path
+
+
+def _build_xbmc():
+    module = types.ModuleType('xbmc')
+    module.LOGDEBUG, module.LOGINFO, module.LOGWARNING, module.LOGERROR, module.LOGFATAL = 0, 1, 2, 3, 4
+    module.LOGNONE = 5
+
+    def log(message, level=0):
+        threshold = _state['log_level']
+        if threshold is not None and level >= threshold:
+            sys.stderr.write('%s\n' % message)
+
+    class Monitor:
+        def abortRequested(self):
+            return False
+
+        def waitForAbort(self, timeout=None):
+            return False
+
+    class Player:
+        def isPlaying(self):
+            return False
+
+        def isPlayingVideo(self):
+            return False
+
+    class Keyboard:
+        def __init__(self, default='', heading='', hidden=False):
+            self._text = default
+
+        def doModal(self, autoclose=0):
+            pass
+
+        def isConfirmed(self):
+            return False
+
+        def getText(self):
+            return self._text
+
+    module.log = log
+    module.Monitor = Monitor
+    module.Player = Player
+    module.Keyboard = Keyboard
+    module.sleep = lambda ms: None
+    module.executebuiltin = lambda command, wait=False: None
+    module.executeJSONRPC = lambda request: json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': {}})
+    module.getInfoLabel = lambda label: '21.0.0 (21.0.0) Git:stub' if label == 'System.BuildVersion' else ''
+    module.getCondVisibility = lambda condition: False
+    module.getLanguage = lambda *args, **kwargs: 'English'
+    module.getSkinDir = lambda: 'skin.estuary'
+    module.translatePath = _translate_path
+    return module
+
+
+def _build_xbmcaddon():
+    module = types.ModuleType('xbmcaddon')
+
+    class Settings:
+        def getBool(self, key):
+            return Addon().getSettingBool(key)
+
+        def getInt(self, key):
+            return Addon().getSettingInt(key)
+
+        def getString(self, key):
+            return Addon().getSettingString(key)
+
+    class Addon:
+        def __init__(self, addon_id=None):
+            self._id = addon_id or ADDON_ID
+
+        def getAddonInfo(self, key):
+            return {
+                'id': self._id,
+                'name': 'LibraryGenie',
+                'version': '0.0.0-dev',
+                'path': ADDON_ROOT,
+                'profile': 'special://profile/addon_data/%s/' % ADDON_ID,
+                'icon': os.path.join(ADDON_ROOT, 'icon.png'),
+                'fanart': os.path.join(ADDON_ROOT, 'fanart.jpg'),
+            }.get(key, '')
+
+        def _raw(self, key):
+            entry = _state['settings'].get(key)
+            return entry[1] if entry else ''
+
+        def getSetting(self, key):
+            return self._raw(key)
+
+        def getSettingString(self, key):
+            return self._raw(key)
+
+        def getSettingBool(self, key):
+            return str(self._raw(key)).lower() in ('true', '1', 'yes')
+
+        def getSettingInt(self, key):
+            try:
+                return int(float(self._raw(key) or 0))
+            except ValueError:
+                return 0
+
+        def getSettingNumber(self, key):
+            try:
+                return float(self._raw(key) or 0)
+            except ValueError:
+                return 0.0
+
+        def setSetting(self, key, value):
+            setting_type = _state['settings'].get(key, ('string', ''))[0]
+            _state['settings'][key] = (setting_type, str(value))
+            return True
+
+        def setSettingBool(self, key, value):
+            return self.setSetting(key, 'true' if value else 'false')
+
+        def setSettingInt(self, key, value):
+            return self.setSetting(key, int(value))
+
+        def setSettingNumber(self, key, value):
+            return self.setSetting(key, float(value))
+
+        def setSettingString(self, key, value):
+            return self.setSetting(key, value)
+
+        def getLocalizedString(self, string_id):
+            return 'String %s' % string_id
+
+        def getSettings(self):
+            return Settings()
+
+        def openSettings(self):
+            pass
+
+    module.Addon = Addon
+    return module
+
+
+def _build_xbmcgui():
+    module = types.ModuleType('xbmcgui')
+    module.NOTIFICATION_INFO = 'info'
+    module.NOTIFICATION_WARNING = 'warning'
+    module.NOTIFICATION_ERROR = 'error'
+    module.ACTION_PREVIOUS_MENU = 10
+    module.ACTION_NAV_BACK = 92
+    module.INPUT_ALPHANUM = 0
+    module.INPUT_NUMERIC = 1
+
+    class Window:
+        def __init__(self, window_id=10000):
+            self._props = _state['window_properties'].setdefault(window_id, {})
+
+        def getProperty(self, key):
+            return self._props.get(key, '')
+
+        def setProperty(self, key, value):
+            self._props[key] = value
+
+        def clearProperty(self, key):
+            self._props.pop(key, None)
+
+    class _VideoInfoTag:
+        def __getattr__(self, name):
+            if name.startswith('set') or name.startswith('add'):
+                return lambda *args, **kwargs: None
+            if name.startswith('get'):
+                return lambda *args, **kwargs: ''
+            raise AttributeError(name)
+
+    class ListItem:
+        def __init__(self, label='', label2='', path='', offscreen=False):
+            self._label = label
+            self._label2 = label2
+            self._path = path
+            self._props = {}
+            self._art = {}
+            self._info = {}
+            self._tag = _VideoInfoTag()
+
+        def getLabel(self):
+            return self._label
+
+        def setLabel(self, label):
+            self._label = label
+
+        def setLabel2(self, label):
+            self._label2 = label
+
+        def getPath(self):
+            return self._path
+
+        def setPath(self, path):
+            self._path = path
+
+        def setArt(self, art):
+            self._art.update(art or {})
+
+        def getArt(self, key):
+            return self._art.get(key, '')
+
+        def setInfo(self, info_type, info):
+            self._info.update(info or {})
+
+        def setProperty(self, key, value):
+            self._props[key] = value
+
+        def setProperties(self, values):
+            self._props.update(values or {})
+
+        def getProperty(self, key):
+            return self._props.get(key, '')
+
+        def setIsFolder(self, is_folder):
+            self._props['IsFolder'] = is_folder
+
+        def setContentLookup(self, enable):
+            pass
+
+        def setCast(self, cast):
+            pass
+
+        def setUniqueIDs(self, ids, default=''):
+            pass
+
+        def addContextMenuItems(self, items, replaceItems=False):
+            pass
+
+        def getVideoInfoTag(self):
+            return self._tag
+
+    class _Dialog:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: False
+
+    class DialogProgress:
+        def create(self, heading, message=''):
+            pass
+
+        def update(self, percent, message=''):
+            pass
+
+        def iscanceled(self):
+            return False
+
+        def close(self):
+            pass
+
+    class DialogProgressBG(DialogProgress):
+        def isFinished(self):
+            return False
+
+    class WindowXML(Window):
+        def __init__(self, xml_filename='', script_path='', default_skin='Default', *args, **kwargs):
+            self._props = {}
+
+        def doModal(self):
+            pass
+
+        def show(self):
+            pass
+
+        def close(self):
+            pass
+
+        def getControl(self, control_id):
+            raise RuntimeError('No skin controls outside Kodi (control %s)' % control_id)
+
+        def setFocusId(self, control_id):
+            pass
+
+    class WindowXMLDialog(WindowXML):
+        pass
+
+    module.Window = Window
+    module.WindowXML = WindowXML
+    module.WindowXMLDialog = WindowXMLDialog
+    module.ListItem = ListItem
+    module.Dialog = _Dialog
+    module.DialogProgress = DialogProgress
+    module.DialogProgressBG = DialogProgressBG
+    module.getCurrentWindowId = lambda: 10025
+    module.getCurrentWindowDialogId = lambda: 9999
+    return module
+
+
+def _build_xbmcplugin():
+    module = types.ModuleType('xbmcplugin')
+
+    def addDirectoryItem(handle, url, listitem, isFolder=False, totalItems=0):
+        _state['directory_items'] += 1
+        return True
+
+    def addDirectoryItems(handle, items, totalItems=0):
+        _state['directory_items'] += len(items)
+        return True
+
+    module.addDirectoryItem = addDirectoryItem
+    module.addDirectoryItems = addDirectoryItems
+    module.endOfDirectory = lambda handle, succeeded=True, updateListing=False, cacheToDisc=True: None
+    module.setContent = lambda handle, content: None
+    module.setPluginCategory = lambda handle, category: None
+    module.addSortMethod = lambda handle, sortMethod, labelMask='', label2Mask='': None
+    module.setResolvedUrl = lambda handle, succeeded, listitem: None
+    module.setProperty = lambda handle, key, value: None
+
+    def __getattr__(name):
+        if name.startswith('SORT_METHOD_'):
+            return 0
+        raise AttributeError(name)
+
+    module.__getattr__ = __getattr__
+    return module
+
+
+def _build_xbmcvfs():
+    module = types.ModuleType('xbmcvfs')
+
+    class File:
+        def __init__(self, path, mode='r'):
+            self._handle = open(_translate_path(path), 'wb' if 'w' in mode else 'rb')
+
+        def read(self, *args):
+            return self._handle.read(*args).decode('utf-8')
+
+        def readBytes(self, *args):
+            return self._handle.read(*args)
+
+        def write(self, data):
+            self._handle.write(data.encode('utf-8') if isinstance(data, str) else data)
+            return True
+
+        def size(self):
+            return os.fstat(self._handle.fileno()).st_size
+
+        def close(self):
+            self._handle.close()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.close()
+
+    def mkdirs(path):
+        os.makedirs(_translate_path(path), exist_ok=True)
+        return True
+
+    def delete(path):
+        try:
+            os.remove(_translate_path(path))
+            return True
+        except OSError:
+            return False
+
+    def listdir(path):
+        path = _translate_path(path)
+        entries = os.listdir(path) if os.path.isdir(path) else []
+        dirs = [e for e in entries if os.path.isdir(os.path.join(path, e))]
+        files = [e for e in entries if not os.path.isdir(os.path.join(path, e))]
+        return dirs, files
+
+    module.File = File
+    module.translatePath = _translate_path
+    module.exists = lambda path: os.path.exists(_translate_path(path))
+    module.mkdir = mkdirs
+    module.mkdirs = mkdirs
+    module.delete = delete
+    module.rmdir = lambda path, force=False: shutil.rmtree(_translate_path(path), ignore_errors=True) or True
+    module.rename = lambda src, dst: os.replace(_translate_path(src), _translate_path(dst)) or True
+    module.copy = lambda src, dst: shutil.copyfile(_translate_path(src), _translate_path(dst)) and True
+    module.listdir = listdir
+    module.makeLegalFilename = lambda path: path
+    return module
+
+
+def install(profile_dir=None, settings=None, log_level=None):
+    """Register the stub modules and point the addon profile at profile_dir.
+
+    Returns the profile directory in use (a fresh temporary directory when
+    profile_dir is not given). settings overrides individual settings.xml
+    defaults; log_level echoes xbmc.log() output at or above that level to stderr.
+    """
+    if profile_dir is None:
+        profile_dir = tempfile.mkdtemp(prefix='librarygenie-dev-')
+    os.makedirs(profile_dir, exist_ok=True)
+
+    _state['profile_dir'] = profile_dir
+    _state['settings'] = _load_setting_defaults()
+    _state['log_level'] = log_level
+    for key, value in (settings or {}).items():
+        setting_type = _state['settings'].get(key, ('string', ''))[0]
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        _state['settings'][key] = (setting_type, str(value))
+
+    for name, builder in (('xbmc', _build_xbmc), ('xbmcaddon', _build_xbmcaddon),
+                          ('xbmcgui', _build_xbmcgui), ('xbmcplugin', _build_xbmcplugin),
+                          ('xbmcvfs', _build_xbmcvfs)):
+        sys.modules[name] = builder()
+
+    if ADDON_ROOT not in sys.path:
+        sys.path.insert(0, ADDON_ROOT)
+    return profile_dir
+
+
+def directory_item_count():
+    """Number of items handed to xbmcplugin since install()"""
+    return _state['directory_items']
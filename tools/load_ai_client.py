@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - AI Client Load Test
+Drives the real AISearchClient code paths against the local stand-in server
+(or any server given with --server-url) and reports:
+
+  sync        sync_library(force_replace=True): items/s, chunks, 429s, faults
+  search      concurrent search_movies calls, result cache off: p50/p95/p99
+              latency, failures and results per call
+  repeat      the same searches again with the result cache on
+  similar     search_similar_movies latency
+
+The fault injection options of mock_ai_server.py apply to every route, so
+e.g. --latency-ms 80 --jitter-ms 40 --throttle-rate 0.05 --error-rate 0.02
+shows how the client behaves on a slow, flaky connection.
+
+    python tools/load_ai_client.py [--movies 5000] [--searches 200] [--concurrency 4]
+                                   [--latency-ms 50] [--error-rate 0.02] ...
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kodi_stubs  # noqa: E402
+import mock_ai_server  # noqa: E402
+import synthetic_library  # noqa: E402
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def _queries(count, seed=9):
+    """Keyword queries built from the synthetic library's title and plot vocabulary"""
+    rng = random.Random(seed)
+    words = (synthetic_library.TITLE_ADJECTIVES + synthetic_library.TITLE_NOUNS +
+             synthetic_library.PLOT_OBJECTS + synthetic_library.GENRES)
+    return [' '.join(rng.sample(words, rng.randint(1, 3))).lower() for _ in range(count)]
+
+
+def _timed_calls(calls, concurrency):
+    """Run calls on a pool; [(seconds, result or exception)] in call order"""
+    def timed(call):
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:  # the client is expected not to raise; count it if it does
+            result = e
+        return time.perf_counter() - start, result
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(timed, calls))
+
+
+def _report(name, timings, ok, extra=''):
+    latencies = [seconds * 1000.0 for seconds, _ in timings]
+    failed = sum(1 for _, result in timings if not ok(result))
+    print('%-10s %6d %8.1f %8.1f %8.1f %8.1f %7d  %s' % (
+        name, len(timings), _percentile(latencies, 50), _percentile(latencies, 95),
+        _percentile(latencies, 99), max(latencies) if latencies else 0.0, failed, extra))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server-url', help='use a running server instead of starting the stand-in')
+    parser.add_argument('--movies', type=int, default=5000, help='library size to sync')
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--searches', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--limit', type=int, default=50, help='results per search')
+    parser.add_argument('--mode', default='bm25', choices=('bm25', 'hybrid'))
+    parser.add_argument('--similar', type=int, default=50, help='similar_to calls')
+    mock_ai_server.add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    server_url = args.server_url
+    if not server_url:
+        server = mock_ai_server.start_server(catalog_size=args.movies, faults=mock_ai_server.faults_from_args(args))
+        server_url = server.url
+    kodi_stubs.install(settings={'remote_server_url': server_url, 'ai_search_cache_minutes': 0})
+
+    from lib.data.migrations import get_migration_manager
+    from lib.auth.state import save_api_key
+    from lib.config.config_manager import get_config
+    from lib.remote.ai_search_client import AISearchClient
+
+    get_migration_manager().ensure_initialized()
+    save_api_key('load-test-key')
+    client = AISearchClient()
+
+    imdb_ids = ['tt%07d' % (1000000 + i) for i in range(args.movies)]
+    print('server %s, %d movies, %d searches at concurrency %d' % (
+        server_url, args.movies, args.searches, args.concurrency))
+
+    # Sync throughput
+    if server:
+        server.stats.reset()
+    start = time.perf_counter()
+    result = client.sync_library([{'imdb_id': imdb_id} for imdb_id in imdb_ids], force_replace=True,
+                                 batch_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+    if not result or not result.get('success'):
+        print('sync failed after %.2f s: %s' % (elapsed, result), file=sys.stderr)
+        return 1
+    line = 'sync: %d items in %.2f s = %.0f items/s, %d chunks' % (
+        args.movies, elapsed, args.movies / elapsed, (args.movies + args.chunk_size - 1) // args.chunk_size)
+    if server:
+        stats = server.stats.snapshot()
+        line += ', %d requests, %d throttled, %d faults' % (stats['requests'], stats['throttled'], stats['faults'])
+    print(line)
+    print()
+
+    print('%-10s %6s %8s %8s %8s %8s %7s  %s' % ('', 'calls', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms', 'failed', ''))
+    queries = _queries(args.searches)
+
+    def search_ok(response):
+        return isinstance(response, dict) and response.get('success')
+
+    def search_calls():
+        return [lambda q=q: client.search_movies(q, limit=args.limit, mode=args.mode) for q in queries]
+
+    timings = _timed_calls(search_calls(), args.concurrency)
+    hits = [len(r.get('results', [])) for _, r in timings if search_ok(r)]
+    _report('search', timings, search_ok, 'avg %.1f results' % (sum(hits) / len(hits) if hits else 0.0))
+
+    # Same queries with the result cache on: the first pass fills it
+    get_config().set('ai_search_cache_minutes', 60)
+    _timed_calls(search_calls(), args.concurrency)
+    _report('repeat', _timed_calls(search_calls(), args.concurrency), search_ok, 'result cache on')
+
+    rng = random.Random(3)
+    references = [rng.choice(imdb_ids) for _ in range(args.similar)]
+    facets = {'plot': True, 'genre': True}
+    timings = _timed_calls([lambda r=r: client.search_similar_movies(r, facets) for r in references],
+                           args.concurrency)
+    _report('similar', timings, lambda results: isinstance(results, list))
+
+    if server:
+        print()
+        print('server: %(requests)d requests over %(connections)d connections, '
+              '%(throttled)d throttled, %(faults)d faults injected' % server.stats.snapshot())
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
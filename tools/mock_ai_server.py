@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Local AI Search Stand-in Server
+HTTP/1.1 keep-alive server speaking the AI search API as documented in
+EXTERNAL_AI_SEARCH_ENDPOINTS.md, so AISearchClient can be exercised without
+the real service:
+
+  kodi/test, kodi/search/movies, similar_to, library/hash,
+  library/batch/start, .../chunk, .../commit, .../status,
+  users/me/library/stats, kodi/movies/list, kodi/movies/batches,
+  kodi/movies/clear
+
+Search and similar_to rank a deterministic catalog (the synthetic library's
+movies, same IMDb IDs) with a small keyword index and, like the real server,
+only return movies in the uploaded collection. kodi/search/movies also
+accepts an "offset" and answers with "has_more"/"next_offset" for paging.
+
+GET responses carry an ETag and are answered 304 when If-None-Match matches.
+It understands gzip request bodies and gzips responses for clients that
+accept it, and counts accepted connections and bytes on the wire so clients
+can be compared. Faults can be injected into every route: latency with
+jitter, 5xx errors, 429 with Retry-After, dropped connections and hung
+requests (to trip client timeouts). Chunk uploads can additionally be rate
+limited and slowed down.
+
+    python tools/mock_ai_server.py [--port 8765] [--catalog 5000] [--preload 5000]
+        [--latency-ms 50 --jitter-ms 20] [--error-rate 0.02] [--throttle-rate 0.02]
+        [--drop-rate 0.01] [--hang-rate 0.01 --hang-seconds 35] [--seed 1]
+        [--chunk-rate 5] [--chunk-latency 0.1]
+"""
+
+import os
+import re
+import sys
+import math
+import time
+import gzip
+import json
+import uuid
+import heapq
+import random
+import hashlib
+import argparse
+import threading
+import urllib.parse
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic_library  # noqa: E402
+
+# Responses smaller than this are sent uncompressed
+GZIP_MIN_RESPONSE_BYTES = 256
+# Documented server-side caps
+SEARCH_MAX_LIMIT = 100
+SIMILAR_MAX_RESULTS = 50
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_STOP_WORDS = {'a', 'an', 'the', 'of', 'in', 'on', 'and', 'or', 'to', 'for', 'with', 'from', 'like', 'movies', 'movie'}
+
+
+class ServerStats:
+    """Connection and wire byte counters, shared by all handler threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+            self.throttled = 0
+            self.faults = 0
+            self.not_modified = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        with self._lock:
+            return {'connections': self.connections, 'requests': self.requests,
+                    'bytes_in': self.bytes_in, 'bytes_out': self.bytes_out,
+                    'throttled': self.throttled, 'faults': self.faults,
+                    'not_modified': self.not_modified}
+
+
+class _CountingReader:
+    def __init__(self, raw, stats):
+        self._raw = raw
+        self._stats = stats
+
+    def read(self, *args):
+        data = self._raw.read(*args)
+        self._stats.add(bytes_in=len(data))
+        return data
+
+    def readline(self, *args):
+        data = self._raw.readline(*args)
+        self._stats.add(bytes_in=len(data))
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class _CountingWriter:
+    def __init__(self, raw, stats):
+        self._raw = raw
+        self._stats = stats
+
+    def write(self, data):
+        self._stats.add(bytes_out=len(data))
+        return self._raw.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class MockAIRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # keep-alive response would wait for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        # One handler instance serves one TCP connection for its whole keep-alive lifetime
+        self.server.stats.add(connections=1)
+        self.rfile = _CountingReader(self.rfile, self.server.stats)
+        self.wfile = _CountingWriter(self.wfile, self.server.stats)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if body and self.headers.get('Content-Encoding', '').lower() == 'gzip':
+            if not self.server.accept_gzip:
+                return None
+            body = gzip.decompress(body)
+        return json.loads(body.decode('utf-8')) if body else {}
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        response_headers = {'Content-Type': 'application/json'}
+        if len(body) >= GZIP_MIN_RESPONSE_BYTES and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            response_headers['Content-Encoding'] = 'gzip'
+        response_headers.update(headers or {})
+        self.send_response(status)
+        for name, value in response_headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method):
+        self.server.stats.add(requests=1)
+        path, _, query = self.path.partition('?')
+        path = path.strip('/')
+
+        data = self._read_body() if method in ('POST', 'PUT') else dict(urllib.parse.parse_qsl(query))
+        if data is None:
+            self._send_json(415, {'success': False, 'error': 'Unsupported Content-Encoding'})
+            return
+
+        if self.server.require_api_key and not self.headers.get('Authorization', '').startswith('ApiKey '):
+            self._send_json(401, {'success': False, 'error': 'Missing API key'})
+            return
+
+        if self.server.faults and self._inject_fault(path):
+            return
+
+        for route_method, pattern, handler in self.server.routes:
+            if route_method != method:
+                continue
+            match = re.fullmatch(pattern, path)
+            if match:
+                # Handlers return (status, payload) or (status, payload, headers)
+                response = handler(self.server, data, *match.groups())
+                if method == 'GET' and response[0] == 200:
+                    response = self._conditional(*response)
+                    if response is None:
+                        return
+                self._send_json(*response)
+                return
+
+        self._send_json(404, {'success': False, 'error': f'No route for {method} /{path}'})
+
+    def _conditional(self, status, payload, headers=None):
+        """Tag a GET response with an ETag; answers 304 (returns None) when it matches If-None-Match"""
+        etag = '"%s"' % hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:20]
+        if self.headers.get('If-None-Match') == etag:
+            self.server.stats.add(not_modified=1)
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return None
+        return status, payload, dict(headers or {}, ETag=etag)
+
+    def _inject_fault(self, path):
+        """Apply latency and maybe a fault; True if the request was answered (or dropped)"""
+        delay, fault = self.server.faults.decide(path)
+        if delay:
+            time.sleep(delay)
+        if fault is None:
+            return False
+
+        self.server.stats.add(faults=1)
+        if fault == 'throttle':
+            self._send_json(429, {'success': False, 'error': 'Rate limit exceeded'}, {'Retry-After': '1'})
+        elif fault == 'error':
+            self._send_json(self.server.faults.error_status(), {'success': False, 'error': 'Injected server error'})
+        else:
+            if fault == 'hang':
+                # Outlast the client's socket timeout, then close without answering
+                time.sleep(self.server.faults.hang_seconds)
+            self.close_connection = True
+        return True
+
+
+# ---- API handlers: (server, request data, *path groups) -> (status, payload) ----
+
+def _handle_test(server, data):
+    return 200, {'success': True, 'message': 'ok', 'user_email': 'dev@example.invalid'}
+
+
+def _handle_library_hash(server, data):
+    with server.state_lock:
+        library = sorted(server.library)
+    fingerprints = [hashlib.sha1(imdb_id.encode('utf-8')).hexdigest()[:8] for imdb_id in library]
+    return 200, {'success': True, 'count': len(library), 'fingerprints': fingerprints}
+
+
+def _handle_batch_start(server, data):
+    upload_id = uuid.uuid4().hex
+    with server.state_lock:
+        server.uploads[upload_id] = {'mode': data.get('mode', 'merge'), 'total_count': data.get('total_count', 0),
+                                     'items': set(), 'chunks': set()}
+    return 200, {'success': True, 'upload_id': upload_id, 'max_chunk': 1000}
+
+
+def _handle_batch_chunk(server, data, upload_id):
+    retry_after = server.chunk_limiter.take() if server.chunk_limiter else 0
+    if retry_after:
+        server.stats.add(throttled=1)
+        return 429, {'success': False, 'error': 'Rate limit exceeded'}, {'Retry-After': str(retry_after)}
+    if server.chunk_latency:
+        time.sleep(server.chunk_latency)
+
+    with server.state_lock:
+        upload = server.uploads.get(upload_id)
+        if upload is None:
+            return 404, {'success': False, 'error': 'Unknown upload_id'}
+        accepted = duplicates = invalid = 0
+        for item in data.get('items', []):
+            imdb_id = item.get('imdb_id') or ''
+            if not imdb_id.startswith('tt'):
+                invalid += 1
+            elif imdb_id in upload['items'] or imdb_id in server.library:
+                duplicates += 1
+                upload['items'].add(imdb_id)
+            else:
+                accepted += 1
+                upload['items'].add(imdb_id)
+        upload['chunks'].add(data.get('chunk_index'))
+    return 200, {'success': True, 'results': {'accepted': accepted, 'duplicates': duplicates, 'invalid': invalid}}
+
+
+def _handle_batch_commit(server, data, upload_id):
+    with server.state_lock:
+        upload = server.uploads.pop(upload_id, None)
+        if upload is None:
+            return 404, {'success': False, 'error': 'Unknown upload_id'}
+        removed = 0
+        if upload['mode'] == 'replace':
+            removed = len(server.library - upload['items'])
+            server.library = set(upload['items'])
+        else:
+            server.library |= upload['items']
+        count = len(server.library)
+        server.batches.append({
+            'batch_id': upload_id, 'batch_type': upload['mode'], 'status': 'completed',
+            'total_movies': len(upload['items']), 'successful_imports': len(upload['items']),
+            'failed_imports': 0, 'completed_at': datetime.now().isoformat(timespec='seconds'),
+        })
+    return 200, {'success': True, 'final_tallies': {'accepted': len(upload['items'])},
+                 'user_movie_count': count, 'removed_count': removed}
+
+
+def _handle_batch_status(server, data, upload_id):
+    with server.state_lock:
+        upload = server.uploads.get(upload_id)
+        if upload is None:
+            return 404, {'success': False, 'error': 'Unknown upload_id'}
+        return 200, {'success': True, 'upload_id': upload_id, 'status': 'active', 'mode': upload['mode'],
+                     'total_count': upload['total_count'], 'chunks_received': len(upload['chunks']),
+                     'processed_chunks': sorted(upload['chunks'])}
+
+
+def _handle_library_stats(server, data):
+    with server.state_lock:
+        count = len(server.library)
+        in_catalog = sum(1 for imdb_id in server.library if imdb_id in server.catalog.by_id)
+        uploads = len(server.uploads)
+    return 200, {'success': True, 'stats': {
+        'total_movies': count,
+        'uploads_in_progress': uploads,
+        'library_overview': {'total_uploaded': count},
+        'setup_status': {
+            'completely_setup': {'count': in_catalog},
+            'not_setup': {'count': count - in_catalog},
+        },
+    }}
+
+
+def _handle_search(server, data):
+    query = data.get('vibe') or data.get('query')
+    if not query or not isinstance(query, str):
+        return 400, {'success': False, 'error': 'query or vibe is required'}
+    try:
+        limit = min(max(int(data.get('limit', 20)), 1), SEARCH_MAX_LIMIT)
+        offset = max(int(data.get('offset', 0)), 0)
+    except (TypeError, ValueError):
+        return 400, {'success': False, 'error': 'limit and offset must be integers'}
+    mode = data.get('mode', 'bm25')
+
+    with server.state_lock:
+        library = set(server.library)
+    ranked = server.catalog.search(query, library)
+    page = ranked[offset:offset + limit]
+    results = [{'imdb_id': imdb_id, 'score': score} for imdb_id, score in page]
+    if mode == 'hybrid':
+        for result in results:
+            result['bm25_score'] = round(result['score'] * 0.9, 3)
+
+    response = {
+        'success': True,
+        'query': query,
+        'mode': mode,
+        'total_results': len(ranked),
+        'max_score': ranked[0][1] if ranked else 0.0,
+        'results': results,
+        'has_more': offset + limit < len(ranked),
+    }
+    if response['has_more']:
+        response['next_offset'] = offset + limit
+    if data.get('debug_intent'):
+        response['diagnostics'] = {'llm_used': bool(data.get('use_llm')), 'fallback_used': False,
+                                   'fallback_reason': None, 'execution_mode': 'stand_in_%s' % mode}
+    return 200, response
+
+
+def _handle_similar(server, data):
+    reference = data.get('reference_imdb_id')
+    if not reference:
+        return 400, {'success': False, 'error': 'reference_imdb_id is required'}
+    facets = [name for name in ('plot', 'mood', 'themes', 'genre') if data.get('include_%s' % name)]
+    if not facets:
+        return 400, {'success': False, 'error': 'At least one facet must be included'}
+    if reference not in server.catalog.by_id:
+        return 404, {'success': False, 'error': 'Reference movie not found'}
+
+    with server.state_lock:
+        library = set(server.library)
+    results = server.catalog.similar(reference, facets, library)
+    return 200, {'success': True, 'results': [{'imdb_id': i, 'score': score} for i, score in results]}
+
+
+def _handle_movie_list(server, data):
+    try:
+        page = max(int(data.get('page', 1)), 1)
+        per_page = min(max(int(data.get('per_page', 100)), 1), 1000)
+    except (TypeError, ValueError):
+        return 400, {'success': False, 'error': 'page and per_page must be integers'}
+    with server.state_lock:
+        library = sorted(server.library)
+    total = len(library)
+    pages = max(1, (total + per_page - 1) // per_page)
+    return 200, {
+        'success': True,
+        'movies': library[(page - 1) * per_page:page * per_page],
+        'pagination': {'page': page, 'pages': pages, 'per_page': per_page, 'total': total,
+                       'has_next': page < pages, 'has_prev': page > 1},
+        'user_movie_count': total,
+    }
+
+
+def _handle_batch_history(server, data):
+    with server.state_lock:
+        batches = list(server.batches)
+    return 200, {'success': True, 'batches': batches}
+
+
+def _handle_clear(server, data):
+    with server.state_lock:
+        deleted = len(server.library)
+        server.library = set()
+    return 200, {'success': True, 'message': 'Cleared %d movies from your list' % deleted, 'deleted_count': deleted}
+
+
+DEFAULT_ROUTES = [
+    ('GET', r'kodi/test', _handle_test),
+    ('POST', r'kodi/search/movies', _handle_search),
+    ('POST', r'similar_to', _handle_similar),
+    ('GET', r'kodi/movies/list', _handle_movie_list),
+    ('GET', r'kodi/movies/batches', _handle_batch_history),
+    ('DELETE', r'kodi/movies/clear', _handle_clear),
+    ('GET', r'library/hash', _handle_library_hash),
+    ('POST', r'library/batch/start', _handle_batch_start),
+    ('PUT', r'library/batch/([^/]+)/chunk', _handle_batch_chunk),
+    ('POST', r'library/batch/([^/]+)/commit', _handle_batch_commit),
+    ('GET', r'library/batch/([^/]+)/status', _handle_batch_status),
+    ('GET', r'users/me/library/stats', _handle_library_stats),
+]
+
+
+def _tokens(text):
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOP_WORDS]
+
+
+class Catalog:
+    """Movies the stand-in knows about, with an inverted keyword index"""
+
+    def __init__(self, size, seed=42):
+        self.movies = []
+        self.by_id = {}
+        self._index = {}
+        for movie in synthetic_library.generate_movies(size, seed=seed):
+            entry = {
+                'imdb_id': movie['imdbnumber'],
+                'title_tokens': set(_tokens(movie['title'])),
+                'plot_tokens': set(_tokens(movie['plot'])),
+                'genres': set(json.loads(movie['genre'])),
+                'year': movie['year'],
+            }
+            self.by_id[entry['imdb_id']] = entry
+            self.movies.append(entry)
+            for token in entry['title_tokens'] | entry['plot_tokens'] | {g.lower() for g in entry['genres']}:
+                self._index.setdefault(token, []).append(entry)
+
+    def search(self, query, library):
+        """[(imdb_id, score)] best first; title hits weigh twice as much as plot/genre hits"""
+        terms = set(_tokens(query))
+        if not terms:
+            return []
+        scores = {}
+        for term in terms:
+            for entry in self._index.get(term, ()):
+                if entry['imdb_id'] not in library:
+                    continue
+                weight = 2.0 if term in entry['title_tokens'] else 1.0
+                scores[entry['imdb_id']] = scores.get(entry['imdb_id'], 0.0) + weight
+        top = max(scores.values()) if scores else 1.0
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(imdb_id, round(score / top, 3)) for imdb_id, score in ranked]
+
+    def similar(self, reference, facets, library):
+        ref = self.by_id[reference]
+        scored = []
+        for entry in self.movies:
+            if entry['imdb_id'] == reference or entry['imdb_id'] not in library:
+                continue
+            parts = []
+            if 'genre' in facets or 'themes' in facets:
+                union = ref['genres'] | entry['genres']
+                parts.append(len(ref['genres'] & entry['genres']) / len(union) if union else 0.0)
+            if 'plot' in facets or 'mood' in facets:
+                union = ref['plot_tokens'] | entry['plot_tokens']
+                parts.append(len(ref['plot_tokens'] & entry['plot_tokens']) / len(union) if union else 0.0)
+            score = sum(parts) / len(parts)
+            if score > 0:
+                scored.append((round(score, 3), entry['imdb_id']))
+        return [(imdb_id, score) for score, imdb_id in heapq.nlargest(SIMILAR_MAX_RESULTS, scored)]
+
+
+class FaultInjector:
+    """Latency and faults applied to requests before they are routed
+
+    Rates are per-request probabilities; paths restricts injection to routes
+    matching one of the regular expressions (default: all routes).
+    """
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, throttle_rate=0.0,
+                 drop_rate=0.0, hang_rate=0.0, hang_seconds=35.0, seed=None, paths=None):
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.rates = [('error', error_rate), ('throttle', throttle_rate), ('drop', drop_rate), ('hang', hang_rate)]
+        self.hang_seconds = hang_seconds
+        self.paths = [re.compile(p) for p in paths] if paths else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def decide(self, path):
+        """(delay seconds, fault name or None) for one request"""
+        if self.paths is not None and not any(p.fullmatch(path) for p in self.paths):
+            return 0.0, None
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            roll = self._random.random()
+        for fault, rate in self.rates:
+            if roll < rate:
+                return delay, fault
+            roll -= rate
+        return delay, None
+
+    def error_status(self):
+        with self._lock:
+            return self._random.choice((500, 502, 503))
+
+
+class ChunkRateLimit:
+    """Server-side token bucket for chunk PUTs"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Consume a token; returns 0, or the whole seconds to send as Retry-After"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0
+            return max(1, math.ceil((1.0 - self._tokens) / self.rate))
+
+
+class MockAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, accept_gzip=True, require_api_key=True, chunk_rate=None, chunk_latency=0.0,
+                 catalog_size=5000, preload=0, faults=None):
+        super().__init__(address, MockAIRequestHandler)
+        self.accept_gzip = accept_gzip
+        self.require_api_key = require_api_key
+        self.chunk_limiter = ChunkRateLimit(chunk_rate) if chunk_rate else None
+        self.chunk_latency = chunk_latency
+        self.catalog = Catalog(catalog_size)
+        self.faults = faults
+        self.batches = []
+        self.routes = list(DEFAULT_ROUTES)
+        self.stats = ServerStats()
+        self.state_lock = threading.Lock()
+        # Movies uploaded by the (single) user; preload skips the initial sync
+        self.library = {entry['imdb_id'] for entry in self.catalog.movies[:preload]}
+        self.uploads = {}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+
+def start_server(port=0, **options):
+    """Start the stand-in server on a background thread; returns the server (see .url)"""
+    server = MockAIServer(('127.0.0.1', port), **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def add_fault_arguments(parser):
+    group = parser.add_argument_group('fault injection')
+    group.add_argument('--latency-ms', type=float, default=0.0, help='added to every request')
+    group.add_argument('--jitter-ms', type=float, default=0.0, help='+/- random spread around --latency-ms')
+    group.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered 500/502/503')
+    group.add_argument('--throttle-rate', type=float, default=0.0, help='share answered 429 + Retry-After')
+    group.add_argument('--drop-rate', type=float, default=0.0, help='share closed without a response')
+    group.add_argument('--hang-rate', type=float, default=0.0, help='share held for --hang-seconds, then closed')
+    group.add_argument('--hang-seconds', type=float, default=35.0)
+    group.add_argument('--fault-paths', nargs='*', help='regular expressions of routes to inject into (default all)')
+    group.add_argument('--seed', type=int, help='seed for reproducible fault sequences')
+
+
+def faults_from_args(args):
+    """FaultInjector for the add_fault_arguments options, or None when all are off"""
+    if not any((args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate,
+                args.drop_rate, args.hang_rate)):
+        return None
+    return FaultInjector(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                         throttle_rate=args.throttle_rate, drop_rate=args.drop_rate, hang_rate=args.hang_rate,
+                         hang_seconds=args.hang_seconds, seed=args.seed, paths=args.fault_paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--no-gzip-requests', action='store_true', help='answer gzip request bodies with 415')
+    parser.add_argument('--chunk-rate', type=float, help='chunk PUTs per second before answering 429')
+    parser.add_argument('--chunk-latency', type=float, default=0.0, help='seconds added to each chunk PUT')
+    parser.add_argument('--catalog', type=int, default=5000, help='movies known to search/similar_to')
+    parser.add_argument('--preload', type=int, default=0, help='catalog movies already in the user collection')
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockAIServer(('127.0.0.1', args.port), accept_gzip=not args.no_gzip_requests,
+                          chunk_rate=args.chunk_rate, chunk_latency=args.chunk_latency,
+                          catalog_size=args.catalog, preload=args.preload, faults=faults_from_args(args))
+    print('serving on %s' % server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats.snapshot()))
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LibraryGenie - Synthetic Library
+Deterministic fake movie/episode library for the developer benchmarks.
+The same seed always produces the same rows in the same order, so golden
+result sets recorded against it stay comparable between runs.
+"""
+
+import json
+import random
+
+TITLE_ADJECTIVES = [
+    'Dark', 'Silent', 'Lost', 'Broken', 'Golden', 'Hidden', 'Last', 'Crimson', 'Frozen', 'Wild',
+    'Electric', 'Midnight', 'Forgotten', 'Burning', 'Savage', 'Quiet', 'Iron', 'Secret', 'Endless', 'Fallen',
+]
+TITLE_NOUNS = [
+    'Knight', 'River', 'Empire', 'Horizon', 'Garden', 'Shadow', 'Storm', 'Kingdom', 'Island', 'Machine',
+    'Mountain', 'Station', 'Protocol', 'Harbor', 'Legacy', 'Frontier', 'Signal', 'Voyage', 'Witness', 'Colony',
+]
+TITLE_SUFFIXES = ['', '', '', ' Returns', ' Rising', ': Part II', ' of the North', ' in Paris', ' Reloaded', ' Begins']
+
+PLOT_SUBJECTS = [
+    'a retired detective', 'two estranged sisters', 'a young pilot', 'an ambitious chef', 'a small-town sheriff',
+    'a rogue scientist', 'a grieving father', 'a teenage hacker', 'an aging boxer', 'a ship captain',
+    'a reluctant heir', 'a jazz musician', 'an undercover agent', 'a marine biologist', 'a stranded astronaut',
+]
+PLOT_VERBS = [
+    'uncovers', 'must stop', 'races to find', 'falls for', 'is haunted by', 'plots revenge against',
+    'escapes from', 'investigates', 'protects', 'betrays',
+]
+PLOT_OBJECTS = [
+    'a conspiracy inside the police force', 'an ancient artifact', 'a ruthless crime syndicate', 'a mysterious stranger',
+    'a deadly virus', 'the ghost of a former lover', 'a corrupt senator', 'an alien signal', 'a stolen painting',
+    'a runaway train', 'a family secret', 'a time machine', 'a drug cartel', 'a haunted lighthouse', 'a dragon',
+]
+PLOT_SETTINGS = [
+    'in post-war Berlin', 'on a remote island', 'during a blizzard', 'in near-future Tokyo', 'across the desert',
+    'in a sleepy coastal town', 'aboard a space station', 'in 1920s Chicago', 'beneath the ocean', 'in medieval France',
+]
+
+GENRES = ['Action', 'Adventure', 'Comedy', 'Crime', 'Drama', 'Fantasy', 'Horror', 'Mystery', 'Romance',
+          'Science Fiction', 'Thriller', 'Western', 'Animation', 'Documentary', 'Family', 'War']
+STUDIOS = ['Paramount', 'Warner Bros.', 'Universal', 'A24', 'Lionsgate', 'Focus Features', 'Legendary', 'Pixar']
+FIRST_NAMES = ['Ava', 'Ben', 'Clara', 'David', 'Elena', 'Frank', 'Grace', 'Hugo', 'Iris', 'James', 'Kate', 'Leo']
+LAST_NAMES = ['Nolan', 'Park', 'Reyes', 'Stone', 'Turner', 'Varga', 'Walsh', 'Young', 'Zhang', 'Okafor', 'Lund']
+
+SHOW_NAMES = [
+    'Harbor Lights', 'The Long Shift', 'Station Eleven North', 'Crimson Valley', 'Signal Lost', 'Iron Coast',
+    'The Quiet Frontier', 'Midnight Protocol', 'Golden Legacy', 'Savage Garden', 'The Witness Files', 'Fallen Empire',
+]
+
+
+def _person(rng):
+    return '%s %s' % (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))
+
+
+def _title(rng):
+    return 'The %s %s%s' % (rng.choice(TITLE_ADJECTIVES), rng.choice(TITLE_NOUNS), rng.choice(TITLE_SUFFIXES)) \
+        if rng.random() < 0.4 else \
+        '%s %s%s' % (rng.choice(TITLE_ADJECTIVES), rng.choice(TITLE_NOUNS), rng.choice(TITLE_SUFFIXES))
+
+
+def _plot(rng):
+    sentences = []
+    for _ in range(rng.randint(1, 3)):
+        sentences.append('%s %s %s %s.' % (rng.choice(PLOT_SUBJECTS).capitalize(), rng.choice(PLOT_VERBS),
+                                            rng.choice(PLOT_OBJECTS), rng.choice(PLOT_SETTINGS)))
+    return ' '.join(sentences)
+
+
+def generate_movies(count, seed=42):
+    """Yield movie dicts with the fields the scanner stores"""
+    rng = random.Random(seed)
+    for index in range(count):
+        year = rng.randint(1950, 2024)
+        title = _title(rng)
+        genres = rng.sample(GENRES, rng.randint(1, 3))
+        yield {
+            'kodi_id': index + 1,
+            'title': title,
+            'year': year,
+            'imdbnumber': 'tt%07d' % (1000000 + index),
+            'tmdb_id': str(50000 + index),
+            'plot': _plot(rng),
+            'rating': round(rng.uniform(3.0, 9.5), 1),
+            'votes': rng.randint(100, 900000),
+            'duration': rng.randint(80, 180),
+            'mpaa': rng.choice(['G', 'PG', 'PG-13', 'R']),
+            'genre': json.dumps(genres),
+            'director': json.dumps([_person(rng)]),
+            'writer': '%s, %s' % (_person(rng), _person(rng)),
+            'studio': rng.choice(STUDIOS),
+            'file_path': '/media/movies/%s (%s)/movie-%05d.mkv' % (title, year, index),
+        }
+
+
+def generate_episodes(show_count, seasons=4, episodes_per_season=10, seed=7):
+    """Yield episode dicts grouped by show"""
+    rng = random.Random(seed)
+    kodi_id = 1
+    for show_index in range(show_count):
+        base_name = SHOW_NAMES[show_index % len(SHOW_NAMES)]
+        show_title = base_name if show_index < len(SHOW_NAMES) else '%s (%d)' % (base_name, show_index)
+        for season in range(1, seasons + 1):
+            for episode in range(1, episodes_per_season + 1):
+                yield {
+                    'kodi_id': kodi_id,
+                    'tvshow_kodi_id': show_index + 1,
+                    'tvshowtitle': show_title,
+                    'season': season,
+                    'episode': episode,
+                    'title': _title(rng),
+                    'year': 2000 + show_index % 24,
+                    'plot': _plot(rng),
+                    'rating': round(rng.uniform(5.0, 9.5), 1),
+                    'duration': rng.randint(20, 60),
+                    'aired': '%04d-%02d-%02d' % (2000 + show_index % 24, (season % 12) + 1, episode),
+                    'file_path': '/media/tv/%s/S%02dE%02d.mkv' % (show_title, season, episode),
+                }
+                kodi_id += 1
+
+
+def populate(conn, movies=5000, shows=12, list_size=300, seed=42):
+    """Insert the synthetic library into an initialized LibraryGenie database.
+
+    Returns a dict with the created list id and row counts.
+    """
+    movie_rows = list(generate_movies(movies, seed=seed))
+    conn.executemany("""
+        INSERT INTO media_items
+        (media_type, kodi_id, title, year, imdbnumber, tmdb_id, play, source, plot, rating, votes,
+         duration, mpaa, genre, director, writer, studio, art, file_path, normalized_path,
+         is_removed, display_title, duration_seconds)
+        VALUES ('movie', ?, ?, ?, ?, ?, ?, 'lib', ?, ?, ?, ?, ?, ?, ?, ?, ?, '{}', ?, ?, 0, ?, ?)
+    """, [
+        (m['kodi_id'], m['title'], m['year'], m['imdbnumber'], m['tmdb_id'], m['file_path'], m['plot'],
+         m['rating'], m['votes'], m['duration'], m['mpaa'], m['genre'], m['director'], m['writer'],
+         m['studio'], m['file_path'], m['file_path'].lower(), '%s (%s)' % (m['title'], m['year']),
+         m['duration'] * 60)
+        for m in movie_rows
+    ])
+
+    episode_rows = list(generate_episodes(shows, seed=seed + 1)) if shows else []
+    conn.executemany("""
+        INSERT INTO media_items
+        (media_type, kodi_id, title, year, play, source, plot, rating, duration, art, file_path,
+         normalized_path, is_removed, display_title, duration_seconds, tvshowtitle, season, episode,
+         aired, tvshow_kodi_id)
+        VALUES ('episode', ?, ?, ?, ?, 'lib', ?, ?, ?, '{}', ?, ?, 0, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (e['kodi_id'], e['title'], e['year'], e['file_path'], e['plot'], e['rating'], e['duration'],
+         e['file_path'], e['file_path'].lower(), e['title'], e['duration'] * 60, e['tvshowtitle'],
+         e['season'], e['episode'], e['aired'], e['tvshow_kodi_id'])
+        for e in episode_rows
+    ])
+
+    cursor = conn.execute("INSERT INTO lists (name, folder_id) VALUES (?, NULL)", ['Benchmark List'])
+    list_id = cursor.lastrowid
+    rng = random.Random(seed + 2)
+    movie_ids = [row[0] for row in conn.execute(
+        "SELECT id FROM media_items WHERE media_type = 'movie' ORDER BY id").fetchall()]
+    chosen = rng.sample(movie_ids, min(list_size, len(movie_ids)))
+    conn.executemany(
+        "INSERT INTO list_items (list_id, media_item_id, position) VALUES (?, ?, ?)",
+        [(list_id, media_id, position) for position, media_id in enumerate(chosen)]
+    )
+
+    return {'list_id': list_id, 'movies': len(movie_rows), 'episodes': len(episode_rows), 'list_items': len(chosen)}
+
+
+def create_library_database(movies=5000, shows=12, list_size=300, seed=42):
+    """Initialize the addon database in the (stubbed) profile and fill it.
+
+    kodi_stubs.install() must have been called first.
+    """
+    from lib.data.connection_manager import get_connection_manager
+    from lib.data.migrations import get_migration_manager
+
+    get_migration_manager().ensure_initialized()
+    with get_connection_manager().transaction() as conn:
+        return populate(conn, movies=movies, shows=shows, list_size=list_size, seed=seed)
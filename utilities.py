@@ -665,7 +665,7 @@ def handle_ai_search_replace_sync():
         
         # DEBUG: Log filtering results
         log_info(f"[DEBUG-REPLACE] After filtering: {len(sync_items)} valid items, {skipped_count} skipped (invalid/empty IMDb IDs)")
-        log_info(f"[DEBUG-REPLACE] Sending {len(sync_items)} items to sync_media_batch(use_replace_mode=True)")
+        log_info(f"[DEBUG-REPLACE] Sending {len(sync_items)} items to sync_library(force_replace=True)")
         
         if not sync_items:
             dialog_service.show_error("No movies with IMDb IDs found in your library")
@@ -673,7 +673,7 @@ def handle_ai_search_replace_sync():
         
         # Get AI search service and perform sync
         ai_service = AISearchClient()
-        sync_result = ai_service.sync_media_batch(sync_items, use_replace_mode=True)
+        sync_result = ai_service.sync_library(sync_items, force_replace=True)
         
         if sync_result and sync_result.get('success'):
             results = sync_result.get('results', {})
@@ -751,7 +751,7 @@ def handle_ai_search_regular_sync():
         
         # DEBUG: Log filtering results
         log_info(f"[DEBUG-REGULAR] After filtering: {len(sync_items)} valid items, {skipped_count} skipped (invalid/empty IMDb IDs)")
-        log_info(f"[DEBUG-REGULAR] Sending {len(sync_items)} items to sync_media_batch(use_replace_mode=False)")
+        log_info(f"[DEBUG-REGULAR] Sending {len(sync_items)} items to sync_library(authoritative=False)")
         
         if not sync_items:
             dialog_service.show_error("No movies with IMDb IDs found in your library")
@@ -759,7 +759,7 @@ def handle_ai_search_regular_sync():
         
         # Get AI search service and perform sync (merge mode)
         ai_service = AISearchClient()
-        sync_result = ai_service.sync_media_batch(sync_items, use_replace_mode=False)
+        sync_result = ai_service.sync_library(sync_items, authoritative=False)
         
         if sync_result and sync_result.get('success'):
             results = sync_result.get('results', {})
@@ -808,28 +808,18 @@ def handle_clear_folder_cache():
             dialog_service.show_error("Folder cache not available")
             return
         
-        # Clear all cached data by removing all cache files
-        import os
-        import glob
-        
+        # Clear all cached entries
         cleared_count = 0
         try:
-            # Get cache directory path 
-            cache_dir = folder_cache.cache_dir
-            if os.path.exists(cache_dir):
-                # Remove all .json cache files
-                cache_files = glob.glob(os.path.join(cache_dir, "*.json"))
-                for cache_file in cache_files:
-                    try:
-                        os.remove(cache_file)
-                        cleared_count += 1
-                        log_info(f"Removed cache file: {os.path.basename(cache_file)}")
-                    except Exception as e:
-                        log_error(f"Failed to remove cache file {cache_file}: {e}")
+            cleared_count = folder_cache.clear_all()
+            
+            # Cached list pages are rebuilt the same way
+            from ui.list_cache import get_list_cache
+            cleared_count += get_list_cache().clear_all()
             
             if cleared_count > 0:
-                dialog_service.show_success(f"Folder cache cleared successfully!\n\nRemoved {cleared_count} cache files.")
-                log_info(f"Folder cache cleared: {cleared_count} files removed")
+                dialog_service.show_success(f"Folder cache cleared successfully!\n\nRemoved {cleared_count} cached folders and list pages.")
+                log_info(f"Folder cache cleared: {cleared_count} entries removed")
             else:
                 dialog_service.show_success("Folder cache was already empty.")
                 log_info("Folder cache was already empty")